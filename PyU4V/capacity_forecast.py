@@ -0,0 +1,350 @@
+# Copyright (c) 2025 Dell Inc. or its subsidiaries.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""capacity_forecast.py."""
+
+import logging
+import threading
+import time
+
+from concurrent import futures
+
+from PyU4V import performance_history
+from PyU4V.utils import exception
+from PyU4V.utils import performance_constants as pc
+
+LOG = logging.getLogger(__name__)
+
+LINEAR = 'linear'
+SEASONAL = 'seasonal'
+DAYS_TO_FULL_CATEGORIES = [pc.ARRAY, pc.SRP, pc.THIN_POOL]
+
+
+def _linear_fit(x_values, y_values):
+    """Fit a least squares line.
+
+    :param x_values: x values -- list
+    :param y_values: y values -- list
+    :returns: slope and intercept -- tuple
+    """
+    count = len(x_values)
+    x_mean = sum(x_values) / count
+    y_mean = sum(y_values) / count
+    variance = sum((x - x_mean) ** 2 for x in x_values)
+    if not variance:
+        return 0.0, y_mean
+    slope = sum((x - x_mean) * (y - y_mean)
+                for x, y in zip(x_values, y_values)) / variance
+    return slope, y_mean - slope * x_mean
+
+
+def linear_projection(timestamps, values, capacity):
+    """Project the days until used capacity reaches total capacity.
+
+    :param timestamps: sample timestamps in milliseconds since
+                       epoch -- list
+    :param values: used capacity at each timestamp -- list
+    :param capacity: total capacity -- float
+    :returns: days from the last sample until full, None if usage is not
+              growing -- float
+    """
+    if not values:
+        return None
+    if values[-1] >= capacity:
+        return 0.0
+    if len(values) < 2:
+        return None
+    days = [(t - timestamps[0]) / pc.ONE_DAY for t in timestamps]
+    slope, intercept = _linear_fit(days, values)
+    if slope <= 0:
+        return None
+    return max(0.0, (capacity - intercept) / slope - days[-1])
+
+
+def seasonal_projection(timestamps, values, capacity,
+                        season=pc.FORECAST_SEASON,
+                        horizon=pc.FORECAST_HORIZON):
+    """Project days to full from a linear trend plus a repeating season.
+
+    The trend is fitted by least squares and the mean residual of each day
+    of the season, by default each day of the week, is added to the
+    projected trend. Fewer than two seasons of samples fall back to a
+    linear projection.
+
+    :param timestamps: sample timestamps in milliseconds since
+                       epoch -- list
+    :param values: used capacity at each timestamp -- list
+    :param capacity: total capacity -- float
+    :param season: season length in days -- int
+    :param horizon: maximum days to project -- int
+    :returns: days from the last sample until full, None if not full
+              within the horizon -- float
+    """
+    if not values:
+        return None
+    if values[-1] >= capacity:
+        return 0.0
+    days = [(t - timestamps[0]) / pc.ONE_DAY for t in timestamps]
+    if days[-1] < 2 * season:
+        return linear_projection(timestamps, values, capacity)
+    slope, intercept = _linear_fit(days, values)
+    residuals = dict()
+    for day, value in zip(days, values):
+        residuals.setdefault(int(day) % season, list()).append(
+            value - (slope * day + intercept))
+    seasonal = {phase: sum(r) / len(r) for phase, r in residuals.items()}
+    for offset in range(1, int(horizon) + 1):
+        day = days[-1] + offset
+        projected = slope * day + intercept + seasonal.get(
+            int(day) % season, 0.0)
+        if projected >= capacity:
+            return float(offset)
+    return None
+
+
+class CapacityForecaster(object):
+    """Cached days to full and local capacity projections.
+
+    Unisphere days to full projections change at most daily but need one
+    request per category per array. Results are cached per array and
+    category for ttl seconds, in memory and in the metadata store when one
+    is configured, and a fleet is refreshed with concurrent requests for the
+    entries which have expired.
+
+    Projections can also be calculated locally from capacity metrics kept
+    in a PerformanceHistoryStore.
+    """
+
+    def __init__(self, performance, ttl=pc.DAYS_TO_FULL_TTL,
+                 history_store=None, max_workers=pc.COLLECT_MAX_WORKERS):
+        """__init__.
+
+        :param performance: performance functions -- PerformanceFunctions
+        :param ttl: seconds to keep days to full results -- int
+        :param history_store: capacity metric history, defaults to the
+                              performance history store --
+                              PerformanceHistoryStore
+        :param max_workers: maximum concurrent requests -- int
+        """
+        self.performance = performance
+        self.ttl = ttl
+        self.history_store = history_store if history_store else (
+            performance.history_store)
+        self.max_workers = max_workers
+        self._cache = dict()
+        self._lock = threading.Lock()
+
+    def _get_cached(self, array_id, category, now):
+        """Get an unexpired days to full result.
+
+        :param array_id: array id -- str
+        :param category: days to full category -- str
+        :param now: time in seconds since epoch -- float
+        :returns: days to full information, None if not cached -- list
+        """
+        with self._lock:
+            cached = self._cache.get((array_id, category))
+        if cached and now - cached[0] < self.ttl:
+            return cached[1]
+        store = self.performance.common.metadata_store
+        if store:
+            stored = store.get(pc.DAYS_TO_FULL_NAMESPACE, key=category,
+                               scope=array_id)
+            if stored and now - stored[pc.TIMESTAMP] < self.ttl:
+                with self._lock:
+                    self._cache[(array_id, category)] = (
+                        stored[pc.TIMESTAMP], stored[pc.RESULT])
+                return stored[pc.RESULT]
+        return None
+
+    def _fetch(self, array_id, category, now):
+        """Request days to full information and cache it.
+
+        :param array_id: array id -- str
+        :param category: days to full category -- str
+        :param now: time in seconds since epoch -- float
+        :returns: days to full information -- list
+        """
+        response = self.performance.get_days_to_full(
+            array_id=array_id, array_to_full=category == pc.ARRAY,
+            srp_to_full=category == pc.SRP,
+            thin_pool_to_full=category == pc.THIN_POOL)
+        with self._lock:
+            self._cache[(array_id, category)] = (now, response)
+        store = self.performance.common.metadata_store
+        if store:
+            store.set(pc.DAYS_TO_FULL_NAMESPACE,
+                      {pc.TIMESTAMP: now, pc.RESULT: response},
+                      key=category, scope=array_id)
+        return response
+
+    @staticmethod
+    def _validate_categories(categories):
+        """Check days to full categories.
+
+        :param categories: days to full categories -- list
+        :raises: InvalidInputException
+        """
+        for category in categories:
+            if category not in DAYS_TO_FULL_CATEGORIES:
+                msg = ('Invalid days to full category "{c}", please use one '
+                       'of {cs}.'.format(c=category,
+                                         cs=DAYS_TO_FULL_CATEGORIES))
+                LOG.error(msg)
+                raise exception.InvalidInputException(msg)
+
+    def get_days_to_full(self, category=pc.ARRAY, array_id=None,
+                         refresh=False):
+        """Get days to full information, cached for the ttl.
+
+        :param category: days to full category 'Array', 'SRP' or
+                         'ThinPool' -- str
+        :param array_id: array id -- str
+        :param refresh: request the information even if cached -- bool
+        :returns: days to full information -- list
+        :raises: InvalidInputException
+        """
+        self._validate_categories([category])
+        array_id = str(array_id if array_id else self.performance.array_id)
+        now = time.time()
+        response = None if refresh else self._get_cached(
+            array_id, category, now)
+        if response is None:
+            response = self._fetch(array_id, category, now)
+        return response
+
+    def get_fleet_days_to_full(self, array_ids, categories=None,
+                               refresh=False):
+        """Get days to full information for many arrays.
+
+        Cached results are returned directly, the remaining array and
+        category combinations are requested concurrently. Failed requests
+        are logged and omitted.
+
+        :param array_ids: array ids -- list
+        :param categories: days to full categories, defaults to Array, SRP
+                           and ThinPool -- list
+        :param refresh: request the information even if cached -- bool
+        :returns: days to full information keyed by array id and
+                  category -- dict
+        :raises: InvalidInputException
+        """
+        categories = categories if categories else DAYS_TO_FULL_CATEGORIES
+        self._validate_categories(categories)
+        now = time.time()
+        response, requests = dict(), list()
+        for array_id in array_ids:
+            array_id = str(array_id)
+            response[array_id] = dict()
+            for category in categories:
+                cached = None if refresh else self._get_cached(
+                    array_id, category, now)
+                if cached is None:
+                    requests.append((array_id, category))
+                else:
+                    response[array_id][category] = cached
+
+        if requests:
+            workers = max(1, min(int(self.max_workers), len(requests)))
+            with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+                future_map = {
+                    executor.submit(self._fetch, array_id, category, now): (
+                        array_id, category)
+                    for array_id, category in requests}
+                for future in futures.as_completed(future_map):
+                    array_id, category = future_map[future]
+                    try:
+                        response[array_id][category] = future.result()
+                    except exception.PyU4VException as error:
+                        LOG.warning('Unable to get {c} days to full for '
+                                    'array {a}: {e}'.format(
+                                        c=category, a=array_id, e=error))
+        return {array_id: {c: results[c] for c in categories if c in results}
+                for array_id, results in response.items()}
+
+    def invalidate(self, array_id=None):
+        """Discard cached days to full information.
+
+        :param array_id: only discard this array, defaults to all -- str
+        """
+        with self._lock:
+            if array_id:
+                for key in [k for k in self._cache if k[0] == str(array_id)]:
+                    del self._cache[key]
+            else:
+                self._cache = dict()
+        store = self.performance.common.metadata_store
+        if store:
+            store.invalidate(scope=str(array_id) if array_id else None,
+                             namespace=pc.DAYS_TO_FULL_NAMESPACE)
+
+    def forecast(self, category, used_metric, capacity_metric,
+                 object_ids=None, array_id=None, method=LINEAR,
+                 start_time=None, end_time=None):
+        """Project days to full from capacity metric history.
+
+        Daily history is used where available, otherwise hourly or raw
+        samples.
+
+        :param category: performance category e.g. SRP -- str
+        :param used_metric: used capacity metric -- str
+        :param capacity_metric: total capacity metric -- str
+        :param object_ids: object ids, defaults to all in the history -- list
+        :param array_id: array id -- str
+        :param method: 'linear' or 'seasonal' -- str
+        :param start_time: timestamp in milliseconds since epoch -- int
+        :param end_time: timestamp in milliseconds since epoch -- int
+        :returns: days to full, last used and total capacity keyed by
+                  object id -- dict
+        :raises: InvalidInputException
+        """
+        if method not in [LINEAR, SEASONAL]:
+            msg = ('Invalid forecast method "{m}", please use one of '
+                   '{ms}.'.format(m=method, ms=[LINEAR, SEASONAL]))
+            LOG.error(msg)
+            raise exception.InvalidInputException(msg)
+        if self.history_store is None:
+            msg = ('No performance history store is configured, please set '
+                   'one using PerformanceFunctions.set_history_store.')
+            LOG.error(msg)
+            raise exception.InvalidInputException(msg)
+        array_id = str(array_id if array_id else self.performance.array_id)
+        history = dict()
+        for tier in [performance_history.DAILY, performance_history.HOURLY,
+                     performance_history.RAW]:
+            history = self.history_store.query(
+                category, object_ids=object_ids,
+                metrics=[used_metric, capacity_metric],
+                start_time=start_time, end_time=end_time, tier=tier,
+                array_id=array_id)
+            if history:
+                break
+
+        projection = linear_projection if method == LINEAR else (
+            seasonal_projection)
+        response = dict()
+        for object_id, samples in history.items():
+            samples = [s for s in samples if s.get(used_metric) is not None]
+            if not samples:
+                continue
+            capacities = [s[capacity_metric] for s in samples
+                          if s.get(capacity_metric) is not None]
+            capacity = capacities[-1] if capacities else None
+            response[object_id] = {
+                'days_to_full': projection(
+                    [s[pc.TIMESTAMP] for s in samples],
+                    [s[used_metric] for s in samples],
+                    capacity) if capacity is not None else None,
+                used_metric: samples[-1][used_metric],
+                capacity_metric: capacity}
+        return response
@@ -13,16 +13,21 @@
 # limitations under the License.
 """common.py."""
 
+import functools
+import hashlib
 import json
 import logging
 import math
+import os
 import re
+import requests.exceptions as r_exc
 import six
 import socket
 import time
 
 from PyU4V.utils import constants
 from PyU4V.utils import exception
+from PyU4V.utils import file_handler
 
 LOG = logging.getLogger(__name__)
 
@@ -37,9 +42,21 @@ STATUS_200 = constants.STATUS_200
 STATUS_201 = constants.STATUS_201
 STATUS_202 = constants.STATUS_202
 STATUS_204 = constants.STATUS_204
+STATUS_206 = constants.STATUS_206
 STATUS_401 = constants.STATUS_401
 STATUS_404 = constants.STATUS_404
 
+# Download constants
+BYTES_DOWNLOADED = constants.BYTES_DOWNLOADED
+SHA256 = constants.SHA256
+CONTENT_LENGTH = constants.CONTENT_LENGTH
+DOWNLOAD_CHUNK_SIZE = constants.DOWNLOAD_CHUNK_SIZE
+DOWNLOAD_MAX_RETRIES = constants.DOWNLOAD_MAX_RETRIES
+DOWNLOAD_PART_SUFFIX = constants.DOWNLOAD_PART_SUFFIX
+FILE_READ_MODE = constants.FILE_READ_MODE
+FILE_WRITE_MODE = constants.FILE_WRITE_MODE
+FILE_APPEND_MODE = constants.FILE_APPEND_MODE
+
 # Job constants
 INCOMPLETE_LIST = constants.INCOMPLETE_LIST
 CREATED = constants.CREATED
@@ -56,6 +73,34 @@ ITERATOR = constants.ITERATOR
 PAGE = constants.PAGE
 WLP = constants.WLP
 HEADROOM = constants.HEADROOM
+UNISPHERE_SCOPE = constants.METADATA_UNISPHERE_SCOPE
+VERSIONLESS_CATEGORIES = ['performance', 'common']
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_uri_template(route):
+    """Compile a URI route into a positional format template.
+
+    The route is a tuple of the static URI segments, with a flag after each
+    resource segment indicating if an object id follows it. Static segments
+    are escaped and baked into the template, ids are left as positional
+    placeholders so building a URI is a single str.format call.
+
+    :param route: version, category, then (segment, has id) pairs -- tuple
+    :returns: URI template -- str
+    """
+    def _escape(segment):
+        return str(segment).replace('{', '{{').replace('}', '}}')
+
+    version, category = route[0], route[1]
+    template = '/{v}'.format(v=_escape(version)) if version else str()
+    template += '/{c}'.format(c=_escape(category))
+    for segment, has_id in zip(route[2::2], route[3::2]):
+        if segment:
+            template += '/{s}'.format(s=_escape(segment))
+        if has_id:
+            template += '/{}'
+    return template
 
 
 class CommonFunctions(object):
@@ -68,6 +113,58 @@ class CommonFunctions(object):
         self.interval = self.rest_client.interval
         self.retries = self.rest_client.retries
         self.UNI_VERSION = constants.UNISPHERE_VERSION
+        self._scope_checked = dict()
+
+    @property
+    def metadata_store(self):
+        """Get the persistent metadata store, if enabled.
+
+        :returns: metadata store -- MetadataStore or None
+        """
+        return self.rest_client.metadata_store
+
+    def get_static_metadata(self, namespace, fetch, key=str(),
+                            array_id=None):
+        """Get a rarely changing fact, consulting the metadata store first.
+
+        If the persistent metadata store is not enabled the fact is always
+        fetched live from Unisphere. Before array scoped facts are served the
+        array ucode is checked, at most once per version check interval, so
+        facts cached under a previous ucode are discarded.
+
+        :param namespace: fact namespace e.g. performance_categories -- str
+        :param fetch: callable returning the live value -- callable
+        :param key: fact key within the namespace -- str
+        :param array_id: array id for array scoped facts -- str
+        :returns: fact value -- Any
+        """
+        store = self.metadata_store
+        if not store:
+            return fetch()
+        scope = array_id if array_id else UNISPHERE_SCOPE
+        if array_id:
+            self._check_scope_version(array_id)
+        return store.get_or_fetch(namespace, fetch, key=key, scope=scope)
+
+    def _check_scope_version(self, array_id):
+        """Refresh the recorded ucode of an array if it is due a check.
+
+        get_array records the array ucode in the metadata store, which
+        invalidates the facts of the array if the ucode has changed.
+
+        :param array_id: array id -- str
+        """
+        now = time.time()
+        last_checked = self._scope_checked.get(array_id)
+        if last_checked is not None and (
+                now - last_checked < constants.METADATA_VERSION_INTERVAL):
+            return
+        self._scope_checked[array_id] = now
+        try:
+            self.get_array(array_id)
+        except exception.PyU4VException as error:
+            LOG.debug('Unable to check the ucode of array {a}: {e}'.format(
+                a=array_id, e=error))
 
     def wait_for_job_complete(self, job):
         """Given the job wait for it to complete.
@@ -171,7 +268,7 @@ class CommonFunctions(object):
                 data="Server unavailable or IP incorrect")
 
         if status_code not in [STATUS_200, STATUS_201,
-                               STATUS_202, STATUS_204]:
+                               STATUS_202, STATUS_204, STATUS_206]:
             exception_message = (
                 'Error {op}. The status code received is {sc} and the message '
                 'is {msg}.'.format(op=operation, sc=status_code, msg=message))
@@ -242,47 +339,32 @@ class CommonFunctions(object):
         :key object_type_id: optional name of resource -- str
         :returns: target URI -- str
         """
-        target_uri, version = str(), None
-
-        if kwargs.get('category') not in ['performance', 'common']:
-            version = self._build_uri_get_version(kwargs.get('version'),
-                                                  kwargs.get('no_version'))
-        if version:
-            target_uri += '/{version}'.format(version=version)
-
-        target_uri += '/{category}'.format(
-            category=kwargs.get('category'))
-
-        if kwargs.get('resource_level'):
-            target_uri += '/{resource_level}'.format(
-                resource_level=kwargs.get('resource_level'))
-
-        if kwargs.get('resource_level_id'):
-            target_uri += '/{resource_level_id}'.format(
-                resource_level_id=kwargs.get('resource_level_id'))
-
-        if kwargs.get('resource_type'):
-            target_uri += '/{resource_type}'.format(
-                resource_type=kwargs.get('resource_type'))
-            if kwargs.get('resource_type_id'):
-                target_uri += '/{resource_type_id}'.format(
-                    resource_type_id=kwargs.get('resource_type_id'))
-
-        if kwargs.get('resource'):
-            target_uri += '/{resource}'.format(
-                resource=kwargs.get('resource'))
-            if kwargs.get('resource_id'):
-                target_uri += '/{resource_id}'.format(
-                    resource_id=kwargs.get('resource_id'))
-
-        if kwargs.get('object_type'):
-            target_uri += '/{object_type}'.format(
-                object_type=kwargs.get('object_type'))
-            if kwargs.get('object_type_id'):
-                target_uri += '/{object_type_id}'.format(
-                    object_type_id=kwargs.get('object_type_id'))
-
-        return target_uri
+        get = kwargs.get
+        category = get('category')
+        version = None
+        if category not in VERSIONLESS_CATEGORIES:
+            version = self._build_uri_get_version(
+                get('version'), get('no_version'))
+
+        resource_level_id = get('resource_level_id')
+        resource_type, resource_type_id = (
+            get('resource_type'), get('resource_type_id'))
+        resource, resource_id = get('resource'), get('resource_id')
+        object_type, object_type_id = (
+            get('object_type'), get('object_type_id'))
+
+        # Object ids are only appended when their resource segment is set
+        ids = [resource_level_id]
+        ids.append(resource_type_id if resource_type else None)
+        ids.append(resource_id if resource else None)
+        ids.append(object_type_id if object_type else None)
+
+        route = (version, category,
+                 get('resource_level'), bool(ids[0]),
+                 resource_type, bool(ids[1]),
+                 resource, bool(ids[2]),
+                 object_type, bool(ids[3]))
+        return _compile_uri_template(route).format(*[i for i in ids if i])
 
     def _build_uri_get_version(self, version=None, no_version=False):
         """Get the Unisphere version for the target URI.
@@ -302,16 +384,19 @@ class CommonFunctions(object):
                     ver=version))
         return version
 
-    def get_request(self, target_uri, resource_type, params=None):
+    def get_request(self, target_uri, resource_type, params=None,
+                    timeout=None):
         """Send a GET request to the array.
 
         :param target_uri: target uri -- str
         :param resource_type: the resource type, e.g. maskingview -- str
         :param params: optional filter params -- dict
+        :param timeout: optional timeout override in seconds -- int
         :returns: resource_object -- dict
         :raises: ResourceNotFoundException
         """
-        message, sc = self.request(target_uri, GET, params=params)
+        message, sc = self.request(target_uri, GET, params=params,
+                                   timeout=timeout)
         operation = 'GET {resource_type}'.format(resource_type=resource_type)
         self.check_status_code_success(operation, sc, message)
         return message
@@ -331,9 +416,10 @@ class CommonFunctions(object):
         :key object_type: optional name of resource -- str
         :key object_type_id: optional name of resource -- str
         :key params: query parameters -- dict
+        :key target_uri: prebuilt target uri, skips uri building -- str
         :returns: resource object -- dict
         """
-        target_uri = self._build_uri(**kwargs)
+        target_uri = kwargs.get('target_uri') or self._build_uri(**kwargs)
         resource_type = None
         if args:
             resource_type = args[2]
@@ -359,9 +445,7 @@ class CommonFunctions(object):
         :key payload: query parameters -- dict
         :returns: resource object -- dict
         """
-        target_uri = self._build_uri(**kwargs)
-        if kwargs.get('target_uri'):
-            target_uri = (kwargs.get('target_uri'))
+        target_uri = kwargs.get('target_uri') or self._build_uri(**kwargs)
         message, status_code = self.request(
             target_uri, POST, request_object=kwargs.get('payload'))
         resource_type = None
@@ -391,9 +475,7 @@ class CommonFunctions(object):
         :key payload: query parameters
         :returns: resource object -- dict
         """
-        target_uri = self._build_uri(**kwargs)
-        if kwargs.get('target_uri'):
-            target_uri = (kwargs.get('target_uri'))
+        target_uri = kwargs.get('target_uri') or self._build_uri(**kwargs)
         message, status_code = self.request(
             target_uri, PUT, request_object=kwargs.get('payload'))
         resource_type = None
@@ -422,9 +504,7 @@ class CommonFunctions(object):
         :key object_type_id: optional name of resource -- str
         :key payload: query parameters
         """
-        target_uri = self._build_uri(**kwargs)
-        if kwargs.get('target_uri'):
-            target_uri = (kwargs.get('target_uri'))
+        target_uri = kwargs.get('target_uri') or self._build_uri(**kwargs)
         message, status_code = self.request(
             target_uri, DELETE, request_object=kwargs.get('payload'),
             params=kwargs.get('params'))
@@ -452,15 +532,15 @@ class CommonFunctions(object):
         :key object_type: optional name of resource -- str
         :key object_type_id: optional name of resource -- str
         :key payload: query parameters -- dict
+        :key range_start: byte offset to resume the download from -- int
         :returns: file info including binary data -- dict
         :raises: ValueError
         """
-        target_uri = self._build_uri(**kwargs)
-        if kwargs.get('target_uri'):
-            target_uri = (kwargs.get('target_uri'))
+        target_uri = kwargs.get('target_uri') or self._build_uri(**kwargs)
         response, status_code = self.rest_client.file_transfer_request(
             method=POST, download=True, uri=target_uri,
-            timeout=kwargs.get('timeout'), r_obj=kwargs.get('payload'))
+            timeout=kwargs.get('timeout'), r_obj=kwargs.get('payload'),
+            range_start=kwargs.get('range_start'))
         try:
             message = response.raw.reason
             operation = ('download {resource_type} resource'.format(
@@ -474,6 +554,106 @@ class CommonFunctions(object):
                     uri=target_uri))
         return response
 
+    def stream_download(self, file_path=None, file_object=None,
+                        resume=False, checksum=False,
+                        chunk_size=DOWNLOAD_CHUNK_SIZE,
+                        progress_callback=None,
+                        max_retries=DOWNLOAD_MAX_RETRIES, **kwargs):
+        """Stream a file download to a local path or file-like object.
+
+        The response is read in chunk_size chunks and written through a
+        write-behind buffer so the full file is never held in memory. When
+        writing to file_path data is first written to a .part file which is
+        renamed once the download completes.
+
+        With resume set, an existing .part file is continued from its
+        current size and a download interrupted by a connection error is
+        retried up to max_retries times from the last byte received. Resume
+        uses an HTTP Range request, if Unisphere ignores the range and
+        returns the full file the partial data is discarded and the
+        download starts again from the beginning.
+
+        :param file_path: file write path -- str
+        :param file_object: writable binary file-like object, used instead
+                            of file_path -- file
+        :param resume: resume partial downloads -- bool
+        :param checksum: calculate the SHA-256 of the downloaded file -- bool
+        :param chunk_size: bytes read from the response at a time -- int
+        :param progress_callback: called with bytes done and total bytes,
+                                  total is None if unknown -- callable
+        :param max_retries: resume attempts after a connection error -- int
+        :key target_uri: target uri -- str
+        :key category: resource category e.g. system -- str
+        :key payload: download request payload -- dict
+        :key timeout: timeout -- int
+        :returns: file path, bytes downloaded and SHA-256 hex digest if
+                  checksum is set -- dict
+        :raises: InvalidInputException
+        """
+        if not (file_path or file_object) or (file_path and file_object):
+            msg = 'One of file_path or file_object must be supplied.'
+            LOG.error(msg)
+            raise exception.InvalidInputException(msg)
+
+        sha256 = hashlib.sha256() if checksum else None
+        bytes_done = 0
+        part_path = None
+        if file_path:
+            part_path = '{p}{s}'.format(p=file_path, s=DOWNLOAD_PART_SUFFIX)
+            if resume and os.path.isfile(part_path):
+                bytes_done = os.path.getsize(part_path)
+                if sha256:
+                    with open(part_path, FILE_READ_MODE) as part:
+                        for block in iter(
+                                lambda: part.read(chunk_size), b''):
+                            sha256.update(block)
+            file_object = open(
+                part_path, FILE_APPEND_MODE if bytes_done else FILE_WRITE_MODE)
+
+        attempt = 0
+        try:
+            while True:
+                response = self.download_file(
+                    range_start=bytes_done, **kwargs)
+                if bytes_done and response.status_code != STATUS_206:
+                    LOG.warning('Range requests are not supported for this '
+                                'download, restarting from the beginning.')
+                    file_object.seek(0)
+                    file_object.truncate()
+                    bytes_done = 0
+                    if sha256:
+                        sha256 = hashlib.sha256()
+                length = response.headers.get(CONTENT_LENGTH)
+                total_bytes = bytes_done + int(length) if length else None
+                try:
+                    bytes_done = file_handler.stream_binary_data(
+                        response, file_object, chunk_size=chunk_size,
+                        progress_callback=progress_callback, checksum=sha256,
+                        bytes_done=bytes_done, total_bytes=total_bytes)
+                    break
+                except (r_exc.ChunkedEncodingError,
+                        r_exc.ConnectionError) as error:
+                    attempt += 1
+                    if not resume or not part_path or attempt > max_retries:
+                        raise
+                    file_object.flush()
+                    bytes_done = file_object.tell()
+                    LOG.warning(
+                        'Download interrupted after {b} bytes, resuming '
+                        'attempt {a} of {m}. Exception received: '
+                        '{e}.'.format(b=bytes_done, a=attempt, m=max_retries,
+                                      e=error))
+        finally:
+            if part_path:
+                file_object.close()
+
+        if part_path:
+            os.replace(part_path, file_path)
+        LOG.info('Download complete, {b} bytes received.'.format(
+            b=bytes_done))
+        return {'file_path': file_path, BYTES_DOWNLOADED: bytes_done,
+                SHA256: sha256.hexdigest() if sha256 else None}
+
     def upload_file(self, **kwargs):
         """Upload a file.
 
@@ -489,15 +669,16 @@ class CommonFunctions(object):
         :key object_type: optional name of resource -- str
         :key object_type_id: optional name of resource -- str
         :key form_data: multipart form data -- dict
+        :key progress_callback: called with bytes sent and total bytes
+                                -- callable
         :returns: response success details -- dict
         """
         response_content = dict()
-        target_uri = self._build_uri(**kwargs)
-        if kwargs.get('target_uri'):
-            target_uri = (kwargs.get('target_uri'))
+        target_uri = kwargs.get('target_uri') or self._build_uri(**kwargs)
         response, status_code = self.rest_client.file_transfer_request(
             method=POST, upload=True, uri=target_uri,
-            form_data=kwargs.get('form_data'))
+            form_data=kwargs.get('form_data'),
+            progress_callback=kwargs.get('progress_callback'))
         try:
             response_content = json.loads(response.text)
             msg = response_content.get('message')
@@ -528,6 +709,8 @@ class CommonFunctions(object):
             version = response['version']
             version_list = version.split('.')
             major_version = version_list[0][1:] + version_list[1]
+            if self.metadata_store:
+                self.metadata_store.set_scope_version(version)
         return version, major_version
 
     def get_uni_version_info(self):
@@ -536,9 +719,9 @@ class CommonFunctions(object):
         :returns: {'version': 'T10.1.0.468', 'api_version': '101',
                   'supported_api_versions': ['101', '100', '92']} -- dict
         """
-        response = self.get_resource(category=VERSION, no_version=True)
-
-        return response
+        return self.get_static_metadata(
+            'uni_version_info', lambda: self.get_resource(
+                category=VERSION, no_version=True))
 
     def get_array_list(self, filters=None):
         """Return a list of arrays.
@@ -566,8 +749,14 @@ class CommonFunctions(object):
         :param array_id: array id -- str
         :returns: array details -- dict
         """
-        return self.get_resource(category=SYSTEM, resource_level=SYMMETRIX,
-                                 resource_level_id=array_id)
+        array_details = self.get_resource(
+            category=SYSTEM, resource_level=SYMMETRIX,
+            resource_level_id=array_id)
+        if array_details and self.metadata_store:
+            self.metadata_store.set_scope_version(
+                array_details.get('ucode') or array_details.get('microcode'),
+                scope=array_id)
+        return array_details
 
     def get_iterator_page_list(self, iterator_id, start, end):
         """Get a page of results from an iterator instance.
@@ -675,7 +864,18 @@ class CommonFunctions(object):
         :param array_id: the array serial number
         :returns: bool
         """
+        if not array_id:
+            return self._is_array_v4(array_id)
+        return self.get_static_metadata(
+            'is_array_v4', lambda: self._is_array_v4(array_id),
+            array_id=array_id)
 
+    def _is_array_v4(self, array_id):
+        """Check live against Unisphere to see if array is a v4.
+
+        :param array_id: the array serial number
+        :returns: bool
+        """
         is_v4 = False
         array_details = self.get_array(array_id)
 
@@ -43,11 +43,13 @@ class EnhancedAPIFunctions(object):
         :returns: dictionary with list of attributes and descriptions of
                  attribute types used for filtering and selection -- dict
         """
-        response = self.common.get_request(
-            target_uri=f"/{self.enhanced_api_version}/systems"
-                       f"/{storage_object}/metadata",
-                       resource_type=None)
-        return response
+        return self.common.get_static_metadata(
+            'enhanced_api_metadata', lambda: self.common.get_request(
+                target_uri=f"/{self.enhanced_api_version}/systems"
+                           f"/{storage_object}/metadata",
+                resource_type=None),
+            key='{v}/{o}'.format(v=self.enhanced_api_version,
+                                 o=storage_object))
 
     def get_storage_object_details(
             self, storage_object, array_id=None, filters=None, select=None,
@@ -0,0 +1,480 @@
+# Copyright (c) 2025 Dell Inc. or its subsidiaries.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""exporter.py.
+
+Prometheus exporter for PowerMax performance metrics.
+
+Run with ``python -m PyU4V.exporter``. Unisphere connection details are
+read from PyU4V.conf. Metrics are collected in the background every
+interval seconds, each array in parallel, and the last sample of every
+object is kept in memory. Scrapes of /metrics are served from the last
+completed collection and never cause Unisphere requests, so scrape
+frequency and timeouts are independent of Unisphere response times.
+
+Collections are given as source:category[:metric,metric], where source is
+diagnostic, enhanced or real_time, for example diagnostic:StorageGroup:KPI
+or real_time:Array:HostIOs,HostMBs. Metrics default to KPI metrics for
+diagnostic collections and every metric for the others.
+"""
+
+import argparse
+import collections
+import http.server
+import logging
+import math
+import re
+import socketserver
+import threading
+import time
+
+from concurrent import futures
+
+from PyU4V.utils import exception
+from PyU4V.utils import performance_constants as pc
+
+LOG = logging.getLogger(__name__)
+
+DIAGNOSTIC = 'diagnostic'
+ENHANCED = 'enhanced'
+REAL_TIME = 'real_time'
+SOURCES = [DIAGNOSTIC, ENHANCED, REAL_TIME]
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+# Words of a metric name, keeping plural acronyms such as IOs together
+METRIC_WORD = '[A-Z]+s(?![a-z])|[A-Z]?[a-z0-9]+|[A-Z]+(?![a-z])'
+
+Collection = collections.namedtuple(
+    'Collection', ['source', 'category', 'metrics', 'object_ids'])
+Collection.__new__.__defaults__ = (None, None)
+
+DEFAULT_COLLECTIONS = [Collection(DIAGNOSTIC, pc.ARRAY, pc.KPI)]
+
+
+def parse_collection(spec):
+    """Parse a source:category[:metric,metric] collection.
+
+    :param spec: collection e.g. diagnostic:StorageGroup:KPI -- str
+    :returns: collection -- Collection
+    :raises: InvalidInputException
+    """
+    parts = spec.split(':')
+    if len(parts) not in [2, 3] or parts[0] not in SOURCES or not parts[1]:
+        msg = ('Invalid collection "{s}", please use source:category or '
+               'source:category:metric,metric where source is one of '
+               '{src}.'.format(s=spec, src=SOURCES))
+        LOG.error(msg)
+        raise exception.InvalidInputException(msg)
+    metrics = None
+    if len(parts) == 3 and parts[2]:
+        metrics = parts[2].split(',')
+        if len(metrics) == 1 and metrics[0].upper() in [
+                pc.KPI.upper(), pc.ALL.upper()]:
+            metrics = metrics[0]
+    return Collection(parts[0], parts[1], metrics)
+
+
+def get_metric_name(category, metric, prefix=pc.EXPORTER_PREFIX):
+    """Get the Prometheus metric name of a performance metric.
+
+    :param category: performance category e.g. StorageGroup -- str
+    :param metric: metric name e.g. HostIOs -- str
+    :param prefix: metric name prefix -- str
+    :returns: metric name e.g. pyu4v_storage_group_host_ios -- str
+    """
+    words = [prefix]
+    for part in [category, metric]:
+        words.extend(re.findall(METRIC_WORD, part) or [part])
+    return re.sub('[^a-zA-Z0-9_]', '_', '_'.join(words)).lower()
+
+
+def _escape_label(value):
+    """Escape a label value for the exposition format.
+
+    :param value: label value -- str
+    :returns: escaped value -- str
+    """
+    return str(value).replace('\\', r'\\').replace('\n', r'\n').replace(
+        '"', r'\"')
+
+
+def format_sample(name, labels, value, timestamp=None):
+    """Format one sample in the Prometheus text exposition format.
+
+    :param name: metric name -- str
+    :param labels: label names and values -- dict
+    :param value: sample value -- float
+    :param timestamp: timestamp in milliseconds since epoch -- int
+    :returns: sample line -- str
+    """
+    label_str = ','.join('{k}="{v}"'.format(k=k, v=_escape_label(v))
+                         for k, v in sorted(labels.items()))
+    line = '{n}{{{l}}} {v}'.format(n=name, l=label_str, v=repr(float(value)))
+    if timestamp is not None:
+        line = '{line} {t}'.format(line=line, t=int(timestamp))
+    return line
+
+
+def _is_number(value):
+    """Check a value can be exported.
+
+    :param value: sample value -- any
+    :returns: value is a finite number -- bool
+    """
+    return isinstance(value, (int, float)) and not isinstance(
+        value, bool) and not math.isnan(value)
+
+
+class MetricsServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    """HTTP server handling each scrape in its own thread."""
+
+    daemon_threads = True
+
+
+class PerformanceExporter(object):
+    """Collect performance metrics in the background for scraping.
+
+    Each collection interval every array is collected concurrently. The
+    samples of a completed collection replace the previous ones in a single
+    step, so a scrape always sees a complete collection. If an array fails
+    the previous samples of that array are kept, and the failure is
+    reported by the pyu4v_exporter_collection_success metric.
+    """
+
+    def __init__(self, conn, array_ids=None, collection_list=None,
+                 interval=pc.EXPORTER_INTERVAL,
+                 max_workers=pc.COLLECT_MAX_WORKERS, timestamps=False,
+                 prefix=pc.EXPORTER_PREFIX, keys_ttl=pc.EXPORTER_KEYS_TTL):
+        """__init__.
+
+        :param conn: Unisphere connection -- U4VConn
+        :param array_ids: array ids, defaults to the connection array
+                          id -- list
+        :param collection_list: collections, defaults to Array KPI
+                                metrics -- list
+        :param interval: seconds between collections -- int
+        :param max_workers: maximum arrays, and real-time instances of an
+                            array, collected concurrently -- int
+        :param timestamps: export sample timestamps -- bool
+        :param prefix: metric name prefix -- str
+        :param keys_ttl: seconds to keep the real-time instances of a
+                         category before listing them again -- int
+        """
+        self.conn = conn
+        self.array_ids = array_ids or [conn.array_id]
+        self.collection_list = collection_list or DEFAULT_COLLECTIONS
+        self.interval = interval
+        self.max_workers = max_workers
+        self.timestamps = timestamps
+        self.prefix = prefix
+        self.keys_ttl = keys_ttl
+        self._samples = dict()
+        self._status = dict()
+        self._payload = b''
+        self._real_time_keys = dict()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _collect_diagnostic(self, array_id, collection):
+        """Collect the latest diagnostic samples of a category.
+
+        :param array_id: array id -- str
+        :param collection: collection -- Collection
+        :returns: latest sample keyed by object id -- dict
+        """
+        response = self.conn.performance.collect_stats(
+            collection.category, object_ids=collection.object_ids,
+            metrics=collection.metrics or pc.KPI, array_id=array_id)
+        return {object_id: samples[-1] for object_id, samples in (
+            response.get(pc.RESULT) or dict()).items() if samples}
+
+    def _collect_enhanced(self, array_id, collection):
+        """Collect the latest enhanced performance samples of a category.
+
+        :param array_id: array id -- str
+        :param collection: collection -- Collection
+        :returns: latest sample keyed by object id -- dict
+        """
+        response = self.conn.performance_enhanced.get_category_metrics(
+            collection.category, array_id=array_id) or dict()
+        latest = dict()
+        for instance in response.get('metric_instances') or list():
+            object_id = instance.get('id')
+            if collection.object_ids and (
+                    object_id not in collection.object_ids):
+                continue
+            samples = instance.get(pc.METRICS) or list()
+            if samples:
+                latest[object_id] = samples[-1]
+        return latest
+
+    def _collect_real_time(self, array_id, collection):
+        """Collect the latest real-time samples of a category.
+
+        :param array_id: array id -- str
+        :param collection: collection -- Collection
+        :returns: latest sample keyed by object id, instances which fail
+                  are logged and omitted -- dict
+        """
+        real_time = self.conn.real_time
+        object_ids = collection.object_ids
+        key = (array_id, collection.category)
+        if object_ids is None:
+            if collection.category == pc.ARRAY:
+                object_ids = [None]
+            else:
+                cached = self._real_time_keys.get(key)
+                if cached is None or time.time() - cached[0] >= (
+                        self.keys_ttl):
+                    cached = self._real_time_keys[key] = (
+                        time.time(), real_time.get_category_keys(
+                            collection.category, array_id=array_id) or list())
+                object_ids = cached[1]
+        end_date = int(time.time() * 1000)
+        latest = dict()
+        if not object_ids:
+            return latest
+        workers = max(1, min(int(self.max_workers), len(object_ids)))
+        with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            future_map = {executor.submit(
+                real_time.get_performance_data, end_date - pc.ONE_MINUTE,
+                end_date, collection.category,
+                collection.metrics or pc.All_CAP, array_id=array_id,
+                instance_id=object_id): object_id for object_id in object_ids}
+            # Keep the instance order so scrapes list samples consistently
+            for future, object_id in future_map.items():
+                try:
+                    response = future.result()
+                except exception.PyU4VException as error:
+                    LOG.warning(
+                        'Unable to collect real-time {c} performance data '
+                        'for {i} on array {a}: {e}'.format(
+                            c=collection.category, i=object_id or array_id,
+                            a=array_id, e=error))
+                    # The instance may have been deleted, list them again
+                    self._real_time_keys.pop(key, None)
+                    continue
+                samples = (response or dict()).get(pc.RESULT)
+                if samples:
+                    latest[object_id or array_id] = samples[-1]
+        return latest
+
+    def collect_array(self, array_id):
+        """Collect every collection of an array.
+
+        :param array_id: array id -- str
+        :returns: formatted samples keyed by metric name -- dict
+        """
+        collectors = {DIAGNOSTIC: self._collect_diagnostic,
+                      ENHANCED: self._collect_enhanced,
+                      REAL_TIME: self._collect_real_time}
+        samples = dict()
+        for collection in self.collection_list:
+            latest = collectors[collection.source](array_id, collection)
+            metrics = collection.metrics
+            if not isinstance(metrics, list):
+                metrics = None
+            for object_id, sample in latest.items():
+                timestamp = sample.get(pc.TIMESTAMP) if (
+                    self.timestamps) else None
+                labels = {'array': array_id, 'id': object_id,
+                          'source': collection.source}
+                for metric, value in sample.items():
+                    if metric == pc.TIMESTAMP or not _is_number(value) or (
+                            metrics and metric not in metrics):
+                        continue
+                    name = get_metric_name(
+                        collection.category, metric, prefix=self.prefix)
+                    samples.setdefault(name, list()).append(format_sample(
+                        name, labels, value, timestamp))
+        return samples
+
+    def collect(self):
+        """Collect every array concurrently and update the cached samples.
+
+        :returns: array ids which failed -- list
+        """
+        failed = list()
+        workers = max(1, min(int(self.max_workers), len(self.array_ids)))
+        with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            future_map = {executor.submit(
+                self._timed_collect, array_id): array_id
+                for array_id in self.array_ids}
+            for future in futures.as_completed(future_map):
+                array_id = future_map[future]
+                try:
+                    samples, duration = future.result()
+                except Exception as error:
+                    LOG.warning('Unable to collect performance metrics for '
+                                '{a}: {e}'.format(a=array_id, e=error))
+                    failed.append(array_id)
+                    with self._lock:
+                        self._status[array_id] = (
+                            0, self._status.get(array_id, (0, 0, 0))[1], 0)
+                    continue
+                with self._lock:
+                    self._samples[array_id] = samples
+                    self._status[array_id] = (1, time.time(), duration)
+        with self._lock:
+            self._payload = self._render().encode('utf-8')
+        return failed
+
+    def _timed_collect(self, array_id):
+        """Collect an array and time the collection.
+
+        :param array_id: array id -- str
+        :returns: formatted samples, seconds taken -- dict, float
+        """
+        start = time.time()
+        samples = self.collect_array(array_id)
+        return samples, time.time() - start
+
+    def _render(self):
+        """Render the cached samples in the text exposition format.
+
+        :returns: exposition -- str
+        """
+        merged = dict()
+        for samples in self._samples.values():
+            for name, lines in samples.items():
+                merged.setdefault(name, list()).extend(lines)
+        status_name = '{p}_exporter_'.format(p=self.prefix)
+        for array_id, (success, last_success, duration) in sorted(
+                self._status.items()):
+            labels = {'array': array_id}
+            for suffix, value in [
+                    ('collection_success', success),
+                    ('last_success_timestamp_seconds', last_success),
+                    ('collection_duration_seconds', duration)]:
+                name = status_name + suffix
+                merged.setdefault(name, list()).append(
+                    format_sample(name, labels, value))
+        output = list()
+        for name in sorted(merged):
+            output.append('# TYPE {n} gauge'.format(n=name))
+            output.extend(merged[name])
+        return '\n'.join(output) + '\n' if output else ''
+
+    def render(self):
+        """Get the last completed collection, no Unisphere requests are made.
+
+        :returns: exposition -- bytes
+        """
+        with self._lock:
+            return self._payload
+
+    def run(self):
+        """Collect every interval until stopped."""
+        while True:
+            start = time.time()
+            try:
+                self.collect()
+            except Exception as error:
+                LOG.exception('Performance collection failed: {e}'.format(
+                    e=error))
+            if self._stop.wait(max(0, self.interval - (time.time() - start))):
+                return
+
+    def start(self):
+        """Start collecting in a background thread."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self.run, name='PyU4VExporter', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the background collection."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def get_server(self, address=pc.EXPORTER_ADDRESS,
+                   port=pc.EXPORTER_PORT):
+        """Get an HTTP server serving /metrics from the cached samples.
+
+        :param address: listen address -- str
+        :param port: listen port -- int
+        :returns: server -- MetricsServer
+        """
+        exporter = self
+
+        class MetricsHandler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                payload = exporter.render()
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, msg_format, *args):
+                LOG.debug(msg_format % args)
+
+        return MetricsServer((address, port), MetricsHandler)
+
+
+def main(argv=None):
+    """Run the exporter until interrupted.
+
+    :param argv: command line arguments -- list
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m PyU4V.exporter',
+        description='Export PowerMax performance metrics to Prometheus.')
+    parser.add_argument(
+        '--array', action='append', dest='array_ids',
+        help='array id, may be repeated, defaults to the PyU4V.conf array')
+    parser.add_argument(
+        '--collection', action='append', dest='collections',
+        help='source:category[:metric,metric], may be repeated, defaults '
+             'to diagnostic:Array:KPI')
+    parser.add_argument('--interval', type=int, default=pc.EXPORTER_INTERVAL,
+                        help='seconds between collections')
+    parser.add_argument('--address', default=pc.EXPORTER_ADDRESS,
+                        help='listen address')
+    parser.add_argument('--port', type=int, default=pc.EXPORTER_PORT,
+                        help='listen port')
+    parser.add_argument('--max-workers', type=int,
+                        default=pc.COLLECT_MAX_WORKERS,
+                        help='maximum arrays collected concurrently')
+    parser.add_argument('--timestamps', action='store_true',
+                        help='export sample timestamps')
+    args = parser.parse_args(argv)
+
+    from PyU4V import univmax_conn
+    collection_list = [parse_collection(spec)
+                       for spec in args.collections or list()]
+    conn = univmax_conn.U4VConn()
+    exporter = PerformanceExporter(
+        conn, array_ids=args.array_ids, collection_list=collection_list,
+        interval=args.interval, max_workers=args.max_workers,
+        timestamps=args.timestamps)
+    server = exporter.get_server(args.address, args.port)
+    exporter.start()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        exporter.stop()
+        conn.close_session()
+
+
+if __name__ == '__main__':
+    main()
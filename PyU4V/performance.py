@@ -17,12 +17,18 @@ import copy
 import logging
 import re
 import socket
+import threading
 import time
+
+from concurrent import futures
+
 from PyU4V import common
 from PyU4V import real_time
 from PyU4V.utils import exception
 from PyU4V.utils import file_handler
 from PyU4V.utils import performance_constants as pc
+from PyU4V.utils import performance_frame
+from PyU4V.utils import timestamp_index
 
 
 LOG = logging.getLogger(__name__)
@@ -42,6 +48,10 @@ class PerformanceFunctions(object):
         self.is_v4 = self.common.is_array_v4(self.array_id)
         self.timestamp = None
         self.recency = 7
+        self.history_store = None
+        self.key_index_ttl = pc.KEY_INDEX_TTL
+        self._key_index_cache = dict()
+        self._key_index_lock = threading.Lock()
 
     def set_array_id(self, array_id):
         """Set the array id.
@@ -64,6 +74,16 @@ class PerformanceFunctions(object):
         """
         self.recency = minutes
 
+    def set_history_store(self, history_store):
+        """Set a local history store to record collected statistics in.
+
+        Results returned by get_performance_stats and collect_stats are
+        added to the raw tier of the store, set to None to stop recording.
+
+        :param history_store: history store -- PerformanceHistoryStore
+        """
+        self.history_store = history_store
+
     def is_array_diagnostic_performance_registered(self, array_id=None):
         """Check if an array is registered for diagnostic performance data.
 
@@ -302,6 +322,10 @@ class PerformanceFunctions(object):
     def get_last_available_timestamp(self, array_id=None):
         """Get the last recorded performance timestamp.
 
+        If the connection has a timestamp index the timestamps of all arrays
+        are requested once per diagnostic interval and shared, otherwise
+        they are requested on every call.
+
         :param array_id: array_id: array id -- str
         :returns: timestamp -- int
         :raises: ResourceNotFoundException
@@ -309,13 +333,21 @@ class PerformanceFunctions(object):
         array_id = self.array_id if not array_id else array_id
         timestamp = None
 
-        response = self.get_request(
-            category=pc.PERFORMANCE, resource_level=pc.ARRAY,
-            resource_type=pc.KEYS)
-        if response:
-            for key in response.get(pc.ARRAY_INFO):
-                if key and key.get(pc.SYMM_ID) == array_id:
-                    timestamp = key[pc.LA_DATE]
+        def _get_array_keys():
+            return self.get_request(
+                category=pc.PERFORMANCE, resource_level=pc.ARRAY,
+                resource_type=pc.KEYS)
+
+        index = self.common.rest_client.timestamp_index
+        if index is not None:
+            array_keys = index.get_array_keys(_get_array_keys, array_id)
+        else:
+            response = _get_array_keys()
+            array_keys = timestamp_index.index_array_keys(
+                response) if response else None
+        if array_keys is not None:
+            if array_keys.get(array_id):
+                timestamp = array_keys[array_id].get(pc.LA_DATE)
             if not timestamp:
                 msg = ('Array {arr} could not be found in list of performance '
                        'keys.'.format(arr=array_id))
@@ -481,12 +513,17 @@ class PerformanceFunctions(object):
         :returns: categories -- list
         """
         array_id = self.array_id if not array_id else array_id
-        response = self.get_request(
-            category=pc.PERFORMANCE, resource_level=pc.ARRAY,
-            resource_type=pc.HELP, resource_type_id=array_id,
-            resource=pc.CATEGORIES)
 
-        return response.get('categoryName', list()) if response else list()
+        def _get_categories():
+            response = self.get_request(
+                category=pc.PERFORMANCE, resource_level=pc.ARRAY,
+                resource_type=pc.HELP, resource_type_id=array_id,
+                resource=pc.CATEGORIES)
+            return response.get(
+                'categoryName', list()) if response else list()
+
+        return self.common.get_static_metadata(
+            'performance_categories', _get_categories, array_id=array_id)
 
     def validate_category(self, category, array_id=None):
         """Check that a supplied category is valid.
@@ -515,12 +552,19 @@ class PerformanceFunctions(object):
         category_list = self.get_performance_categories_list(array_id)
         if category in category_list:
             mode = 'Kpi' if kpi_only else 'All'
-            response = self.get_request(
-                category=pc.PERFORMANCE, resource_level=pc.ARRAY,
-                resource_type=pc.HELP, resource_type_id=array_id,
-                resource=category, object_type=pc.METRICS,
-                object_type_id=mode)
-            return response.get('metricName', list()) if response else list()
+
+            def _get_metrics():
+                response = self.get_request(
+                    category=pc.PERFORMANCE, resource_level=pc.ARRAY,
+                    resource_type=pc.HELP, resource_type_id=array_id,
+                    resource=category, object_type=pc.METRICS,
+                    object_type_id=mode)
+                return response.get(
+                    'metricName', list()) if response else list()
+
+            return self.common.get_static_metadata(
+                'performance_metrics', _get_metrics,
+                key='{c}/{m}'.format(c=category, m=mode), array_id=array_id)
         else:
             raise exception.InvalidInputException(
                 'There was an issue retrieving the metrics for user '
@@ -563,26 +607,18 @@ class PerformanceFunctions(object):
         :param category: performance category -- str
         :param director_id: director id -- str
         :param key_tgt_id: object id for the timestamp required -- str
-        :returns: timestamp in milliseconds since epoch -- str
+        :returns: first and last available timestamps in milliseconds since
+                  epoch, None if the object has no keys -- str, str
         """
         array_id = self.array_id if not array_id else array_id
         self.validate_category(category)
-        response = self.get_performance_key_list(
-            category=category, array_id=array_id, director_id=director_id)
-        key_regex = re.compile(r'\A[\w]*(Info)$')
-        start = None
-        end = None
-        for key in response.keys():
-            match = key_regex.search(key)
-            if match:
-                time_keys = response.get(match.group())
-                for p_keys in time_keys:
-                    for k, v in p_keys.items():
-                        tgt_id = array_id if not key_tgt_id else key_tgt_id
-                        if isinstance(v, str) and tgt_id in v:
-                            start = p_keys.get(pc.FA_DATE)
-                            end = p_keys.get(pc.LA_DATE)
-        return start, end
+        __, key_info, field_index = self._get_key_index(
+            category, array_id, director_id=director_id)
+        tgt_id = str(array_id if not key_tgt_id else key_tgt_id)
+        p_keys = key_info.get(tgt_id) or field_index.get(tgt_id)
+        if not p_keys:
+            return None, None
+        return p_keys.get(pc.FA_DATE), p_keys.get(pc.LA_DATE)
 
     def format_time_input(
             self, array_id=None, category=None, director_id=None,
@@ -658,9 +694,20 @@ class PerformanceFunctions(object):
 
     def get_performance_stats(
             self, category, metrics, data_format=pc.AVERAGE, array_id=None,
-            request_body=None, start_time=None, end_time=None, recency=None):
+            request_body=None, start_time=None, end_time=None, recency=None,
+            max_window=None, max_workers=pc.COLLECT_MAX_WORKERS,
+            columnar=False):
         """Retrieve the performance statistics for a given category and object.
 
+        Time ranges longer than max_window minutes are split into slices
+        which are requested concurrently and stitched back together in
+        timestamp order, so long ranges are returned by a single call while
+        each request stays within server limits. By default a slice is one
+        day, or one hour for the Volume category.
+
+        With columnar set the result is returned as a PerformanceFrame, one
+        array per metric, rather than a list with a dict per sample.
+
         :param category: category id -- str
         :param array_id: array id -- str
         :param metrics: performance metrics, options are individual metrics,
@@ -671,6 +718,10 @@ class PerformanceFunctions(object):
         :param start_time: timestamp in milliseconds since epoch -- str
         :param end_time: timestamp in milliseconds since epoch -- str
         :param recency: check recency of timestamp in minutes -- int
+        :param max_window: maximum minutes per request, 0 disables splitting
+                           the time range -- int
+        :param max_workers: maximum concurrent slice requests -- int
+        :param columnar: return the result as a PerformanceFrame -- bool
         :returns: performance metrics -- dict
         :raises: VolumeBackendAPIException, InvalidInputException
         """
@@ -755,17 +806,19 @@ class PerformanceFunctions(object):
         request_body[pc.METRICS] = metrics_list
 
         # 7. Post Request
-        if 'SDNAS' in category:
-            perf_response = self._run_v4_filesystem_request(
-                category, request_body, metrics=True)
-        else:
-            perf_response = self.post_request(
-                category=pc.PERFORMANCE, resource_level=category,
-                resource_type=pc.METRICS, payload=request_body)
+        results = self._get_sliced_metrics_results(
+            category, request_body, max_window=max_window,
+            max_workers=max_workers)
+        if self.history_store is not None:
+            self.history_store.add_results(
+                array_id, category,
+                object_id if object_id is not None else array_id, results)
+        if columnar:
+            results = performance_frame.PerformanceFrame.from_results(results)
 
         # 8 Format results response
         performance_details.update(
-            {'result': self.common.get_iterator_results(perf_response),
+            {'result': results,
              'array_id': str(array_id),
              'start_date': start_time,
              'end_date': end_time,
@@ -774,6 +827,437 @@ class PerformanceFunctions(object):
 
         return performance_details
 
+    def _get_metrics_results(self, category, request_body):
+        """Post a metrics request and return all pages of results.
+
+        :param category: performance category -- str
+        :param request_body: complete metrics request body -- dict
+        :returns: performance results -- list
+        """
+        if 'SDNAS' in category:
+            perf_response = self._run_v4_filesystem_request(
+                category, request_body, metrics=True)
+        else:
+            perf_response = self.post_request(
+                category=pc.PERFORMANCE, resource_level=category,
+                resource_type=pc.METRICS, payload=request_body)
+        return self.common.get_iterator_results(perf_response)
+
+    @staticmethod
+    def get_time_slices(start_time, end_time, window):
+        """Split a time range into consecutive slices.
+
+        Neighbouring slices share their boundary timestamp so no sample is
+        missed whether or not the server treats the range as inclusive.
+
+        :param start_time: timestamp in milliseconds since epoch -- int
+        :param end_time: timestamp in milliseconds since epoch -- int
+        :param window: maximum slice length in milliseconds -- int
+        :returns: slice start and end times -- list
+        """
+        start_time, end_time = int(start_time), int(end_time)
+        if not window or end_time - start_time <= window:
+            return [(start_time, end_time)]
+        slices = list()
+        slice_start = start_time
+        while slice_start < end_time:
+            slice_end = min(slice_start + window, end_time)
+            slices.append((slice_start, slice_end))
+            slice_start = slice_end
+        return slices
+
+    @staticmethod
+    def merge_time_slice_results(slice_results):
+        """Stitch results from time slices together in timestamp order.
+
+        Samples repeated at slice boundaries are dropped. A sample is
+        identified by its timestamp and any string values, such as object
+        ids, it carries.
+
+        :param slice_results: results for each slice in time order -- list
+        :returns: merged results -- list
+        """
+        merged, seen = list(), set()
+        for results in slice_results:
+            for sample in results:
+                identity = (sample.get(pc.TIMESTAMP), tuple(sorted(
+                    (k, v) for k, v in sample.items() if isinstance(v, str))))
+                if identity in seen:
+                    continue
+                seen.add(identity)
+                merged.append(sample)
+        merged.sort(key=lambda sample: sample.get(pc.TIMESTAMP) or 0)
+        return merged
+
+    def _get_sliced_metrics_results(self, category, request_body,
+                                    max_window=None,
+                                    max_workers=pc.COLLECT_MAX_WORKERS):
+        """Get metrics results, splitting long time ranges into slices.
+
+        :param category: performance category -- str
+        :param request_body: complete metrics request body -- dict
+        :param max_window: maximum minutes per request, None for the
+                           category default, 0 to disable -- int
+        :param max_workers: maximum concurrent slice requests -- int
+        :returns: performance results -- list
+        """
+        if max_window is None:
+            window = pc.MAX_REQUEST_WINDOW.get(
+                category, pc.DEFAULT_MAX_REQUEST_WINDOW)
+        else:
+            window = int(max_window) * pc.ONE_MINUTE
+        slices = self.get_time_slices(
+            request_body[pc.START_DATE], request_body[pc.END_DATE], window)
+        if len(slices) == 1:
+            return self._get_metrics_results(category, request_body)
+
+        LOG.debug('Splitting {c} metrics request into {n} time '
+                  'slices.'.format(c=category, n=len(slices)))
+        bodies = list()
+        for slice_start, slice_end in slices:
+            body = dict(request_body)
+            body[pc.START_DATE] = str(slice_start)
+            body[pc.END_DATE] = str(slice_end)
+            bodies.append(body)
+        workers = max(1, min(int(max_workers), len(bodies)))
+        with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            slice_results = list(executor.map(
+                lambda body: self._get_metrics_results(category, body),
+                bodies))
+        return self.merge_time_slice_results(slice_results)
+
+    def get_object_key_info(self, category, array_id=None, director_id=None):
+        """Get the performance keys for every object in a category.
+
+        One key list request returns the id key used by the category and the
+        first and last available dates of each object, which is everything
+        needed to build metrics requests for any number of objects. The
+        index is kept until the array has a newer diagnostic sample, see
+        _get_key_cache.
+
+        :param category: performance category -- str
+        :param array_id: array id -- str
+        :param director_id: director id, port categories only -- str
+        :returns: object id request key, key details keyed by object
+                  id -- str, dict
+        """
+        array_id = self.array_id if not array_id else array_id
+        id_key, key_info, __ = self._get_key_index(
+            category, array_id, director_id=director_id)
+        return id_key, key_info
+
+    def set_key_index_ttl(self, seconds):
+        """Set how often cached key indexes are checked for new samples.
+
+        Changing the time to live clears any cached indexes.
+
+        :param seconds: seconds a key index is used before the last
+                        available timestamp of the array is checked again,
+                        0 disables caching -- int
+        """
+        self.key_index_ttl = int(seconds)
+        self.refresh_key_index()
+
+    def refresh_key_index(self, category=None, array_id=None):
+        """Discard cached performance key indexes.
+
+        Indexes are requested again on their next use. Indexes kept in the
+        metadata store are also discarded, for the array if one is given,
+        otherwise for every array.
+
+        :param category: only discard indexes of this category -- str
+        :param array_id: only discard indexes of this array -- str
+        """
+        with self._key_index_lock:
+            for cache_key in list(self._key_index_cache.keys()):
+                if (array_id and cache_key[0] != str(array_id)) or (
+                        category and cache_key[1] != category):
+                    continue
+                del self._key_index_cache[cache_key]
+        store = self.common.metadata_store
+        if store:
+            store.invalidate(scope=str(array_id) if array_id else None,
+                             namespace=pc.KEY_INDEX_NAMESPACE)
+
+    @staticmethod
+    def get_key_list_timestamp(key_list, array_id=None):
+        """Get the latest last available date in a performance key list.
+
+        This is the diagnostic sample the key list is current up to. For
+        the Array category the date of the given array is used.
+
+        :param key_list: get_performance_key_list response -- dict
+        :param array_id: array id -- str
+        :returns: timestamp in milliseconds since epoch, None if the key
+                  list has no dates -- int
+        """
+        __, key_info, __ = PerformanceFunctions.build_key_index(key_list)
+        if array_id and str(array_id) in key_info and pc.ARRAY_INFO in (
+                key_list):
+            key_info = {array_id: key_info[str(array_id)]}
+        timestamps = [int(keys[pc.LA_DATE]) for keys in key_info.values()
+                      if keys.get(pc.LA_DATE)]
+        return max(timestamps) if timestamps else None
+
+    def _is_key_list_current(self, array_id, timestamp):
+        """Check the array has no diagnostic sample newer than a key list.
+
+        :param array_id: array id -- str
+        :param timestamp: last available date of the key list -- int
+        :returns: key list is current -- bool
+        """
+        if timestamp is None:
+            return False
+        try:
+            last_available = self.get_last_available_timestamp(array_id)
+        except (exception.ResourceNotFoundException,
+                exception.VolumeBackendAPIException) as error:
+            LOG.debug('Unable to check performance keys for {a} are '
+                      'current: {e}'.format(a=array_id, e=error))
+            return False
+        return last_available is not None and (
+            int(last_available) <= timestamp)
+
+    def _get_key_cache(self, category, array_id, director_id=None):
+        """Get the cached performance key list and index of a category.
+
+        Objects only appear or disappear with a new diagnostic sample, so a
+        key list is kept until the last available timestamp of the array is
+        newer than the last available dates in the key list. The timestamp
+        is checked at most every key_index_ttl seconds and comes from the
+        timestamp index shared by the connection, so using a cached index
+        costs no requests. If the metadata store is enabled key lists are
+        also shared with other processes on the host.
+
+        :param category: performance category -- str
+        :param array_id: array id -- str
+        :param director_id: director id, port categories only -- str
+        :returns: key list response, key index -- dict, tuple
+        """
+        if not self.key_index_ttl:
+            response = self.get_performance_key_list(
+                category=category, array_id=array_id,
+                director_id=director_id)
+            return response, self.build_key_index(response)
+
+        cache_key = (str(array_id), category, director_id)
+        now = time.time()
+        cached = self._key_index_cache.get(cache_key)
+        if cached and (cached[0] > now or self._is_key_list_current(
+                array_id, cached[1])):
+            if cached[0] <= now:
+                with self._key_index_lock:
+                    self._key_index_cache[cache_key] = (
+                        now + self.key_index_ttl,) + cached[1:]
+            return cached[2], cached[3]
+
+        store = self.common.metadata_store
+        store_key = '{c}/{d}'.format(c=category, d=director_id or str())
+        response = None
+        if store:
+            stored = store.get(pc.KEY_INDEX_NAMESPACE, key=store_key,
+                               scope=str(array_id))
+            if stored and self._is_key_list_current(
+                    array_id, self.get_key_list_timestamp(stored, array_id)):
+                response = stored
+        if response is None:
+            response = self.get_performance_key_list(
+                category=category, array_id=array_id,
+                director_id=director_id)
+            if store and response:
+                store.set(pc.KEY_INDEX_NAMESPACE, response, key=store_key,
+                          scope=str(array_id))
+        key_index = self.build_key_index(response)
+        with self._key_index_lock:
+            self._key_index_cache[cache_key] = (
+                now + self.key_index_ttl,
+                self.get_key_list_timestamp(response, array_id), response,
+                key_index)
+        return response, key_index
+
+    def _get_key_list(self, category, array_id, director_id=None):
+        """Get the cached performance key list of a category.
+
+        :param category: performance category -- str
+        :param array_id: array id -- str
+        :param director_id: director id, port categories only -- str
+        :returns: category performance keys -- dict
+        """
+        response, __ = self._get_key_cache(
+            category, array_id, director_id=director_id)
+        return response
+
+    def _get_key_index(self, category, array_id, director_id=None):
+        """Get the cached performance key index for a category.
+
+        :param category: performance category -- str
+        :param array_id: array id -- str
+        :param director_id: director id, port categories only -- str
+        :returns: object id request key, key details keyed by object id,
+                  key details keyed by other field values -- str, dict, dict
+        """
+        __, key_index = self._get_key_cache(
+            category, array_id, director_id=director_id)
+        return key_index
+
+    @staticmethod
+    def build_key_index(key_list):
+        """Index a performance key list response by object id.
+
+        Each key entry is indexed by the value of its id field, for port
+        categories the port rather than the director. Entries are also
+        indexed by the exact value of their other string fields, for
+        example director ids, without overriding an object id.
+
+        :param key_list: get_performance_key_list response -- dict
+        :returns: object id request key, key details keyed by object id,
+                  key details keyed by other field values -- str, dict, dict
+        """
+        key_regex = re.compile(r'\A[\w]*(Info|InfoType)$')
+        id_key, key_info, field_index = None, dict(), dict()
+        for key, value in key_list.items():
+            if not key_regex.search(key) or not isinstance(value, list):
+                continue
+            for p_keys in value:
+                object_keys = [k for k in p_keys.keys() if k not in [
+                    pc.FA_DATE, pc.LA_DATE, pc.DIR_ID]]
+                if not object_keys:
+                    object_keys = [k for k in p_keys.keys() if k not in [
+                        pc.FA_DATE, pc.LA_DATE]]
+                if not object_keys:
+                    continue
+                id_keys = [k for k in object_keys if k.endswith('Id')]
+                id_key = id_keys[0] if id_keys else object_keys[0]
+                key_info[str(p_keys[id_key])] = p_keys
+                for field, field_value in p_keys.items():
+                    if field != id_key and isinstance(field_value, str):
+                        field_index.setdefault(field_value, p_keys)
+        return id_key, key_info, field_index
+
+    def collect_stats(
+            self, category, object_ids=None, metrics=pc.KPI, window=None,
+            array_id=None, data_format=pc.AVERAGE, start_time=None,
+            end_time=None, director_id=None,
+            max_workers=pc.COLLECT_MAX_WORKERS, columnar=False):
+        """Collect performance statistics for many objects in a category.
+
+        Calling a get_<category>_stats function per object repeats the
+        category, metric and timestamp look ups for every object. Here they
+        are resolved once: a single key list request identifies the objects
+        and their request key, metrics are resolved once and the time range
+        is calculated once. The metrics requests are then sent concurrently
+        using at most max_workers threads.
+
+        If no time range is supplied the range ends at the last available
+        array timestamp and covers the preceding window minutes, or only the
+        most recent sample if window is not set.
+
+        :param category: performance category e.g. StorageGroup -- str
+        :param object_ids: object ids, defaults to every object in the
+                           category -- list
+        :param metrics: performance metrics, options are individual metrics,
+                        a list of metrics, 'KPI' for KPI metrics only, and
+                        'ALL' for all metrics -- str/list
+        :param window: minutes of data to collect -- int
+        :param array_id: array id -- str
+        :param data_format: response data format 'Average' or 'Maximum' -- str
+        :param start_time: timestamp in milliseconds since epoch -- str
+        :param end_time: timestamp in milliseconds since epoch -- str
+        :param director_id: director id, port categories only -- str
+        :param max_workers: maximum concurrent metrics requests -- int
+        :param columnar: return the results as a single PerformanceFrame
+                         indexed by object id -- bool
+        :returns: performance results keyed by object id, and any object
+                  ids which could not be collected with the reason -- dict
+        :raises: InvalidInputException
+        """
+        array_id = self.array_id if not array_id else array_id
+        self.validate_category(category, array_id)
+
+        # 1. Resolve object keys once for the whole category
+        id_key, key_info = self.get_object_key_info(
+            category, array_id=array_id, director_id=director_id)
+        if object_ids is None:
+            object_ids = list(key_info.keys())
+        elif isinstance(object_ids, str):
+            object_ids = [object_ids]
+        failed = dict()
+        for object_id in object_ids:
+            if str(object_id) not in key_info:
+                failed[object_id] = (
+                    'No performance keys found for {o}.'.format(o=object_id))
+        collect_ids = [o for o in object_ids if o not in failed]
+
+        # 2. Resolve metrics once
+        if isinstance(metrics, str) and metrics.upper() in [
+                pc.KPI.upper(), pc.ALL.upper()]:
+            metrics = self.get_performance_metrics_list(
+                category, kpi_only=metrics.upper() == pc.KPI.upper(),
+                array_id=array_id)
+        metrics_list = self.format_metrics(metrics)
+
+        if data_format.upper() not in [pc.AVERAGE.upper(), pc.MAXIMUM.upper()]:
+            raise exception.InvalidInputException(
+                'Invalid data format "{f}" specified, please use one of '
+                'Average or Maximum'.format(f=data_format))
+        data_format = pc.MAXIMUM if pc.MAXIMUM.upper() in (
+            data_format.upper()) else pc.AVERAGE
+
+        # 3. Resolve the time range once
+        if not end_time:
+            end_time = self.get_last_available_timestamp(array_id)
+        if not start_time:
+            start_time = int(end_time) - (
+                int(window) * pc.ONE_MINUTE if window else 0)
+        start_time, end_time = self.format_time_input(
+            array_id=array_id, start_time=start_time, end_time=end_time)
+
+        # 4. Fan out metrics requests
+        def _collect(object_id):
+            request_body = {
+                id_key: object_id, pc.START_DATE: start_time,
+                pc.END_DATE: end_time,
+                self._get_rb_key(category): str(array_id),
+                pc.DATA_FORMAT: data_format, pc.METRICS: metrics_list}
+            if director_id:
+                request_body[pc.DIR_ID] = director_id
+            # Slices are fetched serially, concurrency is across objects
+            return self._get_sliced_metrics_results(
+                category, request_body, max_workers=1)
+
+        results = dict()
+        if collect_ids:
+            workers = max(1, min(int(max_workers), len(collect_ids)))
+            with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+                future_map = {executor.submit(_collect, object_id): object_id
+                              for object_id in collect_ids}
+                for future in futures.as_completed(future_map):
+                    object_id = future_map[future]
+                    try:
+                        results[object_id] = future.result()
+                    except Exception as error:
+                        LOG.warning(
+                            'Unable to collect {c} performance data for '
+                            '{o}: {e}'.format(c=category, o=object_id,
+                                              e=error))
+                        failed[object_id] = str(error)
+
+        results = {o: results[o] for o in collect_ids if o in results}
+        if self.history_store is not None:
+            self.history_store.add_object_results(array_id, category, results)
+        if columnar:
+            results = performance_frame.PerformanceFrame.from_object_results(
+                results)
+
+        return {pc.RESULT: results,
+                pc.FAILED: failed,
+                'array_id': str(array_id),
+                'start_date': start_time,
+                'end_date': end_time,
+                'timestamp': end_time,
+                'reporting_level': self.common.convert_to_snake_case(
+                    category)}
+
     def get_days_to_full(self, array_id=None, array_to_full=False,
                          srp_to_full=False, thin_pool_to_full=False):
         """Get days to full information.
@@ -882,6 +1366,160 @@ class PerformanceFunctions(object):
             resource_type=pc.UPDATE, resource_type_id=category,
             payload=payload)
 
+    @staticmethod
+    def _is_threshold_unchanged(threshold_setting, current_setting):
+        """Check if a threshold setting matches the current setting.
+
+        Only the fields present in threshold_setting are compared.
+
+        :param threshold_setting: desired threshold setting -- dict
+        :param current_setting: current threshold setting -- dict
+        :returns: setting unchanged -- bool
+        """
+        if not current_setting:
+            return False
+
+        def _normalise(field, value):
+            if field == pc.ALERT_ERR:
+                return str(value).lower() == 'true'
+            if field in [pc.FIRST_THRESH_SEV, pc.SEC_THRESH_SEV]:
+                return str(value).upper()
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                return value
+
+        for field, value in threshold_setting.items():
+            if field in [pc.CATEGORY, pc.METRIC]:
+                continue
+            if _normalise(field, value) != _normalise(
+                    field, current_setting.get(field)):
+                return False
+        return True
+
+    def apply_threshold_settings(
+            self, threshold_settings, array_id=None, only_changed=True,
+            max_workers=pc.THRESHOLD_MAX_WORKERS,
+            rate_limit=pc.THRESHOLD_RATE_LIMIT):
+        """Apply many performance threshold settings.
+
+        Current settings are retrieved once per category, concurrently, and
+        only settings which differ from them are updated. Fields missing
+        from a setting keep their current value. Updates are sent
+        concurrently using at most max_workers threads and no more than
+        rate_limit updates are started per second.
+
+        Each setting is a dict with category and metric keys and any of the
+        fields returned by get_threshold_category_settings, for example
+        firstThreshold, secondThreshold and alertError.
+
+        :param threshold_settings: threshold settings -- list
+        :param array_id: array serial number used to read current
+                         settings -- str
+        :param only_changed: skip settings which match the current
+                             settings -- bool
+        :param max_workers: maximum concurrent updates -- int
+        :param rate_limit: maximum updates started per second, no limit if
+                           not set -- float
+        :returns: updated and unchanged (category, metric) pairs, and any
+                  which failed with the reason -- dict
+        """
+        array_id = array_id if array_id else self.array_id
+        response = {'updated': list(), 'unchanged': list(),
+                    pc.FAILED: dict()}
+        if not threshold_settings:
+            return response
+        workers = max(1, int(max_workers))
+
+        # 1. Read current settings once per category
+        current = dict()
+        if only_changed:
+            categories = list()
+            for threshold_setting in threshold_settings:
+                if threshold_setting[pc.CATEGORY] not in categories:
+                    categories.append(threshold_setting[pc.CATEGORY])
+            with futures.ThreadPoolExecutor(max_workers=min(
+                    workers, len(categories))) as executor:
+                future_map = {executor.submit(
+                    self.get_threshold_category_settings, category,
+                    array_id=array_id): category for category in categories}
+                for future in futures.as_completed(future_map):
+                    category = future_map[future]
+                    try:
+                        settings = future.result() or dict()
+                    except exception.PyU4VException as error:
+                        LOG.warning(
+                            'Unable to get {c} threshold settings, all of '
+                            'its thresholds will be updated: {e}'.format(
+                                c=category, e=error))
+                        continue
+                    current[category] = {
+                        s.get(pc.METRIC): s for s in settings.get(
+                            pc.PERF_THRESH) or list()}
+
+        # 2. Diff desired against current settings
+        updates = list()
+        for threshold_setting in threshold_settings:
+            key = (threshold_setting[pc.CATEGORY],
+                   threshold_setting[pc.METRIC])
+            current_setting = current.get(key[0], dict()).get(key[1])
+            if only_changed and self._is_threshold_unchanged(
+                    threshold_setting, current_setting):
+                response['unchanged'].append(key)
+                continue
+            setting = dict(current_setting) if current_setting else dict()
+            setting.update(threshold_setting)
+            updates.append((key, setting))
+
+        # 3. Send updates concurrently within the rate limit
+        interval = 1.0 / rate_limit if rate_limit else 0
+        next_slot = [time.time()]
+        slot_lock = threading.Lock()
+
+        def _update(setting):
+            if interval:
+                with slot_lock:
+                    now = time.time()
+                    wait = next_slot[0] - now
+                    next_slot[0] = max(now, next_slot[0]) + interval
+                if wait > 0:
+                    time.sleep(wait)
+            return self.update_threshold_settings(
+                category=setting[pc.CATEGORY], metric=setting[pc.METRIC],
+                first_threshold=setting.get(pc.FIRST_THRESH),
+                second_threshold=setting.get(pc.SEC_THRESH),
+                alert=str(setting.get(pc.ALERT_ERR, True)).lower() == 'true',
+                first_threshold_occurrences=setting.get(
+                    pc.FIRST_THRESH_OCC) or pc.THRESH_OCC,
+                first_threshold_samples=setting.get(
+                    pc.FIRST_THRESH_SAMP) or pc.THRESH_SAMP,
+                first_threshold_severity=setting.get(
+                    pc.FIRST_THRESH_SEV) or pc.WARN_LVL,
+                second_threshold_occurrences=setting.get(
+                    pc.SEC_THRESH_OCC) or pc.THRESH_OCC,
+                second_threshold_samples=setting.get(
+                    pc.SEC_THRESH_SAMP) or pc.THRESH_SAMP,
+                second_threshold_severity=setting.get(
+                    pc.SEC_THRESH_SEV) or pc.CRIT_LVL,
+                include_realtime_trace=str(setting.get(
+                    pc.RT_TRACE_CRIT, False)).lower() == 'true')
+
+        if updates:
+            with futures.ThreadPoolExecutor(max_workers=min(
+                    workers, len(updates))) as executor:
+                future_map = {executor.submit(_update, setting): key
+                              for key, setting in updates}
+                for future in futures.as_completed(future_map):
+                    key = future_map[future]
+                    try:
+                        future.result()
+                        response['updated'].append(key)
+                    except Exception as error:
+                        LOG.error('Error updating threshold settings: '
+                                  '{e}'.format(e=error))
+                        response[pc.FAILED][key] = str(error)
+        return response
+
     def generate_threshold_settings_csv(self, output_csv_path, category=None):
         """Generate a csv file with threshold settings.
 
@@ -911,7 +1549,10 @@ class PerformanceFunctions(object):
                     threshold.get(pc.ALERT_ERR), threshold.get(pc.KPI)])
         file_handler.write_to_csv_file(output_csv_path, data_for_csv)
 
-    def set_thresholds_from_csv(self, csv_file_path, kpi_only=True):
+    def set_thresholds_from_csv(self, csv_file_path, kpi_only=True,
+                                only_changed=True,
+                                max_workers=pc.THRESHOLD_MAX_WORKERS,
+                                rate_limit=pc.THRESHOLD_RATE_LIMIT):
         """Set performance thresholds using a CSV file.
 
         Reads CSV file and sets performance threshold metrics on the values
@@ -922,8 +1563,19 @@ class PerformanceFunctions(object):
         performance.generate_threshold_settings_csv() and edit those values
         within that you would like to change.
 
+        Settings are applied with apply_threshold_settings, so only
+        thresholds which differ from the current settings are updated,
+        concurrently and within the rate limit. Set only_changed to False to
+        update every threshold in the file.
+
         :param csv_file_path: path to CSV file -- str
         :param kpi_only: set only KPI thresholds -- bool
+        :param only_changed: skip thresholds which match the current
+                             settings -- bool
+        :param max_workers: maximum concurrent updates -- int
+        :param rate_limit: maximum updates started per second -- float
+        :returns: updated and unchanged (category, metric) pairs, and any
+                  which failed with the reason -- dict
         """
         LOG.warning("Warning: This function is deprecated and will be removed "
                     "in version 10.4. Please explore API Calls in new "
@@ -940,6 +1592,7 @@ class PerformanceFunctions(object):
         s_threshold_list = data.get("secondThreshold")
         is_kpi = data.get(pc.KPI)
 
+        threshold_settings = list()
         for i in range(0, len(metric_list)):
             if not _str_to_bool(is_kpi[i]) and kpi_only:
                 continue
@@ -957,14 +1610,15 @@ class PerformanceFunctions(object):
                         m=metric_list[i], f=f_threshold_list[i],
                         s=s_threshold_list[i]))
                 continue
-            try:
-                self.update_threshold_settings(
-                    category=category_list[i], metric=metric_list[i],
-                    alert=notify_list[i], first_threshold=f_threshold_list[i],
-                    second_threshold=s_threshold_list[i],
-                    include_realtime_trace=False)
-            except Exception as e:
-                LOG.error('Error updating threshold settings: {e}'.format(e=e))
+            threshold_settings.append({
+                pc.CATEGORY: category_list[i], pc.METRIC: metric_list[i],
+                pc.ALERT_ERR: notify_list[i],
+                pc.FIRST_THRESH: f_threshold_list[i],
+                pc.SEC_THRESH: s_threshold_list[i]})
+
+        return self.apply_threshold_settings(
+            threshold_settings, only_changed=only_changed,
+            max_workers=max_workers, rate_limit=rate_limit)
 
     def get_array_keys(self):
         """List Arrays registered for performance data collection.
@@ -1000,8 +1654,7 @@ class PerformanceFunctions(object):
         :returns: BE directors with first and last available dates -- list
         """
         array_id = self.array_id if not array_id else array_id
-        key_list = self.get_performance_key_list(category=pc.BE_DIR,
-                                                 array_id=array_id)
+        key_list = self._get_key_list(category=pc.BE_DIR, array_id=array_id)
         return key_list.get(pc.BE_DIR_INFO, list()) if key_list else list()
 
     def get_backend_director_stats(
@@ -1032,8 +1685,7 @@ class PerformanceFunctions(object):
         :returns: BE emulation info with first and last available dates -- list
         """
         array_id = self.array_id if not array_id else array_id
-        key_list = self.get_performance_key_list(category=pc.BE_EMU,
-                                                 array_id=array_id)
+        key_list = self._get_key_list(category=pc.BE_EMU, array_id=array_id)
         return key_list.get(pc.BE_EMU_INFO, list()) if key_list else list()
 
     def get_backend_emulation_stats(
@@ -1065,7 +1717,7 @@ class PerformanceFunctions(object):
         :returns: BE port info with first and last available dates -- list
         """
         array_id = self.array_id if not array_id else array_id
-        key_list = self.get_performance_key_list(
+        key_list = self._get_key_list(
             category=pc.BE_PORT, array_id=array_id, director_id=director_id)
         return key_list.get(pc.BE_PORT_INFO, list()) if key_list else list()
 
@@ -1099,8 +1751,7 @@ class PerformanceFunctions(object):
         :returns: board info with first and last available dates -- list
         """
         array_id = self.array_id if not array_id else array_id
-        key_list = self.get_performance_key_list(category=pc.BOARD,
-                                                 array_id=array_id)
+        key_list = self._get_key_list(category=pc.BOARD, array_id=array_id)
         return key_list.get(pc.BOARD_INFO, list()) if key_list else list()
 
     def get_board_stats(
@@ -1133,8 +1784,8 @@ class PerformanceFunctions(object):
                   dates -- list
         """
         array_id = self.array_id if not array_id else array_id
-        key_list = self.get_performance_key_list(category=pc.CACHE_PART,
-                                                 array_id=array_id)
+        key_list = self._get_key_list(category=pc.CACHE_PART,
+                                      array_id=array_id)
         return key_list.get(
             pc.CACHE_PART_INFO, list()) if key_list else list()
 
@@ -1167,8 +1818,7 @@ class PerformanceFunctions(object):
         :returns: device group info with first and last available dates -- list
         """
         array_id = self.array_id if not array_id else array_id
-        key_list = self.get_performance_key_list(category=pc.DEV_GRP,
-                                                 array_id=array_id)
+        key_list = self._get_key_list(category=pc.DEV_GRP, array_id=array_id)
         return key_list.get(pc.DEV_GRP_INFO, list()) if key_list else list()
 
     def get_device_group_stats(
@@ -1200,8 +1850,7 @@ class PerformanceFunctions(object):
         :returns: disk info with first and last available dates -- list
         """
         array_id = self.array_id if not array_id else array_id
-        key_list = self.get_performance_key_list(category=pc.DISK_GRP,
-                                                 array_id=array_id)
+        key_list = self._get_key_list(category=pc.DISK_GRP, array_id=array_id)
         return key_list.get(pc.DISK_GRP_INFO, list()) if key_list else list()
 
     def get_disk_group_stats(
@@ -1233,8 +1882,7 @@ class PerformanceFunctions(object):
         :returns: EDS director info with first and last available dates -- list
         """
         array_id = self.array_id if not array_id else array_id
-        key_list = self.get_performance_key_list(category=pc.EDS_DIR,
-                                                 array_id=array_id)
+        key_list = self._get_key_list(category=pc.EDS_DIR, array_id=array_id)
         return key_list.get(pc.EDS_DIR_INFO, list()) if key_list else list()
 
     def get_eds_director_stats(
@@ -1267,8 +1915,7 @@ class PerformanceFunctions(object):
                   dates -- list
         """
         array_id = self.array_id if not array_id else array_id
-        key_list = self.get_performance_key_list(category=pc.EDS_EMU,
-                                                 array_id=array_id)
+        key_list = self._get_key_list(category=pc.EDS_EMU, array_id=array_id)
         return key_list.get(pc.EDS_EMU_INFO, list()) if key_list else list()
 
     def get_eds_emulation_stats(
@@ -1300,8 +1947,7 @@ class PerformanceFunctions(object):
         :returns: EDS director info with first and last available dates -- list
         """
         array_id = self.array_id if not array_id else array_id
-        key_list = self.get_performance_key_list(category=pc.EM_DIR,
-                                                 array_id=array_id)
+        key_list = self._get_key_list(category=pc.EM_DIR, array_id=array_id)
         return key_list.get(pc.EM_DIR_INFO, list()) if key_list else list()
 
     def get_em_director_stats(
@@ -1333,8 +1979,7 @@ class PerformanceFunctions(object):
         :returns: external disks with first and last available dates -- list
         """
         array_id = self.array_id if not array_id else array_id
-        key_list = self.get_performance_key_list(category=pc.EXT_DISK,
-                                                 array_id=array_id)
+        key_list = self._get_key_list(category=pc.EXT_DISK, array_id=array_id)
         return key_list.get(pc.EXT_DISK_INFO, list()) if key_list else list()
 
     def get_external_disk_stats(
@@ -1365,8 +2010,7 @@ class PerformanceFunctions(object):
         :returns: FE directors with first and last available dates -- list
         """
         array_id = self.array_id if not array_id else array_id
-        key_list = self.get_performance_key_list(category=pc.FE_DIR,
-                                                 array_id=array_id)
+        key_list = self._get_key_list(category=pc.FE_DIR, array_id=array_id)
         return key_list.get(pc.FE_DIR_INFO, list()) if key_list else list()
 
     def get_frontend_director_stats(
@@ -1397,8 +2041,7 @@ class PerformanceFunctions(object):
         :returns: BE emulation info with first and last available dates -- list
         """
         array_id = self.array_id if not array_id else array_id
-        key_list = self.get_performance_key_list(category=pc.FE_EMU,
-                                                 array_id=array_id)
+        key_list = self._get_key_list(category=pc.FE_EMU, array_id=array_id)
         return key_list.get(pc.FE_EMU_INFO, list()) if key_list else list()
 
     def get_frontend_emulation_stats(
@@ -1430,7 +2073,7 @@ class PerformanceFunctions(object):
         :returns: FE port info with first and last available dates -- list
         """
         array_id = self.array_id if not array_id else array_id
-        key_list = self.get_performance_key_list(
+        key_list = self._get_key_list(
             category=pc.FE_PORT, array_id=array_id, director_id=director_id)
         return key_list.get(pc.FE_PORT_INFO, list()) if key_list else list()
 
@@ -1465,8 +2108,7 @@ class PerformanceFunctions(object):
                   dates -- list
         """
         array_id = self.array_id if not array_id else array_id
-        key_list = self.get_performance_key_list(
-            category=pc.FICON_EMU, array_id=array_id)
+        key_list = self._get_key_list(category=pc.FICON_EMU, array_id=array_id)
         return key_list.get(pc.FICON_EMU_INFO, list()) if key_list else list()
 
     def get_ficon_emulation_stats(
@@ -1499,7 +2141,7 @@ class PerformanceFunctions(object):
                   dates -- list
         """
         array_id = self.array_id if not array_id else array_id
-        key_list = self.get_performance_key_list(
+        key_list = self._get_key_list(
             category=pc.FICON_EMU_THR, array_id=array_id)
         return key_list.get(
             pc.FICON_EMU_THR_INFO, list()) if key_list else list()
@@ -1534,7 +2176,7 @@ class PerformanceFunctions(object):
         :returns: FICON port info with first and last available dates -- list
         """
         array_id = self.array_id if not array_id else array_id
-        key_list = self.get_performance_key_list(
+        key_list = self._get_key_list(
             category=pc.FICON_PORT_THR, array_id=array_id)
         return key_list.get(
             pc.FICON_PORT_THR_INFO, list()) if key_list else list()
@@ -1617,8 +2259,7 @@ class PerformanceFunctions(object):
         :returns: IM directors with first and last available dates -- list
         """
         array_id = self.array_id if not array_id else array_id
-        key_list = self.get_performance_key_list(category=pc.IM_DIR,
-                                                 array_id=array_id)
+        key_list = self._get_key_list(category=pc.IM_DIR, array_id=array_id)
         return key_list.get(pc.IM_DIR_INFO, list()) if key_list else list()
 
     def get_im_director_stats(
@@ -1649,8 +2290,7 @@ class PerformanceFunctions(object):
         :returns: IM emulation info with first and last available dates -- list
         """
         array_id = self.array_id if not array_id else array_id
-        key_list = self.get_performance_key_list(category=pc.IM_EMU,
-                                                 array_id=array_id)
+        key_list = self._get_key_list(category=pc.IM_EMU, array_id=array_id)
         return key_list.get(pc.IM_EMU_INFO, list()) if key_list else list()
 
     def get_im_emulation_stats(
@@ -1731,8 +2371,7 @@ class PerformanceFunctions(object):
         :returns: IP interface info with first and last available dates -- list
         """
         array_id = self.array_id if not array_id else array_id
-        key_list = self.get_performance_key_list(category=pc.IP_INT,
-                                                 array_id=array_id)
+        key_list = self._get_key_list(category=pc.IP_INT, array_id=array_id)
         return key_list.get(
             pc.ISCSI_CLIENT_INFO, list()) if key_list else list()
 
@@ -1766,8 +2405,7 @@ class PerformanceFunctions(object):
                   dates -- list
         """
         array_id = self.array_id if not array_id else array_id
-        key_list = self.get_performance_key_list(category=pc.ENDPOINT,
-                                                 array_id=array_id)
+        key_list = self._get_key_list(category=pc.ENDPOINT, array_id=array_id)
         return key_list.get(pc.ENDPOINT_INFO, list()) if key_list else list()
 
     def get_endpoint_stats(
@@ -1799,8 +2437,7 @@ class PerformanceFunctions(object):
         :returns: masking view info with first and last available dates -- list
         """
         array_id = self.array_id if not array_id else array_id
-        key_list = self.get_performance_key_list(category=pc.MV,
-                                                 array_id=array_id)
+        key_list = self._get_key_list(category=pc.MV, array_id=array_id)
         return key_list.get(pc.MV_INFO, list()) if key_list else list()
 
     def get_masking_view_stats(
@@ -1832,8 +2469,7 @@ class PerformanceFunctions(object):
         :returns: port group info with first and last available
         """
         array_id = self.array_id if not array_id else array_id
-        key_list = self.get_performance_key_list(category=pc.PG,
-                                                 array_id=array_id)
+        key_list = self._get_key_list(category=pc.PG, array_id=array_id)
         return key_list.get(pc.PG_INFO, list()) if key_list else list()
 
     def get_port_group_stats(
@@ -1865,8 +2501,7 @@ class PerformanceFunctions(object):
         :returns: RDFA info with first and last available dates -- list
         """
         array_id = self.array_id if not array_id else array_id
-        key_list = self.get_performance_key_list(category=pc.RDFA,
-                                                 array_id=array_id)
+        key_list = self._get_key_list(category=pc.RDFA, array_id=array_id)
         return key_list.get(pc.RDFA_INFO, list()) if key_list else list()
 
     def get_rdfa_stats(
@@ -1898,8 +2533,7 @@ class PerformanceFunctions(object):
         :returns: RDFS info with first and last available dates -- list
         """
         array_id = self.array_id if not array_id else array_id
-        key_list = self.get_performance_key_list(category=pc.RDFS,
-                                                 array_id=array_id)
+        key_list = self._get_key_list(category=pc.RDFS, array_id=array_id)
         return key_list.get(pc.RDFS_INFO, list()) if key_list else list()
 
     def get_rdfs_stats(
@@ -1931,8 +2565,7 @@ class PerformanceFunctions(object):
         :returns: RDF directors with first and last available dates -- list
         """
         array_id = self.array_id if not array_id else array_id
-        key_list = self.get_performance_key_list(category=pc.RDF_DIR,
-                                                 array_id=array_id)
+        key_list = self._get_key_list(category=pc.RDF_DIR, array_id=array_id)
         return key_list.get(pc.RDF_DIR_INFO, list()) if key_list else list()
 
     def get_rdf_director_stats(
@@ -1965,8 +2598,7 @@ class PerformanceFunctions(object):
                   dates -- list
         """
         array_id = self.array_id if not array_id else array_id
-        key_list = self.get_performance_key_list(category=pc.RDF_EMU,
-                                                 array_id=array_id)
+        key_list = self._get_key_list(category=pc.RDF_EMU, array_id=array_id)
         return key_list.get(pc.RDF_EMU_INFO, list()) if key_list else list()
 
     def get_rdf_emulation_stats(
@@ -1999,7 +2631,7 @@ class PerformanceFunctions(object):
         :returns: RDF port info with first and last available dates -- list
         """
         array_id = self.array_id if not array_id else array_id
-        key_list = self.get_performance_key_list(
+        key_list = self._get_key_list(
             category=pc.RDF_PORT, array_id=array_id,
             director_id=director_id)
         return key_list.get(pc.RDF_PORT_INFO, list()) if key_list else list()
@@ -2035,8 +2667,7 @@ class PerformanceFunctions(object):
                   dates -- list
         """
         array_id = self.array_id if not array_id else array_id
-        key_list = self.get_performance_key_list(
-            category=pc.SDNAS_FS, array_id=array_id)
+        key_list = self._get_key_list(category=pc.SDNAS_FS, array_id=array_id)
         return key_list.get(
             pc.SDNAS_FS_INFO, list()) if key_list else list()
 
@@ -2070,7 +2701,7 @@ class PerformanceFunctions(object):
                   dates -- list
         """
         array_id = self.array_id if not array_id else array_id
-        key_list = self.get_performance_key_list(
+        key_list = self._get_key_list(
             category=pc.SDNAS_INTERFACE, array_id=array_id)
         return key_list.get(
             pc.SDNAS_INTERFACE_INFO, list()) if key_list else list()
@@ -2105,7 +2736,7 @@ class PerformanceFunctions(object):
                   dates -- list
         """
         array_id = self.array_id if not array_id else array_id
-        key_list = self.get_performance_key_list(
+        key_list = self._get_key_list(
             category=pc.SDNAS_NODE, array_id=array_id)
         return key_list.get(
             pc.SDNAS_NODE_INFO, list()) if key_list else list()
@@ -2140,7 +2771,7 @@ class PerformanceFunctions(object):
                   dates -- list
         """
         array_id = self.array_id if not array_id else array_id
-        key_list = self.get_performance_key_list(
+        key_list = self._get_key_list(
             category=pc.SDNAS_SERVER, array_id=array_id)
         return key_list.get(
             pc.SDNAS_SERVER_INFO, list()) if key_list else list()
@@ -2175,7 +2806,7 @@ class PerformanceFunctions(object):
                   dates -- list
         """
         array_id = self.array_id if not array_id else array_id
-        key_list = self.get_performance_key_list(
+        key_list = self._get_key_list(
             category=pc.STORAGE_CONT, array_id=array_id)
         return key_list.get(
             pc.STORAGE_CONT_INFO, list()) if key_list else list()
@@ -2210,8 +2841,7 @@ class PerformanceFunctions(object):
                   dates -- list
         """
         array_id = self.array_id if not array_id else array_id
-        key_list = self.get_performance_key_list(
-            category=pc.SG, array_id=array_id)
+        key_list = self._get_key_list(category=pc.SG, array_id=array_id)
         return key_list.get(pc.SG_INFO, list()) if key_list else list()
 
     def get_storage_group_stats(
@@ -2244,8 +2874,7 @@ class PerformanceFunctions(object):
                   dates -- list
         """
         array_id = self.array_id if not array_id else array_id
-        key_list = self.get_performance_key_list(
-            category=pc.SRP, array_id=array_id)
+        key_list = self._get_key_list(category=pc.SRP, array_id=array_id)
         return key_list.get(pc.SRP_INFO, list()) if key_list else list()
 
     def get_storage_resource_pool_stats(
@@ -2277,7 +2906,7 @@ class PerformanceFunctions(object):
                   dates -- list
         """
         array_id = self.array_id if not array_id else array_id
-        key_list = self.get_performance_key_list(
+        key_list = self._get_key_list(
             category=pc.STORAGE_RES, array_id=array_id)
         return key_list.get(
             pc.STORAGE_RES_INFO, list()) if key_list else list()
@@ -2313,8 +2942,7 @@ class PerformanceFunctions(object):
         :returns: thin pools with first and last available dates -- list
         """
         array_id = self.array_id if not array_id else array_id
-        key_list = self.get_performance_key_list(
-            category=pc.THIN_POOL, array_id=array_id)
+        key_list = self._get_key_list(category=pc.THIN_POOL, array_id=array_id)
         return key_list.get(pc.POOL_INFO, list()) if key_list else list()
 
     def get_thin_pool_stats(
@@ -2346,11 +2974,13 @@ class PerformanceFunctions(object):
         """List Performance data for volume level statistics.
 
         Note: This function can gather statistics for up to 10,000 volumes
-        or 100 Storage groups per call, time range can not exceed 1 hour/60
-        minutes.  If Maximum values are required you will need to ensure the
-        array is registered for both realtime and diagnostic data and
-        storage groups are registered for realtime data collection using
-        function enable_real_time_data_collection().
+        or 100 Storage groups per call, each request time range can not
+        exceed 1 hour/60 minutes so longer time ranges are split into one
+        hour requests automatically. Use collect_volume_stats for more
+        volumes or storage groups.  If Maximum values are required you
+        will need to ensure the array is registered for both realtime and
+        diagnostic data and storage groups are registered for realtime data
+        collection using function enable_real_time_data_collection().
 
         :param volume_range_start: 5 digit device id of first device in range
                                    -- str
@@ -2388,9 +3018,198 @@ class PerformanceFunctions(object):
 
         return self.get_performance_stats(
             category=pc.VOLUME, metrics=metrics,
-            data_format=data_format, request_body=request_body,
+            data_format=data_format or pc.AVERAGE, request_body=request_body,
             start_time=start_time, end_time=end_time, recency=recency)
 
+    @staticmethod
+    def plan_volume_shards(volume_ids=None, volume_ranges=None,
+                           storage_groups=None):
+        """Split volumes and storage groups into volume metrics requests.
+
+        A volume metrics request covers one device range of at most
+        MAX_VOLUMES_PER_REQUEST devices or at most MAX_SGS_PER_REQUEST
+        storage groups. Volume ids are grouped into runs of contiguous
+        devices so no unrequested device is included, ranges are split into
+        consecutive ranges and storage groups into batches.
+
+        :param volume_ids: 5 digit device ids -- list
+        :param volume_ranges: first and last device id of each range -- list
+        :param storage_groups: storage group ids -- list
+        :returns: request body volume selection of each shard -- list
+        """
+        device_ranges = list()
+        devices = sorted({int(volume_id, 16)
+                          for volume_id in volume_ids or list()})
+        for device in devices:
+            if device_ranges and device == device_ranges[-1][1] + 1:
+                device_ranges[-1][1] = device
+            else:
+                device_ranges.append([device, device])
+        for range_start, range_end in volume_ranges or list():
+            device_ranges.append([int(range_start, 16), int(range_end, 16)])
+
+        shards = list()
+        for range_start, range_end in device_ranges:
+            for shard_start in range(range_start, range_end + 1,
+                                     pc.MAX_VOLUMES_PER_REQUEST):
+                shard_end = min(shard_start + pc.MAX_VOLUMES_PER_REQUEST - 1,
+                                range_end)
+                shards.append({
+                    pc.VOLUME_START_RANGE: '{d:05X}'.format(d=shard_start),
+                    pc.VOLUME_END_RANGE: '{d:05X}'.format(d=shard_end)})
+        storage_groups = list(storage_groups or list())
+        for index in range(0, len(storage_groups), pc.MAX_SGS_PER_REQUEST):
+            shards.append({pc.SG_LIST: ','.join(
+                storage_groups[index:index + pc.MAX_SGS_PER_REQUEST])})
+        return shards
+
+    @staticmethod
+    def merge_volume_results(shard_results):
+        """Merge volume metrics results by volume.
+
+        Samples are keyed by volume id in timestamp order, samples of a
+        volume returned by more than one shard, for example a volume in two
+        requested storage groups, are only included once.
+
+        :param shard_results: results of each shard -- list
+        :returns: samples keyed by volume id -- dict
+        """
+        merged = dict()
+        for results in shard_results:
+            for sample in results:
+                volume_samples = sample.get(pc.VOLUME_RESULT)
+                if volume_samples is None:
+                    volume_samples = [sample]
+                for volume_sample in volume_samples:
+                    volume_id = volume_sample.get(pc.VOLUME_ID)
+                    if volume_id is None:
+                        continue
+                    timestamp = volume_sample.get(
+                        pc.TIMESTAMP, sample.get(pc.TIMESTAMP))
+                    volume = merged.setdefault(volume_id, dict())
+                    if timestamp not in volume:
+                        volume_sample = dict(volume_sample)
+                        volume_sample[pc.TIMESTAMP] = timestamp
+                        volume[timestamp] = volume_sample
+        return {volume_id: [samples[t] for t in sorted(
+            samples, key=lambda t: t or 0)]
+            for volume_id, samples in merged.items()}
+
+    def collect_volume_stats(
+            self, volume_ids=None, volume_ranges=None, storage_groups=None,
+            metrics=None, array_id=None, data_format=pc.AVERAGE,
+            start_time=None, end_time=None,
+            max_workers=pc.COLLECT_MAX_WORKERS, columnar=False):
+        """Collect volume level statistics for any number of volumes.
+
+        get_volume_stats is limited to 10,000 volumes or 100 storage groups
+        per call. Here the volumes and storage groups are planned into
+        shards within those limits, see plan_volume_shards, and the time
+        range into one hour slices. Metrics and the time range are resolved
+        once, then every shard and slice is requested concurrently using at
+        most max_workers threads and the results merged by volume.
+
+        :param volume_ids: 5 digit device ids -- list
+        :param volume_ranges: first and last device id of each range -- list
+        :param storage_groups: storage group ids -- list
+        :param metrics: performance metrics, options are individual metrics,
+                        a list of metrics, 'KPI' for KPI metrics only, and
+                        'ALL' for all metrics, defaults to all -- str/list
+        :param array_id: array id -- str
+        :param data_format: response data format 'Average' or 'Maximum' -- str
+        :param start_time: timestamp in milliseconds since epoch -- str
+        :param end_time: timestamp in milliseconds since epoch -- str
+        :param max_workers: maximum concurrent metrics requests -- int
+        :param columnar: return the results as a single PerformanceFrame
+                         indexed by volume id -- bool
+        :returns: performance results keyed by volume id, and any shards
+                  which could not be collected with the reason -- dict
+        :raises: InvalidInputException
+        """
+        array_id = self.array_id if not array_id else array_id
+        shards = self.plan_volume_shards(
+            volume_ids=volume_ids, volume_ranges=volume_ranges,
+            storage_groups=storage_groups)
+        if not shards:
+            msg = ('Please specify at least one volume, volume range or '
+                   'storage group.')
+            LOG.error(msg)
+            raise exception.InvalidInputException(msg)
+        if data_format.upper() not in [pc.AVERAGE.upper(), pc.MAXIMUM.upper()]:
+            raise exception.InvalidInputException(
+                'Invalid data format "{f}" specified, please use one of '
+                'Average or Maximum'.format(f=data_format))
+        data_format = pc.MAXIMUM if (
+            pc.MAXIMUM.upper() in data_format.upper()) else pc.AVERAGE
+
+        # 1. Resolve metrics and time range once for every shard
+        if not metrics or (isinstance(metrics, str) and metrics.upper() in [
+                pc.KPI.upper(), pc.ALL.upper()]):
+            metrics = self.get_performance_metrics_list(
+                category=pc.VOLUME,
+                kpi_only=bool(metrics) and metrics.upper() == pc.KPI.upper(),
+                array_id=array_id)
+        else:
+            metrics = self.format_metrics(metrics)
+        start_time, end_time = self.format_time_input(
+            array_id=array_id, category=pc.VOLUME, key_tgt_id=array_id,
+            start_time=start_time, end_time=end_time)
+        slices = self.get_time_slices(
+            start_time, end_time, pc.MAX_REQUEST_WINDOW[pc.VOLUME])
+
+        # 2. Request every shard and slice concurrently
+        bodies = list()
+        for shard in shards:
+            for slice_start, slice_end in slices:
+                body = {pc.SYSTEM_ID: str(array_id),
+                        pc.START_DATE: str(slice_start),
+                        pc.END_DATE: str(slice_end),
+                        pc.DATA_FORMAT: data_format, pc.METRICS: metrics}
+                body.update(shard)
+                bodies.append(body)
+        LOG.debug('Collecting volume metrics in {s} shards of {t} time '
+                  'slices.'.format(s=len(shards), t=len(slices)))
+
+        shard_results, failed = list(), dict()
+        workers = max(1, min(int(max_workers), len(bodies)))
+        with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            future_map = {executor.submit(
+                self._get_metrics_results, pc.VOLUME, body): body
+                for body in bodies}
+            for future in futures.as_completed(future_map):
+                body = future_map[future]
+                try:
+                    shard_results.append(future.result() or list())
+                except Exception as error:
+                    shard = body.get(pc.SG_LIST) or '{s}-{e}'.format(
+                        s=body[pc.VOLUME_START_RANGE],
+                        e=body[pc.VOLUME_END_RANGE])
+                    LOG.warning(
+                        'Unable to collect volume performance data for '
+                        '{sh} from {s} to {e}: {err}'.format(
+                            sh=shard, s=body[pc.START_DATE],
+                            e=body[pc.END_DATE], err=error))
+                    failed['{sh} {s}'.format(
+                        sh=shard, s=body[pc.START_DATE])] = str(error)
+
+        # 3. Merge results by volume
+        results = self.merge_volume_results(shard_results)
+        if self.history_store is not None:
+            self.history_store.add_object_results(
+                array_id, pc.VOLUME, results)
+        if columnar:
+            results = performance_frame.PerformanceFrame.from_object_results(
+                results)
+
+        return {pc.RESULT: results,
+                pc.FAILED: failed,
+                'array_id': str(array_id),
+                'start_date': start_time,
+                'end_date': end_time,
+                'timestamp': end_time,
+                'reporting_level': self.common.convert_to_snake_case(
+                    pc.VOLUME)}
+
     def get_zhyperlink_port_keys(self, array_id=None):
         """List zHyperLink Ports for the given array.
 
@@ -2398,7 +3217,7 @@ class PerformanceFunctions(object):
         :returns: thin pools with first and last available dates -- list
         """
         array_id = self.array_id if not array_id else array_id
-        key_list = self.get_performance_key_list(
+        key_list = self._get_key_list(
             category=pc.ZHYPER_LINK_PORT, array_id=array_id)
         return key_list.get(
             pc.ZHYPER_LINK_PORT_INFO, list()) if key_list else list()
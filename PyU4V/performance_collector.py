@@ -0,0 +1,191 @@
+# Copyright (c) 2025 Dell Inc. or its subsidiaries.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""performance_collector.py."""
+
+import logging
+
+from PyU4V.utils import constants
+from PyU4V.utils import performance_constants as pc
+from PyU4V.utils import sqlite_store
+
+LOG = logging.getLogger(__name__)
+
+
+def get_default_watermark_path():
+    """Get the default watermark store path in the ~/.PyU4V directory.
+
+    :returns: watermark store file path -- str
+    """
+    return sqlite_store.get_default_path(constants.WATERMARK_STORE_FILENAME)
+
+
+class WatermarkStore(sqlite_store.SQLiteStore):
+    """Persistent last collected timestamp per performance object.
+
+    Watermarks are kept in a SQLite database so they survive restarts and
+    can be shared by collectors running in separate processes.
+    """
+
+    def __init__(self, db_path=None):
+        """__init__.
+
+        :param db_path: path to the SQLite database file -- str
+        """
+        super(WatermarkStore, self).__init__(
+            db_path if db_path else get_default_watermark_path())
+        self._execute(
+            'CREATE TABLE IF NOT EXISTS watermark ('
+            'array_id TEXT, category TEXT, object_id TEXT, timestamp INTEGER, '
+            'PRIMARY KEY (array_id, category, object_id))')
+
+    def get_watermarks(self, array_id, category):
+        """Get the watermarks for every object in a category.
+
+        :param array_id: array id -- str
+        :param category: performance category -- str
+        :returns: last collected timestamp keyed by object id -- dict
+        """
+        rows = self._execute(
+            'SELECT object_id, timestamp FROM watermark WHERE array_id=? '
+            'AND category=?', (array_id, category), fetch=True)
+        return {object_id: timestamp for object_id, timestamp in rows}
+
+    def set_watermarks(self, array_id, category, watermarks):
+        """Record the watermarks for objects in a category.
+
+        :param array_id: array id -- str
+        :param category: performance category -- str
+        :param watermarks: last collected timestamp keyed by object
+                           id -- dict
+        """
+        self._execute(
+            'INSERT OR REPLACE INTO watermark VALUES (?, ?, ?, ?)',
+            [(array_id, category, str(object_id), int(timestamp))
+             for object_id, timestamp in watermarks.items()], many=True)
+
+    def reset(self, array_id=None, category=None):
+        """Remove watermarks so history is collected again.
+
+        :param array_id: only remove watermarks for this array -- str
+        :param category: only remove watermarks for this category -- str
+        """
+        statement = 'DELETE FROM watermark WHERE 1=1'
+        params = list()
+        if array_id:
+            statement += ' AND array_id=?'
+            params.append(array_id)
+        if category:
+            statement += ' AND category=?'
+            params.append(category)
+        self._execute(statement, tuple(params))
+
+
+class IncrementalCollector(object):
+    """Collect only performance samples not seen by a previous cycle.
+
+    The collector records the timestamp of the last sample collected for
+    each (array, category, object) and on each cycle requests only the
+    interval from that watermark to the last available array timestamp,
+    which is looked up once per cycle. Objects that share a watermark, the
+    normal case once collection is running, are requested together through
+    PerformanceFunctions.collect_stats.
+    """
+
+    def __init__(self, performance, watermark_path=None,
+                 initial_window=None, max_workers=pc.COLLECT_MAX_WORKERS):
+        """__init__.
+
+        :param performance: performance functions -- PerformanceFunctions
+        :param watermark_path: path to the watermark database -- str
+        :param initial_window: minutes of history to collect for objects
+                               without a watermark, only the latest sample
+                               is collected if not set -- int
+        :param max_workers: maximum concurrent metrics requests -- int
+        """
+        self.performance = performance
+        self.watermarks = WatermarkStore(watermark_path)
+        self.initial_window = initial_window
+        self.max_workers = max_workers
+
+    def collect(self, category, object_ids=None, metrics=pc.KPI,
+                array_id=None, data_format=pc.AVERAGE):
+        """Run a collection cycle for a category.
+
+        :param category: performance category e.g. StorageGroup -- str
+        :param object_ids: object ids, defaults to every object in the
+                           category -- list
+        :param metrics: performance metrics, options are individual metrics,
+                        a list of metrics, 'KPI' for KPI metrics only, and
+                        'ALL' for all metrics -- str/list
+        :param array_id: array id -- str
+        :param data_format: response data format 'Average' or 'Maximum' -- str
+        :returns: new samples keyed by object id, and any object ids which
+                  could not be collected with the reason -- dict
+        """
+        array_id = self.performance.array_id if not array_id else array_id
+        end_time = int(self.performance.get_last_available_timestamp(
+            array_id))
+        if object_ids is None:
+            __, key_info = self.performance.get_object_key_info(
+                category, array_id=array_id)
+            object_ids = list(key_info.keys())
+        elif isinstance(object_ids, str):
+            object_ids = [object_ids]
+
+        watermarks = self.watermarks.get_watermarks(array_id, category)
+        initial_start = end_time - (
+            int(self.initial_window) * pc.ONE_MINUTE
+            if self.initial_window else 0)
+
+        # Group objects by the start of their missing interval
+        groups = dict()
+        for object_id in object_ids:
+            watermark = watermarks.get(str(object_id))
+            if watermark is None:
+                start_time = initial_start
+            elif watermark >= end_time:
+                continue
+            else:
+                start_time = watermark
+            groups.setdefault(start_time, list()).append(object_id)
+
+        results, failed, new_watermarks = dict(), dict(), dict()
+        for start_time, group_ids in sorted(groups.items()):
+            response = self.performance.collect_stats(
+                category, object_ids=group_ids, metrics=metrics,
+                array_id=array_id, data_format=data_format,
+                start_time=start_time, end_time=end_time,
+                max_workers=self.max_workers)
+            failed.update(response.get(pc.FAILED, dict()))
+            for object_id, samples in response[pc.RESULT].items():
+                watermark = watermarks.get(str(object_id))
+                new_samples = [
+                    s for s in samples if watermark is None or int(
+                        s.get(pc.TIMESTAMP) or 0) > watermark]
+                results[object_id] = new_samples
+                if new_samples:
+                    new_watermarks[object_id] = max(
+                        int(s.get(pc.TIMESTAMP) or 0) for s in new_samples)
+
+        if new_watermarks:
+            self.watermarks.set_watermarks(array_id, category, new_watermarks)
+        LOG.debug('Collected new {c} samples for {n} objects up to '
+                  '{t}.'.format(c=category, n=len(new_watermarks), t=end_time))
+
+        return {pc.RESULT: results,
+                pc.FAILED: failed,
+                'array_id': str(array_id),
+                'timestamp': end_time,
+                'reporting_level': (
+                    self.performance.common.convert_to_snake_case(category))}
@@ -0,0 +1,300 @@
+# Copyright (c) 2025 Dell Inc. or its subsidiaries.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""performance_engine.py.
+
+Multi-process performance collection.
+
+Threads share one interpreter, so JSON decoding and result shaping for
+large estates are limited to a single core. The collection engine spreads
+(array, category, object batch) work units over a pool of worker processes,
+each with its own Unisphere connection. Workers return the samples of each
+object as a performance_codec block rather than pickled lists of dicts,
+which keeps the data passed between processes small.
+"""
+
+import collections
+import logging
+import os
+
+from concurrent import futures
+
+from PyU4V.utils import exception
+from PyU4V.utils import performance_codec
+from PyU4V.utils import performance_constants as pc
+
+LOG = logging.getLogger(__name__)
+
+WorkUnit = collections.namedtuple('WorkUnit', [
+    'array_id', 'category', 'object_ids', 'metrics', 'data_format',
+    'start_time', 'end_time', 'window'])
+
+# Connection of the current worker process
+_connection = None
+
+
+def _get_connection(connection_kwargs):
+    """Get the Unisphere connection of a worker process.
+
+    The connection is opened by the first task a worker runs and reused by
+    the tasks which follow.
+
+    :param connection_kwargs: U4VConn keyword arguments -- dict
+    :returns: connection -- U4VConn
+    """
+    global _connection
+    if _connection is None:
+        from PyU4V import univmax_conn
+        _connection = univmax_conn.U4VConn(**connection_kwargs)
+    return _connection
+
+
+def _get_last_available_timestamp(connection_kwargs, array_id):
+    """Get the last available timestamp of an array in a worker process.
+
+    :param connection_kwargs: U4VConn keyword arguments -- dict
+    :param array_id: array id -- str
+    :returns: timestamp in milliseconds since epoch -- int
+    """
+    return int(_get_connection(
+        connection_kwargs).performance.get_last_available_timestamp(
+        array_id))
+
+
+def _get_object_ids(connection_kwargs, array_id, category):
+    """Get the object ids of a category in a worker process.
+
+    :param connection_kwargs: U4VConn keyword arguments -- dict
+    :param array_id: array id -- str
+    :param category: performance category -- str
+    :returns: object ids -- list
+    """
+    __, key_info = _get_connection(
+        connection_kwargs).performance.get_object_key_info(
+        category, array_id=array_id)
+    return list(key_info.keys())
+
+
+def _collect_work_unit(connection_kwargs, work_unit, max_workers):
+    """Collect a work unit in a worker process.
+
+    :param connection_kwargs: U4VConn keyword arguments -- dict
+    :param work_unit: work unit -- WorkUnit
+    :param max_workers: maximum concurrent requests in the worker -- int
+    :returns: encoded samples keyed by object id, failed object ids with
+              the reason, and the collected end time -- tuple
+    """
+    response = _get_connection(
+        connection_kwargs).performance.collect_stats(
+        work_unit.category, object_ids=list(work_unit.object_ids),
+        metrics=work_unit.metrics, window=work_unit.window,
+        array_id=work_unit.array_id, data_format=work_unit.data_format,
+        start_time=work_unit.start_time, end_time=work_unit.end_time,
+        max_workers=max_workers)
+    encoded = {object_id: performance_codec.encode_block(samples)
+               for object_id, samples in response[pc.RESULT].items()}
+    return encoded, response.get(pc.FAILED, dict()), response.get(
+        'end_date')
+
+
+def plan_work_units(category, object_ids, metrics=pc.KPI,
+                    data_format=pc.AVERAGE, start_time=None, end_time=None,
+                    window=None, batch_size=pc.ENGINE_BATCH_SIZE):
+    """Partition objects into work units of at most batch_size objects.
+
+    :param category: performance category -- str
+    :param object_ids: object ids keyed by array id -- dict
+    :param metrics: performance metrics -- str/list
+    :param data_format: response data format 'Average' or 'Maximum' -- str
+    :param start_time: timestamp in milliseconds since epoch -- int
+    :param end_time: timestamp in milliseconds since epoch -- int
+    :param window: minutes of data to collect -- int
+    :param batch_size: maximum objects per work unit -- int
+    :returns: work units -- list
+    :raises: InvalidInputException
+    """
+    if not batch_size or int(batch_size) <= 0:
+        raise exception.InvalidInputException(
+            'Work unit batch size must be a positive number of objects.')
+    batch_size = int(batch_size)
+    work_units = list()
+    for array_id, array_object_ids in object_ids.items():
+        array_object_ids = list(array_object_ids)
+        for index in range(0, len(array_object_ids), batch_size):
+            work_units.append(WorkUnit(
+                str(array_id), category,
+                tuple(array_object_ids[index:index + batch_size]), metrics,
+                data_format, start_time, end_time, window))
+    return work_units
+
+
+class CollectionEngine(object):
+    """Collect performance data for many arrays and objects in processes.
+
+    Each worker process opens its own U4VConn from connection_kwargs on its
+    first task, so credentials and server details are passed to the engine
+    rather than a connection. The process pool is created on first use
+    and kept until close is called, use the engine as a context manager to
+    close it automatically.
+    """
+
+    def __init__(self, connection_kwargs=None, processes=None,
+                 threads_per_process=pc.ENGINE_THREADS,
+                 batch_size=pc.ENGINE_BATCH_SIZE):
+        """__init__.
+
+        :param connection_kwargs: U4VConn keyword arguments, PyU4V.conf is
+                                  used if not set -- dict
+        :param processes: worker processes, defaults to the number of
+                          cores -- int
+        :param threads_per_process: concurrent metrics requests in each
+                                    worker -- int
+        :param batch_size: maximum objects per work unit -- int
+        """
+        self.connection_kwargs = connection_kwargs if (
+            connection_kwargs) else dict()
+        self.processes = processes if processes else os.cpu_count() or 1
+        self.threads_per_process = threads_per_process
+        self.batch_size = batch_size
+        self._executor = None
+
+    def __enter__(self):
+        """Enter the runtime context.
+
+        :returns: engine -- CollectionEngine
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Exit the runtime context and stop the worker processes."""
+        self.close()
+
+    def _get_executor(self):
+        """Get the process pool, starting it if required.
+
+        :returns: executor -- ProcessPoolExecutor
+        """
+        if self._executor is None:
+            self._executor = futures.ProcessPoolExecutor(
+                max_workers=self.processes)
+        return self._executor
+
+    def close(self):
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def collect(self, category, array_ids, object_ids=None, metrics=pc.KPI,
+                window=None, data_format=pc.AVERAGE, start_time=None,
+                end_time=None, columnar=False):
+        """Collect performance statistics across worker processes.
+
+        :param category: performance category e.g. StorageGroup -- str
+        :param array_ids: array ids, responses are keyed by them as
+                          strings -- list
+        :param object_ids: object ids keyed by array id, defaults to every
+                           object in the category of each array -- dict
+        :param metrics: performance metrics, options are individual metrics,
+                        a list of metrics, 'KPI' for KPI metrics only, and
+                        'ALL' for all metrics -- str/list
+        :param window: minutes of data to collect -- int
+        :param data_format: response data format 'Average' or 'Maximum' -- str
+        :param start_time: timestamp in milliseconds since epoch -- int
+        :param end_time: timestamp in milliseconds since epoch, defaults to
+                         the last available timestamp of each array -- int
+        :param columnar: return the results of each object as a
+                         PerformanceFrame -- bool
+        :returns: performance results keyed by object id, and any object
+                  ids which could not be collected with the reason, keyed
+                  by array id -- dict
+        """
+        if isinstance(array_ids, (str, int)):
+            array_ids = [array_ids]
+        # Work units carry string array ids, key everything by them
+        array_ids = [str(array_id) for array_id in array_ids]
+        object_ids = {str(array_id): ids for array_id, ids in (
+            object_ids or dict()).items()}
+        executor = self._get_executor()
+        response = {array_id: {
+            pc.RESULT: dict(), pc.FAILED: dict(), 'array_id': str(array_id),
+            'reporting_level': category} for array_id in array_ids}
+
+        # 1. Resolve the end time and discover objects once per array, so
+        # every work unit of an array covers the same time range
+        end_times = {array_id: int(end_time) for array_id in array_ids} if (
+            end_time is not None) else dict()
+        future_map = dict()
+        for array_id in array_ids:
+            if array_id not in end_times:
+                future_map[executor.submit(
+                    _get_last_available_timestamp, self.connection_kwargs,
+                    array_id)] = (array_id, end_times, 'last available time')
+            if array_id not in object_ids:
+                future_map[executor.submit(
+                    _get_object_ids, self.connection_kwargs, array_id,
+                    category)] = (array_id, object_ids, category + ' objects')
+        for future in futures.as_completed(future_map):
+            array_id, lookup, description = future_map[future]
+            try:
+                lookup[array_id] = future.result()
+            except Exception as error:
+                LOG.warning('Unable to get the {d} of array {a}: {e}'.format(
+                    d=description, a=array_id, e=error))
+                response[array_id]['error'] = str(error)
+
+        # 2. Collect work units
+        work_units = list()
+        for array_id in array_ids:
+            array_response = response[array_id]
+            if 'error' in array_response:
+                array_response[pc.FAILED].update(
+                    {o: array_response['error']
+                     for o in object_ids.get(array_id, list())})
+                continue
+            array_response['end_date'] = end_times[array_id]
+            work_units.extend(plan_work_units(
+                category, {array_id: object_ids[array_id]}, metrics=metrics,
+                data_format=data_format, start_time=start_time,
+                end_time=end_times[array_id], window=window,
+                batch_size=self.batch_size))
+        future_map = {executor.submit(
+            _collect_work_unit, self.connection_kwargs, work_unit,
+            self.threads_per_process): work_unit for work_unit in work_units}
+        for future in futures.as_completed(future_map):
+            work_unit = future_map[future]
+            array_response = response[work_unit.array_id]
+            try:
+                encoded, failed, __ = future.result()
+            except Exception as error:
+                LOG.warning(
+                    'Unable to collect {c} performance data for {n} objects '
+                    'on array {a}: {e}'.format(
+                        c=category, n=len(work_unit.object_ids),
+                        a=work_unit.array_id, e=error))
+                array_response[pc.FAILED].update(
+                    {o: str(error) for o in work_unit.object_ids})
+                continue
+            array_response[pc.FAILED].update(failed)
+            for object_id, data in encoded.items():
+                frame = performance_codec.decode_block_frame(data)
+                array_response[pc.RESULT][object_id] = frame if (
+                    columnar) else frame.to_records()
+
+        # 3. Restore the requested object order
+        for array_id, array_response in response.items():
+            results = array_response[pc.RESULT]
+            array_response[pc.RESULT] = {
+                o: results[o] for o in object_ids.get(array_id, list())
+                if o in results}
+        return response
@@ -14,9 +14,14 @@
 """performance_enhanced.py."""
 
 import logging
+import threading
+import time
+
+from concurrent import futures
 
 from PyU4V.common import CommonFunctions
 from PyU4V.utils import constants
+from PyU4V.utils import performance_constants as pc
 
 LOG = logging.getLogger(__name__)
 
@@ -34,6 +39,8 @@ class EnhancedPerformanceFunctions(object):
         self.delete_resource = self.common.delete_resource
         self.array_id = array_id
         self.enhanced_api_version = constants.ENHANCED_API_VERSION
+        self._delta_state = dict()
+        self._delta_lock = threading.Lock()
 
     def get_performance_categories_list(self, array_id=None):
         """Get a list of performance categories and metrics that will be
@@ -46,34 +53,114 @@ class EnhancedPerformanceFunctions(object):
                  array represented by 'system' key -- list
         """
         array_id = array_id if array_id else self.array_id
-        response = self.common.get_request(
+
+        def _get_categories():
+            response = self.common.get_request(
+                target_uri=f"/{self.enhanced_api_version}/systems"
+                           f"/{array_id}/performance-categories",
+                resource_type=None)
+            if response:
+                category_list = response['performance_categories']
+            else:
+                category_list = []
+            return category_list
+
+        return self.common.get_static_metadata(
+            'enhanced_performance_categories', _get_categories,
+            array_id=array_id)
+
+    def _get_category_performance(self, array_id, category, timeout=None):
+        """Get latest data for all KPI metrics of a category.
+
+        :param array_id: 12 Digit Serial Number of Array -- int
+        :param category: performance category -- str
+        :param timeout: request timeout in seconds -- int
+        :returns: category metrics -- dict
+        """
+        return self.common.get_request(
             target_uri=f"/{self.enhanced_api_version}/systems"
-                       f"/{array_id}/performance-categories",
-            resource_type=None)
-        if response:
-            category_list = response['performance_categories']
-        else:
-            category_list = []
-        return category_list
+                       f"/{array_id}/performance-categories/"
+                       f"{category}",
+            resource_type=None, timeout=timeout)
+
+    def stream_performance_metrics_for_system(
+            self, array_id=None, max_workers=pc.COLLECT_MAX_WORKERS,
+            timeout=None):
+        """Get latest data for all KPI metrics, each category as it arrives.
+
+        Categories are requested concurrently using at most max_workers
+        threads and yielded in the order they complete, so the first
+        categories can be processed while the slowest are still being
+        retrieved. A category which fails or does not respond within
+        timeout seconds is logged and skipped, the remaining categories are
+        still returned.
+
+        :param array_id: 12 Digit Serial Number of Array -- int
+        :param max_workers: maximum concurrent category requests -- int
+        :param timeout: request timeout per category in seconds, defaults
+                        to the connection timeout -- int
+        :returns: category metrics -- generator
+        """
+        array_id = array_id if array_id else self.array_id
+        category_ids = [category['id'] for category in
+                        self.get_performance_categories_list(
+                            array_id=array_id)]
+        return (response for __, response in self._stream_categories(
+            array_id, category_ids, max_workers, timeout))
 
-    def get_all_performance_metrics_for_system(self, array_id=None):
+    def _stream_categories(self, array_id, category_ids, max_workers,
+                           timeout):
+        """Request categories concurrently, yielding each as it completes.
+
+        :param array_id: 12 Digit Serial Number of Array -- int
+        :param category_ids: performance categories -- list
+        :param max_workers: maximum concurrent category requests -- int
+        :param timeout: request timeout per category in seconds -- int
+        :returns: category id and metrics -- generator
+        """
+        if not category_ids:
+            return
+        workers = max(1, min(int(max_workers), len(category_ids)))
+        with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            future_map = {executor.submit(
+                self._get_category_performance, array_id, category,
+                timeout): category for category in category_ids}
+            for future in futures.as_completed(future_map):
+                try:
+                    response = future.result()
+                except Exception as error:
+                    LOG.warning(
+                        'Unable to get {c} performance metrics for {a}: '
+                        '{e}'.format(c=future_map[future], a=array_id,
+                                     e=error))
+                    continue
+                if response is not None:
+                    yield future_map[future], response
+
+    def get_all_performance_metrics_for_system(
+            self, array_id=None, max_workers=pc.COLLECT_MAX_WORKERS,
+            timeout=None):
         """Get latest data for all KPI metrics.
 
+        Categories are requested concurrently, so the time taken is close
+        to that of the slowest category. Categories which fail or time out
+        are logged and omitted from the results.
+
         :param array_id: 12 Digit Serial Number of Array -- int
+        :param max_workers: maximum concurrent category requests -- int
+        :param timeout: request timeout per category in seconds, defaults
+                        to the connection timeout -- int
         :returns: data for all available categories for the specified PowerMax
                  Array diagnostic level metrics only, 5 min interval -- dict
         """
         array_id = array_id if array_id else self.array_id
-        category_list = self.get_performance_categories_list(array_id=array_id)
-        full_metric_collection = []
-        for category in category_list:
-            response = self.common.get_request(
-                target_uri=f"/{self.enhanced_api_version}/systems"
-                           f"/{array_id}/performance-categories/"
-                           f"{category['id']}",
-                resource_type=None)
-            if response is not None:
-                full_metric_collection.append(response)
+        category_ids = [category['id'] for category in
+                        self.get_performance_categories_list(
+                            array_id=array_id)]
+        responses = dict(self._stream_categories(
+            array_id, category_ids, max_workers, timeout))
+        full_metric_collection = [responses[category] for category in
+                                  category_ids if category in responses]
         return full_metric_collection
 
     def get_category_metrics(self, category: str, array_id=None, filters=None):
@@ -109,3 +196,93 @@ class EnhancedPerformanceFunctions(object):
             resource_type=None)
 
         return response
+
+    def get_category_metrics_delta(self, category, array_id=None,
+                                   filters=None):
+        """Get the components of a category which changed since the last call.
+
+        The latest timestamp and values of each component are remembered per
+        array and category. Diagnostic data is only updated every five
+        minutes, so until five minutes after the last timestamp seen no
+        request is sent. When the timestamp has not advanced nothing is
+        returned, otherwise only the components which are new or whose
+        values changed are returned.
+
+        :param category: performance category -- str
+        :param array_id: 12 Digit Serial Number of Array -- int
+        :param filters: filters as for get_category_metrics -- list
+        :returns: get_category_metrics response containing only changed
+                  components, None if there is no new data -- dict
+        """
+        array_id = array_id if array_id else self.array_id
+        key = (array_id, category, tuple(filters or list()))
+        with self._delta_lock:
+            state = self._delta_state.setdefault(
+                key, {pc.TIMESTAMP: None, 'values': dict()})
+            if state[pc.TIMESTAMP] is not None and time.time() * 1000 < (
+                    state[pc.TIMESTAMP] + pc.DIAGNOSTIC_INTERVAL):
+                return None
+
+        response = self.get_category_metrics(
+            category, array_id=array_id, filters=filters)
+        if not response:
+            return None
+        latest, timestamp = dict(), None
+        for instance in response.get('metric_instances') or list():
+            samples = instance.get(pc.METRICS) or list()
+            if not samples:
+                continue
+            latest[instance.get('id')] = instance, samples[-1]
+            sample_timestamp = samples[-1].get(pc.TIMESTAMP)
+            if sample_timestamp is not None and (
+                    timestamp is None or sample_timestamp > timestamp):
+                timestamp = sample_timestamp
+
+        with self._delta_lock:
+            if timestamp is not None and state[pc.TIMESTAMP] is not None and (
+                    timestamp <= state[pc.TIMESTAMP]):
+                return None
+            changed = list()
+            for component_id, (instance, sample) in latest.items():
+                values = {k: v for k, v in sample.items()
+                          if k != pc.TIMESTAMP}
+                if state['values'].get(component_id) != values:
+                    state['values'][component_id] = values
+                    changed.append(instance)
+            if timestamp is not None:
+                state[pc.TIMESTAMP] = timestamp
+        delta = dict(response)
+        delta['metric_instances'] = changed
+        return delta
+
+    def poll_category_metrics(self, category, array_id=None, filters=None,
+                              poll_interval=pc.ENHANCED_POLL_INTERVAL,
+                              duration=None):
+        """Poll a category, yielding only components which changed.
+
+        See get_category_metrics_delta, polls which return no changed
+        components are not yielded. Polling continues until duration
+        seconds have passed or the generator is closed.
+
+        :param category: performance category -- str
+        :param array_id: 12 Digit Serial Number of Array -- int
+        :param filters: filters as for get_category_metrics -- list
+        :param poll_interval: seconds between polls -- int
+        :param duration: seconds to poll for, defaults to no limit -- int
+        :returns: get_category_metrics responses containing only changed
+                  components -- generator
+        """
+        stop_time = time.time() + duration if duration else None
+        while True:
+            delta = self.get_category_metrics_delta(
+                category, array_id=array_id, filters=filters)
+            if delta and delta['metric_instances']:
+                yield delta
+            if stop_time and time.time() >= stop_time:
+                return
+            time.sleep(poll_interval)
+
+    def reset_category_metrics_delta(self):
+        """Forget the timestamps and values seen by delta polling."""
+        with self._delta_lock:
+            self._delta_state = dict()
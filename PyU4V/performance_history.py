@@ -0,0 +1,223 @@
+# Copyright (c) 2025 Dell Inc. or its subsidiaries.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""performance_history.py."""
+
+import logging
+import time
+
+from PyU4V.utils import constants
+from PyU4V.utils import exception
+from PyU4V.utils import performance_constants as pc
+from PyU4V.utils import sqlite_store
+
+LOG = logging.getLogger(__name__)
+
+RAW = constants.HISTORY_TIER_RAW
+HOURLY = constants.HISTORY_TIER_HOURLY
+DAILY = constants.HISTORY_TIER_DAILY
+TIERS = [RAW, HOURLY, DAILY]
+TIER_INTERVAL = {HOURLY: pc.ONE_HOUR, DAILY: pc.ONE_DAY}
+STATISTICS = {'avg': 'value', 'min': 'minimum', 'max': 'maximum',
+              'count': 'count'}
+
+
+def get_default_history_path():
+    """Get the default history store path in the ~/.PyU4V directory.
+
+    :returns: history store file path -- str
+    """
+    return sqlite_store.get_default_path(constants.HISTORY_STORE_FILENAME)
+
+
+class PerformanceHistoryStore(sqlite_store.SQLiteStore):
+    """Local performance history with downsampled retention tiers.
+
+    Samples collected from Unisphere are written to the raw tier. Calling
+    maintain() rolls complete hours of raw samples up into the hourly tier
+    and complete days of hourly samples into the daily tier, keeping the
+    average, minimum, maximum and sample count of each bucket, then removes
+    samples older than each tier's retention period. Dashboards and reports
+    can then query days or months of history locally.
+    """
+
+    def __init__(self, db_path=None, retention=None):
+        """__init__.
+
+        :param db_path: path to the SQLite database file -- str
+        :param retention: days to keep per tier e.g. {'raw': 7}, tiers not
+                          supplied use the default retention -- dict
+        """
+        super(PerformanceHistoryStore, self).__init__(
+            db_path if db_path else get_default_history_path())
+        self.retention = dict(constants.HISTORY_RETENTION_DAYS)
+        if retention:
+            self.retention.update(retention)
+        self._execute(
+            'CREATE TABLE IF NOT EXISTS sample ('
+            'tier TEXT, array_id TEXT, category TEXT, object_id TEXT, '
+            'metric TEXT, timestamp INTEGER, value REAL, minimum REAL, '
+            'maximum REAL, count INTEGER, PRIMARY KEY (tier, array_id, '
+            'category, object_id, metric, timestamp))')
+
+    def add_results(self, array_id, category, object_id, results):
+        """Add performance results to the raw tier.
+
+        :param array_id: array id -- str
+        :param category: performance category -- str
+        :param object_id: object id the results belong to -- str
+        :param results: performance results, one dict per sample -- list
+        :returns: number of metric values stored -- int
+        """
+        rows = list()
+        for sample in results:
+            timestamp = sample.get(pc.TIMESTAMP)
+            if timestamp is None:
+                continue
+            for metric, value in sample.items():
+                if metric == pc.TIMESTAMP or isinstance(value, bool) or (
+                        not isinstance(value, (int, float))):
+                    continue
+                rows.append((RAW, str(array_id), category, str(object_id),
+                             metric, int(timestamp), value, value, value, 1))
+        if rows:
+            self._execute(
+                'INSERT OR REPLACE INTO sample VALUES '
+                '(?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', rows, many=True)
+        return len(rows)
+
+    def add_object_results(self, array_id, category, object_results):
+        """Add performance results keyed by object id to the raw tier.
+
+        :param array_id: array id -- str
+        :param category: performance category -- str
+        :param object_results: performance results keyed by object id, as
+                               returned by collect_stats -- dict
+        :returns: number of metric values stored -- int
+        """
+        return sum(self.add_results(array_id, category, object_id, results)
+                   for object_id, results in object_results.items())
+
+    def rollup(self, now=None):
+        """Roll complete hours and days up into the hourly and daily tiers.
+
+        Each series, an array, category, object and metric, is rolled up
+        from the most recent bucket it already has in the target tier, so
+        the most recent bucket is recalculated to include samples arriving
+        late and series backfilled after others have been rolled up are
+        rolled up from their first sample.
+
+        :param now: time in milliseconds since epoch, defaults to the current
+                    time -- int
+        """
+        now = int(now) if now else int(time.time() * 1000)
+        for tier, source in [(HOURLY, RAW), (DAILY, HOURLY)]:
+            interval = TIER_INTERVAL[tier]
+            complete_before = (now // interval) * interval
+            self._execute(
+                'INSERT OR REPLACE INTO sample '
+                'SELECT ?, s.array_id, s.category, s.object_id, s.metric, '
+                '(s.timestamp / ?) * ? AS bucket, '
+                'SUM(s.value * s.count) / SUM(s.count), MIN(s.minimum), '
+                'MAX(s.maximum), SUM(s.count) FROM sample s '
+                'LEFT JOIN (SELECT array_id, category, object_id, metric, '
+                'MAX(timestamp) AS since FROM sample WHERE tier=? '
+                'GROUP BY array_id, category, object_id, metric) w '
+                'ON s.array_id = w.array_id AND s.category = w.category '
+                'AND s.object_id = w.object_id AND s.metric = w.metric '
+                'WHERE s.tier=? AND s.timestamp >= COALESCE(w.since, 0) '
+                'AND s.timestamp < ? '
+                'GROUP BY s.array_id, s.category, s.object_id, s.metric, '
+                'bucket',
+                (tier, interval, interval, tier, source, complete_before))
+
+    def apply_retention(self, now=None):
+        """Remove samples older than the retention period of their tier.
+
+        :param now: time in milliseconds since epoch, defaults to the current
+                    time -- int
+        """
+        now = int(now) if now else int(time.time() * 1000)
+        for tier in TIERS:
+            days = self.retention.get(tier)
+            if days:
+                self._execute(
+                    'DELETE FROM sample WHERE tier=? AND timestamp < ?',
+                    (tier, now - int(days) * pc.ONE_DAY))
+
+    def maintain(self, now=None):
+        """Roll up samples then apply retention.
+
+        Call periodically, for example after each collection cycle.
+
+        :param now: time in milliseconds since epoch, defaults to the current
+                    time -- int
+        """
+        self.rollup(now)
+        self.apply_retention(now)
+
+    def query(self, category, object_ids=None, metrics=None,
+              start_time=None, end_time=None, tier=RAW, array_id=None,
+              statistic='avg'):
+        """Get stored samples for a time range.
+
+        :param category: performance category -- str
+        :param object_ids: object id or ids, defaults to all -- str or list
+        :param metrics: metric or metrics, defaults to all -- str or list
+        :param start_time: timestamp in milliseconds since epoch -- int
+        :param end_time: timestamp in milliseconds since epoch -- int
+        :param tier: retention tier raw, hourly or daily -- str
+        :param array_id: array id, defaults to all arrays -- str
+        :param statistic: bucket statistic avg, min, max or count, raw
+                          samples have the same value for each -- str
+        :returns: samples in timestamp order keyed by object id -- dict
+        :raises: InvalidInputException
+        """
+        if tier not in TIERS or statistic not in STATISTICS:
+            msg = ('Invalid history tier "{t}" or statistic "{s}", tier must '
+                   'be one of {ts} and statistic one of {ss}.'.format(
+                       t=tier, s=statistic, ts=TIERS,
+                       ss=list(STATISTICS.keys())))
+            LOG.error(msg)
+            raise exception.InvalidInputException(msg)
+        statement = ('SELECT object_id, timestamp, metric, {c} FROM sample '
+                     'WHERE tier=? AND category=?'.format(
+                         c=STATISTICS[statistic]))
+        params = [tier, category]
+        for column, values in [('array_id', array_id),
+                               ('object_id', object_ids),
+                               ('metric', metrics)]:
+            if values:
+                values = [values] if isinstance(values, str) else values
+                statement += ' AND {c} IN ({p})'.format(
+                    c=column, p=', '.join('?' * len(values)))
+                params.extend(str(v) for v in values)
+        if start_time is not None:
+            statement += ' AND timestamp >= ?'
+            params.append(int(start_time))
+        if end_time is not None:
+            statement += ' AND timestamp <= ?'
+            params.append(int(end_time))
+        statement += ' ORDER BY object_id, timestamp'
+
+        history = dict()
+        samples = dict()
+        for object_id, timestamp, metric, value in self._execute(
+                statement, tuple(params), fetch=True):
+            sample = samples.get((object_id, timestamp))
+            if sample is None:
+                sample = samples[(object_id, timestamp)] = {
+                    pc.TIMESTAMP: timestamp}
+                history.setdefault(object_id, list()).append(sample)
+            sample[metric] = value
+        return history
@@ -0,0 +1,332 @@
+# Copyright (c) 2025 Dell Inc. or its subsidiaries.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""performance_subscriptions.py."""
+
+import collections
+import itertools
+import logging
+import threading
+import time
+
+from PyU4V.utils import exception
+from PyU4V.utils import performance_constants as pc
+
+LOG = logging.getLogger(__name__)
+
+Subscription = collections.namedtuple('Subscription', [
+    'subscription_id', 'array_id', 'category', 'object_ids', 'metrics',
+    'cadence', 'window', 'data_format', 'callback'])
+
+
+class SubscriptionManager(object):
+    """Share performance metrics requests between many consumers.
+
+    Consumers such as dashboards, alerting and reports subscribe to the
+    metrics they need for a set of objects at their own cadence. On each
+    cycle the subscriptions which are due are merged so that each object is
+    requested once per array, category and data format, with the union of
+    the metrics and the longest window of its subscribers. The merged
+    requests are sent through PerformanceFunctions.collect_stats and each
+    subscriber receives only its own objects, metrics and window.
+    """
+
+    def __init__(self, performance, max_workers=pc.COLLECT_MAX_WORKERS):
+        """__init__.
+
+        :param performance: performance functions -- PerformanceFunctions
+        :param max_workers: maximum concurrent metrics requests -- int
+        """
+        self.performance = performance
+        self.max_workers = max_workers
+        self._subscriptions = dict()
+        self._next_due = dict()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def subscribe(self, category, object_ids=None, metrics=pc.KPI,
+                  cadence=pc.SUBSCRIPTION_CADENCE, window=None,
+                  array_id=None, data_format=pc.AVERAGE, callback=None):
+        """Register a subscription to performance metrics.
+
+        :param category: performance category e.g. StorageGroup -- str
+        :param object_ids: object ids, defaults to every object in the
+                           category -- list
+        :param metrics: performance metrics, options are individual metrics,
+                        a list of metrics, 'KPI' for KPI metrics only, and
+                        'ALL' for all metrics -- str/list
+        :param cadence: minutes between deliveries -- int
+        :param window: minutes of data to deliver, defaults to the
+                       cadence -- int
+        :param array_id: array id -- str
+        :param data_format: response data format 'Average' or 'Maximum' -- str
+        :param callback: called with the subscription and its results on
+                         each delivery -- callable
+        :returns: subscription -- Subscription
+        :raises: InvalidInputException
+        """
+        array_id = self.performance.array_id if not array_id else array_id
+        if not cadence or int(cadence) <= 0:
+            raise exception.InvalidInputException(
+                'Subscription cadence must be a positive number of '
+                'minutes.')
+        if data_format.upper() not in [pc.AVERAGE.upper(), pc.MAXIMUM.upper()]:
+            raise exception.InvalidInputException(
+                'Invalid data format "{f}" specified, please use one of '
+                'Average or Maximum'.format(f=data_format))
+        data_format = pc.MAXIMUM if pc.MAXIMUM.upper() in (
+            data_format.upper()) else pc.AVERAGE
+
+        # Resolve KPI and ALL now so metrics can be merged per cycle
+        if isinstance(metrics, str) and metrics.upper() in [
+                pc.KPI.upper(), pc.ALL.upper()]:
+            metrics = self.performance.get_performance_metrics_list(
+                category, kpi_only=metrics.upper() == pc.KPI.upper(),
+                array_id=array_id)
+        metrics = self.performance.format_metrics(metrics)
+        if isinstance(object_ids, str):
+            object_ids = [object_ids]
+
+        with self._lock:
+            subscription = Subscription(
+                next(self._ids), str(array_id), category,
+                tuple(object_ids) if object_ids is not None else None,
+                tuple(metrics), int(cadence),
+                int(window) if window else int(cadence), data_format,
+                callback)
+            self._subscriptions[subscription.subscription_id] = subscription
+            self._next_due[subscription.subscription_id] = 0
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """Remove a subscription.
+
+        :param subscription: subscription or subscription id -- Subscription
+                             or int
+        """
+        subscription_id = getattr(
+            subscription, 'subscription_id', subscription)
+        with self._lock:
+            self._subscriptions.pop(subscription_id, None)
+            self._next_due.pop(subscription_id, None)
+
+    def get_subscriptions(self):
+        """Get the registered subscriptions.
+
+        :returns: subscriptions -- list
+        """
+        with self._lock:
+            return list(self._subscriptions.values())
+
+    def get_due_subscriptions(self, now=None):
+        """Get the subscriptions due for delivery.
+
+        :param now: time in seconds since epoch, defaults to now -- float
+        :returns: subscriptions -- list
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            return [s for i, s in self._subscriptions.items()
+                    if self._next_due[i] <= now]
+
+    @staticmethod
+    def plan_requests(subscriptions, key_info=None):
+        """Merge subscriptions into the minimal set of metrics requests.
+
+        Each object is requested once per array, category and data format
+        with the union of the metrics and the longest window its subscribers
+        ask for. Objects sharing the same metrics and window are grouped so
+        they can be collected together.
+
+        :param subscriptions: subscriptions -- list
+        :param key_info: object ids keyed by (array id, category), used for
+                         subscriptions to every object in a category -- dict
+        :returns: request groups, each with array_id, category, data_format,
+                  object_ids, metrics and window -- list
+        """
+        key_info = key_info if key_info else dict()
+        objects = collections.OrderedDict()
+        for subscription in subscriptions:
+            request_key = (subscription.array_id, subscription.category,
+                           subscription.data_format)
+            object_ids = subscription.object_ids
+            if object_ids is None:
+                object_ids = key_info.get(
+                    (subscription.array_id, subscription.category), list())
+            object_requests = objects.setdefault(
+                request_key, collections.OrderedDict())
+            for object_id in object_ids:
+                metrics, window = object_requests.get(
+                    object_id, (list(), 0))
+                metrics.extend(m for m in subscription.metrics
+                               if m not in metrics)
+                object_requests[object_id] = (
+                    metrics, max(window, subscription.window))
+
+        requests = list()
+        for (array_id, category, data_format), object_requests in (
+                objects.items()):
+            groups = collections.OrderedDict()
+            for object_id, (metrics, window) in object_requests.items():
+                groups.setdefault((tuple(metrics), window), list()).append(
+                    object_id)
+            for (metrics, window), object_ids in groups.items():
+                requests.append({
+                    'array_id': array_id, pc.CATEGORY: category,
+                    'data_format': data_format, 'object_ids': object_ids,
+                    pc.METRICS: list(metrics), 'window': window})
+        return requests
+
+    @staticmethod
+    def filter_results(subscription, results, end_time):
+        """Extract the results for one subscriber from merged results.
+
+        :param subscription: subscription -- Subscription
+        :param results: performance results keyed by object id -- dict
+        :param end_time: end of the collected range in milliseconds since
+                         epoch -- int
+        :returns: the subscription objects, restricted to its metrics and
+                  window -- dict
+        """
+        start_time = int(end_time) - subscription.window * pc.ONE_MINUTE
+        object_ids = subscription.object_ids
+        if object_ids is None:
+            object_ids = list(results.keys())
+        response = dict()
+        for object_id in object_ids:
+            if object_id not in results:
+                continue
+            samples = list()
+            for sample in results[object_id]:
+                timestamp = sample.get(pc.TIMESTAMP)
+                if timestamp is not None and int(timestamp) < start_time:
+                    continue
+                filtered = {pc.TIMESTAMP: timestamp}
+                filtered.update({m: sample[m] for m in subscription.metrics
+                                 if m in sample})
+                samples.append(filtered)
+            response[object_id] = samples
+        return response
+
+    def poll(self, now=None):
+        """Run a collection cycle for the subscriptions which are due.
+
+        The last available timestamp is looked up once per array and the
+        object ids of whole category subscriptions once per category.
+        Objects which could not be collected are reported in the failed
+        entry of each subscriber response. If the lookups for a subscription
+        fail, its failed entry holds the reason for each of its objects, or
+        for its category if it subscribes to the whole category.
+
+        :param now: time in seconds since epoch, defaults to now -- float
+        :returns: results keyed by subscription id -- dict
+        """
+        now = time.time() if now is None else now
+        subscriptions = self.get_due_subscriptions(now)
+        if not subscriptions:
+            return dict()
+
+        end_times, key_info, lookup_errors = dict(), dict(), dict()
+        for subscription in subscriptions:
+            array_id = subscription.array_id
+            if array_id not in end_times and array_id not in lookup_errors:
+                try:
+                    end_times[array_id] = int(
+                        self.performance.get_last_available_timestamp(
+                            array_id))
+                except exception.PyU4VException as error:
+                    LOG.warning('Unable to get the last available timestamp '
+                                'of array {a}: {e}'.format(a=array_id,
+                                                           e=error))
+                    lookup_errors[array_id] = str(error)
+            key = (array_id, subscription.category)
+            if array_id in lookup_errors or (
+                    subscription.object_ids is not None) or (
+                    key in key_info or key in lookup_errors):
+                continue
+            try:
+                __, category_keys = self.performance.get_object_key_info(
+                    subscription.category, array_id=array_id)
+                key_info[key] = list(category_keys.keys())
+            except exception.PyU4VException as error:
+                LOG.warning('Unable to get {c} objects of array {a}: '
+                            '{e}'.format(c=subscription.category, a=array_id,
+                                         e=error))
+                lookup_errors[key] = str(error)
+
+        def _lookup_error(subscription):
+            return lookup_errors.get(subscription.array_id) or (
+                lookup_errors.get((subscription.array_id,
+                                   subscription.category)) if (
+                    subscription.object_ids is None) else None)
+
+        results, failed = dict(), dict()
+        for request in self.plan_requests(
+                [s for s in subscriptions if not _lookup_error(s)],
+                key_info):
+            request_key = (request['array_id'], request[pc.CATEGORY],
+                           request['data_format'])
+            try:
+                response = self.performance.collect_stats(
+                    request[pc.CATEGORY], object_ids=request['object_ids'],
+                    metrics=request[pc.METRICS], window=request['window'],
+                    array_id=request['array_id'],
+                    data_format=request['data_format'],
+                    end_time=end_times[request['array_id']],
+                    max_workers=self.max_workers)
+            except exception.PyU4VException as error:
+                LOG.warning('Unable to collect {c} performance data for '
+                            'subscriptions: {e}'.format(
+                                c=request[pc.CATEGORY], e=error))
+                response = {pc.RESULT: dict(), pc.FAILED: {
+                    o: str(error) for o in request['object_ids']}}
+            results.setdefault(request_key, dict()).update(
+                response[pc.RESULT])
+            failed.setdefault(request_key, dict()).update(
+                response.get(pc.FAILED, dict()))
+
+        deliveries = dict()
+        for subscription in subscriptions:
+            request_key = (subscription.array_id, subscription.category,
+                           subscription.data_format)
+            end_time = end_times.get(subscription.array_id)
+            object_failures = failed.get(request_key, dict())
+            lookup_error = _lookup_error(subscription)
+            if lookup_error:
+                object_failures = {o: lookup_error for o in (
+                    subscription.object_ids or [subscription.category])}
+            delivery = {
+                pc.RESULT: dict() if lookup_error else self.filter_results(
+                    subscription, results.get(request_key, dict()),
+                    end_time),
+                pc.FAILED: {o: r for o, r in object_failures.items() if (
+                    subscription.object_ids is None or (
+                        o in subscription.object_ids))},
+                'array_id': subscription.array_id,
+                'timestamp': end_time,
+                'reporting_level': (
+                    self.performance.common.convert_to_snake_case(
+                        subscription.category))}
+            deliveries[subscription.subscription_id] = delivery
+            with self._lock:
+                if subscription.subscription_id in self._next_due:
+                    self._next_due[subscription.subscription_id] = (
+                        now + subscription.cadence * 60)
+            if subscription.callback is not None:
+                try:
+                    subscription.callback(subscription, delivery)
+                except Exception as error:
+                    LOG.warning('Subscription {i} callback failed: '
+                                '{e}'.format(i=subscription.subscription_id,
+                                             e=error))
+        return deliveries
@@ -16,6 +16,8 @@
 import logging
 import time
 
+from concurrent import futures
+
 from PyU4V import common
 from PyU4V.utils import exception
 from PyU4V.utils import performance_constants as pc
@@ -242,6 +244,27 @@ class RealTimeFunctions(object):
         self._validate_real_time_input(start_date, end_date, category, metrics,
                                        instance_id)
 
+        response = self._get_real_time_results(
+            array_id, start_date, end_date, category, metrics, instance_id)
+        if response is None:
+            return None
+
+        return self._format_real_time_response(
+            array_id, start_date, end_date, category, instance_id, response)
+
+    def _get_real_time_results(self, array_id, start_date, end_date,
+                               category, metrics, instance_id=None):
+        """Post a real-time metrics request without validating input.
+
+        :param array_id: array serial number -- str
+        :param start_date: timestamp in milliseconds since epoch -- int
+        :param end_date: timestamp in milliseconds since epoch -- int
+        :param category: category id -- str
+        :param metrics: performance metrics -- list
+        :param instance_id: instance id -- str
+        :returns: real-time performance results, None if there is no
+                  response -- list
+        """
         request_params = {
             pc.SYMM_ID: array_id, pc.START_DATE: start_date,
             pc.END_DATE: end_date, pc.CATEGORY: category,
@@ -255,19 +278,127 @@ class RealTimeFunctions(object):
             payload=request_params)
         if not response:
             return None
+        return self.common.get_iterator_results(response)
 
+    def _format_real_time_response(self, array_id, start_date, end_date,
+                                   category, instance_id, results):
+        """Format real-time results in the get_performance_data response.
+
+        :param array_id: array serial number -- str
+        :param start_date: timestamp in milliseconds since epoch -- int
+        :param end_date: timestamp in milliseconds since epoch -- int
+        :param category: category id -- str
+        :param instance_id: instance id -- str
+        :param results: real-time performance results -- list
+        :returns: real-time performance data -- dict
+        """
         return_response = {
             pc.ARRAY_ID: array_id, pc.START_DATE_SN: start_date,
             pc.END_DATE_SN: end_date, pc.TIMESTAMP: end_date,
             pc.REAL_TIME_SN: True,
             pc.REP_LEVEL: self.common.convert_to_snake_case(category),
-            pc.RESULT: self.common.get_iterator_results(response)}
+            pc.RESULT: results}
 
         if instance_id:
             return_response[pc.INSTANCE_ID_SN] = instance_id
 
         return return_response
 
+    def stream(self, category, instance_ids=None, metrics=pc.All_CAP,
+               array_id=None, poll_interval=pc.REAL_TIME_POLL_INTERVAL,
+               window=1, max_workers=pc.COLLECT_MAX_WORKERS, duration=None):
+        """Stream new real-time performance samples as they become available.
+
+        Input is validated once, after which Unisphere is polled every
+        poll_interval seconds. Each poll requests the window from the last
+        sample seen for each instance up to the current time, extended to
+        at least one minute as required by Unisphere for timestamps close to
+        local time, and limited to the one hour maximum. Samples at or before
+        the last timestamp seen, which are returned again where windows
+        overlap, are dropped. Instances are polled concurrently.
+
+        A response in the get_performance_data format, containing only new
+        samples, is yielded for each instance with new samples. Polling
+        continues until duration seconds have passed or the generator is
+        closed. Instances which fail to respond are logged and retried on the
+        next poll.
+
+        :param category: category id -- str
+        :param instance_ids: instance id or ids, not required for the Array
+                             category -- str or list
+        :param metrics: performance metrics, options are individual metrics,
+                        a list of metrics, or 'ALL' for all metrics -- str/list
+        :param array_id: array serial number -- str
+        :param poll_interval: seconds between polls -- int
+        :param window: minutes of samples to return on the first poll -- int
+        :param max_workers: maximum concurrent instance requests -- int
+        :param duration: seconds to stream for, defaults to no limit -- int
+        :returns: real-time performance data -- generator
+        :raises: InvalidInputException
+        """
+        array_id = self.array_id if not array_id else array_id
+        metrics = self.format_metrics(metrics)
+        if instance_ids is None or isinstance(instance_ids, str):
+            instance_ids = [instance_ids]
+        now = int(time.time() * 1000)
+        start_date = now - max(int(window), 1) * pc.ONE_MINUTE
+        for instance_id in instance_ids:
+            self._validate_real_time_input(
+                start_date, now, category, metrics, instance_id)
+
+        last_seen = {instance_id: start_date - 1
+                     for instance_id in instance_ids}
+        stop_time = time.time() + duration if duration else None
+        workers = max(1, min(int(max_workers), len(instance_ids)))
+
+        def _poll(instance_id, end_date):
+            poll_start = min(last_seen[instance_id], end_date - pc.ONE_MINUTE)
+            if end_date - poll_start > pc.ONE_HOUR:
+                LOG.warning(
+                    'Real-time samples for {i} older than one hour have '
+                    'been missed.'.format(i=instance_id or array_id))
+                poll_start = end_date - pc.ONE_HOUR
+            results = self._get_real_time_results(
+                array_id, poll_start, end_date, category, metrics,
+                instance_id) or list()
+            return poll_start, results
+
+        with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            while True:
+                end_date = int(time.time() * 1000)
+                polls = [(instance_id, executor.submit(
+                    _poll, instance_id, end_date))
+                    for instance_id in instance_ids]
+                for instance_id, future in polls:
+                    try:
+                        poll_start, results = future.result()
+                    except Exception as error:
+                        LOG.warning(
+                            'Unable to poll real-time {c} performance data '
+                            'for {i}: {e}'.format(
+                                c=category, i=instance_id or array_id,
+                                e=error))
+                        continue
+                    watermark = last_seen[instance_id]
+                    new_samples = [
+                        sample for sample in results
+                        if sample.get(pc.TIMESTAMP) is None or int(
+                            sample[pc.TIMESTAMP]) > watermark]
+                    timestamps = [int(sample[pc.TIMESTAMP])
+                                  for sample in new_samples
+                                  if sample.get(pc.TIMESTAMP) is not None]
+                    if timestamps:
+                        last_seen[instance_id] = max(timestamps)
+                    elif new_samples:
+                        last_seen[instance_id] = end_date
+                    if new_samples:
+                        yield self._format_real_time_response(
+                            array_id, poll_start, end_date, category,
+                            instance_id, new_samples)
+                if stop_time and time.time() >= stop_time:
+                    return
+                time.sleep(poll_interval)
+
     # Real-time category specific calls
 
     def get_array_metrics(self):
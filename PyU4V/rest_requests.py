@@ -19,10 +19,12 @@ import platform
 import requests
 import requests.exceptions as r_exc
 import sys
+import threading
 import urllib3
 
 from PyU4V.utils import constants
 from PyU4V.utils import exception
+from PyU4V.utils import multipart_encoder
 from requests.auth import HTTPBasicAuth
 
 __pyu4v_version__ = constants.PYU4V_VERSION
@@ -40,19 +42,28 @@ LOG = logging.getLogger(__name__)
 CONTENT_TYPE = constants.CONTENT_TYPE
 ACCEPT = constants.ACCEPT
 ACCEPT_ENC = constants.ACCEPT_ENC
+RANGE = constants.RANGE
 USER_AGENT = constants.USER_AGENT
 APP_TYPE = constants.APP_TYPE
 APP_JSON = constants.APP_JSON
 APP_OCT = constants.APP_OCT
 APP_MPART = constants.APP_MPART
+STATUS_401 = constants.STATUS_401
 
 
 class RestRequests(object):
     """RestRequests."""
 
     def __init__(self, username, password, verify, base_url, interval, retries,
-                 application_type=None, proxies=None, timeout=None):
-        """__init__."""
+                 application_type=None, proxies=None, timeout=None,
+                 session_affinity=False):
+        """__init__.
+
+        :param session_affinity: reuse the session cookie issued by
+                                 Unisphere instead of sending credentials on
+                                 every request, credentials are only sent
+                                 again if the session is rejected -- bool
+        """
         self.username = username
         self.password = password
         self.verify_ssl = verify
@@ -67,6 +78,10 @@ class RestRequests(object):
         self.interval = interval
         self.proxies = proxies
         self.retries = retries
+        self.session_affinity = session_affinity
+        self._auth_lock = threading.Lock()
+        self.metadata_store = None
+        self.timestamp_index = None
         self.session = self.establish_rest_session()
 
     def establish_rest_session(self, headers=None):
@@ -81,6 +96,38 @@ class RestRequests(object):
         session.proxies = self.proxies
         return session
 
+    def _send_request(self, session, **kwargs):
+        """Send a request using the session, managing session affinity.
+
+        With session affinity enabled, credentials are sent with a request
+        only while Unisphere has not issued a session cookie. If the cookie
+        is later rejected with a 401 the cookie is cleared and the request is
+        sent once more with credentials. Credentials are passed per request
+        rather than set on the shared session, and the cookie jar is only
+        changed under a lock, so threads sharing the session do not undo
+        each other's authentication.
+
+        :param session: requests session -- object
+        :key kwargs: requests session.request arguments
+        :returns: response -- object
+        """
+        if not self.session_affinity:
+            return session.request(**kwargs)
+        credentials = HTTPBasicAuth(self.username, self.password)
+        with self._auth_lock:
+            session.auth = None
+            cookies = session.cookies.get_dict()
+        response = session.request(
+            auth=None if cookies else credentials, **kwargs)
+        if response.status_code == STATUS_401 and cookies:
+            LOG.debug('Unisphere session has expired, re-authenticating.')
+            with self._auth_lock:
+                # Keep a cookie another thread has already renewed
+                if session.cookies.get_dict() == cookies:
+                    session.cookies.clear()
+            response = session.request(auth=credentials, **kwargs)
+        return response
+
     def rest_request(self, target_url, method,
                      params=None, request_object=None, timeout=None):
         """Send a request to the target api.
@@ -104,17 +151,18 @@ class RestRequests(object):
             base_url=self.base_url, target_url=target_url)
         try:
             if request_object:
-                response = self.session.request(
-                    method=method, url=url, timeout=timeout_val,
+                response = self._send_request(
+                    self.session, method=method, url=url, timeout=timeout_val,
                     data=json.dumps(request_object, sort_keys=True,
                                     indent=4))
             elif params:
-                response = self.session.request(method=method, url=url,
-                                                params=params,
-                                                timeout=timeout_val)
+                response = self._send_request(
+                    self.session, method=method, url=url, params=params,
+                    timeout=timeout_val)
             else:
-                response = self.session.request(method=method, url=url,
-                                                timeout=timeout_val)
+                response = self._send_request(
+                    self.session, method=method, url=url,
+                    timeout=timeout_val)
             status_code = response.status_code
             try:
                 response = response.json()
@@ -162,10 +210,15 @@ class RestRequests(object):
                 data=exp_message) from error
 
     def file_transfer_request(self, method, uri, timeout=None, download=False,
-                              r_obj=None, upload=False, form_data=None):
+                              r_obj=None, upload=False, form_data=None,
+                              range_start=None, progress_callback=None):
         """Send a file transfer request via REST to the target API.
 
-        Valid methods are 'POST' and 'PUT'.
+        Valid methods are 'POST' and 'PUT'. Downloads are always streamed,
+        setting range_start requests the file from that byte offset so an
+        interrupted download can be resumed where the server supports it.
+        Uploads are streamed from the form data values by a multipart
+        encoder instead of building the full body in memory.
 
         :param method: request method -- str
         :param uri: target uri -- str
@@ -174,6 +227,9 @@ class RestRequests(object):
         :param r_obj: download request payload -- dict
         :param upload: if upload request -- bool
         :param form_data: upload multipart form data -- dict
+        :param range_start: download byte offset to resume from -- int
+        :param progress_callback: upload progress callback, called with
+                                  bytes sent and total bytes -- callable
         :returns: server response, status code -- dict, int
         :raises: InvalidInputException, VolumeBackendAPIException,
                  Timeout, SSLError, ConnectionError, HTTPError
@@ -184,6 +240,8 @@ class RestRequests(object):
                 ACCEPT: APP_OCT,
                 USER_AGENT: ua_details,
                 APP_TYPE: self.headers.get('application-type')}
+            if range_start:
+                headers[RANGE] = 'bytes={start}-'.format(start=range_start)
         elif upload and not download:
             headers = {
                 ACCEPT_ENC: APP_MPART,
@@ -197,13 +255,22 @@ class RestRequests(object):
 
         timeout_val = self.timeout if not timeout else timeout
         data = json.dumps(r_obj, sort_keys=True, indent=4) if r_obj else None
+        request_headers = None
+        if upload:
+            data = multipart_encoder.MultipartEncoder(
+                form_data if form_data else dict(),
+                progress_callback=progress_callback)
+            request_headers = {CONTENT_TYPE: data.content_type}
         url = '{base_url}{uri}'.format(base_url=self.base_url, uri=uri)
 
         try:
             ft_session = self.establish_rest_session(headers=headers)
-            response = ft_session.request(
-                method=method, url=url, timeout=timeout_val,
-                stream=download, data=data, files=form_data)
+            if self.session_affinity:
+                # Share the cookie jar so transfers reuse the REST session
+                ft_session.cookies = self.session.cookies
+            response = self._send_request(
+                ft_session, method=method, url=url, timeout=timeout_val,
+                stream=download, data=data, headers=request_headers)
             ft_session.close()
             status_code = response.status_code
             LOG.debug('{method} request to {url} has returned with a status '
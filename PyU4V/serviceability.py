@@ -36,6 +36,8 @@ SERVICEABILITY_LOG_FILENAME = constants.SERVICEABILITY_LOG_FILENAME
 SERVICEABILITY_LOG_RECORD = constants.SERVICEABILITY_LOG_RECORD
 SERVICEABILITY_EXPORT_FILE = constants.SERVICEABILITY_EXPORT_FILE
 BINARY_DATA = constants.BINARY_DATA
+BYTES_DOWNLOADED = constants.BYTES_DOWNLOADED
+SHA256 = constants.SHA256
 SUCCESS = constants.SUCCESS
 SERVICEABILITY_RECORD_PATH = constants.SERVICEABILITY_RECORD_PATH
 SERVICEABILITY_RECORD_TIME = constants.SERVICEABILITY_RECORD_TIME
@@ -114,9 +116,17 @@ class ServiceabilityFunctions(object):
                             return_binary=False,
                             dir_path=None,
                             file_name=None,
-                            timeout=None):
+                            timeout=None,
+                            file_object=None,
+                            progress_callback=None,
+                            resume=False,
+                            checksum=False):
         """Download serviceability logs
 
+        Grab files can be several gigabytes in size so they are streamed to
+        disk or to a supplied file_object in large chunks rather than being
+        held in memory, only return_binary loads the full file into memory.
+
         :param array_id: array serial number -- str
         :param node_name: Node name. Allowable values are Unisphere, Vasa0,
                           Vasa1, Vasadb, Semgmt0, Semgmt1  -- str
@@ -129,6 +139,14 @@ class ServiceabilityFunctions(object):
         :param timeout: timeout, recommend setting a long timeout value as
                         grab file generation can take some time, e.g. 1000
                         -- int
+        :param file_object: writable binary file-like object to stream the
+                            grab files to instead of writing to file -- file
+        :param progress_callback: called with bytes done and total bytes,
+                                  total is None if unknown -- callable
+        :param resume: resume a previously interrupted download to the same
+                       file path -- bool
+        :param checksum: include the SHA-256 of the download in the
+                         response -- bool
         :returns: download details -- dict
         """
         array_id = self.array_id if not array_id else array_id
@@ -138,23 +156,34 @@ class ServiceabilityFunctions(object):
             file_name = {SERVICEABILITY_LOG_FILENAME_TEMPLATE}
 
         req_body = {'node_name': node_name}
-
-        response = self.common.download_file(
-            target_uri=f"/{self.version}/serviceability/symmetrix/{array_id}"
-                       f"/export",
-            resource_type=None, payload=req_body, timeout=timeout)
+        target_uri = (f"/{self.version}/serviceability/symmetrix/{array_id}"
+                      f"/export")
 
         return_dict = dict()
 
         # Return binary data, do not write to file
         if return_binary:
+            response = self.common.download_file(
+                target_uri=target_uri, resource_type=None, payload=req_body,
+                timeout=timeout)
             return_dict[BINARY_DATA] = response.content
-        # Write to file
+        # Stream to file or file-like object
         else:
-            file_path = file_handler.write_binary_data_to_file(
-                data=response, file_extension='.tar.gz', file_name=file_name,
-                dir_path=dir_path)
-            return_dict[SERVICEABILITY_RECORD_PATH] = file_path
+            file_path = None
+            if file_object is None:
+                file_path = file_handler.get_file_write_path(
+                    file_extension='.tar.gz', file_name=file_name,
+                    dir_path=dir_path)
+            details = self.common.stream_download(
+                file_path=file_path, file_object=file_object, resume=resume,
+                checksum=checksum, progress_callback=progress_callback,
+                target_uri=target_uri, resource_type=None, payload=req_body,
+                timeout=timeout)
+            if file_path:
+                return_dict[SERVICEABILITY_RECORD_PATH] = file_path
+            return_dict[BYTES_DOWNLOADED] = details[BYTES_DOWNLOADED]
+            if checksum:
+                return_dict[SHA256] = details[SHA256]
 
         return_dict[SUCCESS] = True
         return_dict[SERVICEABILITY_RECORD_TIME] = date_time
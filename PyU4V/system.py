@@ -72,6 +72,7 @@ AUDIT_LOG_RECORD = constants.AUDIT_LOG_RECORD
 COUNT = constants.COUNT
 AUDIT_LOG_FILENAME = constants.AUDIT_LOG_FILENAME
 BINARY_DATA = constants.BINARY_DATA
+BYTES_DOWNLOADED = constants.BYTES_DOWNLOADED
 AUDIT_RECORD_PATH = constants.AUDIT_RECORD_PATH
 SUCCESS = constants.SUCCESS
 AUDIT_RECORD_TIME = constants.AUDIT_RECORD_TIME
@@ -333,13 +334,15 @@ class SystemFunctions(object):
 
     def _download_settings(
             self, request_body, file_name=None, dir_path=None,
-            return_binary=False):
+            return_binary=False, file_object=None):
         """Download settings helper method.
 
         :param request_body: payload request body -- dict
         :param file_name: zip file name -- str
         :param dir_path: file save location -- str
         :param return_binary: return settings binary data -- bool
+        :param file_object: writable binary file-like object to stream the
+                            settings to instead of writing to file -- file
         :returns: export details -- dict
         """
         date_time = datetime.fromtimestamp(time.time())
@@ -350,12 +353,24 @@ class SystemFunctions(object):
                 d=date_time.strftime(STR_TIME_FORMAT),
                 e=ZIP_SUFFIX)
 
+        return_dict = {'success': False}
+
+        # Stream to file-like object
+        if file_object is not None:
+            details = self.common.stream_download(
+                file_object=file_object, category=SYSTEM,
+                resource_level=SETTINGS, resource_type=EXPORT_FILE,
+                payload=request_body)
+            return_dict[BYTES_DOWNLOADED] = details[BYTES_DOWNLOADED]
+            return_dict['success'] = True
+            return_dict['settings_time'] = date_time
+            LOG.info('The settings download request was successful.')
+            return return_dict
+
         response = self.common.download_file(
             category=SYSTEM, resource_level=SETTINGS,
             resource_type=EXPORT_FILE, payload=request_body)
 
-        return_dict = {'success': False}
-
         if response:
             # Return binary data, do not write to file
             if return_binary:
@@ -375,7 +390,7 @@ class SystemFunctions(object):
 
     def download_all_settings(
             self, file_password, dir_path=None, file_name=None, array_id=None,
-            return_binary=False):
+            return_binary=False, file_object=None):
         """Download all settings.
 
         Export settings feature allows the saving of a subset of system
@@ -415,6 +430,8 @@ class SystemFunctions(object):
         :param file_name: zip file name -- str
         :param array_id: array id -- str
         :param return_binary: return settings binary data -- bool
+        :param file_object: writable binary file-like object to stream the
+                            settings to instead of writing to file -- file
         :returns: download details -- dict
         """
         array_id = self.array_id if not array_id else array_id
@@ -422,14 +439,15 @@ class SystemFunctions(object):
                         SRC_ARRAY: array_id}
         return self._download_settings(
             request_body=request_body, dir_path=dir_path,
-            file_name=file_name, return_binary=return_binary)
+            file_name=file_name, return_binary=return_binary,
+            file_object=file_object)
 
     def download_unisphere_settings(
             self, file_password, dir_path=None, file_name=None,
             return_binary=False, exclude_alert_notification_settings=False,
             exclude_performance_preference_settings=False,
             exclude_performance_user_templates=False,
-            exclude_performance_metric_settings=False):
+            exclude_performance_metric_settings=False, file_object=None):
         """Download Unisphere settings.
 
         - Unisphere settings:
@@ -452,6 +470,8 @@ class SystemFunctions(object):
         :param dir_path: file save location -- str
         :param file_name: zip file name -- str
         :param return_binary: return settings binary data -- bool
+        :param file_object: writable binary file-like object to stream the
+                            settings to instead of writing to file -- file
         :param exclude_alert_notification_settings: exclude alert notification
                                                     settings -- bool
         :param exclude_performance_preference_settings: exclude performance
@@ -490,14 +510,15 @@ class SystemFunctions(object):
 
         return self._download_settings(
             request_body=request_body, dir_path=dir_path,
-            file_name=file_name, return_binary=return_binary)
+            file_name=file_name, return_binary=return_binary,
+            file_object=file_object)
 
     def download_system_settings(
             self, file_password, dir_path=None, file_name=None, array_id=None,
             return_binary=False, exclude_alert_policy_settings=False,
             alert_level_notification_settings=False,
             exclude_system_threshold_settings=False,
-            exclude_performance_threshold_settings=False):
+            exclude_performance_threshold_settings=False, file_object=None):
         """Export System settings.
 
         - System settings:
@@ -521,6 +542,8 @@ class SystemFunctions(object):
         :param file_name: zip file name -- str
         :param array_id: array id -- str
         :param return_binary: return settings binary data -- bool
+        :param file_object: writable binary file-like object to stream the
+                            settings to instead of writing to file -- file
         :param exclude_alert_policy_settings: exclude alert policy settings
                                               -- bool
         :param alert_level_notification_settings: exclude alert level
@@ -560,10 +583,11 @@ class SystemFunctions(object):
 
         return self._download_settings(
             request_body=request_body, dir_path=dir_path,
-            file_name=file_name, return_binary=return_binary)
+            file_name=file_name, return_binary=return_binary,
+            file_object=file_object)
 
     def upload_settings(self, file_password, file_path=None, array_id=None,
-                        binary_data=None):
+                        binary_data=None, progress_callback=None):
         """Upload Unisphere and/or system settings to Unisphere.
 
         Allows for importing a zip file or binary data that contains settings
@@ -591,10 +615,15 @@ class SystemFunctions(object):
         do so pass a list of array IDs in to array_id input parameter. For
         Unisphere settings an array ID is not required.
 
+        Files are streamed to Unisphere in chunks rather than read into
+        memory, progress_callback can be used to monitor large uploads.
+
         :param file_password: password that file has been signed with -- str
         :param file_path: full file location -- str
         :param array_id: array id -- str
         :param binary_data: binary settings data -- bytes
+        :param progress_callback: called with bytes sent and total bytes
+                                  -- callable
         :returns: upload details -- dict
         """
         # Work around: We need to provide the array ID for all upload requests
@@ -629,7 +658,8 @@ class SystemFunctions(object):
 
         return self.common.upload_file(
             category=SYSTEM, resource_level=SETTINGS,
-            resource_type=IMPORT_FILE, form_data=form_data)
+            resource_type=IMPORT_FILE, form_data=form_data,
+            progress_callback=progress_callback)
 
     def get_audit_log_list(
             self, start_time, end_time, array_id=None, user_name=None,
@@ -801,7 +831,8 @@ class SystemFunctions(object):
         return response if response else dict()
 
     def download_audit_log_record(self, array_id=None, return_binary=False,
-                                  dir_path=None, file_name=None, timeout=None):
+                                  dir_path=None, file_name=None, timeout=None,
+                                  file_object=None):
         """Download audit log record for the last week in PDF
 
         :param array_id: array serial number -- str
@@ -810,6 +841,9 @@ class SystemFunctions(object):
         :param dir_path: file write directory path -- str
         :param file_name: file name -- str
         :param timeout: timeout -- int
+        :param file_object: writable binary file-like object to stream the
+                            audit log record to instead of writing to file or
+                            returning binary data -- file
         :returns: download details -- dict
         """
         array_id = self.array_id if not array_id else array_id
@@ -822,24 +856,31 @@ class SystemFunctions(object):
                 e=PDF_SUFFIX)
 
         req_body = {AUDIT_LOG_FILENAME: file_name}
-
-        response = self.common.download_file(
-            category=SYSTEM,
-            resource_level=SYMMETRIX, resource_level_id=array_id,
-            resource_type=AUDIT_LOG_RECORD,
-            resource=EXPORT_FILE, payload=req_body, timeout=timeout)
-
         return_dict = dict()
 
-        # Return binary data, do not write to file
-        if return_binary:
-            return_dict[BINARY_DATA] = response.content
-        # Write to file
+        # Stream to file-like object
+        if file_object is not None:
+            details = self.common.stream_download(
+                file_object=file_object, category=SYSTEM,
+                resource_level=SYMMETRIX, resource_level_id=array_id,
+                resource_type=AUDIT_LOG_RECORD,
+                resource=EXPORT_FILE, payload=req_body, timeout=timeout)
+            return_dict[BYTES_DOWNLOADED] = details[BYTES_DOWNLOADED]
         else:
-            file_path = file_handler.write_binary_data_to_file(
-                data=response, file_extension=PDF_SUFFIX, file_name=file_name,
-                dir_path=dir_path)
-            return_dict[AUDIT_RECORD_PATH] = file_path
+            response = self.common.download_file(
+                category=SYSTEM,
+                resource_level=SYMMETRIX, resource_level_id=array_id,
+                resource_type=AUDIT_LOG_RECORD,
+                resource=EXPORT_FILE, payload=req_body, timeout=timeout)
+            # Return binary data, do not write to file
+            if return_binary:
+                return_dict[BINARY_DATA] = response.content
+            # Write to file
+            else:
+                file_path = file_handler.write_binary_data_to_file(
+                    data=response, file_extension=PDF_SUFFIX,
+                    file_name=file_name, dir_path=dir_path)
+                return_dict[AUDIT_RECORD_PATH] = file_path
 
         return_dict[SUCCESS] = True
         return_dict[AUDIT_RECORD_TIME] = date_time
@@ -856,11 +897,16 @@ class SystemFunctions(object):
         """
         array_id = array_id if array_id else self.array_id
 
-        response = self.common.get_resource(
-            category=SYSTEM,
-            resource_level=SYMMETRIX, resource_level_id=array_id,
-            resource_type=DIRECTOR)
-        dir_list = response.get('directorId', list()) if response else list()
+        def _get_directors():
+            response = self.common.get_resource(
+                category=SYSTEM,
+                resource_level=SYMMETRIX, resource_level_id=array_id,
+                resource_type=DIRECTOR)
+            return response.get(
+                'directorId', list()) if response else list()
+
+        dir_list = self.common.get_static_metadata(
+            'director_list', _get_directors, array_id=array_id)
         response_dir_list = list()
         if not self.is_v4:
             for director in dir_list:
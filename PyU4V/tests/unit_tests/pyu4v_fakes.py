@@ -30,9 +30,10 @@ class FakeResponse(object):
     """Fake response."""
 
     def __init__(self, status_code, return_object, raw_reason=None, text=None,
-                 content=None):
+                 content=None, headers=None):
         """__init__."""
         self.status_code = status_code
+        self.headers = headers if headers else dict()
         self.return_object = return_object
         self.raw = mock.MagicMock()
         self.raw.reason = raw_reason
@@ -48,7 +49,8 @@ class FakeResponse(object):
 
     def iter_content(self, chunk_size):
         if self.content:
-            return [self.content]
+            return [self.content[i:i + chunk_size] for i in range(
+                0, len(self.content), chunk_size)]
         else:
             return [self.return_object]
 
@@ -62,7 +64,7 @@ class FakeRequestsSession(object):
         self.p_data = PerformanceData()
 
     def request(self, method, url, params=None, data=None, timeout=None,
-                stream=None, files=None):
+                stream=None, files=None, headers=None):
         """request."""
         return_object = ''
         status_code = 200
@@ -0,0 +1,158 @@
+# Copyright (c) 2025 Dell Inc. or its subsidiaries.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""test_pyu4v_capacity_forecast.py."""
+
+import os
+import shutil
+import tempfile
+import testtools
+import time
+
+from unittest import mock
+
+from PyU4V import capacity_forecast as cf
+from PyU4V import performance_history
+from PyU4V.tests.unit_tests import pyu4v_performance_data as pd
+from PyU4V.utils import exception
+from PyU4V.utils import metadata_store
+from PyU4V.utils import performance_constants as pc
+
+
+class PyU4VCapacityForecastTest(testtools.TestCase):
+    """Test cached days to full and capacity projections."""
+
+    def setUp(self):
+        """setUp."""
+        super(PyU4VCapacityForecastTest, self).setUp()
+        self.p_data = pd.PerformanceData()
+        self.days_to_full = self.p_data.days_to_full_resp[
+            pc.DAYS_TO_FULL_RESULT]
+        self.performance = mock.Mock(array_id=self.p_data.array,
+                                     history_store=None)
+        self.performance.common.metadata_store = None
+        self.performance.get_days_to_full.return_value = self.days_to_full
+        self.forecaster = cf.CapacityForecaster(self.performance)
+        self.day = 20000 * pc.ONE_DAY
+
+    def test_linear_projection(self):
+        """Test linear projections from a growing series."""
+        timestamps = [self.day + i * pc.ONE_DAY for i in range(10)]
+        values = [10.0 + 2 * i for i in range(10)]
+        self.assertAlmostEqual(
+            41.0, cf.linear_projection(timestamps, values, 110.0))
+        self.assertEqual(0.0, cf.linear_projection(timestamps, values, 20.0))
+        self.assertIsNone(cf.linear_projection(
+            timestamps, list(reversed(values)), 110.0))
+        self.assertIsNone(cf.linear_projection(list(), list(), 110.0))
+
+    def test_seasonal_projection(self):
+        """Test the weekly pattern is added to the trend."""
+        timestamps = [self.day + i * pc.ONE_DAY for i in range(28)]
+        # Usage grows by one a day with a peak of 5 every seventh day
+        values = [float(i) + (5.0 if i % 7 == 6 else 0.0)
+                  for i in range(28)]
+        linear = cf.linear_projection(timestamps, values, 37.0)
+        seasonal = cf.seasonal_projection(timestamps, values, 37.0)
+        self.assertEqual(7.0, seasonal)
+        self.assertGreater(linear, seasonal)
+        self.assertIsNone(cf.seasonal_projection(
+            timestamps, values, 37.0, horizon=5))
+        self.assertAlmostEqual(
+            cf.linear_projection(timestamps[:7], values[:7], 37.0),
+            cf.seasonal_projection(timestamps[:7], values[:7], 37.0))
+
+    def test_get_days_to_full_cached(self):
+        """Test days to full is requested once per ttl."""
+        with mock.patch.object(time, 'time', return_value=1000):
+            self.assertEqual(self.days_to_full,
+                             self.forecaster.get_days_to_full(pc.SRP))
+            self.forecaster.get_days_to_full(pc.SRP)
+        self.performance.get_days_to_full.assert_called_once_with(
+            array_id=self.p_data.array, array_to_full=False,
+            srp_to_full=True, thin_pool_to_full=False)
+        with mock.patch.object(time, 'time',
+                               return_value=1000 + pc.DAYS_TO_FULL_TTL):
+            self.forecaster.get_days_to_full(pc.SRP)
+        self.assertEqual(2, self.performance.get_days_to_full.call_count)
+        self.forecaster.get_days_to_full(pc.SRP, refresh=True)
+        self.assertEqual(3, self.performance.get_days_to_full.call_count)
+        self.assertRaises(exception.InvalidInputException,
+                          self.forecaster.get_days_to_full, pc.SG)
+
+    def test_get_fleet_days_to_full(self):
+        """Test expired entries are requested concurrently."""
+        self.forecaster.get_days_to_full(pc.ARRAY, array_id='000111111111')
+
+        def _get_days_to_full(array_id, array_to_full, srp_to_full,
+                              thin_pool_to_full):
+            if array_id == '000222222222' and thin_pool_to_full:
+                raise exception.VolumeBackendAPIException(data='')
+            return self.days_to_full
+
+        self.performance.get_days_to_full.side_effect = _get_days_to_full
+        response = self.forecaster.get_fleet_days_to_full(
+            ['000111111111', '000222222222'])
+        self.assertEqual(cf.DAYS_TO_FULL_CATEGORIES,
+                         list(response['000111111111'].keys()))
+        self.assertEqual([pc.ARRAY, pc.SRP],
+                         list(response['000222222222'].keys()))
+        self.assertEqual(6, self.performance.get_days_to_full.call_count)
+        self.forecaster.invalidate('000111111111')
+        self.forecaster.get_fleet_days_to_full(
+            ['000111111111', '000222222222'], categories=[pc.ARRAY])
+        self.assertEqual(7, self.performance.get_days_to_full.call_count)
+
+    def test_days_to_full_metadata_store(self):
+        """Test days to full is shared through the metadata store."""
+        store_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, store_dir)
+        self.performance.common.metadata_store = (
+            metadata_store.MetadataStore(os.path.join(store_dir, 'meta.db')))
+        self.forecaster.get_days_to_full(pc.THIN_POOL)
+        forecaster = cf.CapacityForecaster(self.performance)
+        self.assertEqual(self.days_to_full,
+                         forecaster.get_days_to_full(pc.THIN_POOL))
+        self.performance.get_days_to_full.assert_called_once()
+        forecaster.invalidate()
+        cf.CapacityForecaster(self.performance).get_days_to_full(
+            pc.THIN_POOL)
+        self.assertEqual(2, self.performance.get_days_to_full.call_count)
+
+    def test_forecast_from_history(self):
+        """Test projections from daily capacity history."""
+        store_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, store_dir)
+        history_store = performance_history.PerformanceHistoryStore(
+            os.path.join(store_dir, 'history.db'))
+        history_store.add_object_results(self.p_data.array, pc.SRP, {
+            'SRP_1': [{pc.TIMESTAMP: self.day + i * pc.ONE_DAY,
+                       'UsedCapacity': 10.0 + 2 * i,
+                       'TotalManagedSpace': 110.0} for i in range(10)]})
+        self.assertRaises(exception.InvalidInputException,
+                          self.forecaster.forecast, pc.SRP, 'UsedCapacity',
+                          'TotalManagedSpace')
+        forecaster = cf.CapacityForecaster(
+            self.performance, history_store=history_store)
+        response = forecaster.forecast(
+            pc.SRP, 'UsedCapacity', 'TotalManagedSpace')
+        self.assertAlmostEqual(41.0, response['SRP_1']['days_to_full'])
+        self.assertEqual(
+            (28.0, 110.0), (response['SRP_1']['UsedCapacity'],
+                            response['SRP_1']['TotalManagedSpace']))
+        self.assertEqual(dict(), forecaster.forecast(
+            pc.SRP, 'UsedCapacity', 'TotalManagedSpace',
+            array_id='000222222222', method=cf.SEASONAL))
+        self.assertRaises(exception.InvalidInputException,
+                          forecaster.forecast, pc.SRP, 'UsedCapacity',
+                          'TotalManagedSpace', method='arima')
@@ -13,6 +13,12 @@
 # limitations under the License.
 """test_pyu4v_common.py."""
 
+import hashlib
+import io
+import os
+import requests.exceptions as r_exc
+import shutil
+import tempfile
 import testtools
 import time
 
@@ -302,6 +308,169 @@ class PyU4VCommonTest(testtools.TestCase):
         temp_uri_9 = '/performance/Array/keys'
         self.assertEqual(temp_uri_9, built_uri_9)
 
+    def test_stream_download_file_path(self):
+        """Test stream_download writes via a part file with checksum."""
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        file_path = os.path.join(tmp_dir, 'grab.tar.gz')
+        response = pf.FakeResponse(
+            200, dict(), content=b'test_binary_data',
+            headers={constants.CONTENT_LENGTH: '16'})
+        progress = mock.MagicMock()
+        with mock.patch.object(
+                self.common, 'download_file',
+                return_value=response) as mck_dl:
+            details = self.common.stream_download(
+                file_path=file_path, checksum=True, chunk_size=4,
+                progress_callback=progress, target_uri='/fake')
+            mck_dl.assert_called_once_with(range_start=0, target_uri='/fake')
+        progress.assert_called_with(16, 16)
+        self.assertEqual(16, details[constants.BYTES_DOWNLOADED])
+        self.assertEqual(hashlib.sha256(b'test_binary_data').hexdigest(),
+                         details[constants.SHA256])
+        self.assertFalse(os.path.exists(
+            file_path + constants.DOWNLOAD_PART_SUFFIX))
+        with open(file_path, 'rb') as fd:
+            self.assertEqual(b'test_binary_data', fd.read())
+
+    def test_stream_download_resume_part_file(self):
+        """Test stream_download resumes an existing part file."""
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        file_path = os.path.join(tmp_dir, 'grab.tar.gz')
+        with open(file_path + constants.DOWNLOAD_PART_SUFFIX, 'wb') as fd:
+            fd.write(b'test_')
+        response = pf.FakeResponse(206, dict(), content=b'binary_data')
+        with mock.patch.object(
+                self.common, 'download_file',
+                return_value=response) as mck_dl:
+            details = self.common.stream_download(
+                file_path=file_path, resume=True, checksum=True)
+            mck_dl.assert_called_once_with(range_start=5)
+        self.assertEqual(hashlib.sha256(b'test_binary_data').hexdigest(),
+                         details[constants.SHA256])
+        with open(file_path, 'rb') as fd:
+            self.assertEqual(b'test_binary_data', fd.read())
+
+    def test_stream_download_resume_range_unsupported(self):
+        """Test stream_download restarts if the range is ignored."""
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        file_path = os.path.join(tmp_dir, 'grab.tar.gz')
+        with open(file_path + constants.DOWNLOAD_PART_SUFFIX, 'wb') as fd:
+            fd.write(b'stale')
+        response = pf.FakeResponse(200, dict(), content=b'test_binary_data')
+        with mock.patch.object(
+                self.common, 'download_file', return_value=response):
+            details = self.common.stream_download(
+                file_path=file_path, resume=True)
+        self.assertEqual(16, details[constants.BYTES_DOWNLOADED])
+        with open(file_path, 'rb') as fd:
+            self.assertEqual(b'test_binary_data', fd.read())
+
+    def test_stream_download_retry_interrupted(self):
+        """Test stream_download resumes after a dropped connection."""
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        file_path = os.path.join(tmp_dir, 'grab.tar.gz')
+
+        def _interrupted(chunk_size):
+            yield b'test_'
+            raise r_exc.ChunkedEncodingError
+
+        interrupted = pf.FakeResponse(200, dict())
+        interrupted.iter_content = _interrupted
+        remainder = pf.FakeResponse(206, dict(), content=b'binary_data')
+        with mock.patch.object(
+                self.common, 'download_file',
+                side_effect=[interrupted, remainder]) as mck_dl:
+            details = self.common.stream_download(
+                file_path=file_path, resume=True, checksum=True)
+            self.assertEqual(
+                [mock.call(range_start=0), mock.call(range_start=5)],
+                mck_dl.call_args_list)
+        self.assertEqual(hashlib.sha256(b'test_binary_data').hexdigest(),
+                         details[constants.SHA256])
+        with open(file_path, 'rb') as fd:
+            self.assertEqual(b'test_binary_data', fd.read())
+
+    def test_stream_download_interrupted_no_resume(self):
+        """Test stream_download raises on a dropped connection."""
+        def _interrupted(chunk_size):
+            raise r_exc.ChunkedEncodingError
+            yield
+
+        interrupted = pf.FakeResponse(200, dict())
+        interrupted.iter_content = _interrupted
+        with mock.patch.object(
+                self.common, 'download_file', return_value=interrupted):
+            self.assertRaises(
+                r_exc.ChunkedEncodingError, self.common.stream_download,
+                file_object=io.BytesIO())
+
+    def test_stream_download_file_object(self):
+        """Test stream_download to a file-like object."""
+        file_object = io.BytesIO()
+        with mock.patch.object(
+                self.common, 'download_file',
+                return_value=pf.FakeResponse(
+                    200, dict(), content=b'test_binary_data')):
+            details = self.common.stream_download(file_object=file_object)
+        self.assertEqual(b'test_binary_data', file_object.getvalue())
+        self.assertIsNone(details['file_path'])
+        self.assertIsNone(details[constants.SHA256])
+
+    def test_stream_download_invalid_target(self):
+        """Test stream_download requires exactly one target."""
+        self.assertRaises(exception.InvalidInputException,
+                          self.common.stream_download)
+        self.assertRaises(exception.InvalidInputException,
+                          self.common.stream_download, file_path='/fake',
+                          file_object=io.BytesIO())
+
+    def test_build_uri_template_cached(self):
+        """Test _build_uri reuses compiled route templates."""
+        common._compile_uri_template.cache_clear()
+        for sg_name in [self.data.storagegroup_name,
+                        self.data.storagegroup_name_1]:
+            built_uri = self.common._build_uri(
+                category=SLOPROVISIONING, resource_level=SYMMETRIX,
+                resource_level_id=self.data.array,
+                resource_type='storagegroup', resource_type_id=sg_name)
+            self.assertEqual(
+                '/{ver}/sloprovisioning/symmetrix/{arr}/storagegroup/'
+                '{sg}'.format(ver=UNISPHERE_VERSION, arr=self.data.array,
+                              sg=sg_name), built_uri)
+        cache_info = common._compile_uri_template.cache_info()
+        self.assertEqual(1, cache_info.misses)
+        self.assertEqual(1, cache_info.hits)
+
+    def test_build_uri_ids_without_resource(self):
+        """Test _build_uri ignores ids when their resource is not set."""
+        built_uri = self.common._build_uri(
+            category=SLOPROVISIONING, resource_level=SYMMETRIX,
+            resource_type_id='ignored', resource_id='ignored',
+            object_type_id='ignored')
+        self.assertEqual('/{ver}/sloprovisioning/symmetrix'.format(
+            ver=UNISPHERE_VERSION), built_uri)
+
+    def test_build_uri_escapes_braces(self):
+        """Test _build_uri static segments containing braces."""
+        built_uri = self.common._build_uri(
+            category='performance', resource_level='{odd}',
+            resource_level_id='{id}')
+        self.assertEqual('/performance/{odd}/{id}', built_uri)
+
+    def test_resource_target_uri_skips_build(self):
+        """Test resource calls with target_uri do not build a URI."""
+        with mock.patch.object(self.common, '_build_uri') as mck_build:
+            self.common.get_resource(
+                target_uri='/version', resource_level='version')
+            self.common.create_resource(target_uri='/fake/uri')
+            self.common.modify_resource(target_uri='/fake/uri')
+            self.common.delete_resource(target_uri='/fake/uri')
+            mck_build.assert_not_called()
+
     def test_get_request(self):
         """Test get_request."""
         message = self.common.get_request('/version', resource_type='version')
@@ -0,0 +1,200 @@
+# Copyright (c) 2025 Dell Inc. or its subsidiaries.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""test_pyu4v_exporter.py."""
+
+import testtools
+import threading
+import time
+import urllib.request
+
+from unittest import mock
+
+from PyU4V import exporter
+from PyU4V.utils import exception
+from PyU4V.utils import performance_constants as pc
+
+
+class PyU4VExporterTest(testtools.TestCase):
+    """Test the Prometheus exporter."""
+
+    def setUp(self):
+        """setUp."""
+        super(PyU4VExporterTest, self).setUp()
+        self.conn = mock.Mock(array_id='000111111111')
+        self.conn.performance.collect_stats.return_value = {pc.RESULT: {
+            'sg_1': [{pc.TIMESTAMP: 1, 'HostIOs': 1.0},
+                     {pc.TIMESTAMP: 2, 'HostIOs': 2.0, 'Name': 'x'}],
+            'sg_2': []}}
+        self.conn.performance_enhanced.get_category_metrics.return_value = {
+            'id': pc.ARRAY, 'metric_instances': [
+                {'id': '000111111111', pc.METRICS: [
+                    {pc.TIMESTAMP: 3, 'HostIOs': 5, 'HostMBs': 6.5}]}]}
+        self.conn.real_time.get_performance_data.return_value = {
+            pc.RESULT: [{pc.TIMESTAMP: 4, 'HostIOs': 7.0}]}
+        self.conn.real_time.get_category_keys.return_value = ['1', '2']
+
+    def test_parse_collection(self):
+        """Test parse_collection."""
+        self.assertEqual(
+            exporter.Collection(exporter.DIAGNOSTIC, pc.SG, 'KPI'),
+            exporter.parse_collection('diagnostic:StorageGroup:KPI'))
+        self.assertEqual(
+            exporter.Collection(exporter.REAL_TIME, pc.ARRAY,
+                                ['HostIOs', 'HostMBs']),
+            exporter.parse_collection('real_time:Array:HostIOs,HostMBs'))
+        self.assertIsNone(
+            exporter.parse_collection('enhanced:Array').metrics)
+        for spec in ['Array', 'unknown:Array', 'enhanced:', 'a:b:c:d']:
+            self.assertRaises(exception.InvalidInputException,
+                              exporter.parse_collection, spec)
+
+    def test_format_sample(self):
+        """Test metric names and label escaping."""
+        self.assertEqual('pyu4v_storage_group_host_ios',
+                         exporter.get_metric_name(pc.SG, 'HostIOs'))
+        self.assertEqual(
+            'm{a="x\\"y",b="1"} 2.5 1000',
+            exporter.format_sample('m', {'b': 1, 'a': 'x"y'}, 2.5, 1000))
+
+    def test_collect_array(self):
+        """Test the latest numeric sample of each object is exported."""
+        performance_exporter = exporter.PerformanceExporter(
+            self.conn, collection_list=[
+                exporter.Collection(exporter.DIAGNOSTIC, pc.SG),
+                exporter.Collection(exporter.ENHANCED, pc.ARRAY, ['HostIOs']),
+                exporter.Collection(exporter.REAL_TIME, 'FEDirector')])
+        samples = performance_exporter.collect_array('000111111111')
+        self.assertEqual(
+            ['pyu4v_storage_group_host_ios{array="000111111111",id="sg_1",'
+             'source="diagnostic"} 2.0'],
+            samples['pyu4v_storage_group_host_ios'])
+        self.assertNotIn('pyu4v_array_host_mbs', samples)
+        self.assertEqual(1, len(samples['pyu4v_array_host_ios']))
+        self.assertEqual(2, len(samples['pyu4v_fe_director_host_ios']))
+        self.conn.performance.collect_stats.assert_called_once_with(
+            pc.SG, object_ids=None, metrics=pc.KPI, array_id='000111111111')
+        performance_exporter.collect_array('000111111111')
+        self.conn.real_time.get_category_keys.assert_called_once()
+
+    def test_collect_real_time_concurrent(self):
+        """Test real-time instances are requested concurrently in order."""
+        self.conn.real_time.get_category_keys.return_value = [
+            str(i) for i in range(4)]
+        barrier = threading.Barrier(4, timeout=5)
+
+        def _get_performance_data(*args, **kwargs):
+            barrier.wait()
+            return {pc.RESULT: [{pc.TIMESTAMP: 4, 'HostIOs': float(
+                kwargs['instance_id'])}]}
+
+        self.conn.real_time.get_performance_data.side_effect = (
+            _get_performance_data)
+        performance_exporter = exporter.PerformanceExporter(
+            self.conn, max_workers=4)
+        latest = performance_exporter._collect_real_time(
+            '000111111111', exporter.Collection(exporter.REAL_TIME, 'FEPort'))
+        self.assertEqual(['0', '1', '2', '3'], list(latest.keys()))
+        self.assertEqual(3.0, latest['3']['HostIOs'])
+
+    def test_collect_real_time_instance_failure(self):
+        """Test a failed real-time instance does not fail the array."""
+        def _get_performance_data(*args, **kwargs):
+            if kwargs['instance_id'] == '1':
+                raise exception.ResourceNotFoundException(data='')
+            return {pc.RESULT: [{pc.TIMESTAMP: 4, 'HostIOs': 7.0}]}
+
+        self.conn.real_time.get_performance_data.side_effect = (
+            _get_performance_data)
+        performance_exporter = exporter.PerformanceExporter(
+            self.conn, collection_list=[
+                exporter.Collection(exporter.DIAGNOSTIC, pc.SG),
+                exporter.Collection(exporter.REAL_TIME, 'FEDirector')])
+        samples = performance_exporter.collect_array('000111111111')
+        self.assertEqual(1, len(samples['pyu4v_storage_group_host_ios']))
+        self.assertEqual(
+            ['pyu4v_fe_director_host_ios{array="000111111111",id="2",'
+             'source="real_time"} 7.0'],
+            samples['pyu4v_fe_director_host_ios'])
+        performance_exporter.collect_array('000111111111')
+        self.assertEqual(2,
+                         self.conn.real_time.get_category_keys.call_count)
+
+    def test_real_time_keys_expire(self):
+        """Test real-time instances are listed again after the ttl."""
+        performance_exporter = exporter.PerformanceExporter(
+            self.conn, keys_ttl=60)
+        collection = exporter.Collection(exporter.REAL_TIME, 'FEDirector')
+        with mock.patch.object(time, 'time', return_value=1000.0):
+            performance_exporter._collect_real_time(
+                '000111111111', collection)
+            performance_exporter._collect_real_time(
+                '000111111111', collection)
+        self.conn.real_time.get_category_keys.assert_called_once()
+        self.conn.real_time.get_category_keys.return_value = ['1', '2', '3']
+        with mock.patch.object(time, 'time', return_value=1060.0):
+            latest = performance_exporter._collect_real_time(
+                '000111111111', collection)
+        self.assertEqual(['1', '2', '3'], list(latest.keys()))
+
+    def test_collect_caches_payload(self):
+        """Test render serves the last collection and keeps failed arrays."""
+        performance_exporter = exporter.PerformanceExporter(
+            self.conn, array_ids=['000111111111', '000222222222'],
+            timestamps=True)
+        self.conn.performance.collect_stats.return_value = {pc.RESULT: {
+            '000111111111': [{pc.TIMESTAMP: 300000, 'HostIOs': 1.0}]}}
+        self.assertEqual(b'', performance_exporter.render())
+        self.assertEqual([], performance_exporter.collect())
+        payload = performance_exporter.render().decode()
+        self.assertIn('# TYPE pyu4v_array_host_ios gauge\n', payload)
+        self.assertIn('} 1.0 300000\n', payload)
+        self.assertIn('pyu4v_exporter_collection_success{'
+                      'array="000222222222"} 1.0', payload)
+
+        self.conn.performance.collect_stats.side_effect = (
+            exception.VolumeBackendAPIException(data=''))
+        self.assertEqual(['000111111111', '000222222222'],
+                         sorted(performance_exporter.collect()))
+        payload = performance_exporter.render().decode()
+        self.assertIn('} 1.0 300000\n', payload)
+        self.assertIn('pyu4v_exporter_collection_success{'
+                      'array="000222222222"} 0.0', payload)
+
+    def test_server(self):
+        """Test the HTTP server serves the cached payload."""
+        performance_exporter = exporter.PerformanceExporter(self.conn)
+        performance_exporter._payload = b'pyu4v_test{} 1.0\n'
+        server = performance_exporter.get_server('127.0.0.1', 0)
+        self.addCleanup(server.server_close)
+        self.assertIsInstance(server, exporter.MetricsServer)
+        with mock.patch.object(performance_exporter, 'collect') as mck:
+            thread = threading.Thread(target=server.handle_request)
+            thread.start()
+            url = 'http://127.0.0.1:{p}/metrics'.format(
+                p=server.server_address[1])
+            with urllib.request.urlopen(url) as response:
+                self.assertEqual(b'pyu4v_test{} 1.0\n', response.read())
+                self.assertEqual(exporter.CONTENT_TYPE,
+                                 response.headers['Content-Type'])
+            thread.join()
+        mck.assert_not_called()
+
+    def test_run_stops(self):
+        """Test the background thread collects until stopped."""
+        performance_exporter = exporter.PerformanceExporter(
+            self.conn, interval=60)
+        with mock.patch.object(performance_exporter, 'collect') as mck:
+            performance_exporter.start()
+            performance_exporter.stop()
+        mck.assert_called_once()
@@ -0,0 +1,256 @@
+# Copyright (c) 2025 Dell Inc. or its subsidiaries.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""test_pyu4v_metadata_store.py."""
+
+import os
+import shutil
+import tempfile
+import testtools
+import time
+
+from unittest import mock
+
+from PyU4V import rest_requests
+from PyU4V.tests.unit_tests import pyu4v_common_data as pcd
+from PyU4V.tests.unit_tests import pyu4v_fakes as pf
+from PyU4V.tests.unit_tests import pyu4v_performance_data as pd
+from PyU4V import univmax_conn
+from PyU4V.utils import constants
+from PyU4V.utils import metadata_store
+
+
+class PyU4VMetadataStoreTest(testtools.TestCase):
+    """Test persistent metadata store."""
+
+    def setUp(self):
+        """setUp."""
+        super(PyU4VMetadataStoreTest, self).setUp()
+        self.data = pcd.CommonData()
+        self.p_data = pd.PerformanceData()
+        self.store_dir = tempfile.mkdtemp()
+        self.store_path = os.path.join(self.store_dir, 'metadata.db')
+        self.store = metadata_store.MetadataStore(
+            db_path=self.store_path, server='10.0.0.75:8443')
+        self.conf_file, self.conf_dir = (
+            pf.FakeConfigFile.create_fake_config_file())
+        univmax_conn.file_path = self.conf_file
+
+    def tearDown(self):
+        """tearDown."""
+        super(PyU4VMetadataStoreTest, self).tearDown()
+        shutil.rmtree(self.store_dir)
+        pf.FakeConfigFile.delete_fake_config_file(
+            self.conf_file, self.conf_dir)
+
+    def _create_conn(self):
+        with mock.patch.object(
+                rest_requests.RestRequests, 'establish_rest_session',
+                return_value=pf.FakeRequestsSession()):
+            return univmax_conn.U4VConn(
+                array_id=self.p_data.array, metadata_cache=True,
+                metadata_cache_path=self.store_path)
+
+    def test_get_default_store_path(self):
+        """Test get_default_store_path."""
+        path = metadata_store.get_default_store_path()
+        self.assertIn('.PyU4V', path)
+        self.assertTrue(path.endswith('metadata.db'))
+
+    def test_set_get(self):
+        """Test set and get."""
+        self.store.set('categories', ['Array', 'FEPort'], scope='123')
+        self.assertEqual(['Array', 'FEPort'],
+                         self.store.get('categories', scope='123'))
+        self.assertIsNone(self.store.get('categories', scope='456'))
+
+    def test_get_stale(self):
+        """Test get with a fact older than max age."""
+        self.store.set('categories', ['Array'])
+        self.store.max_age = 1
+        with mock.patch('time.time', return_value=4102444800):
+            self.assertIsNone(self.store.get('categories'))
+
+    def test_shared_between_instances(self):
+        """Test facts are visible to another store on the same file."""
+        self.store.set('version_info', {'api_version': '103'})
+        other = metadata_store.MetadataStore(
+            db_path=self.store_path, server='10.0.0.75:8443')
+        self.assertEqual({'api_version': '103'}, other.get('version_info'))
+        other_server = metadata_store.MetadataStore(
+            db_path=self.store_path, server='10.0.0.76:8443')
+        self.assertIsNone(other_server.get('version_info'))
+
+    def test_set_scope_version_array_change(self):
+        """Test array ucode change invalidates only that array."""
+        self.assertFalse(self.store.set_scope_version('6079', scope='123'))
+        self.store.set('directors', ['OR-1C'], scope='123')
+        self.store.set('directors', ['OR-2C'], scope='456')
+        self.assertFalse(self.store.set_scope_version('6079', scope='123'))
+        self.assertEqual(['OR-1C'], self.store.get('directors', scope='123'))
+        self.assertTrue(self.store.set_scope_version('6080', scope='123'))
+        self.assertIsNone(self.store.get('directors', scope='123'))
+        self.assertEqual(['OR-2C'], self.store.get('directors', scope='456'))
+        self.assertEqual('6080', self.store.get_scope_version('123'))
+
+    def test_set_scope_version_unisphere_change(self):
+        """Test Unisphere version change invalidates all scopes."""
+        self.store.set_scope_version('V10.3.0.0')
+        self.store.set('directors', ['OR-1C'], scope='123')
+        self.store.set('version_info', {'api_version': '103'})
+        self.assertTrue(self.store.set_scope_version('V10.3.0.1'))
+        self.assertIsNone(self.store.get('directors', scope='123'))
+        self.assertIsNone(self.store.get('version_info'))
+
+    def test_invalidate_namespace(self):
+        """Test invalidate by namespace."""
+        self.store.set('directors', ['OR-1C'], scope='123')
+        self.store.set('categories', ['Array'], scope='123')
+        self.store.invalidate(scope='123', namespace='directors')
+        self.assertIsNone(self.store.get('directors', scope='123'))
+        self.assertEqual(['Array'], self.store.get('categories', scope='123'))
+
+    def test_get_or_fetch(self):
+        """Test get_or_fetch only fetches once."""
+        fetch = mock.MagicMock(return_value=['Array'])
+        self.assertEqual(['Array'], self.store.get_or_fetch('cats', fetch))
+        self.assertEqual(['Array'], self.store.get_or_fetch('cats', fetch))
+        fetch.assert_called_once()
+
+    def test_get_or_fetch_bool_and_empty(self):
+        """Test get_or_fetch stores booleans but not empty values."""
+        fetch_bool = mock.MagicMock(return_value=False)
+        self.store.get_or_fetch('is_array_v4', fetch_bool, scope='123')
+        self.store.get_or_fetch('is_array_v4', fetch_bool, scope='123')
+        fetch_bool.assert_called_once()
+        fetch_empty = mock.MagicMock(return_value=list())
+        self.store.get_or_fetch('directors', fetch_empty, scope='123')
+        self.store.get_or_fetch('directors', fetch_empty, scope='123')
+        self.assertEqual(2, fetch_empty.call_count)
+
+    def test_conn_disabled_by_default(self):
+        """Test the metadata store is not enabled by default."""
+        with mock.patch.object(
+                rest_requests.RestRequests, 'establish_rest_session',
+                return_value=pf.FakeRequestsSession()):
+            conn = univmax_conn.U4VConn(array_id=self.p_data.array)
+        self.assertIsNone(conn.metadata_store)
+        self.assertIsNone(conn.common.metadata_store)
+
+    def test_conn_records_unisphere_version(self):
+        """Test connection records the Unisphere version scope."""
+        conn = self._create_conn()
+        self.assertIsNotNone(conn.metadata_store)
+        self.assertEqual(self.data.server_version['version'],
+                         conn.metadata_store.get_scope_version())
+
+    def test_performance_categories_cached(self):
+        """Test performance categories are served from the store."""
+        conn = self._create_conn()
+        perf = conn.performance
+        first = perf.get_performance_categories_list()
+        with mock.patch.object(perf, 'get_request') as mck_get:
+            second = perf.get_performance_categories_list()
+            mck_get.assert_not_called()
+        self.assertEqual(first, second)
+
+    def test_performance_categories_cached_across_connections(self):
+        """Test a new connection consults the store populated by another."""
+        conn = self._create_conn()
+        conn.performance.get_performance_categories_list()
+        conn_two = self._create_conn()
+        with mock.patch.object(
+                conn_two.performance, 'get_request') as mck_get:
+            categories = (
+                conn_two.performance.get_performance_categories_list())
+            mck_get.assert_not_called()
+        self.assertEqual(self.p_data.perf_cats['categoryName'], categories)
+
+    def test_performance_metrics_cached(self):
+        """Test performance metrics are cached per category and mode."""
+        conn = self._create_conn()
+        perf = conn.performance
+        perf.get_performance_metrics_list('Array', kpi_only=True)
+        with mock.patch.object(
+                perf, 'get_request',
+                return_value=self.p_data.perf_metrics) as mck_get:
+            perf.get_performance_metrics_list('Array', kpi_only=True)
+            mck_get.assert_not_called()
+            perf.get_performance_metrics_list('Array', kpi_only=False)
+            mck_get.assert_called_once()
+
+    def test_is_array_v4_cached(self):
+        """Test is_array_v4 is served from the store."""
+        conn = self._create_conn()
+        conn.common.is_array_v4(self.p_data.array)
+        with mock.patch.object(conn.common, 'get_array') as mck_get:
+            with mock.patch.object(conn.common, '_is_array_v4') as mck_v4:
+                conn.common.is_array_v4(self.p_data.array)
+                mck_v4.assert_not_called()
+            mck_get.assert_not_called()
+
+    def test_array_scope_version_checked(self):
+        """Test cached array facts are dropped after a ucode change."""
+        conn = self._create_conn()
+        store = conn.metadata_store
+        store.set_scope_version('5978', scope=self.p_data.array)
+        store.set('is_array_v4', False, scope=self.p_data.array)
+        with mock.patch.object(
+                conn.common, 'get_resource',
+                return_value={'ucode': '6079.175.0'}) as mck_get:
+            with mock.patch.object(conn.common, '_is_array_v4',
+                                   return_value=True) as mck_v4:
+                self.assertTrue(conn.common.is_array_v4(self.p_data.array))
+                self.assertTrue(conn.common.is_array_v4(self.p_data.array))
+                mck_v4.assert_called_once()
+            mck_get.assert_called_once()
+        with mock.patch.object(time, 'time', return_value=(
+                time.time() + constants.METADATA_VERSION_INTERVAL)):
+            with mock.patch.object(conn.common, 'get_array') as mck_array:
+                conn.common.is_array_v4(self.p_data.array)
+                mck_array.assert_called_once_with(self.p_data.array)
+
+    def test_get_array_ucode_change_invalidates(self):
+        """Test observing a new ucode invalidates the array scope."""
+        conn = self._create_conn()
+        store = conn.metadata_store
+        store.set_scope_version('5978', scope=self.p_data.array)
+        store.set('director_list', ['OR-1C'], scope=self.p_data.array)
+        with mock.patch.object(
+                conn.common, 'get_resource',
+                return_value={'ucode': '6079.175.0'}):
+            conn.common.get_array(self.p_data.array)
+        self.assertIsNone(
+            store.get('director_list', scope=self.p_data.array))
+
+    def test_enhanced_api_metadata_cached_per_version(self):
+        """Test enhanced API metadata is cached per API version."""
+        conn = self._create_conn()
+        enhanced_api = conn.enhanced_api
+        with mock.patch.object(enhanced_api.common, 'get_request',
+                               return_value={'id': 'v1'}) as mck_get:
+            enhanced_api.get_storage_object_meta_data('volumes')
+            enhanced_api.get_storage_object_meta_data('volumes')
+            mck_get.assert_called_once()
+            enhanced_api.enhanced_api_version = 'v2'
+            enhanced_api.get_storage_object_meta_data('volumes')
+            self.assertEqual(2, mck_get.call_count)
+
+    def test_uni_version_info_cached(self):
+        """Test get_uni_version_info is served from the store."""
+        conn = self._create_conn()
+        first = conn.common.get_uni_version_info()
+        with mock.patch.object(conn.common, 'get_resource') as mck_get:
+            second = conn.common.get_uni_version_info()
+            mck_get.assert_not_called()
+        self.assertEqual(first, second)
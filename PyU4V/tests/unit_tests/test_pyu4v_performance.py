@@ -13,6 +13,7 @@
 # limitations under the License.
 """test_pyu4v_performance.py."""
 
+import copy
 import socket
 import testtools
 import time
@@ -26,6 +27,7 @@ from PyU4V import univmax_conn
 from PyU4V.utils import exception
 from PyU4V.utils import file_handler
 from PyU4V.utils import performance_constants as pc
+from PyU4V.utils import timestamp_index
 
 
 class PyU4VPerformanceTest(testtools.TestCase):
@@ -331,6 +333,57 @@ class PyU4VPerformanceTest(testtools.TestCase):
             self.assertRaises(exception.ResourceNotFoundException,
                               self.perf.get_last_available_timestamp)
 
+    def test_get_last_available_timestamp_index(self):
+        """Test array timestamps are shared until the next refresh."""
+        last = self.p_data.last_date
+        array_keys = {pc.ARRAY_INFO: [
+            {pc.SYMM_ID: self.p_data.array, pc.LA_DATE: last},
+            {pc.SYMM_ID: self.p_data.remote_array, pc.LA_DATE: last + 1}]}
+        index = self.conn.timestamp_index
+        self.assertIs(index, self.perf.common.rest_client.timestamp_index)
+        with mock.patch.object(self.perf, 'get_request',
+                               return_value=array_keys) as mck_get:
+            with mock.patch.object(time, 'time', return_value=1000):
+                self.assertEqual(
+                    last, self.perf.get_last_available_timestamp())
+                self.assertEqual(
+                    last + 1, self.perf.get_last_available_timestamp(
+                        self.p_data.remote_array))
+                self.assertEqual(
+                    (str(self.p_data.first_date), str(last)),
+                    self.perf.format_time_input(
+                        start_time=self.p_data.first_date))
+            self.assertEqual(1, mck_get.call_count)
+            with mock.patch.object(
+                    time, 'time', return_value=index.get_next_refresh(1000)):
+                self.perf.get_last_available_timestamp()
+            self.assertEqual(2, mck_get.call_count)
+
+    def test_get_last_available_timestamp_no_index(self):
+        """Test timestamps are requested every call without an index."""
+        self.perf.common.rest_client.timestamp_index = None
+        with mock.patch.object(self.perf, 'get_request',
+                               return_value=self.p_data.array_keys) as mck_get:
+            self.perf.get_last_available_timestamp()
+            self.perf.get_last_available_timestamp()
+        self.assertEqual(2, mck_get.call_count)
+
+    def test_timestamp_index_schedule(self):
+        """Test refreshes are aligned to the diagnostic interval."""
+        index = timestamp_index.TimestampIndex(interval=300, offset=60)
+        self.assertEqual(60, index.get_next_refresh(0))
+        self.assertEqual(360, index.get_next_refresh(60))
+        self.assertEqual(660, index.get_next_refresh(360))
+        fetch = mock.Mock(side_effect=[None, self.p_data.array_keys,
+                                       self.p_data.array_keys])
+        self.assertIsNone(index.get_array_keys(fetch))
+        self.assertIn(self.p_data.array, index.get_array_keys(fetch))
+        index.get_array_keys(fetch, self.p_data.array)
+        index.get_array_keys(fetch, self.p_data.remote_array)
+        self.assertEqual(3, fetch.call_count)
+        index.invalidate()
+        self.assertRaises(StopIteration, index.get_array_keys, fetch)
+
     def test_is_timestamp_current_true(self):
         """Test is_timestamp_current true condition."""
         two_mins_ago = self.time_now - (pc.ONE_MINUTE * 2)
@@ -568,6 +621,129 @@ class PyU4VPerformanceTest(testtools.TestCase):
             self.assertIsNone(start)
             self.assertIsNone(end)
 
+    def test_extract_timestamp_keys_exact_match(self):
+        """Test extract_timestamp_keys does not match id substrings."""
+        key_list = {pc.SG_INFO: [
+            {pc.SG_ID: 'sg_10', pc.FA_DATE: 1, pc.LA_DATE: 10},
+            {pc.SG_ID: 'sg_1', pc.FA_DATE: 2, pc.LA_DATE: 20},
+            {pc.SG_ID: 'sg_100', pc.FA_DATE: 3, pc.LA_DATE: 30}]}
+        with mock.patch.object(self.perf, 'get_performance_key_list',
+                               return_value=key_list) as mck_keys:
+            self.assertEqual((2, 20), self.perf.extract_timestamp_keys(
+                category=pc.SG, key_tgt_id='sg_1'))
+            self.assertEqual((1, 10), self.perf.extract_timestamp_keys(
+                category=pc.SG, key_tgt_id='sg_10'))
+            self.assertEqual((None, None), self.perf.extract_timestamp_keys(
+                category=pc.SG, key_tgt_id='sg'))
+            mck_keys.assert_called_once()
+
+    def test_extract_timestamp_keys_port_by_director(self):
+        """Test port keys are found by port id and director id."""
+        key_list = {'fePortInfo': [
+            {pc.DIR_ID: 'FA-1D', 'portId': '4', pc.FA_DATE: 1,
+             pc.LA_DATE: 10},
+            {pc.DIR_ID: 'FA-1D', 'portId': '14', pc.FA_DATE: 2,
+             pc.LA_DATE: 20}]}
+        with mock.patch.object(self.perf, 'get_performance_key_list',
+                               return_value=key_list):
+            self.assertEqual((2, 20), self.perf.extract_timestamp_keys(
+                category=pc.FE_PORT, director_id='FA-1D', key_tgt_id='14'))
+            self.assertEqual((1, 10), self.perf.extract_timestamp_keys(
+                category=pc.FE_PORT, director_id='FA-1D', key_tgt_id='FA-1D'))
+            self.assertEqual(
+                ('portId', ['4', '14']),
+                (self.perf.get_object_key_info(
+                    pc.FE_PORT, director_id='FA-1D')[0],
+                 list(self.perf.get_object_key_info(
+                     pc.FE_PORT, director_id='FA-1D')[1].keys())))
+
+    def test_key_index_cache_ttl(self):
+        """Test the key index is kept until a newer sample is available."""
+        last_date = self.p_data.last_date
+        with mock.patch.object(self.perf, 'get_performance_key_list',
+                               return_value=self.p_data.array_keys) as mck:
+            with mock.patch.object(
+                    self.perf, 'get_last_available_timestamp',
+                    side_effect=[last_date, last_date + 5 * pc.ONE_MINUTE]
+            ) as mck_last:
+                with mock.patch.object(time, 'time', return_value=1000):
+                    self.perf.get_object_key_info(pc.ARRAY)
+                    self.perf.extract_timestamp_keys(category=pc.ARRAY)
+                self.assertEqual(1, mck.call_count)
+                mck_last.assert_not_called()
+                with mock.patch.object(
+                        time, 'time', return_value=1000 + pc.KEY_INDEX_TTL):
+                    self.perf.extract_timestamp_keys(category=pc.ARRAY)
+                    self.perf.extract_timestamp_keys(category=pc.ARRAY)
+                self.assertEqual(1, mck.call_count)
+                with mock.patch.object(
+                        time, 'time',
+                        return_value=1000 + 2 * pc.KEY_INDEX_TTL):
+                    self.perf.extract_timestamp_keys(category=pc.ARRAY)
+                self.assertEqual(2, mck.call_count)
+                self.assertEqual(2, mck_last.call_count)
+            self.perf.set_key_index_ttl(0)
+            self.perf.extract_timestamp_keys(category=pc.ARRAY)
+            self.perf.extract_timestamp_keys(category=pc.ARRAY)
+            self.assertEqual(4, mck.call_count)
+
+    def test_get_category_keys_use_key_index(self):
+        """Test get_*_keys functions share the key index until refresh."""
+        sg_keys = {pc.SG_INFO: [
+            {pc.SG_ID: 'sg_1', pc.FA_DATE: self.p_data.first_date,
+             pc.LA_DATE: self.p_data.last_date}]}
+        with mock.patch.object(self.perf, 'get_performance_key_list',
+                               return_value=sg_keys) as mck:
+            self.assertEqual(sg_keys[pc.SG_INFO],
+                             self.perf.get_storage_group_keys())
+            self.perf.get_object_key_info(pc.SG)
+            self.perf.extract_timestamp_keys(
+                category=pc.SG, key_tgt_id='sg_1')
+            self.assertEqual(1, mck.call_count)
+            self.perf.refresh_key_index(category=pc.ARRAY)
+            self.perf.get_storage_group_keys()
+            self.assertEqual(1, mck.call_count)
+            self.perf.refresh_key_index(
+                category=pc.SG, array_id=self.p_data.array)
+            self.perf.get_storage_group_keys()
+            self.assertEqual(2, mck.call_count)
+
+    def test_key_index_metadata_store(self):
+        """Test key lists are shared through the metadata store."""
+        sg_keys = {pc.SG_INFO: [
+            {pc.SG_ID: 'sg_1', pc.FA_DATE: self.p_data.first_date,
+             pc.LA_DATE: self.p_data.last_date}]}
+        store = mock.Mock()
+        store.get.return_value = sg_keys
+        with mock.patch.object(
+                self.perf.common.rest_client, 'metadata_store', store):
+            with mock.patch.object(
+                    self.perf, 'get_last_available_timestamp',
+                    return_value=self.p_data.last_date):
+                with mock.patch.object(
+                        self.perf, 'get_performance_key_list') as mck:
+                    self.perf.get_storage_group_keys()
+                    mck.assert_not_called()
+                    self.perf.refresh_key_index(array_id=self.p_data.array)
+                    store.invalidate.assert_called_once_with(
+                        scope=self.p_data.array,
+                        namespace=pc.KEY_INDEX_NAMESPACE)
+                    store.get.return_value = None
+                    mck.return_value = sg_keys
+                    self.perf.get_storage_group_keys()
+                    mck.assert_called_once()
+        store.set.assert_called_once_with(
+            pc.KEY_INDEX_NAMESPACE, sg_keys, key='StorageGroup/',
+            scope=self.p_data.array)
+
+    def test_get_key_list_timestamp(self):
+        """Test get_key_list_timestamp."""
+        self.assertEqual(self.p_data.last_date,
+                         self.perf.get_key_list_timestamp(
+                             self.p_data.array_keys, self.p_data.array))
+        self.assertIsNone(self.perf.get_key_list_timestamp(
+            self.p_data.array_keys_empty))
+
     def test_format_time_input_no_end_time(self):
         """Test format_time_input no end time specified."""
         five_mins_ago = self.time_now - (pc.ONE_MINUTE * 5)
@@ -757,6 +933,134 @@ class PyU4VPerformanceTest(testtools.TestCase):
                           start_time=self.time_now, end_time=self.time_now,
                           recency=True, data_format='INVALID_FORMAT')
 
+    def test_get_time_slices(self):
+        """Test get_time_slices."""
+        self.assertEqual([(0, 10)], self.perf.get_time_slices(0, 10, 10))
+        self.assertEqual([(0, 10)], self.perf.get_time_slices(0, 10, None))
+        self.assertEqual([(0, 4), (4, 8), (8, 10)],
+                         self.perf.get_time_slices('0', '10', 4))
+
+    def test_merge_time_slice_results(self):
+        """Test merge_time_slice_results orders and dedupes samples."""
+        merged = self.perf.merge_time_slice_results([
+            [{pc.TIMESTAMP: 1, 'v': 'a', 'x': 1.0},
+             {pc.TIMESTAMP: 2, 'v': 'a', 'x': 2.0},
+             {pc.TIMESTAMP: 2, 'v': 'b', 'x': 2.5}],
+            [{pc.TIMESTAMP: 2, 'v': 'a', 'x': 2.0},
+             {pc.TIMESTAMP: 3, 'v': 'a', 'x': 3.0}]])
+        self.assertEqual([1, 2, 2, 3], [m[pc.TIMESTAMP] for m in merged])
+        self.assertEqual(['a', 'b'], [m['v'] for m in merged[1:3]])
+
+    def test_get_performance_stats_sliced(self):
+        """Test get_performance_stats splits long time ranges."""
+        start = self.p_data.last_date - (7 * pc.ONE_DAY)
+        end = self.p_data.last_date
+
+        def _post(**kwargs):
+            payload = kwargs['payload']
+            return {'resultList': {'result': [
+                {pc.TIMESTAMP: int(payload[pc.START_DATE]), 'x': 1.0},
+                {pc.TIMESTAMP: int(payload[pc.END_DATE]), 'x': 1.0}]}}
+
+        with mock.patch.object(
+                self.perf, 'post_request', side_effect=_post) as mck_post:
+            response = self.perf.get_performance_stats(
+                category=pc.ARRAY, metrics=['HostIOs'], start_time=start,
+                end_time=end)
+            self.assertEqual(7, mck_post.call_count)
+            for call in mck_post.call_args_list:
+                payload = call[1]['payload']
+                self.assertTrue(int(payload[pc.END_DATE]) - int(
+                    payload[pc.START_DATE]) <= pc.ONE_DAY)
+        timestamps = [r[pc.TIMESTAMP] for r in response[pc.RESULT]]
+        self.assertEqual(8, len(timestamps))
+        self.assertEqual(sorted(set(timestamps)), timestamps)
+        self.assertEqual(str(start), response[pc.START_DATE_SN])
+        self.assertEqual(str(end), response[pc.END_DATE_SN])
+
+    def test_get_performance_stats_volume_window(self):
+        """Test Volume requests are split into one hour slices."""
+        start = self.p_data.last_date - (3 * pc.ONE_HOUR)
+        with mock.patch.object(
+                self.perf, 'post_request',
+                return_value=self.p_data.perf_metrics_resp) as mck_post:
+            self.perf.get_performance_stats(
+                category=pc.VOLUME, metrics=['HostIOs'], start_time=start,
+                end_time=self.p_data.last_date,
+                request_body={'commaSeparatedStorageGroupList': 'sg'})
+            self.assertEqual(3, mck_post.call_count)
+        with mock.patch.object(
+                self.perf, 'post_request',
+                return_value=self.p_data.perf_metrics_resp) as mck_post:
+            self.perf.get_performance_stats(
+                category=pc.VOLUME, metrics=['HostIOs'], start_time=start,
+                end_time=self.p_data.last_date, max_window=0,
+                request_body={'commaSeparatedStorageGroupList': 'sg'})
+            mck_post.assert_called_once()
+
+    def test_get_object_key_info(self):
+        """Test get_object_key_info."""
+        with mock.patch.object(
+                self.perf, 'get_performance_key_list',
+                return_value=self.p_data.fe_port_keys):
+            id_key, key_info = self.perf.get_object_key_info(
+                pc.FE_PORT, director_id=self.p_data.fe_dir_id)
+        self.assertEqual(pc.PORT_ID, id_key)
+        self.assertEqual([self.p_data.fe_port_id], list(key_info.keys()))
+
+    def test_collect_stats(self):
+        """Test collect_stats resolves keys and timestamps once."""
+        sg_keys = {pc.SG_INFO: [
+            {pc.SG_ID: 'sg_{n}'.format(n=n),
+             pc.FA_DATE: self.p_data.first_date,
+             pc.LA_DATE: self.p_data.last_date} for n in range(5)]}
+        with mock.patch.object(
+                self.perf, 'get_performance_key_list',
+                return_value=sg_keys) as mck_keys, mock.patch.object(
+                self.perf, 'get_last_available_timestamp',
+                return_value=self.p_data.last_date) as mck_last:
+            with mock.patch.object(
+                    self.perf, 'post_request',
+                    return_value=self.p_data.perf_metrics_resp) as mck_post:
+                response = self.perf.collect_stats(
+                    pc.SG, object_ids=['sg_0', 'sg_3', 'missing'],
+                    metrics=['HostIOs'], window=60, max_workers=2)
+            mck_keys.assert_called_once()
+            mck_last.assert_called_once()
+            self.assertEqual(2, mck_post.call_count)
+            payload = mck_post.call_args[1]['payload']
+            self.assertEqual(['HostIOs'], payload[pc.METRICS])
+            self.assertEqual(str(self.p_data.last_date - 60 * pc.ONE_MINUTE),
+                             payload[pc.START_DATE])
+            self.assertEqual(str(self.p_data.last_date), payload[pc.END_DATE])
+        self.assertEqual(['sg_0', 'sg_3'], list(response[pc.RESULT].keys()))
+        self.assertEqual(self.p_data.perf_metrics_resp['resultList'][
+            'result'], response[pc.RESULT]['sg_0'])
+        self.assertIn('missing', response[pc.FAILED])
+        self.assertEqual('storage_group', response[pc.REP_LEVEL])
+
+    def test_collect_stats_all_objects_partial_failure(self):
+        """Test collect_stats collects all objects and reports failures."""
+        def _post(**kwargs):
+            if kwargs['payload'][pc.SG_ID] == 'sg_1':
+                raise exception.VolumeBackendAPIException('failed')
+            return self.p_data.perf_metrics_resp
+
+        sg_keys = {pc.SG_INFO: [
+            {pc.SG_ID: 'sg_{n}'.format(n=n),
+             pc.FA_DATE: self.p_data.first_date,
+             pc.LA_DATE: self.p_data.last_date} for n in range(3)]}
+        with mock.patch.object(
+                self.perf, 'get_performance_key_list', return_value=sg_keys):
+            with mock.patch.object(
+                    self.perf, 'post_request', side_effect=_post):
+                response = self.perf.collect_stats(
+                    pc.SG, metrics=['HostIOs'],
+                    start_time=self.p_data.first_date,
+                    end_time=self.p_data.last_date)
+        self.assertEqual(['sg_0', 'sg_2'], list(response[pc.RESULT].keys()))
+        self.assertEqual(['sg_1'], list(response[pc.FAILED].keys()))
+
     def test_get_days_to_full_array(self):
         """Test get_days_to_full array info."""
         response = self.perf.get_days_to_full(array_id=self.p_data.array,
@@ -866,7 +1170,13 @@ class PyU4VPerformanceTest(testtools.TestCase):
             with mock.patch.object(
                     self.perf, 'update_threshold_settings') as mck_update:
 
-                self.perf.set_thresholds_from_csv('fake_csv_path')
+                response = self.perf.set_thresholds_from_csv(
+                    'fake_csv_path')
+                self.assertEqual(mck_update.call_count, 0)
+                self.assertEqual([(pc.ARRAY, 'ResponseTime')],
+                                 response['unchanged'])
+                self.perf.set_thresholds_from_csv(
+                    'fake_csv_path', only_changed=False)
                 self.assertEqual(mck_update.call_count, 1)
 
     def test_set_thresholds_from_csv_invalid_threshold_values(self):
@@ -895,6 +1205,80 @@ class PyU4VPerformanceTest(testtools.TestCase):
                 self.perf.set_thresholds_from_csv('fake_csv_path')
                 self.assertEqual(mck_update.call_count, 0)
 
+    def test_apply_threshold_settings(self):
+        """Test only changed thresholds are updated."""
+        threshold_settings = [
+            {pc.CATEGORY: pc.ARRAY, pc.METRIC: 'ResponseTime',
+             pc.FIRST_THRESH: '20', pc.SEC_THRESH: 30.0,
+             pc.ALERT_ERR: 'False'},
+            {pc.CATEGORY: pc.ARRAY, pc.METRIC: 'HostMBWritten',
+             pc.FIRST_THRESH: 100, pc.SEC_THRESH: 200},
+            {pc.CATEGORY: pc.ARRAY, pc.METRIC: 'PercentBusy',
+             pc.FIRST_THRESH: 80, pc.SEC_THRESH: 90, pc.ALERT_ERR: True},
+            {pc.CATEGORY: pc.SG, pc.METRIC: 'HostIOs',
+             pc.FIRST_THRESH: 1000, pc.SEC_THRESH: 2000}]
+
+        def _update(metric, **kwargs):
+            if metric == 'PercentBusy':
+                raise exception.VolumeBackendAPIException(data='')
+
+        with mock.patch.object(
+                self.perf, 'get_threshold_category_settings',
+                side_effect=[self.p_data.threshold_settings_resp,
+                             exception.ResourceNotFoundException(data='')]
+        ) as mck_get:
+            with mock.patch.object(self.perf, 'update_threshold_settings',
+                                   side_effect=_update) as mck_update:
+                response = self.perf.apply_threshold_settings(
+                    threshold_settings, max_workers=1)
+        self.assertEqual(2, mck_get.call_count)
+        self.assertEqual([(pc.ARRAY, 'ResponseTime')], response['unchanged'])
+        self.assertEqual([(pc.ARRAY, 'HostMBWritten'), (pc.SG, 'HostIOs')],
+                         response['updated'])
+        self.assertEqual([(pc.ARRAY, 'PercentBusy')],
+                         list(response[pc.FAILED].keys()))
+        mck_update.assert_any_call(
+            category=pc.ARRAY, metric='HostMBWritten', first_threshold=100,
+            second_threshold=200, alert=False,
+            first_threshold_occurrences=pc.THRESH_OCC,
+            first_threshold_samples=pc.THRESH_SAMP,
+            first_threshold_severity=pc.WARN_LVL,
+            second_threshold_occurrences=pc.THRESH_OCC,
+            second_threshold_samples=pc.THRESH_SAMP,
+            second_threshold_severity=pc.CRIT_LVL,
+            include_realtime_trace=False)
+
+    def test_apply_threshold_settings_keeps_realtime_trace(self):
+        """Test the current real-time trace setting is kept."""
+        current = copy.deepcopy(self.p_data.threshold_settings_resp)
+        current[pc.PERF_THRESH][1][pc.RT_TRACE_CRIT] = True
+        with mock.patch.object(self.perf, 'get_threshold_category_settings',
+                               return_value=current):
+            with mock.patch.object(
+                    self.perf, 'update_threshold_settings') as mck_update:
+                self.perf.apply_threshold_settings([
+                    {pc.CATEGORY: pc.ARRAY, pc.METRIC: 'HostMBWritten',
+                     pc.FIRST_THRESH: 100, pc.SEC_THRESH: 200}])
+        self.assertTrue(
+            mck_update.call_args[1]['include_realtime_trace'])
+
+    def test_apply_threshold_settings_rate_limit(self):
+        """Test updates are spaced by the rate limit."""
+        threshold_settings = [
+            {pc.CATEGORY: pc.ARRAY, pc.METRIC: 'metric_{i}'.format(i=i),
+             pc.FIRST_THRESH: 1, pc.SEC_THRESH: 2} for i in range(3)]
+        with mock.patch.object(self.perf, 'update_threshold_settings'):
+            with mock.patch.object(time, 'time', return_value=100.0):
+                with mock.patch.object(time, 'sleep') as mck_sleep:
+                    response = self.perf.apply_threshold_settings(
+                        threshold_settings, only_changed=False,
+                        max_workers=1, rate_limit=2)
+        self.assertEqual(3, len(response['updated']))
+        self.assertEqual([mock.call(0.5), mock.call(1.0)],
+                         mck_sleep.call_args_list)
+        self.assertEqual(dict(), self.perf.apply_threshold_settings(
+            list())[pc.FAILED])
+
     def test_generate_threshold_settings_csv(self):
         """Test generate_threshold_settings_csv."""
         data_for_csv = list()
@@ -1514,6 +1898,103 @@ class PyU4VPerformanceTest(testtools.TestCase):
             data_format='Average')
         self.assertIsInstance(response, dict)
 
+    def test_get_volume_stats_default_data_format(self):
+        """Test get_volume_stats defaults to average values."""
+        with mock.patch.object(
+                self.perf, 'get_performance_stats') as mck_stats:
+            self.perf.get_volume_stats(
+                storage_group_list=['sg_1', 'sg_2'], metrics=['HostIOs'])
+        self.assertEqual(pc.AVERAGE, mck_stats.call_args[1]['data_format'])
+        self.assertEqual('sg_1,sg_2', mck_stats.call_args[1][
+            'request_body'][pc.SG_LIST])
+
+    def test_plan_volume_shards(self):
+        """Test volumes are split into contiguous ranges and SG batches."""
+        shards = self.perf.plan_volume_shards(
+            volume_ids=['00003', '00001', '00002', '0000A'],
+            volume_ranges=[('00010', '0271F')],
+            storage_groups=['sg_{n}'.format(n=n) for n in range(150)])
+        self.assertEqual(
+            [('00001', '00003'), ('0000A', '0000A'), ('00010', '0271F')],
+            [(s[pc.VOLUME_START_RANGE], s[pc.VOLUME_END_RANGE])
+             for s in shards[:3]])
+        self.assertEqual([100, 50], [len(s[pc.SG_LIST].split(','))
+                                     for s in shards[3:]])
+        shards = self.perf.plan_volume_shards(
+            volume_ranges=[('00000', '0FFFF')])
+        self.assertEqual(7, len(shards))
+        self.assertEqual({pc.VOLUME_START_RANGE: '0EA60',
+                          pc.VOLUME_END_RANGE: '0FFFF'}, shards[-1])
+        self.assertEqual(list(), self.perf.plan_volume_shards())
+
+    def test_merge_volume_results(self):
+        """Test volume results are merged by volume and deduplicated."""
+        shard_results = [
+            [{pc.TIMESTAMP: 2, pc.VOLUME_RESULT: [
+                {pc.VOLUME_ID: '00001', 'HostIOs': 2.0},
+                {pc.VOLUME_ID: '00002', 'HostIOs': 4.0}]}],
+            [{pc.TIMESTAMP: 1, pc.VOLUME_ID: '00001', 'HostIOs': 1.0},
+             {pc.TIMESTAMP: 2, pc.VOLUME_ID: '00001', 'HostIOs': 2.0},
+             {pc.TIMESTAMP: 2, 'HostIOs': 9.0}]]
+        merged = self.perf.merge_volume_results(shard_results)
+        self.assertEqual([1, 2], [s[pc.TIMESTAMP] for s in merged['00001']])
+        self.assertEqual([{pc.TIMESTAMP: 2, pc.VOLUME_ID: '00002',
+                           'HostIOs': 4.0}], merged['00002'])
+
+    def test_collect_volume_stats(self):
+        """Test shards and time slices are requested concurrently."""
+        start = self.p_data.first_date
+        end = start + 2 * pc.ONE_HOUR
+
+        def _results(category, body):
+            if body.get(pc.SG_LIST) == 'sg_1':
+                raise exception.VolumeBackendAPIException('failed')
+            return [{pc.TIMESTAMP: int(body[pc.END_DATE]),
+                     pc.VOLUME_ID: body.get(pc.VOLUME_START_RANGE),
+                     'HostIOs': 1.0}]
+
+        with mock.patch.object(
+                self.perf, '_get_metrics_results',
+                side_effect=_results) as mck_results:
+            response = self.perf.collect_volume_stats(
+                volume_ranges=[('00000', '04E1F')], storage_groups=['sg_1'],
+                metrics=['HostIOs'], start_time=start, end_time=end,
+                data_format='maximum', max_workers=4)
+        self.assertEqual(6, mck_results.call_count)
+        body = mck_results.call_args[0][1]
+        self.assertEqual(pc.MAXIMUM, body[pc.DATA_FORMAT])
+        self.assertEqual(['HostIOs'], body[pc.METRICS])
+        self.assertEqual(['00000', '02710'],
+                         sorted(response[pc.RESULT].keys()))
+        self.assertEqual(2, len(response[pc.RESULT]['00000']))
+        self.assertEqual(2, len(response[pc.FAILED]))
+        self.assertEqual('volume', response[pc.REP_LEVEL])
+        self.assertRaises(exception.InvalidInputException,
+                          self.perf.collect_volume_stats)
+        self.assertRaises(exception.InvalidInputException,
+                          self.perf.collect_volume_stats,
+                          volume_ids=['00001'], data_format='Minimum')
+
+    def test_collect_volume_stats_kpi_other_array(self):
+        """Test KPI metrics are listed for the requested array."""
+        start = self.p_data.first_date
+        with mock.patch.object(
+                self.perf, 'get_performance_metrics_list',
+                return_value=['HostIOs']) as mck_metrics:
+            with mock.patch.object(
+                    self.perf, '_get_metrics_results',
+                    return_value=list()) as mck_results:
+                self.perf.collect_volume_stats(
+                    volume_ids=['00001'], metrics='KPI',
+                    array_id=self.p_data.remote_array, start_time=start,
+                    end_time=start + pc.ONE_HOUR)
+        mck_metrics.assert_called_once_with(
+            category=pc.VOLUME, kpi_only=True,
+            array_id=self.p_data.remote_array)
+        body = mck_results.call_args[0][1]
+        self.assertEqual(self.p_data.remote_array, body[pc.SYSTEM_ID])
+        self.assertEqual(['HostIOs'], body[pc.METRICS])
+
     def test_get_zhyperlink_port_keys(self):
         """Test get_zhyperlink_port_keys."""
         response = self.perf.get_zhyperlink_port_keys()
@@ -0,0 +1,201 @@
+# Copyright (c) 2025 Dell Inc. or its subsidiaries.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""test_pyu4v_performance_aggregation.py."""
+
+import math
+import testtools
+
+from unittest import mock
+
+from PyU4V.utils import exception
+from PyU4V.utils import performance_aggregation as pa
+from PyU4V.utils import performance_constants as pc
+
+
+class PyU4VPerformanceAggregationTest(testtools.TestCase):
+    """Test aggregations over performance results."""
+
+    def setUp(self):
+        """setUp."""
+        super(PyU4VPerformanceAggregationTest, self).setUp()
+        self.step = 5 * pc.ONE_MINUTE
+        self.results = {
+            'sg_1': [{pc.TIMESTAMP: i * self.step, 'HostIOs': float(i)}
+                     for i in range(1, 101)],
+            'sg_2': [{pc.TIMESTAMP: i * self.step, 'HostIOs': 10.0}
+                     for i in range(1, 101)],
+            'sg_3': [{pc.TIMESTAMP: self.step, 'PercentBusy': 1.0}]}
+
+    def test_as_frame(self):
+        """Test every results form converts to the same frame."""
+        frame = pa.as_frame(self.results)
+        self.assertIs(frame, pa.as_frame(frame))
+        self.assertEqual(201, len(pa.as_frame({pc.RESULT: self.results})))
+        self.assertEqual([None, None], pa.as_frame(
+            self.results['sg_1'][:2]).object_ids)
+        self.assertEqual(0, len(pa.as_frame(None)))
+
+    def test_get_series(self):
+        """Test series skip missing values and are sorted."""
+        results = {'sg_1': [
+            {pc.TIMESTAMP: 3, 'HostIOs': 3.0}, {pc.TIMESTAMP: 1},
+            {pc.TIMESTAMP: 2, 'HostIOs': 2.0}]}
+        series = pa.get_series(results, 'HostIOs')
+        self.assertEqual(['sg_1'], list(series.keys()))
+        self.assertEqual(([2, 3], [2.0, 3.0]),
+                         tuple(list(column) for column in series['sg_1']))
+        self.assertEqual(dict(), pa.get_series(results, 'Unknown'))
+
+    def test_get_series_split_object(self):
+        """Test rows of an object appended separately are joined."""
+        frame = pa.as_frame({'sg_1': self.results['sg_1'][:2],
+                             'sg_2': self.results['sg_2'][:1]})
+        frame.append(self.results['sg_1'][2:3], object_id='sg_1')
+        timestamps, values = pa.get_series(frame, 'HostIOs')['sg_1']
+        self.assertEqual([self.step, 2 * self.step, 3 * self.step],
+                         list(timestamps))
+        self.assertEqual([1.0, 2.0, 3.0], list(values))
+
+    def test_to_frame(self):
+        """Test series convert to a frame with object ids."""
+        frame = pa.to_frame(pa.get_series(self.results, 'HostIOs'),
+                            'HostIOs')
+        self.assertEqual(200, len(frame))
+        self.assertEqual({pc.TIMESTAMP: self.step, 'HostIOs': 1.0,
+                          'object_id': 'sg_1'}, frame.to_records()[0])
+        self.assertEqual([{pc.TIMESTAMP: 1, 'HostIOs': 2.0}], pa.to_frame(
+            {None: ([1], [2.0])}, 'HostIOs').to_records())
+
+    def test_percentiles(self):
+        """Test percentiles use linear interpolation."""
+        response = pa.percentiles(self.results, 'HostIOs')
+        self.assertEqual({'p50': 50.5, 'p95': 95.05, 'p99': 99.01},
+                         {k: round(v, 6) for k, v in response['sg_1'].items()})
+        self.assertEqual(10.0, response['sg_2']['p99'])
+        self.assertNotIn('sg_3', response)
+        overall = pa.percentiles(self.results, 'HostIOs',
+                                 percentile_list=[0, 100], by_object=False)
+        self.assertEqual({'p0': 1.0, 'p100': 100.0}, overall)
+
+    def test_percentile_matches_numpy(self):
+        """Test the Python percentile matches numpy.percentile."""
+        if pa.numpy is None:
+            self.skipTest('numpy is not installed')
+        values = [5.0, 1.0, 7.5, 3.25, 9.0, 2.0]
+        expected = pa._percentile(values, 37)
+        with mock.patch.object(pa, 'numpy', None):
+            self.assertAlmostEqual(expected, pa._percentile(values, 37))
+
+    def test_series_functions_match_numpy(self):
+        """Test the Python series functions match the NumPy results."""
+        if pa.numpy is None:
+            self.skipTest('numpy is not installed')
+        groups = {'sg_1': 'SRP_1', 'sg_2': 'SRP_1'}
+        calls = [(pa.ewma, (self.results, 'HostIOs')),
+                 (pa.delta, (self.results, 'HostIOs')),
+                 (pa.rate, (self.results, 'HostIOs')),
+                 (pa.group_by, (self.results, 'HostIOs', groups, pa.AVG))]
+        expected = [function(*args).to_records() for function, args in calls]
+        with mock.patch.object(pa, 'numpy', None):
+            for (function, args), records in zip(calls, expected):
+                response = function(*args).to_records()
+                self.assertEqual(len(records), len(response))
+                for record, python_record in zip(records, response):
+                    self.assertAlmostEqual(record['HostIOs'],
+                                           python_record['HostIOs'])
+
+    def test_calculate_statistic(self):
+        """Test calculate_statistic."""
+        values = [1.0, 2.0, 6.0]
+        self.assertEqual(3.0, pa.calculate_statistic(values, pa.AVG))
+        self.assertEqual(1.0, pa.calculate_statistic(values, pa.MIN))
+        self.assertEqual(6.0, pa.calculate_statistic(values, pa.MAX))
+        self.assertEqual(9.0, pa.calculate_statistic(values, pa.SUM))
+        self.assertEqual(3, pa.calculate_statistic(values, pa.COUNT))
+        self.assertEqual(2.0, pa.calculate_statistic(values, 'p50'))
+        self.assertTrue(math.isnan(pa.calculate_statistic([], pa.AVG)))
+        self.assertTrue(math.isnan(pa.calculate_statistic([], 'p95')))
+        for statistic in ['median', 'p101', 'px', None]:
+            self.assertRaises(exception.InvalidInputException,
+                              pa.calculate_statistic, values, statistic)
+
+    def test_summarise(self):
+        """Test summarise."""
+        response = pa.summarise(self.results, 'HostIOs',
+                                statistics=[pa.AVG, 'p95'])
+        self.assertEqual({pa.AVG: 10.0, 'p95': 10.0}, response['sg_2'])
+        self.assertEqual(
+            {pa.AVG, pa.MIN, pa.MAX, 'p50', 'p95', 'p99'},
+            set(pa.summarise(self.results, 'HostIOs')['sg_1'].keys()))
+
+    def test_top_n(self):
+        """Test top_n orders objects by statistic."""
+        self.assertEqual([('sg_1', 100.0)], pa.top_n(
+            self.results, 'HostIOs', n=1, statistic=pa.MAX))
+        self.assertEqual([('sg_2', 10.0), ('sg_1', 50.5)], pa.top_n(
+            self.results, 'HostIOs', largest=False))
+        self.assertRaises(exception.InvalidInputException, pa.top_n,
+                          self.results, 'HostIOs', statistic='mode')
+
+    def test_ewma(self):
+        """Test ewma."""
+        response = pa.get_series(
+            pa.ewma(self.results, 'HostIOs', alpha=0.5), 'HostIOs')
+        timestamps, values = response['sg_1']
+        self.assertEqual([1.0, 1.5, 2.25], list(values[:3]))
+        self.assertEqual(self.step, timestamps[0])
+        self.assertEqual(100, len(values))
+        self.assertTrue(all(v == 10.0 for v in response['sg_2'][1]))
+        expected = 1.0
+        for value in range(2, 101):
+            expected = 0.1 * value + 0.9 * expected
+        self.assertAlmostEqual(expected, pa.get_series(pa.ewma(
+            self.results, 'HostIOs', alpha=0.1), 'HostIOs')['sg_1'][1][-1])
+        self.assertEqual(list(range(1, 101)), list(pa.get_series(pa.ewma(
+            self.results, 'HostIOs', alpha=1), 'HostIOs')['sg_1'][1]))
+        self.assertRaises(exception.InvalidInputException, pa.ewma,
+                          self.results, 'HostIOs', alpha=0)
+
+    def test_delta_and_rate(self):
+        """Test delta and rate between successive samples."""
+        results = [{pc.TIMESTAMP: 0, 'Reads': 0.0},
+                   {pc.TIMESTAMP: 2000, 'Reads': 10.0},
+                   {pc.TIMESTAMP: 2000, 'Reads': 10.0},
+                   {pc.TIMESTAMP: 6000, 'Reads': 12.0}]
+        self.assertEqual([10.0, 0.0, 2.0], list(
+            pa.delta(results, 'Reads').metrics['Reads']))
+        self.assertEqual(
+            [{pc.TIMESTAMP: 2000, 'Reads': 5.0},
+             {pc.TIMESTAMP: 6000, 'Reads': 0.5}],
+            pa.rate(results, 'Reads').to_records())
+
+    def test_group_by(self):
+        """Test group_by aggregates objects per timestamp."""
+        groups = {'sg_1': 'SRP_1', 'sg_2': 'SRP_1'}
+        response = pa.group_by(self.results, 'HostIOs', groups)
+        self.assertEqual({'SRP_1'}, set(response.object_ids))
+        self.assertEqual({pc.TIMESTAMP: self.step, 'HostIOs': 11.0,
+                          'object_id': 'SRP_1'}, response.to_records()[0])
+        self.assertEqual(100, len(response))
+        response = pa.get_series(pa.group_by(
+            self.results, 'HostIOs', lambda object_id: object_id[-1],
+            aggregate=pa.MAX), 'HostIOs')
+        self.assertEqual(10.0, response['2'][1][0])
+        for aggregate, expected in [(pa.AVG, 5.5), (pa.MIN, 1.0),
+                                    (pa.COUNT, 2.0)]:
+            response = pa.group_by(self.results, 'HostIOs', groups,
+                                   aggregate=aggregate)
+            self.assertEqual(expected, response.metrics['HostIOs'][0])
+        self.assertRaises(exception.InvalidInputException, pa.group_by,
+                          self.results, 'HostIOs', groups, aggregate='p95')
@@ -0,0 +1,148 @@
+# Copyright (c) 2025 Dell Inc. or its subsidiaries.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""test_pyu4v_performance_codec.py."""
+
+import io
+import json
+import math
+import random
+import testtools
+
+from PyU4V.tests.unit_tests import pyu4v_performance_data as pd
+from PyU4V.utils import exception
+from PyU4V.utils import performance_codec
+from PyU4V.utils import performance_constants as pc
+from PyU4V.utils import performance_frame
+
+
+class PyU4VPerformanceCodecTest(testtools.TestCase):
+    """Test compressed performance result encoding."""
+
+    def setUp(self):
+        """setUp."""
+        super(PyU4VPerformanceCodecTest, self).setUp()
+        self.p_data = pd.PerformanceData()
+        rand = random.Random(42)
+        start = self.p_data.last_date
+        self.results = [
+            {pc.TIMESTAMP: start + i * 5 * pc.ONE_MINUTE,
+             'HostIOs': round(1000 + rand.random() * 10, 2),
+             'PercentBusy': 12.5,
+             'ResponseTime': rand.random()} for i in range(500)]
+
+    def test_timestamps_round_trip(self):
+        """Test regular, irregular, negative and large intervals."""
+        timestamps = [0, 300000, 600000, 900000, 900001, 900000,
+                      1000000, 2 ** 40, 5, -5, 2 ** 62, -(2 ** 62)]
+        encoded = performance_codec.encode_timestamps(timestamps)
+        self.assertEqual(timestamps, performance_codec.decode_timestamps(
+            encoded, len(timestamps)))
+
+    def test_regular_timestamps_use_one_bit(self):
+        """Test a fixed interval costs one bit per sample."""
+        timestamps = [i * 5 * pc.ONE_MINUTE for i in range(1001)]
+        encoded = performance_codec.encode_timestamps(timestamps)
+        # 64 bit first value, 37 bit first delta and a bit per sample
+        self.assertEqual(math.ceil((64 + 37 + 999) / 8), len(encoded))
+
+    def test_values_round_trip(self):
+        """Test values including special floats are bit exact."""
+        values = [0.0, 0.0, 1.5, -1.5, 1e-300, 1e300, float('inf'),
+                  -0.0, 3.141592653589793, 3.141592653589794, 2.0 ** -1074]
+        decoded = performance_codec.decode_values(
+            performance_codec.encode_values(values), len(values))
+        self.assertEqual([repr(v) for v in values],
+                         [repr(v) for v in decoded])
+        nan = performance_codec.decode_values(
+            performance_codec.encode_values([float('nan')]), 1)
+        self.assertTrue(math.isnan(nan[0]))
+
+    def test_block_round_trip(self):
+        """Test a block decodes to the original results."""
+        encoded = performance_codec.encode_block(self.results)
+        self.assertEqual(self.results,
+                         performance_codec.decode_block(encoded))
+
+    def test_block_missing_metrics_and_labels(self):
+        """Test absent metrics and label columns survive a round trip."""
+        results = [
+            {pc.TIMESTAMP: 1000, 'HostIOs': 10.0, 'volumeId': '0001A'},
+            {pc.TIMESTAMP: 2000, 'PercentBusy': 3.5, 'volumeId': '0001A'},
+            {pc.TIMESTAMP: 3000, 'HostIOs': 20.0}]
+        self.assertEqual(results, performance_codec.decode_block(
+            performance_codec.encode_block(results)))
+        self.assertEqual([], performance_codec.decode_block(
+            performance_codec.encode_block([])))
+
+    def test_block_from_frame(self):
+        """Test a PerformanceFrame can be encoded directly."""
+        frame = performance_frame.PerformanceFrame.from_results(self.results)
+        decoded = performance_codec.decode_block_frame(
+            performance_codec.encode_block(frame))
+        self.assertEqual(list(frame.timestamps), list(decoded.timestamps))
+        self.assertEqual(frame.metrics, decoded.metrics)
+
+    def test_decode_selected_metrics(self):
+        """Test only requested metrics are decoded."""
+        decoded = performance_codec.decode_block(
+            performance_codec.encode_block(self.results),
+            metrics=['PercentBusy'])
+        self.assertEqual(
+            [{pc.TIMESTAMP: s[pc.TIMESTAMP], 'PercentBusy': 12.5}
+             for s in self.results], decoded)
+
+    def test_compression_ratio(self):
+        """Test encoded results are much smaller than JSON."""
+        encoded = performance_codec.encode_block(self.results)
+        self.assertGreater(len(json.dumps(self.results)), 4 * len(encoded))
+
+    def test_stream_round_trip(self):
+        """Test streamed results are written and read in blocks."""
+        stream = io.BytesIO()
+        self.assertEqual(500, performance_codec.encode_stream(
+            iter(self.results), stream, block_size=64))
+        stream.seek(0)
+        decoded = performance_codec.decode_stream(stream)
+        self.assertEqual(self.results[:64], [next(decoded)
+                                             for __ in range(64)])
+        self.assertEqual(self.results[64:], list(decoded))
+
+    def test_encode_performance_stats(self):
+        """Test encoding a get_performance_stats response."""
+        for columnar in [False, True]:
+            results = self.p_data.perf_metrics_resp['resultList']['result']
+            if columnar:
+                results = performance_frame.PerformanceFrame.from_results(
+                    results)
+            stream = io.BytesIO()
+            performance_codec.encode_performance_stats(
+                {pc.RESULT: results}, stream)
+            stream.seek(0)
+            self.assertEqual(
+                self.p_data.perf_metrics_resp['resultList']['result'],
+                list(performance_codec.decode_stream(stream)))
+
+    def test_decode_corrupt(self):
+        """Test truncated or unknown data is rejected."""
+        encoded = performance_codec.encode_block(self.results)
+        self.assertRaises(exception.InvalidInputException,
+                          performance_codec.decode_block, encoded[:-10])
+        self.assertRaises(exception.InvalidInputException,
+                          performance_codec.decode_block, b'JSON' + encoded)
+        self.assertRaises(
+            exception.InvalidInputException, performance_codec.decode_block,
+            performance_codec.MAGIC + b'\x09' + encoded[5:])
+        stream = io.BytesIO(b'\x00\x00\x01\x00abc')
+        self.assertRaises(exception.InvalidInputException, list,
+                          performance_codec.decode_stream(stream))
@@ -0,0 +1,138 @@
+# Copyright (c) 2025 Dell Inc. or its subsidiaries.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""test_pyu4v_performance_collector.py."""
+
+import os
+import shutil
+import tempfile
+import testtools
+
+from unittest import mock
+
+from PyU4V import performance_collector
+from PyU4V import rest_requests
+from PyU4V.tests.unit_tests import pyu4v_fakes as pf
+from PyU4V.tests.unit_tests import pyu4v_performance_data as pd
+from PyU4V import univmax_conn
+from PyU4V.utils import performance_constants as pc
+
+
+class PyU4VPerformanceCollectorTest(testtools.TestCase):
+    """Test incremental performance collection."""
+
+    def setUp(self):
+        """setUp."""
+        super(PyU4VPerformanceCollectorTest, self).setUp()
+        self.p_data = pd.PerformanceData()
+        self.conf_file, self.conf_dir = (
+            pf.FakeConfigFile.create_fake_config_file())
+        univmax_conn.file_path = self.conf_file
+        with mock.patch.object(
+                rest_requests.RestRequests, 'establish_rest_session',
+                return_value=pf.FakeRequestsSession()):
+            self.conn = univmax_conn.U4VConn(array_id=self.p_data.array)
+            self.perf = self.conn.performance
+        self.store_dir = tempfile.mkdtemp()
+        self.store_path = os.path.join(self.store_dir, 'watermarks.db')
+        self.collector = performance_collector.IncrementalCollector(
+            self.perf, watermark_path=self.store_path)
+        self.end = self.p_data.last_date
+        self.sg_keys = {pc.SG_INFO: [
+            {pc.SG_ID: sg_id, pc.FA_DATE: self.p_data.first_date,
+             pc.LA_DATE: self.end} for sg_id in ['sg_1', 'sg_2']]}
+
+    def tearDown(self):
+        """tearDown."""
+        super(PyU4VPerformanceCollectorTest, self).tearDown()
+        shutil.rmtree(self.store_dir)
+        pf.FakeConfigFile.delete_fake_config_file(
+            self.conf_file, self.conf_dir)
+
+    def _post(self, **kwargs):
+        """Return a sample for every five minutes of the requested range."""
+        payload = kwargs['payload']
+        start, end = int(payload[pc.START_DATE]), int(payload[pc.END_DATE])
+        return {'resultList': {'result': [
+            {pc.TIMESTAMP: t, 'HostIOs': 1.0} for t in range(
+                start, end + 1, 5 * pc.ONE_MINUTE)]}}
+
+    def _collect(self, end, **kwargs):
+        with mock.patch.object(
+                self.perf, 'get_last_available_timestamp',
+                return_value=end) as mck_last, mock.patch.object(
+                self.perf, 'get_performance_key_list',
+                return_value=self.sg_keys), mock.patch.object(
+                self.perf, 'post_request',
+                side_effect=self._post) as mck_post:
+            response = self.collector.collect(
+                pc.SG, metrics=['HostIOs'], **kwargs)
+            mck_last.assert_called_once()
+        return response, mck_post
+
+    def test_watermark_store(self):
+        """Test watermarks persist across store instances."""
+        store = performance_collector.WatermarkStore(self.store_path)
+        store.set_watermarks('123', pc.SG, {'sg_1': 10, 'sg_2': 20})
+        other = performance_collector.WatermarkStore(self.store_path)
+        self.assertEqual({'sg_1': 10, 'sg_2': 20},
+                         other.get_watermarks('123', pc.SG))
+        self.assertEqual(dict(), other.get_watermarks('123', pc.ARRAY))
+        other.reset(category=pc.SG)
+        self.assertEqual(dict(), store.get_watermarks('123', pc.SG))
+
+    def test_get_default_watermark_path(self):
+        """Test get_default_watermark_path."""
+        path = performance_collector.get_default_watermark_path()
+        self.assertIn('.PyU4V', path)
+        self.assertTrue(path.endswith('watermarks.db'))
+
+    def test_collect_first_cycle(self):
+        """Test the first cycle collects the initial window."""
+        self.collector.initial_window = 10
+        response, mck_post = self._collect(self.end)
+        self.assertEqual(2, mck_post.call_count)
+        self.assertEqual(3, len(response[pc.RESULT]['sg_1']))
+        self.assertEqual(
+            {'sg_1': self.end, 'sg_2': self.end},
+            self.collector.watermarks.get_watermarks(
+                self.p_data.array, pc.SG))
+
+    def test_collect_only_new_samples(self):
+        """Test later cycles only request and emit new samples."""
+        self._collect(self.end)
+        later = self.end + 10 * pc.ONE_MINUTE
+        response, mck_post = self._collect(later)
+        payload = mck_post.call_args[1]['payload']
+        self.assertEqual(str(self.end), payload[pc.START_DATE])
+        self.assertEqual(str(later), payload[pc.END_DATE])
+        self.assertEqual(
+            [self.end + 5 * pc.ONE_MINUTE, later],
+            [s[pc.TIMESTAMP] for s in response[pc.RESULT]['sg_2']])
+
+    def test_collect_nothing_new(self):
+        """Test no metrics requests are sent when up to date."""
+        self._collect(self.end)
+        response, mck_post = self._collect(self.end)
+        mck_post.assert_not_called()
+        self.assertEqual(dict(), response[pc.RESULT])
+
+    def test_collect_restart_uses_persisted_watermarks(self):
+        """Test a new collector resumes from persisted watermarks."""
+        self._collect(self.end)
+        self.collector = performance_collector.IncrementalCollector(
+            self.perf, watermark_path=self.store_path, initial_window=60)
+        later = self.end + 5 * pc.ONE_MINUTE
+        response, __ = self._collect(later)
+        self.assertEqual(
+            [later], [s[pc.TIMESTAMP] for s in response[pc.RESULT]['sg_1']])
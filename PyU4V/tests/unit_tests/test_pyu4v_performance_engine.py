@@ -0,0 +1,168 @@
+# Copyright (c) 2025 Dell Inc. or its subsidiaries.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""test_pyu4v_performance_engine.py."""
+
+import testtools
+
+from concurrent import futures
+from unittest import mock
+
+from PyU4V import performance_engine as pe
+from PyU4V import univmax_conn
+from PyU4V.utils import exception
+from PyU4V.utils import performance_constants as pc
+from PyU4V.utils import performance_frame
+
+
+class PyU4VPerformanceEngineTest(testtools.TestCase):
+    """Test the multi-process collection engine."""
+
+    def setUp(self):
+        """setUp."""
+        super(PyU4VPerformanceEngineTest, self).setUp()
+        self.conn = mock.Mock()
+        self.conn.performance.get_object_key_info.return_value = (
+            pc.SG_ID, {'sg_1': dict(), 'sg_2': dict(), 'sg_3': dict()})
+        self.conn.performance.collect_stats.side_effect = self._collect_stats
+        self.conn.performance.get_last_available_timestamp.return_value = (
+            600000)
+        self.addCleanup(setattr, pe, '_connection', None)
+        # Worker processes are replaced by threads sharing the mock
+        patcher = mock.patch.object(
+            pe.futures, 'ProcessPoolExecutor',
+            side_effect=lambda max_workers: futures.ThreadPoolExecutor(
+                max_workers=max_workers))
+        self.mck_pool = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(
+            univmax_conn, 'U4VConn', return_value=self.conn)
+        self.mck_conn = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @staticmethod
+    def _collect_stats(category, object_ids, array_id, **kwargs):
+        if array_id == '000222222222':
+            raise exception.VolumeBackendAPIException(data='')
+        return {pc.RESULT: {
+            o: [{pc.TIMESTAMP: 300000, 'HostIOs': 1.5, 'Name': o},
+                {pc.TIMESTAMP: 600000, 'HostIOs': 2.5, 'Name': o}]
+            for o in object_ids if o != 'sg_2'},
+            pc.FAILED: {o: 'not found' for o in object_ids if o == 'sg_2'},
+            'end_date': 600000}
+
+    def test_plan_work_units(self):
+        """Test objects are partitioned into batches per array."""
+        work_units = pe.plan_work_units(
+            pc.SG, {'000111111111': ['sg_1', 'sg_2', 'sg_3'],
+                    '000222222222': ['sg_4']}, batch_size=2)
+        self.assertEqual(
+            [('000111111111', ('sg_1', 'sg_2')),
+             ('000111111111', ('sg_3',)), ('000222222222', ('sg_4',))],
+            [(w.array_id, w.object_ids) for w in work_units])
+        self.assertRaises(exception.InvalidInputException,
+                          pe.plan_work_units, pc.SG, dict(), batch_size=0)
+
+    def test_collect_work_unit_encodes_results(self):
+        """Test workers return codec blocks instead of sample dicts."""
+        work_unit = pe.WorkUnit(
+            '000111111111', pc.SG, ('sg_1', 'sg_2'), ['HostIOs'],
+            pc.AVERAGE, None, None, 10)
+        encoded, failed, end_time = pe._collect_work_unit(
+            {'array_id': '000111111111'}, work_unit, 2)
+        pe._collect_work_unit({'array_id': '000111111111'}, work_unit, 2)
+        self.mck_conn.assert_called_once_with(array_id='000111111111')
+        self.assertIsInstance(encoded['sg_1'], bytes)
+        self.assertEqual({'sg_2': 'not found'}, failed)
+        self.assertEqual(600000, end_time)
+        self.conn.performance.collect_stats.assert_called_with(
+            pc.SG, object_ids=['sg_1', 'sg_2'], metrics=['HostIOs'],
+            window=10, array_id='000111111111', data_format=pc.AVERAGE,
+            start_time=None, end_time=None, max_workers=2)
+
+    def test_collect(self):
+        """Test results are decoded and merged per array in object order."""
+        with pe.CollectionEngine({'array_id': '000111111111'}, processes=2,
+                                 batch_size=2) as engine:
+            response = engine.collect(
+                pc.SG, ['000111111111', '000222222222'],
+                object_ids={'000222222222': ['sg_9']}, window=10)
+            self.assertIsInstance(engine._executor,
+                                  futures.ThreadPoolExecutor)
+        self.assertIsNone(engine._executor)
+        self.mck_pool.assert_called_once()
+        array_response = response['000111111111']
+        self.assertEqual(['sg_1', 'sg_3'], list(
+            array_response[pc.RESULT].keys()))
+        self.assertEqual(
+            [{pc.TIMESTAMP: 300000, 'HostIOs': 1.5, 'Name': 'sg_3'},
+             {pc.TIMESTAMP: 600000, 'HostIOs': 2.5, 'Name': 'sg_3'}],
+            array_response[pc.RESULT]['sg_3'])
+        self.assertEqual({'sg_2': 'not found'}, array_response[pc.FAILED])
+        self.assertEqual(600000, array_response['end_date'])
+        self.assertEqual(['sg_9'], list(
+            response['000222222222'][pc.FAILED].keys()))
+        self.conn.performance.get_object_key_info.assert_called_once_with(
+            pc.SG, array_id='000111111111')
+        self.assertEqual(
+            2, self.conn.performance.get_last_available_timestamp.call_count)
+        # Both work units of the array cover the same time range
+        self.assertEqual([600000, 600000], [
+            c[1]['end_time'] for c in
+            self.conn.performance.collect_stats.call_args_list
+            if c[1]['array_id'] == '000111111111'])
+
+    def test_collect_end_time_failure(self):
+        """Test arrays without a last available time are failed."""
+        self.conn.performance.get_last_available_timestamp.side_effect = (
+            exception.ResourceNotFoundException(data=''))
+        engine = pe.CollectionEngine(processes=1)
+        self.addCleanup(engine.close)
+        response = engine.collect(
+            pc.SG, ['000111111111'], object_ids={'000111111111': ['sg_1']})
+        self.assertIn('error', response['000111111111'])
+        self.assertEqual(['sg_1'], list(
+            response['000111111111'][pc.FAILED].keys()))
+        self.conn.performance.collect_stats.assert_not_called()
+        response = engine.collect(
+            pc.SG, ['000111111111'], object_ids={'000111111111': ['sg_1']},
+            end_time=300000)
+        self.assertEqual(300000, response['000111111111']['end_date'])
+        self.assertEqual(
+            300000,
+            self.conn.performance.collect_stats.call_args[1]['end_time'])
+
+    def test_collect_int_array_ids(self):
+        """Test array ids which are not strings are normalised."""
+        engine = pe.CollectionEngine(processes=1)
+        self.addCleanup(engine.close)
+        response = engine.collect(pc.SG, [111111111],
+                                  object_ids={111111111: ['sg_1']})
+        self.assertEqual(['111111111'], list(response.keys()))
+        self.assertEqual(['sg_1'], list(
+            response['111111111'][pc.RESULT].keys()))
+
+    def test_collect_columnar(self):
+        """Test columnar results and failed object discovery."""
+        self.conn.performance.get_object_key_info.side_effect = (
+            exception.ResourceNotFoundException(data=''))
+        engine = pe.CollectionEngine(processes=1)
+        self.addCleanup(engine.close)
+        response = engine.collect(
+            pc.SG, ['000111111111', '000333333333'],
+            object_ids={'000111111111': ['sg_1']}, columnar=True)
+        frame = response['000111111111'][pc.RESULT]['sg_1']
+        self.assertIsInstance(frame, performance_frame.PerformanceFrame)
+        self.assertEqual([1.5, 2.5], list(frame.metrics['HostIOs']))
+        self.assertIn('error', response['000333333333'])
+        self.assertEqual(dict(), response['000333333333'][pc.RESULT])
@@ -19,6 +19,7 @@ from PyU4V import rest_requests
 from PyU4V.tests.unit_tests import pyu4v_common_data as pcd
 from PyU4V.tests.unit_tests import pyu4v_fakes as pf
 from PyU4V import univmax_conn
+from PyU4V.utils import exception
 
 
 class PyU4VPerformanceEnhancedTest(testtools.TestCase):
@@ -60,3 +61,78 @@ class PyU4VPerformanceEnhancedTest(testtools.TestCase):
                 self.common, 'get_request') as mock_get:
             self.performace_enhanced.get_category_metrics(category='Array')
         mock_get.assert_called()
+
+    def test_get_all_performance_metrics_for_system_concurrent(self):
+        categories = [{'id': 'Array'}, {'id': 'FEDirector'},
+                      {'id': 'StorageGroup'}]
+
+        def _get_request(target_uri, resource_type, params=None,
+                         timeout=None):
+            category = target_uri.split('/')[-1]
+            if category == 'FEDirector':
+                raise exception.VolumeBackendAPIException(data='timeout')
+            return {'id': category, 'timeout': timeout}
+
+        with mock.patch.object(
+                self.performace_enhanced, 'get_performance_categories_list',
+                return_value=categories) as mock_categories:
+            with mock.patch.object(
+                    self.common, 'get_request', side_effect=_get_request):
+                response = (self.performace_enhanced.
+                            get_all_performance_metrics_for_system(
+                                max_workers=2, timeout=30))
+                streamed = list(self.performace_enhanced.
+                                stream_performance_metrics_for_system())
+        self.assertEqual([{'id': 'Array', 'timeout': 30},
+                          {'id': 'StorageGroup', 'timeout': 30}], response)
+        self.assertEqual(['Array', 'StorageGroup'],
+                         sorted(r['id'] for r in streamed))
+        self.assertEqual(2, mock_categories.call_count)
+
+    def test_get_category_metrics_delta(self):
+        def _response(timestamp, values):
+            return {'id': 'StorageGroup', 'metric_instances': [
+                {'id': sg, 'metrics': [
+                    {'timestamp': timestamp, 'HostIOs': value}]}
+                for sg, value in values.items()]}
+
+        responses = [
+            _response(300000, {'sg_1': 1.0, 'sg_2': 2.0}),
+            _response(300000, {'sg_1': 1.0, 'sg_2': 2.0}),
+            _response(600000, {'sg_1': 1.0, 'sg_2': 3.0})]
+        with mock.patch.object(
+                self.performace_enhanced, 'get_category_metrics',
+                side_effect=responses) as mock_get:
+            with mock.patch('time.time', return_value=400.0):
+                first = self.performace_enhanced.get_category_metrics_delta(
+                    'StorageGroup')
+                self.assertIsNone(
+                    self.performace_enhanced.get_category_metrics_delta(
+                        'StorageGroup'))
+                self.assertEqual(1, mock_get.call_count)
+            with mock.patch('time.time', return_value=1000000.0):
+                self.assertIsNone(
+                    self.performace_enhanced.get_category_metrics_delta(
+                        'StorageGroup'))
+                third = self.performace_enhanced.get_category_metrics_delta(
+                    'StorageGroup')
+        self.assertEqual(['sg_1', 'sg_2'],
+                         [i['id'] for i in first['metric_instances']])
+        self.assertEqual(['sg_2'],
+                         [i['id'] for i in third['metric_instances']])
+        self.assertEqual(3, mock_get.call_count)
+
+    def test_poll_category_metrics(self):
+        deltas = [None, {'metric_instances': []},
+                  {'metric_instances': [{'id': 'sg_1'}]}]
+        with mock.patch.object(
+                self.performace_enhanced, 'get_category_metrics_delta',
+                side_effect=deltas):
+            with mock.patch('time.sleep') as mock_sleep:
+                poller = self.performace_enhanced.poll_category_metrics(
+                    'StorageGroup', poll_interval=5)
+                self.assertEqual({'metric_instances': [{'id': 'sg_1'}]},
+                                 next(poller))
+                poller.close()
+        self.assertEqual(2, mock_sleep.call_count)
+        mock_sleep.assert_called_with(5)
@@ -0,0 +1,140 @@
+# Copyright (c) 2025 Dell Inc. or its subsidiaries.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""test_pyu4v_performance_frame.py."""
+
+import math
+import testtools
+
+from unittest import mock
+
+from PyU4V import rest_requests
+from PyU4V.tests.unit_tests import pyu4v_fakes as pf
+from PyU4V.tests.unit_tests import pyu4v_performance_data as pd
+from PyU4V import univmax_conn
+from PyU4V.utils import exception
+from PyU4V.utils import performance_constants as pc
+from PyU4V.utils import performance_frame
+
+
+class PyU4VPerformanceFrameTest(testtools.TestCase):
+    """Test columnar performance results."""
+
+    def setUp(self):
+        """setUp."""
+        super(PyU4VPerformanceFrameTest, self).setUp()
+        self.p_data = pd.PerformanceData()
+        self.results = [
+            {'timestamp': 1000, 'HostIOs': 10.0, 'PercentBusy': 1.5},
+            {'timestamp': 2000, 'HostIOs': 20, 'volumeId': '0001A'},
+            {'timestamp': 3000, 'PercentBusy': 3.5}]
+
+    def test_from_results(self):
+        """Test from_results builds one column per metric."""
+        frame = performance_frame.PerformanceFrame.from_results(self.results)
+        self.assertEqual(3, len(frame))
+        self.assertEqual([1000, 2000, 3000], list(frame.timestamps))
+        self.assertEqual(['HostIOs', 'PercentBusy'], frame.metric_names)
+        self.assertEqual(10.0, frame.metrics['HostIOs'][0])
+        self.assertTrue(math.isnan(frame.metrics['HostIOs'][2]))
+        self.assertTrue(math.isnan(frame.metrics['PercentBusy'][1]))
+        self.assertEqual([None, '0001A', None], frame.labels['volumeId'])
+
+    def test_to_records_round_trip(self):
+        """Test to_records returns the original samples."""
+        frame = performance_frame.PerformanceFrame.from_results(self.results)
+        self.assertEqual(self.results, frame.to_records())
+
+    def test_from_object_results(self):
+        """Test from_object_results indexes samples by object id."""
+        frame = performance_frame.PerformanceFrame.from_object_results(
+            {'sg_1': self.results[:1], 'sg_2': self.results[1:]})
+        self.assertEqual(['sg_1', 'sg_2', 'sg_2'], frame.object_ids)
+        self.assertEqual(
+            'sg_2', frame.to_records()[2][performance_frame.OBJECT_ID])
+
+    def test_from_columns(self):
+        """Test from_columns copies the columns into arrays."""
+        frame = performance_frame.PerformanceFrame.from_columns(
+            [1000, 2000], {'HostIOs': [1, 2.5]}, object_ids=['sg_1', 'sg_2'])
+        self.assertEqual(
+            [{'timestamp': 1000, 'HostIOs': 1.0, 'object_id': 'sg_1'},
+             {'timestamp': 2000, 'HostIOs': 2.5, 'object_id': 'sg_2'}],
+            frame.to_records())
+        frame = performance_frame.PerformanceFrame.from_columns(
+            [1000], {'HostIOs': [1.0]})
+        self.assertEqual([None], frame.object_ids)
+        self.assertEqual([{'timestamp': 1000, 'HostIOs': 1.0}],
+                         frame.to_records())
+
+    def test_to_numpy(self):
+        """Test to_numpy."""
+        if performance_frame.numpy is None:
+            self.skipTest('numpy is not installed')
+        frame = performance_frame.PerformanceFrame.from_results(self.results)
+        columns = frame.to_numpy()
+        self.assertEqual([1000, 2000, 3000], columns[pc.TIMESTAMP].tolist())
+        self.assertEqual(20.0, columns['HostIOs'][1])
+
+    def test_to_pandas(self):
+        """Test to_pandas indexes by object and timestamp."""
+        if performance_frame.pandas is None:
+            self.skipTest('pandas is not installed')
+        frame = performance_frame.PerformanceFrame.from_object_results(
+            {'sg_1': self.results})
+        data_frame = frame.to_pandas()
+        self.assertEqual([performance_frame.OBJECT_ID, pc.TIMESTAMP],
+                         list(data_frame.index.names))
+        self.assertEqual(3, len(data_frame))
+
+    def test_to_arrow(self):
+        """Test to_arrow."""
+        if performance_frame.pyarrow is None:
+            self.skipTest('pyarrow is not installed')
+        frame = performance_frame.PerformanceFrame.from_results(self.results)
+        self.assertEqual(3, frame.to_arrow().num_rows)
+
+    def test_missing_dependency(self):
+        """Test conversion without the optional dependency installed."""
+        frame = performance_frame.PerformanceFrame.from_results(self.results)
+        with mock.patch.object(performance_frame, 'numpy', None):
+            self.assertRaises(exception.MissingDependencyException,
+                              frame.to_numpy)
+        with mock.patch.object(performance_frame, 'pandas', None):
+            self.assertRaises(exception.MissingDependencyException,
+                              frame.to_pandas)
+        with mock.patch.object(performance_frame, 'pyarrow', None):
+            self.assertRaises(exception.MissingDependencyException,
+                              frame.to_arrow)
+
+    def test_get_performance_stats_columnar(self):
+        """Test get_performance_stats columnar result."""
+        conf_file, conf_dir = pf.FakeConfigFile.create_fake_config_file()
+        self.addCleanup(pf.FakeConfigFile.delete_fake_config_file,
+                        conf_file, conf_dir)
+        univmax_conn.file_path = conf_file
+        with mock.patch.object(
+                rest_requests.RestRequests, 'establish_rest_session',
+                return_value=pf.FakeRequestsSession()):
+            conn = univmax_conn.U4VConn(array_id=self.p_data.array)
+        with mock.patch.object(
+                conn.performance, 'post_request',
+                return_value=self.p_data.perf_metrics_resp):
+            response = conn.performance.get_performance_stats(
+                category=pc.ARRAY, metrics=['PercentBusy'],
+                start_time=self.p_data.last_date,
+                end_time=self.p_data.last_date, columnar=True)
+        frame = response[pc.RESULT]
+        self.assertIsInstance(frame, performance_frame.PerformanceFrame)
+        self.assertEqual(self.p_data.perf_metrics_resp['resultList'][
+            'result'], frame.to_records())
@@ -0,0 +1,178 @@
+# Copyright (c) 2025 Dell Inc. or its subsidiaries.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""test_pyu4v_performance_history.py."""
+
+import os
+import shutil
+import tempfile
+import testtools
+
+from unittest import mock
+
+from PyU4V import performance_history
+from PyU4V import rest_requests
+from PyU4V.tests.unit_tests import pyu4v_fakes as pf
+from PyU4V.tests.unit_tests import pyu4v_performance_data as pd
+from PyU4V import univmax_conn
+from PyU4V.utils import exception
+from PyU4V.utils import performance_constants as pc
+
+
+class PyU4VPerformanceHistoryTest(testtools.TestCase):
+    """Test the local performance history store."""
+
+    def setUp(self):
+        """setUp."""
+        super(PyU4VPerformanceHistoryTest, self).setUp()
+        self.p_data = pd.PerformanceData()
+        self.store_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.store_dir)
+        self.store = performance_history.PerformanceHistoryStore(
+            os.path.join(self.store_dir, 'history.db'))
+        # Two hours of five minute samples starting on a day boundary
+        self.day = 20000 * pc.ONE_DAY
+        self.results = [
+            {pc.TIMESTAMP: self.day + i * 5 * pc.ONE_MINUTE,
+             'HostIOs': float(i), 'volumeId': '0001A'} for i in range(24)]
+
+    def test_get_default_history_path(self):
+        """Test get_default_history_path."""
+        path = performance_history.get_default_history_path()
+        self.assertIn('.PyU4V', path)
+        self.assertTrue(path.endswith('performance_history.db'))
+
+    def test_add_and_query_raw(self):
+        """Test raw samples round trip, ignoring label values."""
+        self.assertEqual(24, self.store.add_results(
+            '123', pc.SG, 'sg_1', self.results))
+        history = self.store.query(pc.SG, object_ids='sg_1')
+        self.assertEqual(
+            [{pc.TIMESTAMP: s[pc.TIMESTAMP], 'HostIOs': s['HostIOs']}
+             for s in self.results], history['sg_1'])
+
+    def test_query_filters(self):
+        """Test queries by object, metric, array and time range."""
+        self.store.add_object_results('123', pc.SG, {
+            'sg_1': [{pc.TIMESTAMP: 1, 'HostIOs': 1.0, 'PercentBusy': 2.0}],
+            'sg_2': [{pc.TIMESTAMP: 2, 'HostIOs': 3.0}]})
+        self.store.add_results('456', pc.SG, 'sg_1',
+                               [{pc.TIMESTAMP: 3, 'HostIOs': 4.0}])
+        self.assertEqual(
+            {'sg_1': [{pc.TIMESTAMP: 1, 'PercentBusy': 2.0}]},
+            self.store.query(pc.SG, metrics=['PercentBusy']))
+        self.assertEqual(
+            ['sg_2'], list(self.store.query(
+                pc.SG, array_id='123', start_time=2).keys()))
+        self.assertEqual(
+            [1], [s[pc.TIMESTAMP] for s in self.store.query(
+                pc.SG, object_ids=['sg_1'], end_time=2)['sg_1']])
+        self.assertEqual(dict(), self.store.query(pc.ARRAY))
+
+    def test_query_invalid(self):
+        """Test query with an invalid tier or statistic."""
+        self.assertRaises(exception.InvalidInputException,
+                          self.store.query, pc.SG, tier='weekly')
+        self.assertRaises(exception.InvalidInputException,
+                          self.store.query, pc.SG, statistic='median')
+
+    def test_rollup(self):
+        """Test complete hours and days are rolled up."""
+        self.store.add_results('123', pc.SG, 'sg_1', self.results)
+        self.store.rollup(now=self.day + pc.ONE_DAY)
+        hourly = self.store.query(
+            pc.SG, tier=performance_history.HOURLY)['sg_1']
+        self.assertEqual([self.day, self.day + pc.ONE_HOUR],
+                         [s[pc.TIMESTAMP] for s in hourly])
+        self.assertEqual(5.5, hourly[0]['HostIOs'])
+        self.assertEqual(17.5, hourly[1]['HostIOs'])
+        self.assertEqual(23.0, self.store.query(
+            pc.SG, tier=performance_history.HOURLY,
+            statistic='max')['sg_1'][1]['HostIOs'])
+        daily = self.store.query(
+            pc.SG, tier=performance_history.DAILY)['sg_1']
+        self.assertEqual([{pc.TIMESTAMP: self.day, 'HostIOs': 11.5}], daily)
+        self.assertEqual(24, self.store.query(
+            pc.SG, tier=performance_history.DAILY,
+            statistic='count')['sg_1'][0]['HostIOs'])
+
+    def test_rollup_incomplete_and_late_samples(self):
+        """Test the current bucket waits and late samples are included."""
+        self.store.add_results('123', pc.SG, 'sg_1', self.results[:6])
+        self.store.rollup(now=self.day + 30 * pc.ONE_MINUTE)
+        self.assertEqual(dict(), self.store.query(
+            pc.SG, tier=performance_history.HOURLY))
+        self.store.rollup(now=self.day + pc.ONE_HOUR)
+        self.store.add_results('123', pc.SG, 'sg_1', self.results[6:12])
+        self.store.rollup(now=self.day + pc.ONE_HOUR)
+        hourly = self.store.query(
+            pc.SG, tier=performance_history.HOURLY, statistic='count')
+        self.assertEqual(12, hourly['sg_1'][0]['HostIOs'])
+
+    def test_rollup_backfilled_series(self):
+        """Test a series backfilled after another is rolled up is kept."""
+        hour = 12 * pc.ONE_HOUR
+        self.store.add_results('123', pc.SG, 'sg_1', [
+            {pc.TIMESTAMP: self.day + i * pc.ONE_HOUR, 'HostIOs': 1.0}
+            for i in range(11)])
+        self.store.maintain(now=self.day + hour)
+        self.store.add_results('123', pc.SG, 'sg_2', [
+            {pc.TIMESTAMP: self.day + i * pc.ONE_HOUR, 'HostIOs': 2.0}
+            for i in range(2, 6)])
+        self.store.maintain(now=self.day + hour)
+        hourly = self.store.query(pc.SG, tier=performance_history.HOURLY)
+        self.assertEqual(
+            [self.day + i * pc.ONE_HOUR for i in range(2, 6)],
+            [s[pc.TIMESTAMP] for s in hourly['sg_2']])
+        self.assertEqual(11, len(hourly['sg_1']))
+
+    def test_apply_retention(self):
+        """Test samples older than their tier retention are removed."""
+        store = performance_history.PerformanceHistoryStore(
+            self.store.db_path, retention={performance_history.RAW: 1})
+        store.add_results('123', pc.SG, 'sg_1', self.results)
+        store.maintain(now=self.day + 2 * pc.ONE_DAY)
+        self.assertEqual(dict(), store.query(pc.SG))
+        self.assertEqual(2, len(store.query(
+            pc.SG, tier=performance_history.HOURLY)['sg_1']))
+
+    def test_performance_functions_record_history(self):
+        """Test get_performance_stats and collect_stats record results."""
+        conf_file, conf_dir = pf.FakeConfigFile.create_fake_config_file()
+        self.addCleanup(pf.FakeConfigFile.delete_fake_config_file,
+                        conf_file, conf_dir)
+        univmax_conn.file_path = conf_file
+        with mock.patch.object(
+                rest_requests.RestRequests, 'establish_rest_session',
+                return_value=pf.FakeRequestsSession()):
+            perf = univmax_conn.U4VConn(array_id=self.p_data.array).performance
+        perf.set_history_store(self.store)
+        sample = {pc.TIMESTAMP: self.p_data.last_date, 'HostIOs': 1.0}
+        with mock.patch.object(perf, 'post_request', return_value={
+                'resultList': {'result': [sample]}}):
+            perf.get_performance_stats(
+                category=pc.ARRAY, metrics=['HostIOs'],
+                start_time=self.p_data.last_date,
+                end_time=self.p_data.last_date)
+            with mock.patch.object(perf, 'get_performance_key_list',
+                                   return_value={pc.SG_INFO: [{
+                                       pc.SG_ID: 'sg_1',
+                                       pc.FA_DATE: self.p_data.first_date,
+                                       pc.LA_DATE: self.p_data.last_date}]}):
+                perf.collect_stats(
+                    pc.SG, metrics=['HostIOs'],
+                    start_time=self.p_data.last_date,
+                    end_time=self.p_data.last_date)
+        self.assertEqual({self.p_data.array: [sample]},
+                         self.store.query(pc.ARRAY))
+        self.assertEqual({'sg_1': [sample]}, self.store.query(pc.SG))
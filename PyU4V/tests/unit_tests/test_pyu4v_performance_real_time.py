@@ -474,3 +474,78 @@ class PyU4VPerformanceTest(testtools.TestCase):
                 start_date=start, end_date=self.time_now, category=pc.SG,
                 metrics='All', instance_id=self.p_data.storage_group_id,
                 array_id=self.rt.array_id)
+
+    def _stream(self, post, **kwargs):
+        """Stream with a simulated clock advanced by each poll sleep."""
+        clock = [1600000000.0]
+
+        def _sleep(seconds):
+            clock[0] += seconds
+
+        with mock.patch.object(self.rt, '_validate_real_time_input'):
+            with mock.patch.object(time, 'time', side_effect=lambda: clock[0]):
+                with mock.patch.object(time, 'sleep', side_effect=_sleep):
+                    with mock.patch.object(self.rt, 'post_request',
+                                           side_effect=post) as mck_post:
+                        responses = list(self.rt.stream(
+                            pc.FE_DIR, metrics=['IOs'], **kwargs))
+        return responses, mck_post
+
+    @staticmethod
+    def _post_samples(**kwargs):
+        """Return a sample for every five seconds of the requested range."""
+        payload = kwargs['payload']
+        start = payload[pc.START_DATE] + (-payload[pc.START_DATE] % 5000)
+        return {'resultList': {'result': [
+            {pc.TIMESTAMP: t, 'IOs': 1.0,
+             'instance': payload[pc.INSTANCE_ID]} for t in range(
+                start, payload[pc.END_DATE] + 1, 5000)]}}
+
+    def test_stream(self):
+        """Test stream yields each sample once across overlapping polls."""
+        responses, mck_post = self._stream(
+            self._post_samples, instance_ids=['1', '2'], poll_interval=10,
+            duration=20)
+        self.assertEqual(6, mck_post.call_count)
+        for instance_id in ['1', '2']:
+            timestamps = [
+                s[pc.TIMESTAMP] for r in responses
+                if r[pc.INSTANCE_ID_SN] == instance_id for s in r[pc.RESULT]]
+            self.assertEqual(sorted(set(timestamps)), timestamps)
+            # One minute of history then two polls ten seconds apart
+            self.assertEqual(13 + 2 + 2, len(timestamps))
+        for call in mck_post.call_args_list:
+            payload = call[1]['payload']
+            self.assertGreaterEqual(
+                payload[pc.END_DATE] - payload[pc.START_DATE], pc.ONE_MINUTE)
+            self.assertLessEqual(
+                payload[pc.END_DATE] - payload[pc.START_DATE], pc.ONE_HOUR)
+        self.assertTrue(all(r[pc.REAL_TIME_SN] for r in responses))
+
+    def test_stream_instance_failure(self):
+        """Test a failed instance is retried without stopping the stream."""
+        calls = list()
+
+        def _post(**kwargs):
+            calls.append(kwargs['payload'][pc.INSTANCE_ID])
+            if kwargs['payload'][pc.INSTANCE_ID] == '2' and (
+                    calls.count('2') == 1):
+                raise exception.VolumeBackendAPIException('error')
+            return self._post_samples(**kwargs)
+
+        responses, __ = self._stream(
+            _post, instance_ids=['1', '2'], poll_interval=10, duration=10)
+        self.assertEqual(['1', '1', '2'],
+                         [r[pc.INSTANCE_ID_SN] for r in responses])
+        self.assertEqual(15, len(responses[2][pc.RESULT]))
+
+    def test_stream_validates_once(self):
+        """Test input is validated once per instance before polling."""
+        with mock.patch.object(
+                self.rt, '_validate_real_time_input',
+                side_effect=exception.InvalidInputException) as mck_validate:
+            with mock.patch.object(self.rt, 'post_request') as mck_post:
+                self.assertRaises(exception.InvalidInputException, next,
+                                  self.rt.stream(pc.ARRAY))
+                mck_post.assert_not_called()
+        mck_validate.assert_called_once()
@@ -0,0 +1,168 @@
+# Copyright (c) 2025 Dell Inc. or its subsidiaries.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""test_pyu4v_performance_subscriptions.py."""
+
+import testtools
+
+from unittest import mock
+
+from PyU4V import performance_subscriptions as ps
+from PyU4V.utils import exception
+from PyU4V.utils import performance_constants as pc
+
+
+class PyU4VPerformanceSubscriptionsTest(testtools.TestCase):
+    """Test shared performance metric subscriptions."""
+
+    def setUp(self):
+        """setUp."""
+        super(PyU4VPerformanceSubscriptionsTest, self).setUp()
+        self.end_time = 100 * pc.ONE_MINUTE
+        self.performance = mock.Mock(array_id='000111111111')
+        self.performance.format_metrics.side_effect = (
+            lambda m: [m] if isinstance(m, str) else m)
+        self.performance.get_performance_metrics_list.return_value = [
+            'HostIOs', 'HostMBs']
+        self.performance.get_last_available_timestamp.return_value = (
+            self.end_time)
+        self.performance.get_object_key_info.return_value = (
+            pc.SG_ID, {'sg_1': dict(), 'sg_2': dict()})
+        self.performance.common.convert_to_snake_case.return_value = (
+            'storage_group')
+        self.performance.collect_stats.side_effect = self._collect_stats
+        self.manager = ps.SubscriptionManager(self.performance)
+
+    def _collect_stats(self, category, object_ids, metrics, window,
+                       **kwargs):
+        step = 5 * pc.ONE_MINUTE
+        return {pc.RESULT: {o: [
+            dict({pc.TIMESTAMP: self.end_time - i * step},
+                 **{m: float(i) for m in metrics})
+            for i in reversed(range(window // 5 + 1))]
+            for o in object_ids if o != 'sg_missing'},
+            pc.FAILED: {o: 'not found' for o in object_ids
+                        if o == 'sg_missing'}}
+
+    def test_subscribe(self):
+        """Test KPI metrics are resolved and inputs validated."""
+        subscription = self.manager.subscribe(pc.SG, object_ids='sg_1')
+        self.assertEqual(('sg_1',), subscription.object_ids)
+        self.assertEqual(('HostIOs', 'HostMBs'), subscription.metrics)
+        self.assertEqual(pc.SUBSCRIPTION_CADENCE, subscription.window)
+        self.assertEqual('000111111111', subscription.array_id)
+        self.assertRaises(exception.InvalidInputException,
+                          self.manager.subscribe, pc.SG, cadence=0)
+        self.assertRaises(exception.InvalidInputException,
+                          self.manager.subscribe, pc.SG, data_format='Min')
+        self.manager.unsubscribe(subscription)
+        self.assertEqual([], self.manager.get_subscriptions())
+
+    def test_plan_requests(self):
+        """Test overlapping subscriptions are merged per object."""
+        dashboard = self.manager.subscribe(
+            pc.SG, object_ids=['sg_1', 'sg_2'], metrics=['HostIOs'])
+        alerting = self.manager.subscribe(
+            pc.SG, object_ids=['sg_1', 'sg_2'],
+            metrics=['HostIOs', 'ResponseTime'], window=15)
+        report = self.manager.subscribe(pc.SG, metrics='HostMBs')
+        requests = self.manager.plan_requests(
+            [dashboard, alerting, report],
+            {('000111111111', pc.SG): ['sg_1', 'sg_3']})
+        self.assertEqual(
+            [(['sg_1'], ['HostIOs', 'ResponseTime', 'HostMBs'], 15),
+             (['sg_2'], ['HostIOs', 'ResponseTime'], 15),
+             (['sg_3'], ['HostMBs'], 5)],
+            [(r['object_ids'], r[pc.METRICS], r['window'])
+             for r in requests])
+        maximum = self.manager.subscribe(
+            pc.SG, object_ids=['sg_1'], data_format=pc.MAXIMUM)
+        self.assertEqual(2, len(self.manager.plan_requests(
+            [dashboard, maximum])))
+
+    def test_poll_fans_out_results(self):
+        """Test each subscriber receives its own objects, metrics, window."""
+        callback = mock.Mock()
+        dashboard = self.manager.subscribe(
+            pc.SG, object_ids=['sg_1'], metrics=['HostIOs'],
+            callback=callback)
+        alerting = self.manager.subscribe(
+            pc.SG, object_ids=['sg_1', 'sg_missing'],
+            metrics=['HostIOs', 'ResponseTime'], window=15, cadence=1)
+        deliveries = self.manager.poll(now=1000)
+
+        self.performance.collect_stats.assert_called_once_with(
+            pc.SG, object_ids=['sg_1', 'sg_missing'],
+            metrics=['HostIOs', 'ResponseTime'], window=15,
+            array_id='000111111111', data_format=pc.AVERAGE,
+            end_time=self.end_time, max_workers=pc.COLLECT_MAX_WORKERS)
+        self.performance.get_last_available_timestamp.assert_called_once()
+        self.assertEqual(
+            [{pc.TIMESTAMP: self.end_time - 5 * pc.ONE_MINUTE,
+              'HostIOs': 1.0},
+             {pc.TIMESTAMP: self.end_time, 'HostIOs': 0.0}],
+            deliveries[dashboard.subscription_id][pc.RESULT]['sg_1'])
+        self.assertEqual(dict(), deliveries[
+            dashboard.subscription_id][pc.FAILED])
+        callback.assert_called_once_with(
+            dashboard, deliveries[dashboard.subscription_id])
+        response = deliveries[alerting.subscription_id]
+        self.assertEqual(4, len(response[pc.RESULT]['sg_1']))
+        self.assertEqual({'sg_missing': 'not found'}, response[pc.FAILED])
+
+        deliveries = self.manager.poll(now=1060)
+        self.assertEqual([alerting.subscription_id], list(deliveries.keys()))
+        self.assertEqual([], self.manager.get_due_subscriptions(now=1100))
+        self.assertEqual(2, len(self.manager.get_due_subscriptions(
+            now=1000 + pc.SUBSCRIPTION_CADENCE * 60)))
+
+    def test_poll_category_subscription(self):
+        """Test whole category subscriptions and failed requests."""
+        subscription = self.manager.subscribe(pc.SG, metrics='HostIOs')
+        self.performance.collect_stats.side_effect = (
+            exception.VolumeBackendAPIException(data=''))
+        deliveries = self.manager.poll(now=1000)
+        self.performance.get_object_key_info.assert_called_once_with(
+            pc.SG, array_id='000111111111')
+        self.assertEqual(['sg_1', 'sg_2'], sorted(
+            deliveries[subscription.subscription_id][pc.FAILED].keys()))
+        self.assertEqual(dict(), self.manager.poll(now=1001))
+
+    def test_poll_lookup_failures(self):
+        """Test failed lookups only fail the affected subscriptions."""
+        def _get_last_available_timestamp(array_id):
+            if array_id == '000222222222':
+                raise exception.ResourceNotFoundException(data='')
+            return self.end_time
+
+        self.performance.get_last_available_timestamp.side_effect = (
+            _get_last_available_timestamp)
+        self.performance.get_object_key_info.side_effect = (
+            exception.VolumeBackendAPIException(data=''))
+        healthy = self.manager.subscribe(
+            pc.SG, object_ids=['sg_1'], metrics=['HostIOs'])
+        category = self.manager.subscribe(pc.SG, metrics='HostIOs')
+        unregistered = self.manager.subscribe(
+            pc.SG, object_ids=['sg_1', 'sg_2'], metrics=['HostIOs'],
+            array_id='000222222222')
+        deliveries = self.manager.poll(now=1000)
+        self.assertEqual(['sg_1'], list(
+            deliveries[healthy.subscription_id][pc.RESULT].keys()))
+        self.assertEqual([pc.SG], list(
+            deliveries[category.subscription_id][pc.FAILED].keys()))
+        delivery = deliveries[unregistered.subscription_id]
+        self.assertEqual(dict(), delivery[pc.RESULT])
+        self.assertEqual(['sg_1', 'sg_2'], sorted(delivery[pc.FAILED]))
+        self.assertIsNone(delivery['timestamp'])
+        self.performance.collect_stats.assert_called_once()
+        self.assertEqual([], self.manager.get_due_subscriptions(now=1001))
@@ -13,6 +13,7 @@
 # limitations under the License.
 """test_pyu4v_requests.py."""
 
+import io
 import json
 import platform
 import requests
@@ -25,6 +26,7 @@ from PyU4V.tests.unit_tests import pyu4v_common_data as pcd
 from PyU4V.tests.unit_tests import pyu4v_fakes as pf
 from PyU4V.utils import constants
 from PyU4V.utils import exception
+from PyU4V.utils import multipart_encoder
 
 
 class PyU4VRestRequestsTest(testtools.TestCase):
@@ -209,6 +211,17 @@ class PyU4VRestRequestsTest(testtools.TestCase):
             self.assertEqual(200, sc)
             self.assertEqual('OK', response.raw.reason)
 
+    def test_file_transfer_request_download_range(self):
+        """Test file_transfer_request download resuming from an offset."""
+        with mock.patch.object(
+                self.rest, 'establish_rest_session',
+                return_value=pf.FakeRequestsSession()) as mck_est:
+            self.rest.file_transfer_request(
+                method=constants.POST, uri='/system/settings/importfile',
+                download=True, range_start=1024)
+            headers = mck_est.call_args[1]['headers']
+            self.assertEqual('bytes=1024-', headers[constants.RANGE])
+
     def test_file_transfer_request_upload(self):
         """Test file_transfer_request download request."""
         with mock.patch.object(
@@ -229,6 +242,28 @@ class PyU4VRestRequestsTest(testtools.TestCase):
             self.assertEqual(200, sc)
             self.assertEqual('OK', response.raw.reason)
 
+    def test_file_transfer_request_upload_streamed(self):
+        """Test file_transfer_request upload sends a streaming body."""
+        session = pf.FakeRequestsSession()
+        progress = mock.MagicMock()
+        with mock.patch.object(
+                self.rest, 'establish_rest_session', return_value=session):
+            with mock.patch.object(
+                    session, 'request',
+                    wraps=session.request) as mck_request:
+                self.rest.file_transfer_request(
+                    method=constants.POST,
+                    uri='/system/settings/importfile', upload=True,
+                    form_data={constants.ZIP_FILE: io.BytesIO(b'zip')},
+                    progress_callback=progress)
+                kwargs = mck_request.call_args[1]
+        encoder = kwargs['data']
+        self.assertIsInstance(encoder, multipart_encoder.MultipartEncoder)
+        self.assertIsNone(kwargs.get('files'))
+        self.assertEqual(encoder.content_type,
+                         kwargs['headers'][constants.CONTENT_TYPE])
+        self.assertEqual(progress, encoder.progress_callback)
+
     def test_file_transfer_request_download_upload_exception(self):
         """Test file_transfer_request exc download and upload both set."""
         self.assertRaises(
@@ -274,3 +309,102 @@ class PyU4VRestRequestsTest(testtools.TestCase):
                 exception.VolumeBackendAPIException,
                 self.rest.file_transfer_request,
                 method=constants.POST, uri='/fake', download=True)
+
+    def test_rest_request_session_affinity_drops_auth(self):
+        """Test session affinity drops credentials once a cookie is set."""
+        self.rest.session_affinity = True
+        self.rest.session.cookies.set('JSESSIONID', 'abc123')
+        with mock.patch.object(
+                self.rest.session, 'request',
+                return_value=pf.FakeResponse(
+                    200, self.data.server_version)) as mock_request:
+            self.rest.rest_request('/fake_uri', 'GET')
+            self.assertIsNone(self.rest.session.auth)
+            self.rest.rest_request('/fake_uri', 'GET')
+            self.assertEqual(2, mock_request.call_count)
+            self.assertIsNone(mock_request.call_args[1]['auth'])
+        self.assertEqual(
+            'abc123', self.rest.session.cookies.get('JSESSIONID'))
+
+    def test_rest_request_session_affinity_no_cookie(self):
+        """Test session affinity sends credentials until a cookie is set."""
+        self.rest.session_affinity = True
+        with mock.patch.object(
+                self.rest.session, 'request',
+                return_value=pf.FakeResponse(
+                    200, self.data.server_version)) as mock_request:
+            self.rest.rest_request('/fake_uri', 'GET')
+        self.assertEqual('smc', mock_request.call_args[1]['auth'].username)
+        self.assertIsNone(self.rest.session.auth)
+
+    def test_rest_request_session_affinity_reauth_on_401(self):
+        """Test session affinity re-authenticates on a rejected cookie."""
+        self.rest.session_affinity = True
+        self.rest.session.cookies.set('JSESSIONID', 'expired')
+        auth_sent = list()
+
+        def _request(auth, **kwargs):
+            auth_sent.append(auth)
+            if auth is None:
+                return pf.FakeResponse(401, None)
+            self.rest.session.cookies.set('JSESSIONID', 'renewed')
+            return pf.FakeResponse(200, self.data.server_version)
+
+        with mock.patch.object(
+                self.rest.session, 'request', side_effect=_request):
+            response, sc = self.rest.rest_request('/fake_uri', 'GET')
+        self.assertEqual(200, sc)
+        self.assertEqual(self.data.server_version, response)
+        self.assertIsNone(auth_sent[0])
+        self.assertEqual('smc', auth_sent[1].username)
+        self.assertIsNone(self.rest.session.auth)
+        self.assertEqual(
+            'renewed', self.rest.session.cookies.get('JSESSIONID'))
+
+    def test_rest_request_session_affinity_keeps_renewed_cookie(self):
+        """Test a 401 does not clear a cookie renewed by another thread."""
+        self.rest.session_affinity = True
+        self.rest.session.cookies.set('JSESSIONID', 'expired')
+
+        def _request(auth, **kwargs):
+            if auth is None:
+                # Another thread renews the session meanwhile
+                self.rest.session.cookies.set('JSESSIONID', 'renewed')
+                return pf.FakeResponse(401, None)
+            return pf.FakeResponse(200, self.data.server_version)
+
+        with mock.patch.object(
+                self.rest.session, 'request', side_effect=_request):
+            __, sc = self.rest.rest_request('/fake_uri', 'GET')
+        self.assertEqual(200, sc)
+        self.assertEqual(
+            'renewed', self.rest.session.cookies.get('JSESSIONID'))
+
+    def test_rest_request_no_session_affinity_401(self):
+        """Test a 401 is returned as is without session affinity."""
+        with mock.patch.object(
+                self.rest.session, 'request',
+                return_value=pf.FakeResponse(401, None)) as mock_request:
+            __, sc = self.rest.rest_request('/fake_uri', 'GET')
+            mock_request.assert_called_once()
+        self.assertEqual(401, sc)
+        self.assertEqual('smc', self.rest.session.auth.username)
+
+    def test_file_transfer_request_session_affinity(self):
+        """Test file transfers reuse the REST session cookie."""
+        self.rest.session_affinity = True
+        self.rest.session.cookies.set('JSESSIONID', 'abc123')
+        ft_session = requests.session()
+        with mock.patch.object(
+                self.rest, 'establish_rest_session',
+                return_value=ft_session):
+            with mock.patch.object(
+                    ft_session, 'request',
+                    return_value=pf.FakeResponse(
+                        200, dict(), raw_reason='OK')) as mock_request:
+                __, sc = self.rest.file_transfer_request(
+                    method=constants.POST, uri='/fake', download=True)
+        self.assertEqual(200, sc)
+        self.assertIs(self.rest.session.cookies, ft_session.cookies)
+        self.assertIsNone(ft_session.auth)
+        self.assertIsNone(mock_request.call_args[1]['auth'])
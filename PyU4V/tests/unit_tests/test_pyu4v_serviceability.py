@@ -70,6 +70,24 @@ class PyU4VServiceabilityTest(testtools.TestCase):
             dir_path=".", file_name="test", timeout=10)
         self.assertTrue(response['success'])
 
+    def test_download_grab_files_file_object(self):
+        """Test download_grab_files streaming to a file-like object."""
+        file_object = mock.MagicMock()
+        with mock.patch.object(
+                common.CommonFunctions, 'stream_download',
+                return_value={'file_path': None,
+                              constants.BYTES_DOWNLOADED: 16,
+                              constants.SHA256: 'abc'}) as mck_stream:
+            response = self.serviceability.download_grab_files(
+                file_object=file_object, checksum=True)
+            self.assertEqual(file_object,
+                             mck_stream.call_args[1]['file_object'])
+            self.assertIsNone(mck_stream.call_args[1]['file_path'])
+        self.assertTrue(response[constants.SUCCESS])
+        self.assertEqual(16, response[constants.BYTES_DOWNLOADED])
+        self.assertEqual('abc', response[constants.SHA256])
+        self.assertNotIn(constants.SERVICEABILITY_RECORD_PATH, response)
+
     def test_get_ip_configuration(self):
         """Test get_ip_configuration."""
         ip_configuration_result = self.serviceability.get_ip_configuration()
@@ -0,0 +1,47 @@
+# Copyright (c) 2025 Dell Inc. or its subsidiaries.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""test_pyu4v_sqlite_store.py."""
+
+import os
+import shutil
+import tempfile
+import testtools
+
+from PyU4V.utils import sqlite_store
+
+
+class PyU4VSQLiteStoreTest(testtools.TestCase):
+    """Test the shared SQLite store helpers."""
+
+    def setUp(self):
+        """setUp."""
+        super(PyU4VSQLiteStoreTest, self).setUp()
+        self.store_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.store_dir)
+
+    def test_get_default_path(self):
+        """Test get_default_path."""
+        path = sqlite_store.get_default_path('test.db')
+        self.assertTrue(path.endswith(os.path.join('.PyU4V', 'test.db')))
+
+    def test_execute(self):
+        """Test the directory is created and statements are run."""
+        store = sqlite_store.SQLiteStore(
+            os.path.join(self.store_dir, 'sub', 'test.db'))
+        store._execute('CREATE TABLE item (name TEXT)')
+        store._execute('INSERT INTO item VALUES (?)', [('a',), ('b',)],
+                       many=True)
+        self.assertEqual([('a',), ('b',)], store._execute(
+            'SELECT name FROM item ORDER BY name', fetch=True))
+        self.assertEqual(list(), store._execute('DELETE FROM item'))
@@ -247,7 +247,8 @@ class PyU4VSystemTest(testtools.TestCase):
                 return_binary=True)
             mck_dl.assert_called_once_with(
                 request_body=ref_request_body, dir_path='/test/file/path',
-                file_name='test_filename', return_binary=True)
+                file_name='test_filename', return_binary=True,
+                file_object=None)
 
     def test_download_unisphere_settings_1_2_params(self):
         """Test download_unisphere_settings success 1 & 2 output params."""
@@ -265,7 +266,8 @@ class PyU4VSystemTest(testtools.TestCase):
                 exclude_performance_preference_settings=True)
             mck_dl.assert_called_once_with(
                 request_body=ref_request_body, dir_path='/test/file/path',
-                file_name='test_filename', return_binary=True)
+                file_name='test_filename', return_binary=True,
+                file_object=None)
 
     def test_download_unisphere_settings_3_4_params(self):
         """Test download_unisphere_settings success 3 & 4 output params."""
@@ -284,7 +286,8 @@ class PyU4VSystemTest(testtools.TestCase):
                 exclude_performance_metric_settings=True)
             mck_dl.assert_called_once_with(
                 request_body=ref_request_body, dir_path='/test/file/path',
-                file_name='test_filename', return_binary=True)
+                file_name='test_filename', return_binary=True,
+                file_object=None)
 
     def test_download_unisphere_settings_all_excluded_exception(self):
         """Test download_unisphere_settings all settings excluded exception."""
@@ -314,7 +317,8 @@ class PyU4VSystemTest(testtools.TestCase):
                 alert_level_notification_settings=True)
             mck_dl.assert_called_once_with(
                 request_body=ref_request_body, dir_path='/test/file/path',
-                file_name='test_filename', return_binary=True)
+                file_name='test_filename', return_binary=True,
+                file_object=None)
 
     def test_download_system_settings_3_4_params(self):
         """Test download_system_settings success 3 & 4 output params."""
@@ -334,7 +338,8 @@ class PyU4VSystemTest(testtools.TestCase):
                 exclude_performance_threshold_settings=True)
             mck_dl.assert_called_once_with(
                 request_body=ref_request_body, dir_path='/test/file/path',
-                file_name='test_filename', return_binary=True)
+                file_name='test_filename', return_binary=True,
+                file_object=None)
 
     def test_download_system_settings_all_excluded_exception(self):
         """Test download_system_settings all settings excluded exception."""
@@ -361,7 +366,7 @@ class PyU4VSystemTest(testtools.TestCase):
             category=constants.SYSTEM,
             resource_level=constants.SETTINGS,
             resource_type=constants.IMPORT_FILE,
-            form_data=ref_form_data)
+            form_data=ref_form_data, progress_callback=None)
 
     @mock.patch.object(common.CommonFunctions, 'upload_file')
     def test_upload_settings_binary_data(self, mck_up):
@@ -376,7 +381,7 @@ class PyU4VSystemTest(testtools.TestCase):
             category=constants.SYSTEM,
             resource_level=constants.SETTINGS,
             resource_type=constants.IMPORT_FILE,
-            form_data=ref_form_data)
+            form_data=ref_form_data, progress_callback=None)
 
     def test_upload_settings_path_exception(self):
         """Test upload_settings path doesn't exist exception."""
@@ -480,6 +485,39 @@ class PyU4VSystemTest(testtools.TestCase):
             self.assertTrue(response[SUCCESS])
             self.assertIn('/test/test.pdf', str(response[AUDIT_RECORD_PATH]))
 
+    def test_download_audit_log_record_file_object(self):
+        """Test download_audit_log_record streaming to a file-like object."""
+        file_object = mock.MagicMock()
+        with mock.patch.object(
+                common.CommonFunctions, 'stream_download',
+                return_value={constants.BYTES_DOWNLOADED: 16}) as mck_stream:
+            response = self.system.download_audit_log_record(
+                file_name='test', file_object=file_object)
+            mck_stream.assert_called_once_with(
+                file_object=file_object, category=SYSTEM,
+                resource_level=SYMMETRIX,
+                resource_level_id=self.system.array_id,
+                resource_type=AUDIT_LOG_RECORD, resource=EXPORT_FILE,
+                payload={AUDIT_LOG_FILENAME: 'test'}, timeout=None)
+        self.assertTrue(response[SUCCESS])
+        self.assertEqual(16, response[constants.BYTES_DOWNLOADED])
+        self.assertNotIn(BINARY_DATA, response)
+
+    @mock.patch.object(
+        common.CommonFunctions, 'stream_download',
+        return_value={constants.BYTES_DOWNLOADED: 16})
+    def test_download_settings_file_object(self, mck_stream):
+        """Test _download_settings streaming to a file-like object."""
+        file_object = mock.MagicMock()
+        response = self.system._download_settings(
+            request_body=dict(), file_object=file_object)
+        mck_stream.assert_called_once_with(
+            file_object=file_object, category=constants.SYSTEM,
+            resource_level=constants.SETTINGS,
+            resource_type=constants.EXPORT_FILE, payload=dict())
+        self.assertTrue(response['success'])
+        self.assertEqual(16, response[constants.BYTES_DOWNLOADED])
+
     def test_get_director_list(self):
         """Test get_director_list."""
         array_id = self.data.array
@@ -0,0 +1,164 @@
+# Copyright (c) 2025 Dell Inc. or its subsidiaries.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""test_pyu4v_threshold_evaluator.py."""
+
+import testtools
+
+from unittest import mock
+
+from PyU4V import threshold_evaluator as te
+from PyU4V.utils import performance_constants as pc
+
+
+class PyU4VThresholdEvaluatorTest(testtools.TestCase):
+    """Test local threshold evaluation."""
+
+    def setUp(self):
+        """setUp."""
+        super(PyU4VThresholdEvaluatorTest, self).setUp()
+        self.category_settings = {
+            pc.CATEGORY: pc.SG,
+            pc.PERF_THRESH: [
+                {pc.METRIC: 'HostIOs', pc.KPI: 'True',
+                 pc.ALERT_ERR: 'True', pc.FIRST_THRESH: 100,
+                 pc.FIRST_THRESH_OCC: 2, pc.FIRST_THRESH_SAMP: 3,
+                 pc.SEC_THRESH: 200},
+                {pc.METRIC: 'HostMBs', pc.KPI: 'True',
+                 pc.ALERT_ERR: 'False', pc.FIRST_THRESH: 0,
+                 pc.SEC_THRESH: ''}]}
+        self.global_thresholds = {'global_performance_thresholds': [
+            {pc.CATEGORY: pc.SG, pc.METRIC: 'HostIOs', 'kpi': True,
+             'alert_error': True, 'first_upper_threshold': 100.0,
+             'second_upper_threshold': '', 'first_lower_threshold': 5.0,
+             'second_lower_threshold': None}]}
+
+    @staticmethod
+    def _samples(values, start=1):
+        return [{pc.TIMESTAMP: (start + i) * 300000, 'HostIOs': v}
+                for i, v in enumerate(values)]
+
+    def test_rules_from_category_settings(self):
+        """Test unset thresholds are skipped and defaults applied."""
+        rules = te.rules_from_category_settings(self.category_settings)
+        self.assertEqual(3, len(rules))
+        first, second, zero = rules
+        self.assertEqual((pc.SG, 'HostIOs', 100.0, te.UPPER, 2, 3,
+                          pc.WARN_LVL, True),
+                         (first.category, first.metric, first.threshold,
+                          first.direction, first.occurrences, first.samples,
+                          first.severity, first.alert))
+        self.assertEqual((pc.THRESH_OCC, pc.THRESH_SAMP, pc.CRIT_LVL),
+                         (second.occurrences, second.samples,
+                          second.severity))
+        self.assertEqual(('HostMBs', pc.FIRST_THRESH, 0.0),
+                         (zero.metric, zero.name, zero.threshold))
+
+    def test_rules_from_global_thresholds(self):
+        """Test upper and lower thresholds from settings."""
+        rules = te.rules_from_global_thresholds(self.global_thresholds)
+        self.assertEqual(
+            [('first_upper_threshold', te.UPPER, 100.0),
+             ('first_lower_threshold', te.LOWER, 5.0)],
+            [(r.name, r.direction, r.threshold) for r in rules])
+
+    def test_from_performance(self):
+        """Test thresholds are loaded once per category."""
+        performance = mock.Mock()
+        performance.get_threshold_categories.return_value = [pc.SG, pc.ARRAY]
+        performance.get_threshold_category_settings.side_effect = [
+            self.category_settings, None]
+        evaluator = te.ThresholdEvaluator.from_performance(
+            performance, array_id='000123456789')
+        self.assertEqual([pc.SG], list(evaluator.rules.keys()))
+        performance.get_threshold_category_settings.assert_called_with(
+            pc.ARRAY, array_id='000123456789')
+
+    def test_from_settings_enabled_only(self):
+        """Test thresholds without alerts enabled can be skipped."""
+        settings = mock.Mock()
+        self.global_thresholds['global_performance_thresholds'][0][
+            'alert_error'] = False
+        settings.get_performance_thresholds_and_alerts.return_value = (
+            self.global_thresholds)
+        evaluator = te.ThresholdEvaluator.from_settings(
+            settings, category=pc.SG, enabled_only=True)
+        self.assertEqual(dict(), evaluator.rules)
+        settings.get_performance_thresholds_and_alerts.assert_called_once_with(
+            category=pc.SG)
+
+    def test_evaluate_occurrences_within_samples(self):
+        """Test breach and clear events over a sliding window."""
+        evaluator = te.ThresholdEvaluator(te.rules_from_category_settings(
+            self.category_settings))
+        events = evaluator.evaluate(
+            pc.SG, {'sg_1': self._samples([150, 50, 150, 50, 50]),
+                    'sg_2': self._samples([50, 50, 50])})
+        self.assertEqual(
+            [(te.BREACHED, 'sg_1', 3 * 300000, pc.WARN_LVL),
+             (te.CLEARED, 'sg_1', 4 * 300000, pc.WARN_LVL)],
+            [(e['state'], e['object_id'], e[pc.TIMESTAMP], e['severity'])
+             for e in events])
+        self.assertEqual([], evaluator.get_breaches())
+
+    def test_evaluate_across_calls(self):
+        """Test windows persist between calls and samples are deduped."""
+        evaluator = te.ThresholdEvaluator(te.rules_from_category_settings(
+            self.category_settings))
+        events = evaluator.evaluate(
+            pc.SG, self._samples([250, 250]), object_id='sg_1')
+        self.assertEqual([pc.FIRST_THRESH],
+                         [e['threshold_name'] for e in events])
+        response = {pc.RESULT: self._samples([250, 250, 250]),
+                    pc.INSTANCE_ID_SN: 'sg_1'}
+        events = evaluator.evaluate(pc.SG, response)
+        self.assertEqual([(te.BREACHED, pc.SEC_THRESH, 3 * 300000, 3)],
+                         [(e['state'], e['threshold_name'], e[pc.TIMESTAMP],
+                           e['occurrences']) for e in events])
+        self.assertEqual(2, len(evaluator.get_breaches()))
+        evaluator.reset()
+        self.assertEqual([], evaluator.get_breaches())
+
+    def test_evaluate_objects_in_one_column(self):
+        """Test objects are evaluated independently in one column."""
+        evaluator = te.ThresholdEvaluator([te.ThresholdRule(
+            pc.SG, 'HostIOs', pc.FIRST_THRESH, 100.0, te.UPPER, 2, 3,
+            pc.WARN_LVL, True)])
+        evaluator.evaluate(pc.SG, {'sg_1': self._samples([150, 50]),
+                                   'sg_2': self._samples([150])})
+        events = evaluator.evaluate(
+            pc.SG, {'sg_1': self._samples([50, 150, 50, 150], start=2),
+                    'sg_2': self._samples([50, 150, 50], start=2),
+                    'sg_3': self._samples([150, 150])})
+        self.assertEqual(
+            [('sg_1', te.BREACHED, 3 * 300000, 2, 3),
+             ('sg_1', te.CLEARED, 4 * 300000, 1, 3),
+             ('sg_1', te.BREACHED, 5 * 300000, 2, 3),
+             ('sg_2', te.BREACHED, 3 * 300000, 2, 3),
+             ('sg_2', te.CLEARED, 4 * 300000, 1, 3),
+             ('sg_3', te.BREACHED, 2 * 300000, 2, 2)],
+            [(e['object_id'], e['state'], e[pc.TIMESTAMP],
+              e['occurrences'], e['samples']) for e in events])
+        self.assertEqual(['sg_1', 'sg_3'], sorted(
+            breach[1] for breach in evaluator.get_breaches()))
+
+    def test_evaluate_lower_threshold(self):
+        """Test lower thresholds are breached by low values."""
+        evaluator = te.ThresholdEvaluator(te.rules_from_global_thresholds(
+            self.global_thresholds))
+        events = evaluator.evaluate(
+            pc.SG, {'sg_1': self._samples([1, 1, 1])})
+        self.assertEqual(['first_lower_threshold'],
+                         [e['threshold_name'] for e in events])
+        self.assertEqual([], evaluator.evaluate(pc.ARRAY, {
+            'array': self._samples([1, 1, 1])}))
@@ -15,7 +15,10 @@
 
 import configparser
 import csv
+import hashlib
+import io
 import os
+import requests
 import six
 import testtools
 import time
@@ -30,6 +33,7 @@ from PyU4V.utils import console
 from PyU4V.utils import constants
 from PyU4V.utils import exception
 from PyU4V.utils import file_handler
+from PyU4V.utils import multipart_encoder
 from PyU4V.utils import time_handler
 
 
@@ -322,6 +326,84 @@ class PyU4VUtilsTest(testtools.TestCase):
             data=dict(), file_extension=None, file_name='test',
             dir_path='fake')
 
+    def test_stream_binary_data_buffered(self):
+        """Test stream_binary_data buffers writes, progress and checksum."""
+        test_data = pf.FakeResponse(200, dict(), content=b'0123456789')
+        file_object = mock.MagicMock()
+        progress = mock.MagicMock()
+        checksum = hashlib.sha256()
+        response = self.file.stream_binary_data(
+            test_data, file_object, chunk_size=2, buffer_size=4,
+            progress_callback=progress, checksum=checksum, bytes_done=5,
+            total_bytes=15)
+        self.assertEqual(15, response)
+        self.assertEqual(
+            [mock.call(bytearray(b'0123')), mock.call(bytearray(b'4567')),
+             mock.call(bytearray(b'89'))],
+            file_object.write.call_args_list)
+        self.assertEqual(5, progress.call_count)
+        progress.assert_called_with(15, 15)
+        self.assertEqual(hashlib.sha256(b'0123456789').hexdigest(),
+                         checksum.hexdigest())
+
+    def test_stream_binary_data_flush_on_error(self):
+        """Test stream_binary_data flushes received data on failure."""
+        test_data = mock.MagicMock()
+        test_data.iter_content.return_value = self._failing_iter()
+        file_object = mock.MagicMock()
+        self.assertRaises(
+            IOError, self.file.stream_binary_data, test_data, file_object,
+            buffer_size=1024)
+        file_object.write.assert_called_once_with(bytearray(b'abcd'))
+
+    @staticmethod
+    def _failing_iter():
+        yield b'ab'
+        yield b'cd'
+        raise IOError
+
+    # utils.multipart_encoder
+    def test_multipart_encoder_matches_requests(self):
+        """Test encoded body matches the body requests builds for files."""
+        fields = {constants.ZIP_FILE: b'test_binary_data' * 100,
+                  constants.TGT_ARRAYS: self.data.array,
+                  constants.FILE_PASSWORD: 'test_password'}
+        ref_body, ref_content_type = (
+            requests.models.RequestEncodingMixin._encode_files(fields, {}))
+        boundary = ref_content_type.split('boundary=')[1]
+        encoder = multipart_encoder.MultipartEncoder(
+            fields, boundary=boundary, chunk_size=64)
+        chunks = list(encoder)
+        self.assertEqual(ref_body, b''.join(chunks))
+        self.assertEqual(ref_content_type, encoder.content_type)
+        self.assertEqual(len(ref_body), len(encoder))
+        self.assertTrue(max(len(chunk) for chunk in chunks) < 256)
+
+    def test_multipart_encoder_file_object(self):
+        """Test file values are streamed, rewound and named."""
+        file_object = io.BytesIO(b'0123456789')
+        file_object.name = '/tmp/settings.zip'
+        progress = mock.MagicMock()
+        encoder = multipart_encoder.MultipartEncoder(
+            {constants.ZIP_FILE: file_object}, boundary='b', chunk_size=4,
+            progress_callback=progress)
+        body = b''.join(encoder)
+        self.assertEqual(body, b''.join(encoder))
+        self.assertIn(b'filename="settings.zip"', body)
+        self.assertIn(b'\r\n\r\n0123456789\r\n--b--\r\n', body)
+        self.assertEqual(len(body), encoder.length)
+        progress.assert_called_with(len(body), len(body))
+
+    def test_multipart_encoder_unknown_length(self):
+        """Test an unsized value results in chunked transfer encoding."""
+        stream = mock.MagicMock(spec=['read'])
+        stream.read.side_effect = [b'data', b'']
+        encoder = multipart_encoder.MultipartEncoder(
+            {constants.ZIP_FILE: stream}, boundary='b')
+        self.assertIsNone(encoder.length)
+        self.assertEqual(0, len(encoder))
+        self.assertIn(b'\r\n\r\ndata\r\n', b''.join(encoder))
+
     # utils.time_handler
     def test_format_time_input_return_seconds_from_seconds(self):
         """Test format_time_input input seconds return seconds."""
@@ -0,0 +1,399 @@
+# Copyright (c) 2025 Dell Inc. or its subsidiaries.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""threshold_evaluator.py."""
+
+import bisect
+import collections
+import itertools
+import logging
+import operator
+import threading
+
+from PyU4V.utils import performance_aggregation
+from PyU4V.utils import performance_constants as pc
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+LOG = logging.getLogger(__name__)
+
+UPPER = 'upper'
+LOWER = 'lower'
+BREACHED = 'breached'
+CLEARED = 'cleared'
+HISTORY = 'history'
+
+ThresholdRule = collections.namedtuple('ThresholdRule', [
+    'category', 'metric', 'name', 'threshold', 'direction', 'occurrences',
+    'samples', 'severity', 'alert'])
+
+# Settings threshold name and default severity
+SETTINGS_THRESHOLDS = [
+    ('first_upper_threshold', UPPER, pc.WARN_LVL),
+    ('second_upper_threshold', UPPER, pc.CRIT_LVL),
+    ('first_lower_threshold', LOWER, pc.WARN_LVL),
+    ('second_lower_threshold', LOWER, pc.CRIT_LVL)]
+
+
+def _to_float(value):
+    """Convert a threshold value, returning None if it is not set.
+
+    Unisphere reports thresholds which are not set as an empty value, 0 is
+    a valid threshold.
+
+    :param value: threshold value -- str, int or float
+    :returns: threshold -- float
+    """
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_bool(value):
+    """Convert a flag which may be returned as a string.
+
+    :param value: flag -- str or bool
+    :returns: flag -- bool
+    """
+    if isinstance(value, str):
+        return value.lower() == 'true'
+    return bool(value)
+
+
+def _rolling_breaches(values, group_starts, rule):
+    """Apply the occurrences within samples rule to a metric column.
+
+    The breach mask of the column is summed cumulatively, the occurrences
+    in the window of each row are then the difference between two sums.
+    Windows do not extend before the first row of their object.
+
+    :param values: metric values of every object in timestamp
+                   order -- array
+    :param group_starts: first row of the object of each row -- array
+    :param rule: threshold rule -- ThresholdRule
+    :returns: breached flags, occurrences and samples in the window of
+              each row -- tuple
+    """
+    window = max(rule.samples, 1)
+    if numpy is not None:
+        mask = values > rule.threshold if rule.direction == UPPER else (
+            values < rule.threshold)
+        totals = numpy.concatenate(([0], numpy.cumsum(mask)))
+        rows = numpy.arange(1, len(values) + 1)
+        starts = numpy.maximum(group_starts, rows - window)
+        occurrences = totals[rows] - totals[starts]
+        return occurrences >= rule.occurrences, occurrences, rows - starts
+    compare = operator.gt if rule.direction == UPPER else operator.lt
+    totals = [0] + list(itertools.accumulate(
+        compare(value, rule.threshold) for value in values))
+    starts = [max(start, row - window)
+              for row, start in enumerate(group_starts, 1)]
+    occurrences = [totals[row] - totals[start]
+                   for row, start in enumerate(starts, 1)]
+    return ([count >= rule.occurrences for count in occurrences],
+            occurrences,
+            [row - start for row, start in enumerate(starts, 1)])
+
+
+def _changed_rows(breached, new_rows, first_rows, previous):
+    """Get the new rows where the breached state of an object changes.
+
+    :param breached: breached flag of each row -- array
+    :param new_rows: rows not evaluated by a previous call -- array
+    :param first_rows: first new row of each object -- list
+    :param previous: breached state of each object before its first new
+                     row -- list
+    :returns: changed rows in order -- list
+    """
+    if numpy is not None:
+        before = numpy.empty_like(breached)
+        before[1:] = breached[:-1]
+        before[first_rows] = previous
+        return numpy.flatnonzero(new_rows & (breached != before)).tolist()
+    before = [False] + list(breached[:-1])
+    for row, state in zip(first_rows, previous):
+        before[row] = state
+    return [row for row, is_new in enumerate(new_rows)
+            if is_new and breached[row] != before[row]]
+
+
+def rules_from_category_settings(settings):
+    """Get threshold rules from get_threshold_category_settings output.
+
+    :param settings: category threshold settings -- dict
+    :returns: threshold rules -- list
+    """
+    rules = list()
+    category = settings.get(pc.CATEGORY)
+    for metric_settings in settings.get(pc.PERF_THRESH) or list():
+        for name, occurrences, samples, severity, default_severity in [
+                (pc.FIRST_THRESH, pc.FIRST_THRESH_OCC, pc.FIRST_THRESH_SAMP,
+                 pc.FIRST_THRESH_SEV, pc.WARN_LVL),
+                (pc.SEC_THRESH, pc.SEC_THRESH_OCC, pc.SEC_THRESH_SAMP,
+                 pc.SEC_THRESH_SEV, pc.CRIT_LVL)]:
+            threshold = _to_float(metric_settings.get(name))
+            if threshold is None:
+                continue
+            rules.append(ThresholdRule(
+                category, metric_settings.get(pc.METRIC), name, threshold,
+                UPPER,
+                int(metric_settings.get(occurrences) or pc.THRESH_OCC),
+                int(metric_settings.get(samples) or pc.THRESH_SAMP),
+                metric_settings.get(severity) or default_severity,
+                _to_bool(metric_settings.get(pc.ALERT_ERR))))
+    return rules
+
+
+def rules_from_global_thresholds(thresholds):
+    """Get threshold rules from get_performance_thresholds_and_alerts output.
+
+    Upper thresholds are breached by values above the threshold and lower
+    thresholds by values below it.
+
+    :param thresholds: global performance thresholds -- dict
+    :returns: threshold rules -- list
+    """
+    rules = list()
+    for metric_settings in thresholds.get(
+            'global_performance_thresholds') or list():
+        for name, direction, default_severity in SETTINGS_THRESHOLDS:
+            threshold = _to_float(metric_settings.get(name))
+            if threshold is None:
+                continue
+            rules.append(ThresholdRule(
+                metric_settings.get(pc.CATEGORY),
+                metric_settings.get(pc.METRIC), name, threshold, direction,
+                int(metric_settings.get(
+                    '{n}_occurrences'.format(n=name)) or pc.THRESH_OCC),
+                int(metric_settings.get(
+                    '{n}_samples'.format(n=name)) or pc.THRESH_SAMP),
+                metric_settings.get(
+                    '{n}_severity'.format(n=name)) or default_severity,
+                _to_bool(metric_settings.get('alert_error'))))
+    return rules
+
+
+class ThresholdEvaluator(object):
+    """Evaluate performance thresholds locally against collected samples.
+
+    A threshold is breached when at least occurrences of the last samples
+    values of a metric for an object exceed it, or fall below it for lower
+    thresholds, the rule Unisphere uses to raise performance alerts.
+    Threshold definitions are loaded once, then results from
+    get_performance_stats, collect_stats, IncrementalCollector or real-time
+    streams can be evaluated as they are collected without further REST
+    calls.
+
+    Each metric column is evaluated for every object at once, a breach mask
+    is calculated over the column and the occurrences within samples rule
+    is applied with a rolling sum, using NumPy if installed. The last
+    values of each object and metric are kept so windows continue across
+    calls, and samples at or before the last timestamp evaluated for an
+    object are ignored, so overlapping results can be evaluated safely.
+    """
+
+    def __init__(self, rules, enabled_only=False):
+        """__init__.
+
+        :param rules: threshold rules -- list
+        :param enabled_only: only evaluate thresholds with alerts
+                             enabled -- bool
+        """
+        self.rules = dict()
+        for rule in rules:
+            if enabled_only and not rule.alert:
+                continue
+            self.rules.setdefault(rule.category, dict()).setdefault(
+                rule.metric, list()).append(rule)
+        self._state = dict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_performance(cls, performance, categories=None, array_id=None,
+                         enabled_only=False):
+        """Load thresholds using PerformanceFunctions.
+
+        :param performance: performance functions -- PerformanceFunctions
+        :param categories: threshold categories, defaults to all -- list
+        :param array_id: array id -- str
+        :param enabled_only: only evaluate thresholds with alerts
+                             enabled -- bool
+        :returns: evaluator -- ThresholdEvaluator
+        """
+        categories = categories or performance.get_threshold_categories(
+            array_id=array_id)
+        rules = list()
+        for category in categories:
+            settings = performance.get_threshold_category_settings(
+                category, array_id=array_id)
+            if settings:
+                rules.extend(rules_from_category_settings(settings))
+        return cls(rules, enabled_only=enabled_only)
+
+    @classmethod
+    def from_settings(cls, settings, category=None, enabled_only=False):
+        """Load thresholds using SettingsFunctions.
+
+        :param settings: settings functions -- SettingsFunctions
+        :param category: only load thresholds for this category -- str
+        :param enabled_only: only evaluate thresholds with alerts
+                             enabled -- bool
+        :returns: evaluator -- ThresholdEvaluator
+        """
+        thresholds = settings.get_performance_thresholds_and_alerts(
+            category=category)
+        return cls(rules_from_global_thresholds(thresholds),
+                   enabled_only=enabled_only)
+
+    def evaluate(self, category, results, object_id=None):
+        """Evaluate new samples against the thresholds of a category.
+
+        :param category: performance category e.g. StorageGroup -- str
+        :param results: performance results, a list of samples, samples
+                        keyed by object id, a get_performance_stats,
+                        collect_stats or real-time response, or a
+                        PerformanceFrame -- list, dict or PerformanceFrame
+        :param object_id: object id of a list of samples, defaults to the
+                          instance id of a real-time response -- str
+        :returns: threshold events, a breached event when a threshold is
+                  first breached and a cleared event when it is no longer
+                  breached -- list
+        """
+        metric_rules = self.rules.get(category)
+        if not metric_rules:
+            return list()
+        if isinstance(results, dict) and pc.RESULT in results:
+            if object_id is None:
+                object_id = results.get(pc.INSTANCE_ID_SN)
+            results = results[pc.RESULT]
+        if isinstance(results, list):
+            results = {object_id: results}
+        frame = performance_aggregation.as_frame(results)
+
+        events = list()
+        with self._lock:
+            for metric, rules in metric_rules.items():
+                series = performance_aggregation.get_series(frame, metric)
+                if series:
+                    events.extend(self._evaluate_metric(
+                        category, metric, rules, series))
+        return events
+
+    def _evaluate_metric(self, category, metric, rules, series):
+        """Evaluate the new samples of one metric for every object.
+
+        The values kept from previous calls and the new samples of each
+        object are joined into one column, which is evaluated for each rule
+        with _rolling_breaches.
+
+        :param category: performance category -- str
+        :param metric: metric name -- str
+        :param rules: threshold rules for the metric -- list
+        :param series: timestamps and values in order keyed by object
+                       id -- dict
+        :returns: threshold events in object and timestamp order -- list
+        """
+        history_size = max(max(rule.samples, 1) for rule in rules) - 1
+        objects, value_segments, row = list(), list(), 0
+        for object_id, (timestamps, values) in series.items():
+            key = (category, object_id, metric)
+            state = self._state.get(key)
+            if state is None:
+                state = self._state[key] = {
+                    pc.TIMESTAMP: None, HISTORY: list(),
+                    BREACHED: [False] * len(rules)}
+            new = 0 if state[pc.TIMESTAMP] is None else bisect.bisect_right(
+                timestamps, state[pc.TIMESTAMP])
+            if new == len(timestamps):
+                continue
+            first_new = row + len(state[HISTORY])
+            end = first_new + len(timestamps) - new
+            objects.append((object_id, state, row, first_new, end,
+                            timestamps[new:]))
+            value_segments.extend([state[HISTORY], values[new:]])
+            row = end
+        if not objects:
+            return list()
+
+        first_rows = [o[3] for o in objects]
+        if numpy is not None:
+            values = numpy.concatenate([numpy.asarray(
+                segment, dtype=numpy.float64) for segment in value_segments])
+            group_starts = numpy.repeat(
+                [o[2] for o in objects], [o[4] - o[2] for o in objects])
+            new_rows = numpy.ones(row, dtype=bool)
+            for __, __, start, first_new, __, __ in objects:
+                new_rows[start:first_new] = False
+        else:
+            values = list(itertools.chain.from_iterable(value_segments))
+            group_starts, new_rows = list(), list()
+            for __, __, start, first_new, end, __ in objects:
+                group_starts.extend([start] * (end - start))
+                new_rows.extend([False] * (first_new - start))
+                new_rows.extend([True] * (end - first_new))
+
+        events = list()
+        for index, rule in enumerate(rules):
+            breached, occurrences, samples = _rolling_breaches(
+                values, group_starts, rule)
+            for changed in _changed_rows(
+                    breached, new_rows, first_rows,
+                    [o[1][BREACHED][index] for o in objects]):
+                object_id, __, __, first_new, __, timestamps = objects[
+                    bisect.bisect_right(first_rows, changed) - 1]
+                events.append((changed, index, {
+                    'state': BREACHED if breached[changed] else CLEARED,
+                    pc.CATEGORY: category, 'object_id': object_id,
+                    pc.METRIC: metric, 'threshold_name': rule.name,
+                    pc.THRESHOLD: rule.threshold, 'severity': rule.severity,
+                    'value': float(values[changed]),
+                    pc.TIMESTAMP: int(timestamps[changed - first_new]),
+                    'occurrences': int(occurrences[changed]),
+                    'samples': int(samples[changed])}))
+            for __, state, __, __, end, __ in objects:
+                state[BREACHED][index] = bool(breached[end - 1])
+
+        for __, state, start, __, end, timestamps in objects:
+            state[pc.TIMESTAMP] = int(timestamps[-1])
+            state[HISTORY] = [float(value) for value in values[
+                max(start, end - history_size):end]] if history_size else (
+                list())
+        events.sort(key=lambda event: event[:2])
+        return [event[2] for event in events]
+
+    def get_breaches(self):
+        """Get the thresholds currently breached.
+
+        :returns: category, object id, metric and threshold name of each
+                  breached threshold -- list
+        """
+        breaches = list()
+        with self._lock:
+            for (category, object_id, metric), state in self._state.items():
+                rules = self.rules[category][metric]
+                for rule, breached in zip(rules, state[BREACHED]):
+                    if breached:
+                        breaches.append(
+                            (category, object_id, metric, rule.name))
+        return breaches
+
+    def reset(self):
+        """Discard the sample windows of every object."""
+        with self._lock:
+            self._state = dict()
@@ -32,6 +32,8 @@ from PyU4V.system import SystemFunctions
 from PyU4V.utils import config_handler
 from PyU4V.utils import constants
 from PyU4V.utils import exception
+from PyU4V.utils.metadata_store import MetadataStore
+from PyU4V.utils.timestamp_index import TimestampIndex
 from PyU4V.workload_planner import WLPFunctions
 from PyU4V.volumes import VolumesFunctions
 from PyU4V.storage_groups import StorageGroupsFunctions
@@ -53,6 +55,9 @@ PASSWORD = constants.PASSWORD
 SERVER_IP = constants.SERVER_IP
 PORT = constants.PORT
 VERIFY = constants.VERIFY
+METADATA_CACHE = constants.METADATA_CACHE
+METADATA_CACHE_PATH = constants.METADATA_CACHE_PATH
+SESSION_AFFINITY = constants.SESSION_AFFINITY
 MAJOR_VERSION = MAJOR_VERSION
 
 
@@ -64,8 +69,21 @@ class U4VConn(object):
                  u4v_version=constants.UNISPHERE_VERSION,
                  interval=5, retries=200, array_id=None,
                  application_type=app_type, remote_array=None,
-                 remote_array_2=None, proxies=None, timeout=None):
-        """__init__."""
+                 remote_array_2=None, proxies=None, timeout=None,
+                 metadata_cache=None, metadata_cache_path=None,
+                 session_affinity=None):
+        """__init__.
+
+        :param metadata_cache: keep static Unisphere facts such as
+                               performance categories and director lists in
+                               a persistent store shared between
+                               processes -- bool
+        :param metadata_cache_path: metadata store location, defaults to
+                                    ~/.PyU4V/metadata.db -- str
+        :param session_affinity: reuse the Unisphere session cookie across
+                                 requests and file transfers instead of
+                                 authenticating every request -- bool
+        """
         config = config_handler.set_logger_and_config(file_path)
         self.end_date = int(round(time.time() * 1000))
         self.start_date = (self.end_date - 3600000)
@@ -102,6 +120,15 @@ class U4VConn(object):
                 self.remote_array_2 = None
             if config.has_option(SETUP, 'timeout') and timeout is None:
                 self.timeout = int(config.get(SETUP, 'timeout'))
+            if config.has_option(SETUP, METADATA_CACHE) and (
+                    metadata_cache is None):
+                metadata_cache = config.getboolean(SETUP, METADATA_CACHE)
+            if config.has_option(SETUP, METADATA_CACHE_PATH) and (
+                    not metadata_cache_path):
+                metadata_cache_path = config.get(SETUP, METADATA_CACHE_PATH)
+            if config.has_option(SETUP, SESSION_AFFINITY) and (
+                    session_affinity is None):
+                session_affinity = config.getboolean(SETUP, SESSION_AFFINITY)
 
         # Set verification
         if verify is None:
@@ -120,10 +147,22 @@ class U4VConn(object):
         enhanced_api_url = f'https://{server_ip}:{port}/univmax/rest'
         self.rest_client = RestRequests(
             username, password, verify, base_url, interval, retries,
-            application_type, proxies=proxies, timeout=self.timeout)
+            application_type, proxies=proxies, timeout=self.timeout,
+            session_affinity=bool(session_affinity))
         self.enhanced_rest_client = RestRequests(
             username, password, verify, enhanced_api_url, interval, retries,
-            application_type, proxies=proxies, timeout=self.timeout)
+            application_type, proxies=proxies, timeout=self.timeout,
+            session_affinity=bool(session_affinity))
+        self.metadata_store = None
+        if metadata_cache:
+            self.metadata_store = MetadataStore(
+                db_path=metadata_cache_path,
+                server='{ip}:{port}'.format(ip=server_ip, port=port))
+            self.rest_client.metadata_store = self.metadata_store
+            self.enhanced_rest_client.metadata_store = self.metadata_store
+        self.timestamp_index = TimestampIndex()
+        self.rest_client.timestamp_index = self.timestamp_index
+        self.enhanced_rest_client.timestamp_index = self.timestamp_index
         self.request = self.rest_client.rest_request
         self.common = CommonFunctions(self.rest_client)
         self.validate_unisphere()
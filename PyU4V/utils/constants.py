@@ -25,6 +25,7 @@ PASSWORD = 'password'
 SERVER_IP = 'server_ip'
 PORT = 'port'
 VERIFY = 'verify'
+SESSION_AFFINITY = 'session_affinity'
 
 # HTTP constants
 GET = 'GET'
@@ -34,6 +35,8 @@ DELETE = 'DELETE'
 CONTENT_TYPE = 'content-type'
 ACCEPT = 'accept'
 ACCEPT_ENC = 'Accept-Encoding'
+CONTENT_LENGTH = 'Content-Length'
+RANGE = 'Range'
 USER_AGENT = 'user-agent'
 APP_TYPE = 'application-type'
 APP_JSON = 'application/json'
@@ -96,11 +99,29 @@ SERVICEABILITY = 'serviceability'
 NTP_SERVER = "ntp_server"
 SYMMETRIX_ID = "symmetrix_id"
 
+# Metadata store constants
+METADATA_CACHE = 'metadata_cache'
+METADATA_CACHE_PATH = 'metadata_cache_path'
+METADATA_STORE_FILENAME = 'metadata.db'
+METADATA_UNISPHERE_SCOPE = 'unisphere'
+METADATA_DEFAULT_MAX_AGE = 86400
+METADATA_VERSION_INTERVAL = 3600
+
+# Performance collection constants
+WATERMARK_STORE_FILENAME = 'watermarks.db'
+HISTORY_STORE_FILENAME = 'performance_history.db'
+HISTORY_TIER_RAW = 'raw'
+HISTORY_TIER_HOURLY = 'hourly'
+HISTORY_TIER_DAILY = 'daily'
+HISTORY_RETENTION_DAYS = {HISTORY_TIER_RAW: 7, HISTORY_TIER_HOURLY: 90,
+                          HISTORY_TIER_DAILY: 1095}
+
 # Status Codes
 STATUS_200 = 200
 STATUS_201 = 201
 STATUS_202 = 202
 STATUS_204 = 204
+STATUS_206 = 206
 STATUS_401 = 401
 STATUS_404 = 404
 
@@ -392,6 +413,12 @@ ZIP_SUFFIX = '.zip'
 PDF_SUFFIX = '.pdf'
 FILE_READ_MODE = 'rb'
 FILE_WRITE_MODE = 'wb'
+FILE_APPEND_MODE = 'ab'
+DOWNLOAD_CHUNK_SIZE = 1048576
+DOWNLOAD_BUFFER_SIZE = 8388608
+DOWNLOAD_MAX_RETRIES = 3
+DOWNLOAD_PART_SUFFIX = '.part'
+UPLOAD_CHUNK_SIZE = 1048576
 ALL_SETTINGS = 'all'
 EXCLUDE_UNI_SETTINGS = 'exclude_unisphere_setting_options'
 EXCLUDE_SYS_SETTINGS = 'exclude_system_setting_options'
@@ -411,6 +438,8 @@ AUDIT_RECORD_PATH = 'audit_record_path'
 AUDIT_LOG_RECORD = 'audit_log_record'
 AUDIT_RECORD_TIME = 'audit_record_time'
 BINARY_DATA = 'binary_data'
+BYTES_DOWNLOADED = 'bytes_downloaded'
+SHA256 = 'sha256'
 RECORD_ID = 'record_id'
 HOST_NAME = 'hostname'
 CLIENT_HOST = 'client_host'
@@ -94,3 +94,10 @@ class MissingConfigurationException(PyU4VException):
 
     message = ('PyU4V settings not be loaded, please check file location or '
                'univmax_conn input parameters.')
+
+
+class MissingDependencyException(PyU4VException):
+    """MissingDependencyException."""
+
+    message = ('Optional dependency %(data)s is not installed, please install '
+               'it to use this feature.')
@@ -24,6 +24,8 @@ from PyU4V.utils import exception
 LOG = logging.getLogger(__name__)
 
 FILE_WRITE_MODE = constants.FILE_WRITE_MODE
+DOWNLOAD_CHUNK_SIZE = constants.DOWNLOAD_CHUNK_SIZE
+DOWNLOAD_BUFFER_SIZE = constants.DOWNLOAD_BUFFER_SIZE
 
 
 def create_list_from_file(file_name):
@@ -152,14 +154,14 @@ def write_dict_to_csv_file(
     write_to_csv_file(file_path, data_for_file, delimiter, quotechar)
 
 
-def write_binary_data_to_file(data, file_extension, file_name, dir_path=None):
-    """Write Unisphere binary data to file.
+def get_file_write_path(file_extension, file_name, dir_path=None):
+    """Get the path a binary download will be written to.
 
-    :param data: Unisphere REST response with data for writing -- json response
     :param file_extension: file extension used for writing to file -- str
     :param file_name: file name -- str
     :param dir_path: file write directory path -- str
-    :returns: file name and write directory -- str
+    :returns: file write path -- Path
+    :raises: InvalidInputException
     """
     # Set file write directory
     if dir_path:
@@ -175,17 +177,82 @@ def write_binary_data_to_file(data, file_extension, file_name, dir_path=None):
         # No path set, use current working directory
         path = Path.cwd()
 
-    # Set download file name with .zip extension
+    # Set download file name with extension
     f_name = Path(file_name)
     pdf_name = f_name.with_suffix(file_extension)
     # Join directory & OS idempotent path
-    file_write_path = Path.joinpath(path, pdf_name)
+    return Path.joinpath(path, pdf_name)
+
+
+def stream_binary_data(data, file_object, chunk_size=DOWNLOAD_CHUNK_SIZE,
+                       buffer_size=DOWNLOAD_BUFFER_SIZE,
+                       progress_callback=None, checksum=None, bytes_done=0,
+                       total_bytes=None):
+    """Stream Unisphere binary data to a file-like object.
+
+    Chunks are read from the response and held in a write-behind buffer
+    which is only written out once buffer_size bytes have been received, so
+    the number of writes to the target is independent of the chunk size the
+    server sends. The buffer is always flushed, including when the response
+    stream fails part way through, so that bytes written reflects exactly
+    what was received and a download can be resumed from that offset.
+
+    :param data: Unisphere REST response with data for writing -- response
+    :param file_object: writable binary file-like object -- file
+    :param chunk_size: bytes read from the response at a time -- int
+    :param buffer_size: bytes buffered before writing -- int
+    :param progress_callback: called with bytes done and total bytes, total
+                              is None if unknown -- callable
+    :param checksum: hash object updated with every chunk e.g.
+                     hashlib.sha256() -- hash
+    :param bytes_done: bytes already downloaded before this response -- int
+    :param total_bytes: expected size of the complete file -- int
+    :returns: total bytes done -- int
+    """
+    buffer = bytearray()
+    try:
+        for chunk in data.iter_content(chunk_size=chunk_size):
+            if not chunk:
+                continue
+            buffer.extend(chunk)
+            if checksum is not None:
+                checksum.update(chunk)
+            bytes_done += len(chunk)
+            if len(buffer) >= buffer_size:
+                file_object.write(buffer)
+                buffer = bytearray()
+            if progress_callback:
+                progress_callback(bytes_done, total_bytes)
+    finally:
+        if buffer:
+            file_object.write(buffer)
+    return bytes_done
+
+
+def write_binary_data_to_file(data, file_extension, file_name, dir_path=None,
+                              chunk_size=DOWNLOAD_CHUNK_SIZE,
+                              progress_callback=None, checksum=None):
+    """Write Unisphere binary data to file.
+
+    :param data: Unisphere REST response with data for writing -- json response
+    :param file_extension: file extension used for writing to file -- str
+    :param file_name: file name -- str
+    :param dir_path: file write directory path -- str
+    :param chunk_size: bytes read from the response at a time -- int
+    :param progress_callback: called with bytes done and total bytes, total
+                              is None if unknown -- callable
+    :param checksum: hash object updated with every chunk e.g.
+                     hashlib.sha256() -- hash
+    :returns: file name and write directory -- str
+    """
+    file_write_path = get_file_write_path(file_extension, file_name, dir_path)
 
-    # Write binary file data to zip file
+    # Write binary file data to file
     with open(file_write_path, FILE_WRITE_MODE) as fd:
         LOG.info('Writing settings to: {p}'.format(p=file_write_path))
-        for chunk in data.iter_content(chunk_size=128):
-            fd.write(chunk)
+        stream_binary_data(
+            data, fd, chunk_size=chunk_size,
+            progress_callback=progress_callback, checksum=checksum)
 
     LOG.info('File writing complete.')
     return file_write_path
@@ -0,0 +1,178 @@
+# Copyright (c) 2025 Dell Inc. or its subsidiaries.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""metadata_store.py."""
+
+import json
+import logging
+import time
+
+from PyU4V.utils import constants
+from PyU4V.utils import sqlite_store
+
+LOG = logging.getLogger(__name__)
+
+UNISPHERE_SCOPE = constants.METADATA_UNISPHERE_SCOPE
+DEFAULT_MAX_AGE = constants.METADATA_DEFAULT_MAX_AGE
+
+
+def get_default_store_path():
+    """Get the default metadata store path in the ~/.PyU4V directory.
+
+    :returns: metadata store file path -- str
+    """
+    return sqlite_store.get_default_path(constants.METADATA_STORE_FILENAME)
+
+
+class MetadataStore(sqlite_store.SQLiteStore):
+    """Persistent cross-process store for static Unisphere facts.
+
+    Facts such as performance categories, metric lists, director lists and
+    supported API versions rarely change over the lifetime of a Unisphere
+    instance, so they are kept in a SQLite database shared by every process
+    on the host. Each fact belongs to a scope, either the Unisphere instance
+    itself or an individual array. Every scope records the version it was
+    populated under, the Unisphere version for the instance scope and the
+    array ucode for array scopes, and all facts in a scope are discarded as
+    soon as a different version is observed. Facts older than max_age
+    seconds are also treated as stale.
+    """
+
+    def __init__(self, db_path=None, server=None, max_age=DEFAULT_MAX_AGE):
+        """__init__.
+
+        :param db_path: path to the SQLite database file -- str
+        :param server: Unisphere host and port used to partition facts when
+                       more than one instance is managed from a host -- str
+        :param max_age: maximum age of a fact in seconds -- int
+        """
+        super(MetadataStore, self).__init__(
+            db_path if db_path else get_default_store_path())
+        self.server = server if server else str()
+        self.max_age = max_age
+        self._execute(
+            'CREATE TABLE IF NOT EXISTS scope_version ('
+            'server TEXT, scope TEXT, version TEXT, '
+            'PRIMARY KEY (server, scope))')
+        self._execute(
+            'CREATE TABLE IF NOT EXISTS metadata ('
+            'server TEXT, scope TEXT, namespace TEXT, key TEXT, value TEXT, '
+            'updated REAL, PRIMARY KEY (server, scope, namespace, key))')
+
+    def get_scope_version(self, scope=UNISPHERE_SCOPE):
+        """Get the version a scope was last populated under.
+
+        :param scope: array id or the Unisphere scope -- str
+        :returns: version -- str
+        """
+        rows = self._execute(
+            'SELECT version FROM scope_version WHERE server=? AND scope=?',
+            (self.server, scope), fetch=True)
+        return rows[0][0] if rows else None
+
+    def set_scope_version(self, version, scope=UNISPHERE_SCOPE):
+        """Record the current version of a scope.
+
+        If the version differs from the one previously recorded all facts
+        held for that scope are invalidated. A Unisphere version change
+        invalidates every scope for the instance.
+
+        :param version: Unisphere version or array ucode -- str
+        :param scope: array id or the Unisphere scope -- str
+        :returns: if facts were invalidated -- bool
+        """
+        if not version:
+            return False
+        version = str(version)
+        current = self.get_scope_version(scope)
+        if current == version:
+            return False
+        if current is not None:
+            LOG.info('Version of {s} changed from {o} to {n}, invalidating '
+                     'cached metadata.'.format(s=scope, o=current, n=version))
+            if scope == UNISPHERE_SCOPE:
+                self.invalidate()
+            else:
+                self.invalidate(scope)
+        self._execute(
+            'INSERT OR REPLACE INTO scope_version VALUES (?, ?, ?)',
+            (self.server, scope, version))
+        return current is not None
+
+    def get(self, namespace, key=str(), scope=UNISPHERE_SCOPE):
+        """Get a fact from the store.
+
+        :param namespace: fact namespace e.g. performance_categories -- str
+        :param key: fact key within the namespace -- str
+        :param scope: array id or the Unisphere scope -- str
+        :returns: fact value, None if not present or stale -- Any
+        """
+        rows = self._execute(
+            'SELECT value, updated FROM metadata WHERE server=? AND scope=? '
+            'AND namespace=? AND key=?',
+            (self.server, scope, namespace, str(key)), fetch=True)
+        if not rows:
+            return None
+        value, updated = rows[0]
+        if self.max_age and time.time() - updated > self.max_age:
+            return None
+        return json.loads(value)
+
+    def set(self, namespace, value, key=str(), scope=UNISPHERE_SCOPE):
+        """Add or replace a fact in the store.
+
+        :param namespace: fact namespace e.g. performance_categories -- str
+        :param value: JSON serialisable fact value -- Any
+        :param key: fact key within the namespace -- str
+        :param scope: array id or the Unisphere scope -- str
+        """
+        self._execute(
+            'INSERT OR REPLACE INTO metadata VALUES (?, ?, ?, ?, ?, ?)',
+            (self.server, scope, namespace, str(key), json.dumps(value),
+             time.time()))
+
+    def invalidate(self, scope=None, namespace=None):
+        """Remove facts from the store.
+
+        :param scope: only remove facts for this scope -- str
+        :param namespace: only remove facts in this namespace -- str
+        """
+        statement = 'DELETE FROM metadata WHERE server=?'
+        params = [self.server]
+        if scope:
+            statement += ' AND scope=?'
+            params.append(scope)
+        if namespace:
+            statement += ' AND namespace=?'
+            params.append(namespace)
+        self._execute(statement, tuple(params))
+
+    def get_or_fetch(self, namespace, fetch, key=str(),
+                     scope=UNISPHERE_SCOPE):
+        """Get a fact from the store, fetching and storing it if absent.
+
+        Empty values other than booleans are returned but not stored so that
+        a transient failure to retrieve a fact is not cached.
+
+        :param namespace: fact namespace e.g. performance_categories -- str
+        :param fetch: callable returning the live value -- callable
+        :param key: fact key within the namespace -- str
+        :param scope: array id or the Unisphere scope -- str
+        :returns: fact value -- Any
+        """
+        value = self.get(namespace, key, scope)
+        if value is None:
+            value = fetch()
+            if value or isinstance(value, bool):
+                self.set(namespace, value, key, scope)
+        return value
@@ -0,0 +1,176 @@
+# Copyright (c) 2025 Dell Inc. or its subsidiaries.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""multipart_encoder.py."""
+
+import logging
+import os
+import uuid
+
+from PyU4V.utils import constants
+
+LOG = logging.getLogger(__name__)
+
+UPLOAD_CHUNK_SIZE = constants.UPLOAD_CHUNK_SIZE
+CRLF = b'\r\n'
+
+
+class MultipartEncoder(object):
+    """Streaming multipart/form-data request body.
+
+    Passing form data to requests as files builds the complete multipart
+    body in memory before it is sent. The encoder instead yields the body in
+    chunks, reading file-like values chunk_size bytes at a time, so it can be
+    passed to requests as data. Each field is encoded as a file part in the
+    same way requests does for files, so Unisphere receives an identical
+    body.
+
+    If the size of every value can be determined the body is sent with a
+    Content-Length, otherwise requests falls back to chunked transfer
+    encoding. File-like values are rewound to their starting position each
+    time the body is iterated so a request can be resent.
+    """
+
+    def __init__(self, fields, boundary=None, chunk_size=UPLOAD_CHUNK_SIZE,
+                 progress_callback=None):
+        """__init__.
+
+        :param fields: form field names and values, values can be str, bytes
+                       or binary file-like objects -- dict
+        :param boundary: multipart boundary -- str
+        :param chunk_size: bytes read from file-like values at a time -- int
+        :param progress_callback: called with bytes sent and total bytes,
+                                  total is None if unknown -- callable
+        """
+        self.boundary = boundary if boundary else uuid.uuid4().hex
+        self.chunk_size = chunk_size
+        self.progress_callback = progress_callback
+        self.content_type = 'multipart/form-data; boundary={b}'.format(
+            b=self.boundary)
+        self._parts = list()
+        self._positions = dict()
+        for name, value in fields.items():
+            if not hasattr(value, 'read'):
+                if isinstance(value, str):
+                    value = value.encode('utf-8')
+                elif not isinstance(value, (bytes, bytearray)):
+                    value = str(value).encode('utf-8')
+            elif hasattr(value, 'tell'):
+                try:
+                    self._positions[name] = value.tell()
+                except (OSError, ValueError):
+                    pass
+            self._parts.append(
+                (name, self._get_part_header(name, value), value))
+        self._closing = '--{b}--'.format(b=self.boundary).encode() + CRLF
+        self.length = self._get_length()
+
+    def _get_part_header(self, name, value):
+        """Get the encoded boundary and headers for a field.
+
+        :param name: field name -- str
+        :param value: field value -- bytes or file-like object
+        :returns: part header -- bytes
+        """
+        file_name = getattr(value, 'name', None)
+        if (file_name and isinstance(file_name, (str, bytes))
+                and not str(file_name).startswith('<')):
+            file_name = os.path.basename(
+                file_name.decode() if isinstance(file_name, bytes)
+                else file_name)
+        else:
+            file_name = name
+        header = ('--{b}\r\nContent-Disposition: form-data; name="{n}"; '
+                  'filename="{f}"\r\n\r\n'.format(
+                      b=self.boundary, n=name, f=file_name))
+        return header.encode('utf-8')
+
+    @staticmethod
+    def _get_value_length(value):
+        """Get the remaining length of a field value.
+
+        :param value: field value -- bytes or file-like object
+        :returns: length, None if it cannot be determined -- int
+        """
+        if isinstance(value, (bytes, bytearray)):
+            return len(value)
+        try:
+            position = value.tell()
+            end = value.seek(0, os.SEEK_END)
+            value.seek(position)
+            return end - position
+        except (AttributeError, OSError, ValueError):
+            return None
+
+    def _get_length(self):
+        """Get the total length of the encoded body.
+
+        :returns: body length, None if it cannot be determined -- int
+        """
+        length = len(self._closing)
+        for __, header, value in self._parts:
+            value_length = self._get_value_length(value)
+            if value_length is None:
+                return None
+            length += len(header) + value_length + len(CRLF)
+        return length
+
+    def _iter_value(self, name, value):
+        """Yield a field value in chunks.
+
+        :param name: field name -- str
+        :param value: field value -- bytes or file-like object
+        :returns: value chunks -- generator
+        """
+        if isinstance(value, (bytes, bytearray)):
+            for offset in range(0, len(value), self.chunk_size):
+                yield bytes(value[offset:offset + self.chunk_size])
+            return
+        if name in self._positions:
+            value.seek(self._positions[name])
+        for chunk in iter(lambda: value.read(self.chunk_size), b''):
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            yield chunk
+
+    def __len__(self):
+        """Get the body length, 0 if unknown so chunked encoding is used.
+
+        :returns: body length -- int
+        """
+        return self.length if self.length else 0
+
+    def __iter__(self):
+        """Yield the encoded body in chunks.
+
+        :returns: body chunks -- generator
+        """
+        bytes_sent = 0
+        for name, header, value in self._parts:
+            for chunk in self._iter_value(name, value):
+                # Send the part header with the first chunk of its value
+                if header:
+                    chunk, header = header + chunk, None
+                bytes_sent += len(chunk)
+                yield chunk
+                if self.progress_callback:
+                    self.progress_callback(bytes_sent, self.length)
+            trailer = header + CRLF if header else CRLF
+            bytes_sent += len(trailer)
+            yield trailer
+        bytes_sent += len(self._closing)
+        yield self._closing
+        if self.progress_callback:
+            self.progress_callback(bytes_sent, self.length)
+        LOG.debug('Multipart upload body of {b} bytes sent.'.format(
+            b=bytes_sent))
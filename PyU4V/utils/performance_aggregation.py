@@ -0,0 +1,502 @@
+# Copyright (c) 2025 Dell Inc. or its subsidiaries.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""performance_aggregation.py.
+
+Aggregations over performance results.
+
+Every function accepts performance results in any of the forms returned by
+PyU4V: a list of samples, a dict of samples keyed by object id as returned
+by collect_stats, a get_performance_stats or collect_stats response, or a
+PerformanceFrame. Results are converted to a frame once and each metric is
+processed as a column per object rather than a dict per sample. If NumPy is
+installed statistics are calculated with NumPy, otherwise the same results
+are calculated in Python.
+
+Per sample results, for example ewma, are returned as a PerformanceFrame
+with the object id of each sample, so they can be aggregated further or
+converted with to_records, to_numpy or to_pandas. Results without object
+ids are keyed by None.
+"""
+
+import itertools
+import logging
+import math
+import operator
+
+from array import array
+
+from PyU4V.utils import exception
+from PyU4V.utils import performance_constants as pc
+from PyU4V.utils import performance_frame
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+LOG = logging.getLogger(__name__)
+
+AVG = 'avg'
+MIN = 'min'
+MAX = 'max'
+SUM = 'sum'
+COUNT = 'count'
+AGGREGATES = [AVG, MIN, MAX, SUM, COUNT]
+
+
+def as_frame(results):
+    """Convert performance results to a PerformanceFrame.
+
+    :param results: performance results, see module description -- list,
+                    dict or PerformanceFrame
+    :returns: frame -- PerformanceFrame
+    """
+    if isinstance(results, performance_frame.PerformanceFrame):
+        return results
+    if isinstance(results, dict):
+        if pc.RESULT in results:
+            return as_frame(results[pc.RESULT])
+        return performance_frame.PerformanceFrame.from_object_results(results)
+    return performance_frame.PerformanceFrame.from_results(results or list())
+
+
+def _object_spans(frame):
+    """Get the row spans of each object in a frame.
+
+    Rows of an object are contiguous in frames created from results keyed
+    by object id, so each object usually has a single span.
+
+    :param frame: frame -- PerformanceFrame
+    :returns: start and end rows keyed by object id -- dict
+    """
+    spans, start = dict(), 0
+    for object_id, rows in itertools.groupby(frame.object_ids):
+        end = start + sum(1 for __ in rows)
+        spans.setdefault(object_id, list()).append((start, end))
+        start = end
+    return spans
+
+
+def _numpy_series(timestamps, column, spans):
+    """Get the series of one object as NumPy arrays.
+
+    :param timestamps: frame timestamps -- numpy.ndarray
+    :param column: frame metric column -- numpy.ndarray
+    :param spans: start and end rows of the object -- list
+    :returns: timestamps and values -- tuple
+    """
+    if len(spans) == 1:
+        object_timestamps = timestamps[spans[0][0]:spans[0][1]]
+        values = column[spans[0][0]:spans[0][1]]
+    else:
+        object_timestamps = numpy.concatenate(
+            [timestamps[start:end] for start, end in spans])
+        values = numpy.concatenate([column[start:end] for start, end in spans])
+    present = ~numpy.isnan(values)
+    if not present.all():
+        object_timestamps, values = object_timestamps[present], values[present]
+    if object_timestamps.size > 1 and (
+            numpy.diff(object_timestamps) < 0).any():
+        order = numpy.argsort(object_timestamps, kind='stable')
+        object_timestamps, values = object_timestamps[order], values[order]
+    return object_timestamps, values
+
+
+def _python_series(timestamps, column, spans):
+    """Get the series of one object as arrays without NumPy.
+
+    :param timestamps: frame timestamps -- array
+    :param column: frame metric column -- array
+    :param spans: start and end rows of the object -- list
+    :returns: timestamps and values -- tuple
+    """
+    object_timestamps, values = array('q'), array('d')
+    for start, end in spans:
+        object_timestamps.extend(timestamps[start:end])
+        values.extend(column[start:end])
+    present = [value == value for value in values]
+    if not all(present):
+        object_timestamps = array('q', itertools.compress(
+            object_timestamps, present))
+        values = array('d', itertools.compress(values, present))
+    if any(map(operator.gt, object_timestamps, object_timestamps[1:])):
+        order = sorted(range(len(object_timestamps)),
+                       key=object_timestamps.__getitem__)
+        object_timestamps = array('q', [object_timestamps[i] for i in order])
+        values = array('d', [values[i] for i in order])
+    return object_timestamps, values
+
+
+def get_series(results, metric):
+    """Get the timestamps and values of a metric for each object.
+
+    Each object is sliced from the frame columns rather than read sample by
+    sample. Samples without the metric are skipped, series are in timestamp
+    order.
+
+    :param results: performance results -- list, dict or PerformanceFrame
+    :param metric: metric name -- str
+    :returns: timestamp and value arrays, NumPy arrays if NumPy is
+              installed, keyed by object id -- dict
+    """
+    frame = as_frame(results)
+    column = frame.metrics.get(metric)
+    series = dict()
+    if column is None:
+        return series
+    if numpy is not None:
+        timestamps = numpy.frombuffer(frame.timestamps, dtype=numpy.int64)
+        column = numpy.frombuffer(column, dtype=numpy.float64)
+        get_object_series = _numpy_series
+    else:
+        timestamps = frame.timestamps
+        get_object_series = _python_series
+    for object_id, spans in _object_spans(frame).items():
+        object_timestamps, values = get_object_series(
+            timestamps, column, spans)
+        if len(values):
+            series[object_id] = (object_timestamps, values)
+    return series
+
+
+def to_frame(series, metric):
+    """Convert series keyed by object id to a PerformanceFrame.
+
+    :param series: timestamp and value arrays keyed by object id, as
+                   returned by get_series -- dict
+    :param metric: metric name -- str
+    :returns: frame -- PerformanceFrame
+    """
+    timestamps, values, object_ids = array('q'), array('d'), list()
+    for object_id, (object_timestamps, object_values) in series.items():
+        timestamps.extend(performance_frame._to_array(
+            'q', object_timestamps))
+        values.extend(performance_frame._to_array('d', object_values))
+        object_ids.extend([object_id] * len(object_values))
+    has_object_ids = any(object_id is not None for object_id in series)
+    return performance_frame.PerformanceFrame.from_columns(
+        timestamps, {metric: values},
+        object_ids=object_ids if has_object_ids else None)
+
+
+def _validate_statistic(statistic):
+    """Check a statistic name is supported.
+
+    :param statistic: avg, min, max, sum, count or a percentile such as
+                      p95 -- str
+    :returns: percentile if the statistic is a percentile -- float
+    :raises: InvalidInputException
+    """
+    if statistic in AGGREGATES:
+        return None
+    try:
+        if statistic.startswith('p'):
+            percentile = float(statistic[1:])
+            if 0 <= percentile <= 100:
+                return percentile
+    except (AttributeError, ValueError):
+        pass
+    msg = ('Invalid statistic "{s}", please use one of {a} or a percentile '
+           'such as p95.'.format(s=statistic, a=AGGREGATES))
+    LOG.error(msg)
+    raise exception.InvalidInputException(msg)
+
+
+def _percentile(values, percentile):
+    """Calculate a percentile with linear interpolation.
+
+    Matches the default method of numpy.percentile.
+
+    :param values: values -- list
+    :param percentile: percentile from 0 to 100 -- float
+    :returns: percentile value, NaN if there are no values -- float
+    """
+    if not len(values):
+        return float('nan')
+    if numpy is not None:
+        return float(numpy.percentile(values, percentile))
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * percentile / 100.0
+    lower = int(math.floor(rank))
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (
+        rank - lower)
+
+
+def calculate_statistic(values, statistic):
+    """Calculate a statistic of a list of values.
+
+    :param values: values -- list
+    :param statistic: avg, min, max, sum, count or a percentile such as
+                      p95 -- str
+    :returns: statistic value, NaN if there are no values -- float
+    :raises: InvalidInputException
+    """
+    percentile = _validate_statistic(statistic)
+    if percentile is not None:
+        return _percentile(values, percentile)
+    if statistic == COUNT:
+        return len(values)
+    if not len(values):
+        return float('nan')
+    if numpy is not None:
+        values = numpy.asarray(values, dtype=numpy.float64)
+        function = {AVG: numpy.mean, MIN: numpy.min, MAX: numpy.max,
+                    SUM: numpy.sum}[statistic]
+        return float(function(values))
+    if statistic == AVG:
+        return math.fsum(values) / len(values)
+    function = {MIN: min, MAX: max, SUM: math.fsum}[statistic]
+    return function(values)
+
+
+def percentiles(results, metric, percentile_list=pc.DEFAULT_PERCENTILES,
+                by_object=True):
+    """Calculate percentiles of a metric.
+
+    :param results: performance results -- list, dict or PerformanceFrame
+    :param metric: metric name -- str
+    :param percentile_list: percentiles from 0 to 100 -- list
+    :param by_object: calculate percentiles per object rather than across
+                      all objects -- bool
+    :returns: percentiles keyed by name e.g. p95, per object id if by_object
+              is set -- dict
+    """
+    series = get_series(results, metric)
+
+    def _calculate(values):
+        return {'p{p:g}'.format(p=p): _percentile(values, p)
+                for p in percentile_list}
+
+    if by_object:
+        return {object_id: _calculate(values)
+                for object_id, (__, values) in series.items()}
+    return _calculate([v for __, values in series.values() for v in values])
+
+
+def summarise(results, metric, statistics=None):
+    """Calculate statistics of a metric for each object.
+
+    :param results: performance results -- list, dict or PerformanceFrame
+    :param metric: metric name -- str
+    :param statistics: statistic names, defaults to avg, min, max, p50, p95
+                       and p99 -- list
+    :returns: statistics keyed by name, per object id -- dict
+    :raises: InvalidInputException
+    """
+    statistics = statistics or [AVG, MIN, MAX] + [
+        'p{p:g}'.format(p=p) for p in pc.DEFAULT_PERCENTILES]
+    for statistic in statistics:
+        _validate_statistic(statistic)
+    return {object_id: {s: calculate_statistic(values, s)
+                        for s in statistics}
+            for object_id, (__, values) in get_series(
+                results, metric).items()}
+
+
+def top_n(results, metric, n=10, statistic=AVG, largest=True):
+    """Get the objects with the highest or lowest statistic of a metric.
+
+    :param results: performance results -- list, dict or PerformanceFrame
+    :param metric: metric name -- str
+    :param n: number of objects -- int
+    :param statistic: avg, min, max, sum, count or a percentile such as
+                      p95 -- str
+    :param largest: return the highest values, otherwise the lowest -- bool
+    :returns: object id and statistic value pairs in order -- list
+    :raises: InvalidInputException
+    """
+    _validate_statistic(statistic)
+    ranked = [(object_id, calculate_statistic(values, statistic))
+              for object_id, (__, values) in get_series(
+                  results, metric).items()]
+    ranked.sort(key=lambda r: r[1], reverse=largest)
+    return ranked[:n]
+
+
+def _ewma(values, alpha):
+    """Calculate the exponentially weighted moving average of a series.
+
+    With NumPy the recurrence is solved in closed form with a cumulative
+    sum, in blocks short enough that the weights stay within double
+    precision.
+
+    :param values: values in timestamp order -- array
+    :param alpha: smoothing factor between 0 and 1 -- float
+    :returns: averages -- array
+    """
+    decay = 1.0 - alpha
+    if numpy is None:
+        averages, average = array('d'), values[0]
+        for value in values:
+            average = alpha * value + decay * average
+            averages.append(average)
+        return averages
+    if not decay:
+        return numpy.array(values, dtype=numpy.float64)
+    # Inverse weights of up to 1e15 keep the cumulative sum accurate
+    block = max(1, int(15 / -math.log10(decay)))
+    averages = numpy.empty(len(values), dtype=numpy.float64)
+    average = values[0]
+    for start in range(0, len(values), block):
+        chunk = values[start:start + block]
+        powers = decay ** numpy.arange(1, len(chunk) + 1)
+        averages[start:start + len(chunk)] = powers * (
+            average + alpha * numpy.cumsum(chunk / powers))
+        average = averages[start + len(chunk) - 1]
+    return averages
+
+
+def ewma(results, metric, alpha=pc.EWMA_ALPHA):
+    """Calculate the exponentially weighted moving average of a metric.
+
+    Each average is alpha times the sample plus 1 - alpha times the
+    previous average, starting from the first sample.
+
+    :param results: performance results -- list, dict or PerformanceFrame
+    :param metric: metric name -- str
+    :param alpha: smoothing factor between 0 and 1 -- float
+    :returns: averages of each object in timestamp order -- PerformanceFrame
+    :raises: InvalidInputException
+    """
+    if not 0 < alpha <= 1:
+        msg = 'The EWMA alpha must be greater than 0 and at most 1.'
+        LOG.error(msg)
+        raise exception.InvalidInputException(msg)
+    return to_frame({object_id: (timestamps, _ewma(values, alpha))
+                     for object_id, (timestamps, values) in get_series(
+                         results, metric).items()}, metric)
+
+
+def _difference(values):
+    """Calculate the difference between successive values.
+
+    :param values: values -- array
+    :returns: differences, one fewer than the values -- array
+    """
+    if numpy is not None:
+        return numpy.diff(values)
+    return array(values.typecode, map(operator.sub, values[1:], values[:-1]))
+
+
+def delta(results, metric):
+    """Calculate the change in a metric between successive samples.
+
+    :param results: performance results -- list, dict or PerformanceFrame
+    :param metric: metric name -- str
+    :returns: change since the previous sample of each object, the first
+              sample of each object has no previous sample and is
+              omitted -- PerformanceFrame
+    """
+    return to_frame({object_id: (timestamps[1:], _difference(values))
+                     for object_id, (timestamps, values) in get_series(
+                         results, metric).items()}, metric)
+
+
+def rate(results, metric):
+    """Calculate the per second rate of change of a metric.
+
+    :param results: performance results -- list, dict or PerformanceFrame
+    :param metric: metric name -- str
+    :returns: rate of change since the previous sample of each object,
+              samples with the same timestamp as the previous sample are
+              omitted -- PerformanceFrame
+    """
+    rates = dict()
+    for object_id, (timestamps, values) in get_series(
+            results, metric).items():
+        intervals = _difference(timestamps)
+        changes = _difference(values)
+        if numpy is not None:
+            elapsed = intervals != 0
+            rates[object_id] = (timestamps[1:][elapsed], changes[elapsed] * (
+                1000.0 / intervals[elapsed]))
+        else:
+            elapsed = [interval != 0 for interval in intervals]
+            rates[object_id] = (
+                array('q', itertools.compress(timestamps[1:], elapsed)),
+                array('d', [change * 1000.0 / interval for change, interval
+                            in zip(changes, intervals) if interval]))
+    return to_frame(rates, metric)
+
+
+def _aggregate_timestamps(timestamps, values, aggregate):
+    """Aggregate the values with the same timestamp.
+
+    :param timestamps: timestamps -- array
+    :param values: values -- array
+    :param aggregate: avg, min, max, sum or count -- str
+    :returns: unique timestamps in order and aggregated values -- tuple
+    """
+    if numpy is None:
+        grouped = dict()
+        for timestamp, value in zip(timestamps, values):
+            grouped.setdefault(timestamp, list()).append(value)
+        ordered = sorted(grouped)
+        return array('q', ordered), array('d', [
+            calculate_statistic(grouped[t], aggregate) for t in ordered])
+    order = numpy.argsort(timestamps, kind='stable')
+    timestamps, values = timestamps[order], values[order]
+    unique, starts = numpy.unique(timestamps, return_index=True)
+    counts = numpy.diff(numpy.append(starts, len(timestamps)))
+    if aggregate == COUNT:
+        return unique, counts.astype(numpy.float64)
+    if aggregate == MIN:
+        return unique, numpy.minimum.reduceat(values, starts)
+    if aggregate == MAX:
+        return unique, numpy.maximum.reduceat(values, starts)
+    sums = numpy.add.reduceat(values, starts)
+    return unique, sums / counts if aggregate == AVG else sums
+
+
+def group_by(results, metric, groups, aggregate=SUM):
+    """Aggregate a metric across the objects in each group per timestamp.
+
+    Groups are taken from object metadata, for example the storage group
+    of each volume or the SRP of each storage group.
+
+    :param results: performance results -- list, dict or PerformanceFrame
+    :param metric: metric name -- str
+    :param groups: group keyed by object id, or a callable returning the
+                   group of an object id, objects without a group are
+                   skipped -- dict or callable
+    :param aggregate: avg, min, max, sum or count -- str
+    :returns: aggregated values in timestamp order with the group as the
+              object id -- PerformanceFrame
+    :raises: InvalidInputException
+    """
+    if aggregate not in AGGREGATES:
+        msg = 'Invalid aggregate "{a}", please use one of {s}.'.format(
+            a=aggregate, s=AGGREGATES)
+        LOG.error(msg)
+        raise exception.InvalidInputException(msg)
+    get_group = groups if callable(groups) else groups.get
+    grouped = dict()
+    for object_id, object_series in get_series(results, metric).items():
+        group = get_group(object_id)
+        if group is not None:
+            grouped.setdefault(group, list()).append(object_series)
+    aggregated = dict()
+    for group, group_series in grouped.items():
+        if numpy is not None:
+            timestamps = numpy.concatenate([s[0] for s in group_series])
+            values = numpy.concatenate([s[1] for s in group_series])
+        else:
+            timestamps, values = array('q'), array('d')
+            for object_timestamps, object_values in group_series:
+                timestamps.extend(object_timestamps)
+                values.extend(object_values)
+        aggregated[group] = _aggregate_timestamps(
+            timestamps, values, aggregate)
+    return to_frame(aggregated, metric)
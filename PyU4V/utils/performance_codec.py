@@ -0,0 +1,511 @@
+# Copyright (c) 2025 Dell Inc. or its subsidiaries.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""performance_codec.py.
+
+Compact binary encoding for performance results.
+
+Results are encoded in blocks of samples. Each block holds one column per
+metric rather than one record per sample, timestamps are encoded as the
+difference between successive intervals (delta-of-delta), which is zero for
+regular intervals and costs a single bit, and metric values are encoded as
+the XOR of each value with the previous one, storing only the bits that
+changed. This is the scheme described for Facebook's Gorilla time series
+database and suits performance data, where samples arrive at fixed
+intervals and metrics change slowly.
+
+A block can be decoded for a subset of its metrics, columns which are not
+requested are skipped without being decoded.
+"""
+
+import logging
+import struct
+
+from array import array
+
+from PyU4V.utils import exception
+from PyU4V.utils import performance_constants as pc
+from PyU4V.utils import performance_frame
+
+LOG = logging.getLogger(__name__)
+
+MAGIC = b'PU4V'
+VERSION = 1
+BLOCK_SIZE = 1024
+BLOCK_LENGTH = struct.Struct('>I')
+
+# Delta-of-delta buckets: (control bits, control bit count, value bits)
+DOD_BUCKETS = [(0b10, 2, 7), (0b110, 3, 9), (0b1110, 4, 12),
+               (0b11110, 5, 32)]
+DOD_LARGE = (0b11111, 5, 64)
+INT64_MASK = (1 << 64) - 1
+
+
+class _BitWriter(object):
+    """Append bits to a byte buffer."""
+
+    def __init__(self):
+        """__init__."""
+        self.buffer = bytearray()
+        self._bits = 0
+        self._bit_count = 0
+
+    def write(self, value, count):
+        """Write the lowest count bits of value.
+
+        :param value: bits to write -- int
+        :param count: number of bits -- int
+        """
+        self._bits = (self._bits << count) | (value & ((1 << count) - 1))
+        self._bit_count += count
+        while self._bit_count >= 8:
+            self._bit_count -= 8
+            self.buffer.append((self._bits >> self._bit_count) & 0xFF)
+        self._bits &= (1 << self._bit_count) - 1
+
+    def to_bytes(self):
+        """Get the written bits, padded with zeros to a whole byte.
+
+        :returns: encoded bits -- bytes
+        """
+        data = bytes(self.buffer)
+        if self._bit_count:
+            data += bytes([(self._bits << (8 - self._bit_count)) & 0xFF])
+        return data
+
+
+class _BitReader(object):
+    """Read bits from a byte buffer."""
+
+    def __init__(self, data):
+        """__init__.
+
+        :param data: encoded bits -- bytes
+        """
+        self.data = data
+        self.position = 0
+
+    def read(self, count):
+        """Read count bits as an unsigned integer.
+
+        :param count: number of bits -- int
+        :returns: bits read -- int
+        :raises: InvalidInputException
+        """
+        end = self.position + count
+        if end > len(self.data) * 8:
+            _raise_corrupt()
+        start_byte = self.position >> 3
+        end_byte = (end + 7) >> 3
+        chunk = int.from_bytes(self.data[start_byte:end_byte], 'big')
+        self.position = end
+        return (chunk >> (end_byte * 8 - end)) & ((1 << count) - 1)
+
+
+def _raise_corrupt():
+    """Raise an exception for truncated or corrupt encoded data.
+
+    :raises: InvalidInputException
+    """
+    msg = 'Encoded performance data is truncated or corrupt.'
+    LOG.error(msg)
+    raise exception.InvalidInputException(msg)
+
+
+def _signed(value, count):
+    """Interpret the lowest count bits of value as two's complement.
+
+    :param value: unsigned value -- int
+    :param count: number of bits -- int
+    :returns: signed value -- int
+    """
+    return value - (1 << count) if value >> (count - 1) else value
+
+
+def _write_varint(buffer, value):
+    """Append an unsigned LEB128 integer to a buffer.
+
+    :param buffer: output buffer -- bytearray
+    :param value: non-negative value -- int
+    """
+    while value > 0x7F:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _read_varint(data, offset):
+    """Read an unsigned LEB128 integer.
+
+    :param data: encoded data -- bytes
+    :param offset: offset of the integer -- int
+    :returns: value, offset after the integer -- int, int
+    :raises: InvalidInputException
+    """
+    value, shift = 0, 0
+    while True:
+        if offset >= len(data):
+            _raise_corrupt()
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, offset
+        shift += 7
+
+
+def _write_bytes(buffer, value):
+    """Append length prefixed bytes to a buffer.
+
+    :param buffer: output buffer -- bytearray
+    :param value: bytes to append -- bytes
+    """
+    _write_varint(buffer, len(value))
+    buffer.extend(value)
+
+
+def _read_bytes(data, offset):
+    """Read length prefixed bytes.
+
+    :param data: encoded data -- bytes
+    :param offset: offset of the length prefix -- int
+    :returns: value, offset after the value -- bytes, int
+    :raises: InvalidInputException
+    """
+    length, offset = _read_varint(data, offset)
+    if offset + length > len(data):
+        _raise_corrupt()
+    return data[offset:offset + length], offset + length
+
+
+def encode_timestamps(timestamps):
+    """Encode timestamps using delta-of-delta compression.
+
+    :param timestamps: timestamps in milliseconds since epoch -- list
+    :returns: encoded timestamps -- bytes
+    """
+    writer = _BitWriter()
+    previous, previous_delta = None, 0
+    for timestamp in timestamps:
+        timestamp = int(timestamp)
+        if previous is None:
+            writer.write(timestamp, 64)
+        else:
+            delta = timestamp - previous
+            delta_of_delta = delta - previous_delta
+            previous_delta = delta
+            if delta_of_delta == 0:
+                writer.write(0, 1)
+            else:
+                for control, control_bits, value_bits in DOD_BUCKETS + [
+                        DOD_LARGE]:
+                    limit = 1 << (value_bits - 1)
+                    if -limit <= delta_of_delta < limit or (
+                            value_bits == 64):
+                        writer.write(control, control_bits)
+                        writer.write(delta_of_delta, value_bits)
+                        break
+        previous = timestamp
+    return writer.to_bytes()
+
+
+def decode_timestamps(data, count):
+    """Decode delta-of-delta compressed timestamps.
+
+    :param data: encoded timestamps -- bytes
+    :param count: number of timestamps -- int
+    :returns: timestamps -- list
+    :raises: InvalidInputException
+    """
+    reader = _BitReader(data)
+    timestamps = list()
+    previous, delta = None, 0
+    for __ in range(count):
+        if previous is None:
+            previous = _signed(reader.read(64), 64)
+        else:
+            if reader.read(1):
+                value_bits = DOD_LARGE[2]
+                for __, control_bits, bucket_bits in DOD_BUCKETS:
+                    if not reader.read(1):
+                        value_bits = bucket_bits
+                        break
+                    if control_bits == DOD_LARGE[1]:
+                        break
+                # Arithmetic wraps at 64 bits as for the encoded values
+                delta = _signed((delta + _signed(
+                    reader.read(value_bits), value_bits)) & INT64_MASK, 64)
+            previous = _signed((previous + delta) & INT64_MASK, 64)
+        timestamps.append(previous)
+    return timestamps
+
+
+def encode_values(values):
+    """Encode floating point values using XOR compression.
+
+    :param values: metric values -- iterable
+    :returns: encoded values -- bytes
+    """
+    writer = _BitWriter()
+    previous = None
+    leading, trailing = 65, 0
+    for value in values:
+        bits = struct.unpack('>Q', struct.pack('>d', float(value)))[0]
+        if previous is None:
+            writer.write(bits, 64)
+        else:
+            xor = bits ^ previous
+            if not xor:
+                writer.write(0, 1)
+            else:
+                new_leading = min(64 - xor.bit_length(), 31)
+                new_trailing = (xor & -xor).bit_length() - 1
+                if new_leading >= leading and new_trailing >= trailing:
+                    # Changed bits fit in the previous window
+                    writer.write(0b10, 2)
+                    writer.write(xor >> trailing, 64 - leading - trailing)
+                else:
+                    leading, trailing = new_leading, new_trailing
+                    length = 64 - leading - trailing
+                    writer.write(0b11, 2)
+                    writer.write(leading, 5)
+                    writer.write(length, 6)
+                    writer.write(xor >> trailing, length)
+        previous = bits
+    return writer.to_bytes()
+
+
+def decode_values(data, count):
+    """Decode XOR compressed floating point values.
+
+    :param data: encoded values -- bytes
+    :param count: number of values -- int
+    :returns: values -- list
+    :raises: InvalidInputException
+    """
+    reader = _BitReader(data)
+    values = list()
+    previous = None
+    leading, trailing = 0, 0
+    for __ in range(count):
+        if previous is None:
+            previous = reader.read(64)
+        elif reader.read(1):
+            if reader.read(1):
+                leading = reader.read(5)
+                # A length of 64 is written as 0 in six bits
+                length = reader.read(6) or 64
+                trailing = 64 - leading - length
+            previous ^= reader.read(64 - leading - trailing) << trailing
+        values.append(struct.unpack('>d', struct.pack('>Q', previous))[0])
+    return values
+
+
+def _encode_labels(labels):
+    """Run length encode a label column.
+
+    :param labels: label per sample, None if not set -- list
+    :returns: encoded labels -- bytes
+    """
+    buffer = bytearray()
+    runs = list()
+    for label in labels:
+        if runs and runs[-1][0] == label:
+            runs[-1][1] += 1
+        else:
+            runs.append([label, 1])
+    _write_varint(buffer, len(runs))
+    for label, run_length in runs:
+        _write_varint(buffer, run_length)
+        if label is None:
+            buffer.append(0)
+        else:
+            buffer.append(1)
+            _write_bytes(buffer, label.encode('utf-8'))
+    return bytes(buffer)
+
+
+def _decode_labels(data):
+    """Decode a run length encoded label column.
+
+    :param data: encoded labels -- bytes
+    :returns: label per sample -- list
+    :raises: InvalidInputException
+    """
+    labels = list()
+    run_count, offset = _read_varint(data, 0)
+    for __ in range(run_count):
+        run_length, offset = _read_varint(data, offset)
+        if offset >= len(data):
+            _raise_corrupt()
+        is_set, offset = data[offset], offset + 1
+        label = None
+        if is_set:
+            value, offset = _read_bytes(data, offset)
+            label = value.decode('utf-8')
+        labels.extend([label] * run_length)
+    return labels
+
+
+def encode_block(results):
+    """Encode performance results as a single block.
+
+    Metrics missing from a sample are decoded as absent, string values
+    such as volume ids are kept as run length encoded label columns.
+
+    :param results: performance results, one dict per sample, or a
+                    frame -- list or PerformanceFrame
+    :returns: encoded block -- bytes
+    """
+    frame = results if isinstance(
+        results, performance_frame.PerformanceFrame) else (
+        performance_frame.PerformanceFrame.from_results(results))
+    buffer = bytearray(MAGIC)
+    buffer.append(VERSION)
+    _write_varint(buffer, len(frame))
+    _write_bytes(buffer, encode_timestamps(frame.timestamps))
+    _write_varint(buffer, len(frame.metrics))
+    for name, column in frame.metrics.items():
+        _write_bytes(buffer, name.encode('utf-8'))
+        _write_bytes(buffer, encode_values(column))
+    _write_varint(buffer, len(frame.labels))
+    for name, column in frame.labels.items():
+        _write_bytes(buffer, name.encode('utf-8'))
+        _write_bytes(buffer, _encode_labels(column))
+    return bytes(buffer)
+
+
+def decode_block_frame(data, metrics=None):
+    """Decode a block to a PerformanceFrame.
+
+    :param data: encoded block -- bytes
+    :param metrics: only decode these metrics, defaults to all -- list
+    :returns: frame -- PerformanceFrame
+    :raises: InvalidInputException
+    """
+    if len(data) <= len(MAGIC) or data[:len(MAGIC)] != MAGIC:
+        _raise_corrupt()
+    if data[len(MAGIC)] != VERSION:
+        msg = 'Unsupported performance encoding version {v}.'.format(
+            v=data[len(MAGIC)])
+        LOG.error(msg)
+        raise exception.InvalidInputException(msg)
+    offset = len(MAGIC) + 1
+    frame = performance_frame.PerformanceFrame()
+    count, offset = _read_varint(data, offset)
+    encoded, offset = _read_bytes(data, offset)
+    frame.timestamps.extend(decode_timestamps(encoded, count))
+    frame.object_ids = [None] * count
+
+    column_count, offset = _read_varint(data, offset)
+    for __ in range(column_count):
+        name, offset = _read_bytes(data, offset)
+        encoded, offset = _read_bytes(data, offset)
+        name = name.decode('utf-8')
+        if metrics is None or name in metrics:
+            frame.metrics[name] = array(
+                'd', decode_values(encoded, count))
+    column_count, offset = _read_varint(data, offset)
+    for __ in range(column_count):
+        name, offset = _read_bytes(data, offset)
+        encoded, offset = _read_bytes(data, offset)
+        frame.labels[name.decode('utf-8')] = _decode_labels(encoded)
+    return frame
+
+
+def decode_block(data, metrics=None):
+    """Decode a block to performance results.
+
+    :param data: encoded block -- bytes
+    :param metrics: only decode these metrics, defaults to all -- list
+    :returns: performance results, one dict per sample -- list
+    :raises: InvalidInputException
+    """
+    return decode_block_frame(data, metrics=metrics).to_records()
+
+
+def encode_stream(results, file_object, block_size=BLOCK_SIZE):
+    """Encode performance results to a binary file object.
+
+    Results are read from any iterable and written in blocks of at most
+    block_size samples, so generators and long collections can be encoded
+    without holding every sample in memory.
+
+    :param results: performance results, one dict per sample -- iterable
+    :param file_object: writable binary file object -- file
+    :param block_size: maximum samples per block -- int
+    :returns: number of samples written -- int
+    """
+    block, total = list(), 0
+    for sample in results:
+        block.append(sample)
+        if len(block) >= block_size:
+            total += _write_block(block, file_object)
+            block = list()
+    if block:
+        total += _write_block(block, file_object)
+    return total
+
+
+def _write_block(block, file_object):
+    """Write a length prefixed block.
+
+    :param block: performance results -- list
+    :param file_object: writable binary file object -- file
+    :returns: number of samples written -- int
+    """
+    encoded = encode_block(block)
+    file_object.write(BLOCK_LENGTH.pack(len(encoded)))
+    file_object.write(encoded)
+    return len(block)
+
+
+def decode_stream(file_object, metrics=None):
+    """Decode performance results from a binary file object.
+
+    Samples are yielded one block at a time, so only a single block is held
+    in memory.
+
+    :param file_object: readable binary file object -- file
+    :param metrics: only decode these metrics, defaults to all -- list
+    :returns: performance results, one dict per sample -- generator
+    :raises: InvalidInputException
+    """
+    while True:
+        header = file_object.read(BLOCK_LENGTH.size)
+        if not header:
+            return
+        if len(header) < BLOCK_LENGTH.size:
+            _raise_corrupt()
+        length = BLOCK_LENGTH.unpack(header)[0]
+        data = file_object.read(length)
+        if len(data) < length:
+            _raise_corrupt()
+        for sample in decode_block(data, metrics=metrics):
+            yield sample
+
+
+def encode_performance_stats(performance_stats, file_object,
+                             block_size=BLOCK_SIZE):
+    """Encode the results of a performance stats response.
+
+    :param performance_stats: get_performance_stats or real-time
+                              get_performance_data response -- dict
+    :param file_object: writable binary file object -- file
+    :param block_size: maximum samples per block -- int
+    :returns: number of samples written -- int
+    """
+    results = performance_stats.get(pc.RESULT) or list()
+    if isinstance(results, performance_frame.PerformanceFrame):
+        results = results.to_records()
+    return encode_stream(results, file_object, block_size=block_size)
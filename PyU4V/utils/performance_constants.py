@@ -42,6 +42,40 @@ RESULT = 'result'
 REP_LEVEL = 'reporting_level'
 ONE_MINUTE = 60000
 ONE_HOUR = 3600000
+ONE_DAY = 86400000
+FAILED = 'failed'
+TIMESTAMP = 'timestamp'
+
+# Bulk collection
+COLLECT_MAX_WORKERS = 8
+KEY_INDEX_TTL = 60
+KEY_INDEX_NAMESPACE = 'performance_keys'
+TIMESTAMP_INDEX_INTERVAL = 300
+TIMESTAMP_INDEX_OFFSET = 60
+DIAGNOSTIC_INTERVAL = 5 * ONE_MINUTE
+ENHANCED_POLL_INTERVAL = 60
+SUBSCRIPTION_CADENCE = 5
+ENGINE_BATCH_SIZE = 100
+ENGINE_THREADS = 4
+THRESHOLD_MAX_WORKERS = 8
+THRESHOLD_RATE_LIMIT = 10
+
+# Capacity forecasting
+DAYS_TO_FULL_TTL = 86400
+DAYS_TO_FULL_NAMESPACE = 'days_to_full'
+FORECAST_SEASON = 7
+FORECAST_HORIZON = 730
+
+# Aggregation
+DEFAULT_PERCENTILES = [50, 95, 99]
+EWMA_ALPHA = 0.3
+
+# Exporter
+EXPORTER_ADDRESS = '0.0.0.0'
+EXPORTER_PORT = 9790
+EXPORTER_INTERVAL = 300
+EXPORTER_PREFIX = 'pyu4v'
+EXPORTER_KEYS_TTL = 3600
 
 # Director Tags
 BE_DIR_TAGS = ['DF', 'DX']
@@ -163,6 +197,7 @@ RA_GRP_ID = 'raGroupId'
 RA_GRP_INFO = 'raGroupId'
 REAL_TIME = 'realtime'
 REAL_TIME_SN = 'real_time'
+REAL_TIME_POLL_INTERVAL = 10
 REG = 'registration'
 REG_DETAILS = 'registrationdetails'
 REG_DETAILS_INFO = 'registrationDetailsInfo'
@@ -234,6 +269,9 @@ SEC_THRESH = 'secondThreshold'
 SEC_THRESH_OCC = 'secondThresholdOccurrrences'
 SEC_THRESH_SAMP = 'secondThresholdSamples'
 SEC_THRESH_SEV = 'secondThresholdSeverity'
+RT_TRACE_CRIT = 'includeRealTimeTraceOnCritical'
+THRESH_OCC = 3
+THRESH_SAMP = 5
 
 # Backup
 BACKUP = 'backup'
@@ -250,3 +288,16 @@ ENDPOINT_ID_METRICS = 'endpointId'
 NEW_CATEGORIES = [SDNAS_FS, SDNAS_INTERFACE,
                   SDNAS_NODE, SDNAS_SERVER,
                   EM_DIR, ENDPOINT, VOLUME]
+
+# Maximum time range of a single metrics request, longer ranges are split
+DEFAULT_MAX_REQUEST_WINDOW = ONE_DAY
+MAX_REQUEST_WINDOW = {VOLUME: ONE_HOUR}
+
+# Volume metrics request limits
+VOLUME_ID = 'volumeId'
+VOLUME_RESULT = 'volumeResult'
+VOLUME_START_RANGE = 'volumeStartRange'
+VOLUME_END_RANGE = 'volumeEndRange'
+SG_LIST = 'commaSeparatedStorageGroupList'
+MAX_VOLUMES_PER_REQUEST = 10000
+MAX_SGS_PER_REQUEST = 100
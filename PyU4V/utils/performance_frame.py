@@ -0,0 +1,252 @@
+# Copyright (c) 2025 Dell Inc. or its subsidiaries.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""performance_frame.py."""
+
+import logging
+
+from array import array
+
+from PyU4V.utils import exception
+from PyU4V.utils import performance_constants as pc
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import pandas
+except ImportError:
+    pandas = None
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+LOG = logging.getLogger(__name__)
+
+NAN = float('nan')
+OBJECT_ID = 'object_id'
+
+
+def _to_array(typecode, values):
+    """Copy a column to an array, NumPy arrays are copied as bytes.
+
+    :param typecode: 'q' for timestamps or 'd' for metric values -- str
+    :param values: column values -- array, list or numpy.ndarray
+    :returns: column -- array
+    """
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        column = array(typecode)
+        column.frombytes(numpy.ascontiguousarray(
+            values, dtype=numpy.int64 if typecode == 'q' else (
+                numpy.float64)).tobytes())
+        return column
+    return array(typecode, values)
+
+
+class PerformanceFrame(object):
+    """Columnar performance results.
+
+    Performance results are returned by Unisphere as one dict per sample.
+    A frame holds the same data as a single timestamp array and one array
+    of doubles per metric, with an optional object id per sample as an
+    index, which uses a fraction of the memory of the equivalent list of
+    dicts and can be handed to NumPy, pandas or Arrow without copying each
+    sample.
+
+    Metrics missing from a sample are stored as NaN. String values other
+    than the timestamp, such as volume ids in Volume results, are kept as
+    label columns.
+    """
+
+    def __init__(self):
+        """__init__."""
+        self.timestamps = array('q')
+        self.metrics = dict()
+        self.labels = dict()
+        self.object_ids = list()
+        self._has_object_ids = False
+
+    @classmethod
+    def from_results(cls, results, object_id=None):
+        """Create a frame from performance results.
+
+        :param results: performance results, one dict per sample -- list
+        :param object_id: object id for every sample -- str
+        :returns: frame -- PerformanceFrame
+        """
+        frame = cls()
+        frame.append(results, object_id=object_id)
+        return frame
+
+    @classmethod
+    def from_object_results(cls, object_results):
+        """Create a frame from performance results keyed by object id.
+
+        :param object_results: performance results keyed by object id, as
+                               returned by collect_stats -- dict
+        :returns: frame -- PerformanceFrame
+        """
+        frame = cls()
+        for object_id, results in object_results.items():
+            frame.append(results, object_id=object_id)
+        return frame
+
+    @classmethod
+    def from_columns(cls, timestamps, metrics, object_ids=None):
+        """Create a frame from columns of equal length.
+
+        :param timestamps: timestamps in milliseconds since epoch -- array
+        :param metrics: metric values keyed by metric name -- dict
+        :param object_ids: object id of each sample -- list
+        :returns: frame -- PerformanceFrame
+        """
+        frame = cls()
+        frame.timestamps = _to_array('q', timestamps)
+        for name, column in metrics.items():
+            frame.metrics[name] = _to_array('d', column)
+        if object_ids is None:
+            frame.object_ids = [None] * len(frame.timestamps)
+        else:
+            frame.object_ids = list(object_ids)
+            frame._has_object_ids = True
+        return frame
+
+    def __len__(self):
+        """Get the number of samples in the frame.
+
+        :returns: sample count -- int
+        """
+        return len(self.timestamps)
+
+    @property
+    def metric_names(self):
+        """Get the metric names in the frame.
+
+        :returns: metric names -- list
+        """
+        return list(self.metrics.keys())
+
+    def append(self, results, object_id=None):
+        """Append performance results to the frame.
+
+        :param results: performance results, one dict per sample -- list
+        :param object_id: object id for every sample -- str
+        """
+        if object_id is not None:
+            self._has_object_ids = True
+        for sample in results:
+            row = len(self.timestamps)
+            self.timestamps.append(int(sample.get(pc.TIMESTAMP) or 0))
+            self.object_ids.append(object_id)
+            for name, value in sample.items():
+                if name == pc.TIMESTAMP:
+                    continue
+                if isinstance(value, str):
+                    column = self.labels.get(name)
+                    if column is None:
+                        column = self.labels[name] = [None] * row
+                    column.append(value)
+                elif isinstance(value, (int, float)) and not isinstance(
+                        value, bool):
+                    column = self.metrics.get(name)
+                    if column is None:
+                        column = self.metrics[name] = array('d', [NAN]) * row
+                    column.append(value)
+            # Pad columns not present in this sample
+            for column in self.metrics.values():
+                if len(column) == row:
+                    column.append(NAN)
+            for column in self.labels.values():
+                if len(column) == row:
+                    column.append(None)
+
+    def to_records(self):
+        """Convert the frame back to one dict per sample.
+
+        NaN values, which represent metrics absent from a sample, are
+        omitted.
+
+        :returns: performance results -- list
+        """
+        records = list()
+        for row, timestamp in enumerate(self.timestamps):
+            record = {pc.TIMESTAMP: timestamp}
+            for name, column in self.labels.items():
+                if column[row] is not None:
+                    record[name] = column[row]
+            for name, column in self.metrics.items():
+                if column[row] == column[row]:
+                    record[name] = column[row]
+            if self._has_object_ids:
+                record[OBJECT_ID] = self.object_ids[row]
+            records.append(record)
+        return records
+
+    def to_numpy(self):
+        """Convert the frame to NumPy arrays.
+
+        Metric arrays share memory with the frame.
+
+        :returns: arrays keyed by column name -- dict
+        :raises: MissingDependencyException
+        """
+        if numpy is None:
+            raise exception.MissingDependencyException(data='numpy')
+        columns = {pc.TIMESTAMP: numpy.frombuffer(
+            self.timestamps, dtype=numpy.int64)}
+        if self._has_object_ids:
+            columns[OBJECT_ID] = numpy.array(self.object_ids, dtype=object)
+        for name, column in self.labels.items():
+            columns[name] = numpy.array(column, dtype=object)
+        for name, column in self.metrics.items():
+            columns[name] = numpy.frombuffer(column, dtype=numpy.float64)
+        return columns
+
+    def to_pandas(self):
+        """Convert the frame to a pandas DataFrame.
+
+        The DataFrame is indexed by timestamp, or by object id and
+        timestamp if the frame holds object ids.
+
+        :returns: performance data -- pandas.DataFrame
+        :raises: MissingDependencyException
+        """
+        if pandas is None:
+            raise exception.MissingDependencyException(data='pandas')
+        columns = self.to_numpy()
+        index_names = [OBJECT_ID, pc.TIMESTAMP] if (
+            self._has_object_ids) else [pc.TIMESTAMP]
+        frame = pandas.DataFrame(columns)
+        return frame.set_index(index_names)
+
+    def to_arrow(self):
+        """Convert the frame to a pyarrow Table.
+
+        :returns: performance data -- pyarrow.Table
+        :raises: MissingDependencyException
+        """
+        if pyarrow is None:
+            raise exception.MissingDependencyException(data='pyarrow')
+        columns = {pc.TIMESTAMP: pyarrow.array(
+            self.timestamps, type=pyarrow.int64())}
+        if self._has_object_ids:
+            columns[OBJECT_ID] = pyarrow.array(self.object_ids)
+        for name, column in self.labels.items():
+            columns[name] = pyarrow.array(column)
+        for name, column in self.metrics.items():
+            columns[name] = pyarrow.array(column, type=pyarrow.float64())
+        return pyarrow.table(columns)
@@ -0,0 +1,72 @@
+# Copyright (c) 2025 Dell Inc. or its subsidiaries.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""sqlite_store.py."""
+
+import logging
+import os
+import sqlite3
+import threading
+
+LOG = logging.getLogger(__name__)
+
+
+def get_default_path(filename):
+    """Get the path of a file in the ~/.PyU4V directory.
+
+    :param filename: file name -- str
+    :returns: file path -- str
+    """
+    return os.path.normpath('{home_path}/.PyU4V/{f}'.format(
+        home_path=os.path.expanduser('~'), f=filename))
+
+
+class SQLiteStore(object):
+    """Base class for the local SQLite stores.
+
+    A connection per statement keeps a store safe to share between threads
+    and processes, SQLite handles the file locking.
+    """
+
+    def __init__(self, db_path):
+        """__init__.
+
+        :param db_path: path to the SQLite database file -- str
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        db_dir = os.path.dirname(self.db_path)
+        if db_dir and not os.path.isdir(db_dir):
+            os.makedirs(db_dir, exist_ok=True)
+
+    def _execute(self, statement, params=(), fetch=False, many=False):
+        """Run a statement against the store in its own connection.
+
+        :param statement: SQL statement -- str
+        :param params: statement parameters, or list of them if many is
+                       set -- tuple
+        :param fetch: return the selected rows -- bool
+        :param many: run the statement once per set of parameters -- bool
+        :returns: selected rows -- list
+        """
+        with self._lock:
+            connection = sqlite3.connect(self.db_path, timeout=30)
+            try:
+                with connection:
+                    if many:
+                        connection.executemany(statement, params)
+                        return list()
+                    cursor = connection.execute(statement, params)
+                    return cursor.fetchall() if fetch else list()
+            finally:
+                connection.close()
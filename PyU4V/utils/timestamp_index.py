@@ -0,0 +1,97 @@
+# Copyright (c) 2025 Dell Inc. or its subsidiaries.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""timestamp_index.py."""
+
+import logging
+import threading
+import time
+
+from PyU4V.utils import performance_constants as pc
+
+LOG = logging.getLogger(__name__)
+
+
+def index_array_keys(response):
+    """Index an Array performance key list response by array id.
+
+    :param response: Array performance keys response -- dict
+    :returns: key details keyed by array id -- dict
+    """
+    return {key[pc.SYMM_ID]: key for key in response.get(
+        pc.ARRAY_INFO) or list() if key and key.get(pc.SYMM_ID)}
+
+
+class TimestampIndex(object):
+    """Performance timestamps for every array registered with a Unisphere.
+
+    The Array performance key list returns the first and last available
+    timestamps of every array, so a single request serves all of them.
+    Diagnostic data is collected at five minute intervals, so the index is
+    only refreshed once per interval, shortly after each interval boundary
+    by which time the new sample is normally available. An array not in
+    the index, for example one registered since the last refresh, causes
+    an immediate refresh.
+
+    One index is shared by all performance functions of a U4VConn.
+    """
+
+    def __init__(self, interval=pc.TIMESTAMP_INDEX_INTERVAL,
+                 offset=pc.TIMESTAMP_INDEX_OFFSET):
+        """__init__.
+
+        :param interval: seconds between refreshes -- int
+        :param offset: seconds after each interval boundary to
+                       refresh at -- int
+        """
+        self.interval = interval
+        self.offset = offset
+        self._keys = None
+        self._next_refresh = 0
+        self._lock = threading.Lock()
+
+    def get_next_refresh(self, now):
+        """Get the time of the first scheduled refresh after a given time.
+
+        :param now: time in seconds since epoch -- float
+        :returns: time in seconds since epoch -- float
+        """
+        intervals = (now - self.offset) // self.interval + 1
+        return intervals * self.interval + self.offset
+
+    def get_array_keys(self, fetch, array_id=None):
+        """Get the performance keys of every array, refreshing if due.
+
+        :param fetch: callable returning the Array performance key list
+                      response -- callable
+        :param array_id: array id which must be in the index -- str
+        :returns: key details keyed by array id, None if Unisphere returned
+                  no keys -- dict
+        """
+        with self._lock:
+            now = time.time()
+            if self._keys is None or now >= self._next_refresh or (
+                    array_id and array_id not in self._keys):
+                response = fetch()
+                if not response:
+                    return None
+                self._keys = index_array_keys(response)
+                self._next_refresh = self.get_next_refresh(now)
+                LOG.debug('Refreshed performance timestamps for {n} '
+                          'arrays.'.format(n=len(self._keys)))
+            return self._keys
+
+    def invalidate(self):
+        """Refresh the index on the next request."""
+        with self._lock:
+            self._keys = None